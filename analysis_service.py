@@ -3,8 +3,39 @@ Shared analysis pipeline utilities.
 
 Provides a single prepare_analysis_dataframe() entry point so CLI tools,
 batch backtests, and validation harnesses all build indicators the same way.
+
+get_analysis_dataframe() is the memoized variant: within one process each
+ticker's frame is built once per day and cache state, no matter how many
+consumers (reports, charts, sector relative strength) ask for it, and across
+processes frames are reused from the persistent frame cache (frame_cache.py).
+
+get_period_frames() serves several periods of one ticker from a single run on
+the longest period. Shorter periods are slices of that frame; only features
+that depend on where the history starts are adjusted: the cumulative OBV/AD
+lines are rebased to start at the slice, and the anchored VWAP is re-anchored
+within the slice (a period whose anchor changes is built independently).
+
+Parity with independent runs: every column of a derived period matches an
+independent prepare_analysis_dataframe() run for that period from bar
+PERIOD_SLICE_WARMUP_BARS onward (compare_period_frames() checks this). The
+first bars differ by design: the slice carries indicators warmed up on the
+longer history, where an independent run computes them from truncated
+rolling windows (e.g. the 20-bar z-score of a 20-bar CMF needs 39 bars).
+A period with no more bars than that warmup (1mo) would lie entirely in the
+unchecked zone, so it is always built independently.
+
+Date-range frames (start_date/end_date, used by date-window backtests) read
+only the requested bars plus ANALYSIS_WARMUP_BARS leading bars from the cache
+and trim the warmup after the pipeline has run (the regime columns come from
+the full-history regime store, see regime_filter.get_regime_frame()). Such a
+frame only sees history up to end_date, so the anchored VWAP and the
+cumulative OBV/AD levels are computed as of end_date.
 """
 
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Union
+
 import numpy as np
 import pandas as pd
 
@@ -17,7 +48,16 @@ from error_handler import (
     validate_period,
     get_logger,
 )
-from data_manager import get_smart_data
+from data_manager import (
+    PERIOD_DAYS,
+    get_cache_fingerprint,
+    get_period_start,
+    get_range_data,
+    get_smart_data,
+    get_timeframe_data,
+    normalize_period,
+)
+import frame_cache
 import indicators
 import regime_filter
 import signal_generator
@@ -25,6 +65,17 @@ import swing_structure
 import volume_features
 
 
+# Prepared frames built in this process, least recently used first
+MAX_MEMOIZED_FRAMES = 32
+_frame_memo: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+# Longest indicator warmup chain (20-bar z-score of a 20-bar CMF = 39 bars)
+ANALYSIS_WARMUP_BARS = 40
+
+# Leading bars of a derived period that may differ from an independent run
+PERIOD_SLICE_WARMUP_BARS = ANALYSIS_WARMUP_BARS
+
+
 def prepare_analysis_dataframe(
     ticker: str,
     period: str,
@@ -32,25 +83,48 @@ def prepare_analysis_dataframe(
     data_source: str = "yfinance",
     force_refresh: bool = False,
     verbose: bool = False,
+    interval: str = "1d",
+    start_date: Optional[Union[str, pd.Timestamp]] = None,
+    end_date: Optional[Union[str, pd.Timestamp]] = None,
 ) -> pd.DataFrame:
     """
     Build the full indicator + signal DataFrame used by analysis/backtesting.
+
+    interval='1wk' or '1mo' runs the identical pipeline on weekly/monthly bars
+    resampled from the daily cache (rolling windows are then in bars of that
+    timeframe). No extra data is downloaded.
+
+    start_date (with optional end_date) replaces the period: only that daily
+    range plus ANALYSIS_WARMUP_BARS leading bars is read from the cache, and
+    the returned frame starts at start_date.
     """
     with ErrorContext("preparing analysis dataframe", ticker=ticker, period=period):
         validate_ticker(ticker)
         validate_period(period)
         logger = get_logger()
+        if start_date is not None and interval != "1d":
+            raise DataValidationError("Date-range analysis frames require interval='1d'")
 
         try:
-            df = get_smart_data(
-                ticker,
-                period,
-                interval="1d",
-                force_refresh=force_refresh,
-                data_source=data_source,
-            )
+            if start_date is not None:
+                df = get_range_data(
+                    ticker,
+                    start_date,
+                    end_date,
+                    warmup_bars=ANALYSIS_WARMUP_BARS,
+                )
+            elif interval == "1d":
+                df = get_smart_data(
+                    ticker,
+                    period,
+                    interval="1d",
+                    force_refresh=force_refresh,
+                    data_source=data_source,
+                )
+            else:
+                df = get_timeframe_data(ticker, period, interval=interval)
             logger.info(
-                f"Retrieved {len(df)} rows for {ticker} ({period}) via {data_source}"
+                f"Retrieved {len(df)} {interval} rows for {ticker} ({period}) via {data_source}"
             )
         except (DataValidationError, DataDownloadError, CacheError):
             raise
@@ -259,4 +333,229 @@ def prepare_analysis_dataframe(
     for column in signal_columns:
         df[f"{column}_display"] = df[column].shift(1)
 
+    if start_date is not None:
+        df = df[df.index >= pd.Timestamp(start_date)].copy()
+
     return df
+
+
+def _frame_memo_key(ticker: str, period: str, data_source: str, interval: str) -> tuple:
+    """
+    Identify a prepared frame by its request and the cache files it is built from.
+
+    Periods are cut relative to today, and the regime columns read the SPY and
+    sector ETF caches, so all of those are part of the key.
+    """
+    from corporate_actions import get_actions_fingerprint
+    from earnings_calendar import get_earnings_fingerprint
+
+    ticker = ticker.upper()
+    benchmarks = sorted({'SPY', regime_filter.get_sector_etf(ticker)})
+    return (
+        ticker, period, interval, data_source, date.today().isoformat(),
+        get_cache_fingerprint(ticker, "1d"), get_actions_fingerprint(ticker),
+        tuple(get_cache_fingerprint(etf, "1d") for etf in benchmarks),
+        get_earnings_fingerprint(ticker),
+    )
+
+
+def _period_label(period: str, start_date=None, end_date=None) -> str:
+    """Name of a frame request: its period, or its date range (YYYYMMDD-YYYYMMDD)."""
+    if start_date is None:
+        return period
+    end_label = f"{pd.Timestamp(end_date):%Y%m%d}" if end_date is not None else "end"
+    return f"{pd.Timestamp(start_date):%Y%m%d}-{end_label}"
+
+
+def get_frame_fingerprint(
+    ticker: str,
+    period: str,
+    *,
+    data_source: str = "yfinance",
+    interval: str = "1d",
+    start_date: Optional[Union[str, pd.Timestamp]] = None,
+    end_date: Optional[Union[str, pd.Timestamp]] = None,
+) -> Optional[str]:
+    """
+    Content key of the frame get_analysis_dataframe() would return, without building it.
+
+    Covers the ticker and benchmark cache checksums, corporate actions,
+    earnings dates, the period (cut relative to today) or date range, the
+    threshold config and the pipeline code version.
+
+    Returns:
+        Optional[str]: Key (see frame_cache.get_frame_cache_key()), or None
+            when the ticker has no cache
+    """
+    key = _frame_memo_key(ticker, _period_label(period, start_date, end_date), data_source, interval)
+    if key[5] is None:
+        return None
+    return frame_cache.get_frame_cache_key(key)
+
+
+def get_analysis_dataframe(
+    ticker: str,
+    period: str,
+    *,
+    data_source: str = "yfinance",
+    force_refresh: bool = False,
+    verbose: bool = False,
+    interval: str = "1d",
+    start_date: Optional[Union[str, pd.Timestamp]] = None,
+    end_date: Optional[Union[str, pd.Timestamp]] = None,
+) -> pd.DataFrame:
+    """
+    prepare_analysis_dataframe() with a bounded in-memory memo.
+
+    Repeated requests for the same ticker/period/interval return a copy of the
+    frame built by the first one until its cache (or a benchmark cache it
+    depends on) changes. At most MAX_MEMOIZED_FRAMES frames are kept; the least
+    recently used is evicted first. Memo misses are served from the persistent
+    frame cache when it holds a frame for the same inputs.
+    """
+    with ErrorContext("preparing analysis dataframe", ticker=ticker, period=period):
+        validate_ticker(ticker)
+        validate_period(period)
+        period_label = _period_label(period, start_date, end_date)
+        key = _frame_memo_key(ticker, period_label, data_source, interval)
+
+    build_kwargs = dict(data_source=data_source, verbose=verbose, interval=interval,
+                        start_date=start_date, end_date=end_date)
+    if force_refresh or key[5] is None:
+        return prepare_analysis_dataframe(ticker, period, force_refresh=force_refresh, **build_kwargs)
+
+    df = _frame_memo.get(key)
+    if df is not None:
+        _frame_memo.move_to_end(key)
+        get_logger().info(f"Reusing prepared analysis frame for {ticker} ({period_label}, {interval})")
+        return df.copy()
+
+    cache_key = frame_cache.get_frame_cache_key(key)
+    df = frame_cache.load_frame(ticker, period_label, interval, cache_key)
+    if df is None:
+        df = prepare_analysis_dataframe(ticker, period, **build_kwargs)
+        try:
+            frame_cache.save_frame(ticker, period_label, interval, cache_key, df)
+        except Exception as exc:
+            get_logger().warning(f"Could not store prepared frame for {ticker}: {exc}")
+
+    # Drop frames built from older cache states of the same request
+    for stale_key in [k for k in _frame_memo if k[:4] == key[:4]]:
+        del _frame_memo[stale_key]
+    _frame_memo[key] = df
+    while len(_frame_memo) > MAX_MEMOIZED_FRAMES:
+        _frame_memo.popitem(last=False)
+    return df.copy()
+
+
+def clear_analysis_frame_memo() -> None:
+    """Forget all memoized analysis frames."""
+    _frame_memo.clear()
+
+
+def slice_analysis_dataframe(df: pd.DataFrame, period: str) -> Optional[pd.DataFrame]:
+    """
+    Derive a shorter period from a prepared frame without rerunning the pipeline.
+
+    Args:
+        df: Frame from prepare_analysis_dataframe() on a longer daily period
+        period: Shorter period to cut (relative to now, like get_smart_data)
+
+    Returns:
+        Optional[pd.DataFrame]: The derived frame, or None when it would not
+            match an independent run (callers then build the period on its
+            own): the period has no more than PERIOD_SLICE_WARMUP_BARS bars,
+            or the anchored VWAP would anchor differently
+    """
+    cutoff = get_period_start(period)
+    sliced = df[df.index >= cutoff].copy() if cutoff > df.index[0] else df.copy()
+    if len(sliced) <= PERIOD_SLICE_WARMUP_BARS:
+        return None
+    start = df.index.get_loc(sliced.index[0])
+    if start == 0:
+        return sliced
+
+    # Anchored VWAP: an independent run only sees pivots inside the slice
+    vwap = indicators.calculate_anchored_vwap(sliced)
+    if not np.allclose(vwap.to_numpy(dtype=float), sliced["VWAP"].to_numpy(dtype=float),
+                       rtol=1e-12, atol=0.0, equal_nan=True):
+        return None
+
+    # Cumulative lines restart at the slice, as in an independent run: OBV's
+    # first bar contributes nothing (no prior close), the A/D line's does
+    obv_offset = df["OBV"].iloc[start]
+    ad_offset = df["AD_Line"].iloc[start - 1]
+    sliced[["OBV", "OBV_MA"]] -= obv_offset
+    sliced[["AD_Line", "AD_MA"]] -= ad_offset
+    return sliced
+
+
+def get_period_frames(
+    ticker: str,
+    periods: List[str],
+    *,
+    data_source: str = "yfinance",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Daily analysis frames for several periods from one pipeline run.
+
+    Args:
+        ticker: Stock symbol
+        periods: Periods to return (e.g. ['1mo', '3mo', '6mo', '12mo'])
+        data_source: Data source to use ('yfinance' or 'massive')
+
+    Returns:
+        Dict[str, pd.DataFrame]: Frame per requested period
+    """
+    longest = max(periods, key=lambda p: PERIOD_DAYS.get(normalize_period(p), 365))
+    full = get_analysis_dataframe(ticker, longest, data_source=data_source)
+
+    frames = {}
+    for period in periods:
+        if period == longest:
+            frames[period] = full.copy()
+            continue
+        derived = slice_analysis_dataframe(full, period)
+        if derived is None:
+            get_logger().info(f"{ticker} ({period}) cannot be sliced from {longest} in parity "
+                              f"(warmup-length period or VWAP anchor outside the slice); "
+                              f"building {period} independently")
+            derived = get_analysis_dataframe(ticker, period, data_source=data_source)
+        frames[period] = derived
+    return frames
+
+
+def compare_period_frames(
+    derived: pd.DataFrame,
+    independent: pd.DataFrame,
+    warmup_bars: int = PERIOD_SLICE_WARMUP_BARS,
+) -> List[str]:
+    """
+    Parity check between a derived period and an independent run.
+
+    Args:
+        derived: Frame from slice_analysis_dataframe() / get_period_frames()
+        independent: prepare_analysis_dataframe() run for the same period
+        warmup_bars: Leading bars excluded from the comparison
+
+    Returns:
+        List[str]: Columns that differ after the warmup (empty when in parity),
+            plus 'index' if the two frames cover different bars
+    """
+    if not derived.index.equals(independent.index):
+        return ["index"]
+    mismatched = []
+    for column in independent.columns:
+        if column not in derived.columns:
+            mismatched.append(column)
+            continue
+        a = derived[column].iloc[warmup_bars:]
+        b = independent[column].iloc[warmup_bars:]
+        if pd.api.types.is_numeric_dtype(b) and not pd.api.types.is_bool_dtype(b):
+            same = np.allclose(a.to_numpy(dtype=float), b.to_numpy(dtype=float),
+                               rtol=1e-9, atol=1e-9, equal_nan=True)
+        else:
+            same = ((a == b) | (a.isna() & b.isna())).all()
+        if not same:
+            mismatched.append(column)
+    return mismatched
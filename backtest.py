@@ -8,7 +8,7 @@ generated by the volume analysis tool.
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 from signal_metadata import get_display_name
 
@@ -394,6 +394,10 @@ def pair_entry_exit_signals(df: pd.DataFrame, entry_signals: List[str],
     that occurs after it, calculating the actual entry-to-exit return using
     realistic execution prices (next day opens, not same day closes).
     
+    Pairing works on NumPy arrays: exit bar positions are located with a single
+    searchsorted over the exit positions, so the cost is O(n log n) instead of
+    re-slicing the future for every entry. The input DataFrame is not modified.
+    
     Args:
         df (pd.DataFrame): DataFrame with entry/exit signals and Next_Open prices
         entry_signals (List[str]): List of entry signal column names
@@ -404,62 +408,69 @@ def pair_entry_exit_signals(df: pd.DataFrame, entry_signals: List[str],
     """
     paired_trades = []
     
-    # Create combined entry and exit flags
-    df['Any_Entry'] = df[entry_signals].any(axis=1)
-    df['Any_Exit'] = df[exit_signals].any(axis=1)
+    # Fallback if Next_Open not available - skip every entry to avoid lookahead
+    if 'Next_Open' not in df.columns or len(df) == 0:
+        return paired_trades
+    
+    # Pull everything into arrays once; the caller's DataFrame is not modified
+    index = df.index
+    n_bars = len(df)
+    entry_flags = df[entry_signals].any(axis=1).to_numpy(dtype=bool)
+    exit_flags = df[exit_signals].any(axis=1).to_numpy(dtype=bool)
+    entry_values = df[entry_signals].to_numpy()
+    exit_values = df[exit_signals].to_numpy()
+    next_open = df['Next_Open'].to_numpy()
+    close = df['Close'].to_numpy()
+    regime_values = {
+        col: (df[col].to_numpy() if col in df.columns else None)
+        for col in ('Market_Regime_OK', 'Sector_Regime_OK', 'Overall_Regime_OK')
+    }
+    
+    # For every entry bar, the first exit bar strictly after it (O(log n) each)
+    entry_positions = np.flatnonzero(entry_flags)
+    exit_positions = np.flatnonzero(exit_flags)
+    next_exit_slot = np.searchsorted(exit_positions, entry_positions, side='right')
     
-    # Iterate through each entry signal
-    for idx in df[df['Any_Entry']].index:
-        entry_signal_date = idx
+    last_price = close[-1]
+    last_date = index[-1]
+    
+    for entry_pos, exit_slot in zip(entry_positions, next_exit_slot):
+        entry_signal_date = index[entry_pos]
         
         # CRITICAL FIX: Entry price = OPEN of next day, not close of signal day
         # Signal fires at close of day T, we enter at open of day T+1
-        if 'Next_Open' in df.columns and not pd.isna(df.loc[idx, 'Next_Open']):
-            entry_price = df.loc[idx, 'Next_Open']  # ✅ Realistic entry price
-            
-            # Calculate actual entry date (day after signal)
-            entry_idx_pos = df.index.get_loc(idx)
-            if entry_idx_pos + 1 < len(df):
-                actual_entry_date = df.index[entry_idx_pos + 1]
-            else:
-                # No next day data available - skip this signal
-                continue
-        else:
-            # Fallback if Next_Open not available - skip to avoid lookahead
+        if pd.isna(next_open[entry_pos]) or entry_pos + 1 >= n_bars:
+            # No realistic fill available - skip this signal
             continue
+        entry_price = next_open[entry_pos]  # ✅ Realistic entry price
+        actual_entry_date = index[entry_pos + 1]
         
         # Find which specific entry signals triggered
-        triggered_entries = [sig for sig in entry_signals if df.loc[idx, sig]]
+        triggered_entries = [sig for sig, value in zip(entry_signals, entry_values[entry_pos]) if value]
         
-        # Look for next exit signal after this entry
-        future_data = df.loc[idx:].iloc[1:]  # Start from next day after signal
-        exit_signals_future = future_data[future_data['Any_Exit']]
+        # Get regime filter status at entry
+        market_regime, sector_regime, overall_regime = (
+            values[entry_pos + 1] if values is not None else None
+            for values in regime_values.values()
+        )
         
-        if len(exit_signals_future) > 0:
+        if exit_slot < len(exit_positions):
             # Found an exit signal
-            exit_signal_idx = exit_signals_future.index[0]
-            exit_signal_date = exit_signal_idx
+            exit_pos = exit_positions[exit_slot]
+            exit_signal_date = index[exit_pos]
             
             # CRITICAL FIX: Exit price = OPEN of day after exit signal
             # Exit signal fires at close of day X, we exit at open of day X+1
-            if 'Next_Open' in df.columns and not pd.isna(df.loc[exit_signal_idx, 'Next_Open']):
-                exit_price = df.loc[exit_signal_idx, 'Next_Open']  # ✅ Realistic exit price
-                
-                # Calculate actual exit date (day after exit signal)
-                exit_idx_pos = df.index.get_loc(exit_signal_idx)
-                if exit_idx_pos + 1 < len(df):
-                    actual_exit_date = df.index[exit_idx_pos + 1]
-                else:
-                    # No next day data - use last available price as emergency exit
-                    exit_price = df.loc[exit_signal_idx, 'Close']
-                    actual_exit_date = exit_signal_date
+            if not pd.isna(next_open[exit_pos]) and exit_pos + 1 < n_bars:
+                exit_price = next_open[exit_pos]  # ✅ Realistic exit price
+                actual_exit_date = index[exit_pos + 1]
             else:
-                # Fallback if Next_Open not available - use signal day close
-                exit_price = df.loc[exit_signal_idx, 'Close']
+                # No next day fill - use signal day close as emergency exit
+                exit_price = close[exit_pos]
                 actual_exit_date = exit_signal_date
             
             # Find which specific exit signals triggered
-            triggered_exits = [sig for sig in exit_signals if df.loc[exit_signal_idx, sig]]
+            triggered_exits = [sig for sig, value in zip(exit_signals, exit_values[exit_pos]) if value]
             
             # Calculate return using realistic entry/exit prices
             return_pct = ((exit_price - entry_price) / entry_price) * 100
@@ -467,11 +478,6 @@ def pair_entry_exit_signals(df: pd.DataFrame, entry_signals: List[str],
             # Calculate holding period
             holding_days = (actual_exit_date - actual_entry_date).days
             
-            # Get regime filter status at entry
-            market_regime = df.loc[actual_entry_date, 'Market_Regime_OK'] if 'Market_Regime_OK' in df.columns else None
-            sector_regime = df.loc[actual_entry_date, 'Sector_Regime_OK'] if 'Sector_Regime_OK' in df.columns else None
-            overall_regime = df.loc[actual_entry_date, 'Overall_Regime_OK'] if 'Overall_Regime_OK' in df.columns else None
-            
             paired_trades.append({
                 'entry_signal_date': entry_signal_date,  # When signal fired
                 'entry_date': actual_entry_date,         # When you actually entered
@@ -490,16 +496,9 @@ def pair_entry_exit_signals(df: pd.DataFrame, entry_signals: List[str],
         else:
             # No exit signal found - trade still open or data ended
             # Calculate return to last available price
-            last_price = df['Close'].iloc[-1]
-            last_date = df.index[-1]
             return_pct = ((last_price - entry_price) / entry_price) * 100
             holding_days = (last_date - actual_entry_date).days
             
-            # Get regime filter status at entry
-            market_regime = df.loc[actual_entry_date, 'Market_Regime_OK'] if 'Market_Regime_OK' in df.columns else None
-            sector_regime = df.loc[actual_entry_date, 'Sector_Regime_OK'] if 'Sector_Regime_OK' in df.columns else None
-            overall_regime = df.loc[actual_entry_date, 'Overall_Regime_OK'] if 'Overall_Regime_OK' in df.columns else None
-            
             paired_trades.append({
                 'entry_signal_date': entry_signal_date,
                 'entry_date': actual_entry_date,
@@ -910,17 +909,145 @@ def run_backtest(df: pd.DataFrame, ticker: str, period: str,
     return strategy_report
 
 
+# Exit signals used when sweeping entry-score thresholds
+THRESHOLD_EXIT_SIGNALS = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal',
+                          'Momentum_Exhaustion', 'Stop_Loss']
+
+
+def build_signal_trade_table(df: pd.DataFrame, signal_col: str, score_col: str,
+                             exit_signals: List[str] = None) -> pd.DataFrame:
+    """
+    Pair every raw occurrence of a signal once and attach its score.
+    
+    With a single entry column each trade depends only on its own signal bar
+    (it exits at the next exit signal after it), so the trades taken at any
+    score threshold are exactly the rows of this table with score >= threshold.
+    
+    Args:
+        df: DataFrame with signals, scores, and Next_Open prices
+        signal_col: Column name for boolean signal (e.g., 'Moderate_Buy')
+        score_col: Column name for signal score (e.g., 'Moderate_Buy_Score')
+        exit_signals: Exit signal columns (default: THRESHOLD_EXIT_SIGNALS)
+        
+    Returns:
+        pd.DataFrame: One row per paired signal with entry_signal_date, score,
+            return_pct, holding_days and is_open
+    """
+    if exit_signals is None:
+        exit_signals = THRESHOLD_EXIT_SIGNALS
+    
+    columns = ['entry_signal_date', 'score', 'return_pct', 'holding_days', 'is_open']
+    raw_col = f'{signal_col}_raw'
+    signal_df = df.assign(**{raw_col: (df[signal_col] == True)})
+    paired_trades = pair_entry_exit_signals(signal_df, [raw_col], exit_signals)
+    if not paired_trades:
+        return pd.DataFrame(columns=columns)
+    
+    signal_dates = pd.DatetimeIndex([t['entry_signal_date'] for t in paired_trades])
+    scores = df[score_col].to_numpy(dtype=float)[df.index.get_indexer(signal_dates)]
+    return pd.DataFrame({
+        'entry_signal_date': signal_dates,
+        'score': scores,
+        'return_pct': [t['return_pct'] for t in paired_trades],
+        'holding_days': [t['holding_days'] for t in paired_trades],
+        'is_open': [t.get('is_open', False) for t in paired_trades],
+    }, columns=columns)
+
+
+def sweep_signal_thresholds(trade_table: pd.DataFrame, thresholds: List[float]) -> pd.DataFrame:
+    """
+    Compute performance metrics for many score thresholds from one trade table.
+    
+    Closed trades are sorted by score once; suffix sums over that order give
+    count, wins, return sums and best/worst for every threshold, and each
+    threshold is located with a binary search. Metrics match
+    analyze_strategy_performance() on the trades with score >= threshold.
+    
+    Args:
+        trade_table: Output of build_signal_trade_table() (optionally with a
+            'ticker' column when tables from several tickers are concatenated)
+        thresholds: Threshold values to evaluate (any number, e.g. a 0.1 grid)
+        
+    Returns:
+        pd.DataFrame: Metrics indexed by threshold
+    """
+    thresholds = np.asarray(list(thresholds), dtype=float)
+    # A NaN score never satisfies score >= threshold
+    trade_table = trade_table[trade_table['score'].notna()]
+    all_scores = np.sort(trade_table['score'].to_numpy(dtype=float))
+    total_trades = len(all_scores) - np.searchsorted(all_scores, thresholds, side='left')
+    
+    closed = trade_table[~trade_table['is_open'].astype(bool)]
+    order = np.argsort(closed['score'].to_numpy(dtype=float), kind='mergesort')
+    scores = closed['score'].to_numpy(dtype=float)[order]
+    returns = closed['return_pct'].to_numpy(dtype=float)[order]
+    n = len(returns)
+    
+    # Suffix aggregates: element i covers sorted trades i..n-1 (the trades above a cut)
+    def suffix(values, ufunc=np.add, empty=0.0):
+        out = np.full(n + 1, empty, dtype=float)
+        if n:
+            out[:n] = ufunc.accumulate(values[::-1])[::-1]
+        return out
+    
+    is_win = returns > 0
+    win_count = suffix(is_win.astype(float))
+    win_sum = suffix(np.where(is_win, returns, 0.0))
+    loss_sum = suffix(np.where(is_win, 0.0, returns))
+    best = suffix(returns, np.maximum, -np.inf)
+    worst = suffix(returns, np.minimum, np.inf)
+    
+    cut = np.searchsorted(scores, thresholds, side='left')
+    closed_trades = n - cut
+    wins = win_count[cut]
+    losses = closed_trades - wins
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(closed_trades > 0, wins / closed_trades * 100, 0.0)
+        avg_return = np.where(closed_trades > 0, (win_sum[cut] + loss_sum[cut]) / closed_trades, 0.0)
+        avg_win = np.where(wins > 0, win_sum[cut] / wins, 0.0)
+        avg_loss = np.where(losses > 0, loss_sum[cut] / losses, 0.0)
+        profit_factor = np.where((losses > 0) & (loss_sum[cut] != 0),
+                                 np.abs(win_sum[cut] / loss_sum[cut]), np.inf)
+    expectancy = (win_rate / 100 * avg_win) + ((1 - win_rate / 100) * avg_loss)
+    
+    results = pd.DataFrame({
+        'total_trades': total_trades,
+        'closed_trades': closed_trades,
+        'wins': wins.astype(int),
+        'losses': losses.astype(int),
+        'win_rate': win_rate,
+        'avg_return': avg_return,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'expectancy': expectancy,
+        'profit_factor': np.where(closed_trades > 0, profit_factor, 0.0),
+        'best_return': np.where(closed_trades > 0, best[cut], 0.0),
+        'worst_return': np.where(closed_trades > 0, worst[cut], 0.0),
+    }, index=pd.Index(thresholds, name='threshold'))
+    
+    # Median and ticker coverage are not suffix-decomposable; read the slice per cut
+    results['median_return'] = [float(np.median(returns[c:])) if c < n else 0.0 for c in cut]
+    if 'ticker' in closed.columns:
+        tickers = closed['ticker'].to_numpy()[order]
+        results['tickers_with_trades'] = [len(set(tickers[c:])) for c in cut]
+    
+    return results
+
+
 def optimize_signal_thresholds(df: pd.DataFrame, signal_col: str, score_col: str, 
                               signal_name: str = None, thresholds: List[float] = None) -> Dict:
     """
     Test different score thresholds and measure trading performance at each level.
     
     This function enables empirical threshold optimization by:
-    1. Filtering trades to only those meeting each threshold
-    2. Running entry-to-exit analysis on filtered trades
+    1. Pairing every raw signal with its exit once (build_signal_trade_table)
+    2. Sweeping all thresholds over that trade table in a single pass
     3. Measuring win rate, expectancy, and sample size
     4. Finding optimal threshold that balances performance and sample size
     
+    Because the trade table is built once, fine-grained grids (e.g. every 0.1)
+    cost little more than the default handful of thresholds.
+    
     Args:
         df: DataFrame with signals, scores, and Next_Open prices
         signal_col: Column name for boolean signal (e.g., 'Moderate_Buy')
@@ -937,80 +1064,44 @@ def optimize_signal_thresholds(df: pd.DataFrame, signal_col: str, score_col: str
     if signal_name is None:
         signal_name = signal_col
     
-    results = {}
+    def empty_result(threshold, error=None):
+        result = {
+            'threshold': threshold,
+            'trades': 0,
+            'win_rate': 0,
+            'avg_return': 0,
+            'expectancy': 0,
+            'sample_size': 0
+        }
+        if error is not None:
+            result['error'] = error
+        return result
     
-    for threshold in thresholds:
-        # Create a filtered signal that only triggers when score >= threshold
-        df_filtered = df.copy()
-        df_filtered[f'{signal_col}_filtered'] = (
-            (df[signal_col] == True) & 
-            (df[score_col] >= threshold)
-        )
-        
-        # Skip if no signals at this threshold
-        if df_filtered[f'{signal_col}_filtered'].sum() == 0:
-            results[threshold] = {
-                'threshold': threshold,
-                'trades': 0,
-                'win_rate': 0,
-                'avg_return': 0,
-                'expectancy': 0,
-                'sample_size': 0
-            }
+    try:
+        trade_table = build_signal_trade_table(df, signal_col, score_col)
+        sweep = sweep_signal_thresholds(trade_table, thresholds)
+    except Exception as e:
+        # Handle any errors gracefully
+        return {threshold: empty_result(threshold, str(e)) for threshold in thresholds}
+    
+    results = {}
+    for threshold, metrics in zip(thresholds, sweep.itertuples(index=False)):
+        if metrics.total_trades == 0:
+            # No signals at this threshold
+            results[threshold] = empty_result(threshold)
             continue
         
-        # Run backtest analysis on filtered signals
-        try:
-            # Use existing pair_entry_exit_signals with filtered signal
-            exit_signals = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal', 
-                           'Momentum_Exhaustion', 'Stop_Loss']
-            
-            # Pair filtered entry signals with exit signals
-            paired_trades = pair_entry_exit_signals(
-                df_filtered, 
-                [f'{signal_col}_filtered'], 
-                exit_signals
-            )
-            
-            if not paired_trades:
-                results[threshold] = {
-                    'threshold': threshold,
-                    'trades': 0,
-                    'win_rate': 0,
-                    'avg_return': 0,
-                    'expectancy': 0,
-                    'sample_size': 0
-                }
-                continue
-            
-            # Analyze performance using existing function
-            metrics = analyze_strategy_performance(paired_trades, 
-                                                  entry_filter=f'{signal_col}_filtered')
-            
-            # Extract key metrics
-            results[threshold] = {
-                'threshold': threshold,
-                'trades': metrics.get('closed_trades', 0),
-                'win_rate': metrics.get('win_rate', 0),
-                'avg_return': metrics.get('avg_return', 0),
-                'expectancy': metrics.get('expectancy', 0),
-                'sample_size': metrics.get('total_trades', 0),
-                'profit_factor': metrics.get('profit_factor', 0),
-                'best_return': metrics.get('best_return', 0),
-                'worst_return': metrics.get('worst_return', 0)
-            }
-            
-        except Exception as e:
-            # Handle any errors gracefully
-            results[threshold] = {
-                'threshold': threshold,
-                'trades': 0,
-                'win_rate': 0,
-                'avg_return': 0,
-                'expectancy': 0,
-                'sample_size': 0,
-                'error': str(e)
-            }
+        results[threshold] = {
+            'threshold': threshold,
+            'trades': int(metrics.closed_trades),
+            'win_rate': metrics.win_rate,
+            'avg_return': metrics.avg_return,
+            'expectancy': metrics.expectancy,
+            'sample_size': int(metrics.total_trades),
+            'profit_factor': metrics.profit_factor,
+            'best_return': metrics.best_return,
+            'worst_return': metrics.worst_return
+        }
     
     return results
 
@@ -1208,6 +1299,232 @@ def run_full_threshold_optimization(df: pd.DataFrame, ticker: str, period: str,
     return full_report
 
 
+# Entry and exit signal columns monitored by the risk-managed backtest
+RISK_MANAGED_ENTRY_SIGNALS = ['Strong_Buy', 'Moderate_Buy', 'Stealth_Accumulation',
+                              'Confluence_Signal', 'Volume_Breakout']
+RISK_MANAGED_EXIT_SIGNALS = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal',
+                             'Momentum_Exhaustion', 'Stop_Loss']
+
+
+def _simulate_risk_managed_trades(df: pd.DataFrame, ticker: str, risk_managers: Dict,
+                                  verbose: bool = True, start_idx: int = 0,
+                                  on_checkpoint: Optional[Callable[[int], None]] = None) -> Dict[str, List]:
+    """
+    Walk the bars once, advancing one position state per RiskManager.
+    
+    Every manager sees the same pre-extracted column arrays, entry signals,
+    signal scores and initial stops; only position state, equity and exit
+    rules differ. Idle bars (no manager holding a position and no entry
+    signal) are skipped by jumping between entry-signal bars.
+    
+    Args:
+        df: DataFrame with signals and indicators from vol_analysis.py
+        ticker: Stock symbol
+        risk_managers: Dict mapping a label (e.g. stop strategy) to a RiskManager
+        verbose: Print entries and exits (single-manager runs)
+        start_idx: First bar to process; managers restored from a checkpoint
+            already hold the state of every earlier bar
+        on_checkpoint: Called with the last bar's index just before that bar
+            is processed, while the managers still hold resumable state (the
+            last bar cannot place entries and is followed by END_OF_DATA exits)
+        
+    Returns:
+        Dict[str, List]: Trade records per label (including trades restored
+            with the managers), in the order they closed
+    """
+    entry_signals = RISK_MANAGED_ENTRY_SIGNALS
+    exit_signals = RISK_MANAGED_EXIT_SIGNALS
+    
+    # Pre-extract columns once; per-bar work below only indexes NumPy arrays
+    n_bars = len(df)
+    dates = df.index
+    close = df['Close'].to_numpy()
+    open_prices = df['Open'].to_numpy()
+    entry_values = df[entry_signals].to_numpy()
+    exit_values = df[exit_signals].to_numpy()
+    score_columns = {
+        col: df[col].to_numpy() if col in df.columns else None
+        for col in ('Accumulation_Score', 'Moderate_Buy_Score', 'Profit_Taking_Score')
+    }
+    moderate_buy = df['Moderate_Buy'].to_numpy()
+    
+    # Bars where any entry signal fires; idle bars between them are skipped
+    entry_positions = np.flatnonzero(entry_values.astype(bool).any(axis=1))
+    
+    managers = list(risk_managers.items())
+    trades_by_label = {label: list(risk_mgr.closed_trades) for label, risk_mgr in managers}
+    
+    # Managers share one set of column arrays / range tables for the frame
+    first_mgr = managers[0][1] if managers else None
+    for _, risk_mgr in managers:
+        risk_mgr.bind_frame(df, share_with=first_mgr)
+    
+    if any(ticker in risk_mgr.active_positions for _, risk_mgr in managers):
+        idx = start_idx
+    else:
+        next_slot = np.searchsorted(entry_positions, start_idx, side='left')
+        idx = int(entry_positions[next_slot]) if next_slot < len(entry_positions) else n_bars
+    checkpoint_idx = n_bars - 1
+    while idx < n_bars:
+        if idx == checkpoint_idx and on_checkpoint is not None:
+            on_checkpoint(checkpoint_idx)
+            on_checkpoint = None
+        current_date = dates[idx]
+        current_price = close[idx]
+        triggered_exits = None
+        entry_setup = None
+        
+        for label, risk_mgr in managers:
+            # Update active positions FIRST (before checking for new entries)
+            if ticker in risk_mgr.active_positions:
+                # Check risk management rules (hard stops, time stops, profit scaling)
+                exit_check = risk_mgr.update_position(
+                    ticker=ticker,
+                    current_date=current_date,
+                    current_price=current_price,
+                    df=df,
+                    current_idx=idx
+                )
+                
+                # Check for regular exit signals (proven exit system)
+                if triggered_exits is None:
+                    triggered_exits = [sig for sig, value in zip(exit_signals, exit_values[idx]) if value]
+                has_exit_signal = bool(triggered_exits)
+                
+                # Exit if EITHER risk management OR regular exit signal triggers
+                should_exit_risk_mgmt = exit_check['should_exit']
+                should_exit_signal = has_exit_signal
+                
+                if should_exit_risk_mgmt or should_exit_signal:
+                    # Determine exit type, reason, and capture exit signals
+                    if should_exit_risk_mgmt:
+                        # For risk management exits, no specific exit signals triggered
+                        exit_signals_list = []
+                    else:
+                        # Regular exit signal - use the first one that triggered
+                        exit_check['exit_type'] = 'SIGNAL_EXIT'
+                        exit_check['reason'] = f"Exit signal: {', '.join(triggered_exits)}"
+                        exit_check['should_exit'] = True
+                        # Store the actual exit signals that triggered
+                        exit_signals_list = triggered_exits
+                    
+                    # Add exit signals to exit_check for passing to close_position
+                    exit_check['exit_signals'] = exit_signals_list
+                    
+                    # Close position (use current price for signal exits)
+                    exit_date = current_date
+                    exit_price = current_price if should_exit_signal else exit_check['exit_price']
+                    
+                    # For partial exits, just record the trade but keep position open
+                    trade = risk_mgr.close_position(
+                        ticker=ticker,
+                        exit_price=exit_price,
+                        exit_type=exit_check['exit_type'],
+                        exit_date=exit_date,
+                        partial_exit_pct=exit_check.get('exit_pct', 1.0),
+                        exit_signals=exit_signals_list,
+                        exit_idx=idx
+                    )
+                    
+                    if trade:
+                        trades_by_label[label].append(trade)
+                        
+                        if verbose and exit_check.get('partial_exit', False):
+                            print(f"📊 PARTIAL EXIT ({int(exit_check['exit_pct']*100)}%): {exit_date.strftime('%Y-%m-%d')} @ ${exit_price:.2f} - {exit_check['exit_type']} - {exit_check['reason']}")
+                        elif verbose:
+                            print(f"🚪 EXIT: {exit_date.strftime('%Y-%m-%d')} @ ${exit_price:.2f} - {exit_check['exit_type']} - {exit_check['reason']}")
+                            print(f"   Return: {trade['profit_pct']:.2f}%, R-Multiple: {trade['r_multiple']:.2f}R, Held: {trade['bars_held']} days")
+            
+            # Check for entry signals on this bar (only if no active position)
+            # Entry signal fired - check if we can enter next day
+            if ticker in risk_mgr.active_positions or idx + 1 >= n_bars:
+                continue
+            
+            if entry_setup is None:
+                # Signal metadata and initial stop are shared by every manager
+                triggered_entries = [sig for sig, value in zip(entry_signals, entry_values[idx]) if value]
+                entry_setup = {'triggered_entries': triggered_entries}
+                if triggered_entries:
+                    # Extract signal scores at signal bar (idx, not idx+1)
+                    signal_scores = {}
+                    if score_columns['Accumulation_Score'] is not None:
+                        signal_scores['Accumulation_Score'] = float(score_columns['Accumulation_Score'][idx])
+                    if score_columns['Moderate_Buy_Score'] is not None and moderate_buy[idx]:
+                        signal_scores['Moderate_Buy_Score'] = float(score_columns['Moderate_Buy_Score'][idx])
+                    if score_columns['Profit_Taking_Score'] is not None:
+                        signal_scores['Profit_Taking_Score'] = float(score_columns['Profit_Taking_Score'][idx])
+                    entry_setup['signal_scores'] = signal_scores
+                    try:
+                        entry_setup['stop_price'] = risk_mgr.calculate_initial_stop(df, idx)
+                    except (KeyError, ValueError) as e:
+                        entry_setup['error'] = e
+            
+            if not entry_setup['triggered_entries']:
+                continue
+            
+            # Entry price = next day's open (realistic execution)
+            entry_price = open_prices[idx + 1]
+            entry_date = dates[idx + 1]
+            
+            # Calculate initial stop using RiskManager
+            try:
+                if 'error' in entry_setup:
+                    raise entry_setup['error']
+                stop_price = entry_setup['stop_price']
+                
+                # Open position with signal metadata
+                position = risk_mgr.open_position(
+                    ticker=ticker,
+                    entry_date=entry_date,
+                    entry_price=entry_price,
+                    stop_price=stop_price,
+                    entry_idx=idx + 1,  # Entry happens next day
+                    df=df,
+                    entry_signals=list(entry_setup['triggered_entries']),
+                    signal_scores=dict(entry_setup['signal_scores'])
+                )
+                
+                if verbose:
+                    print(f"✅ ENTRY: {entry_date.strftime('%Y-%m-%d')} @ ${entry_price:.2f}, Stop: ${stop_price:.2f}, Size: {position['position_size']} shares")
+                
+            except (KeyError, ValueError) as e:
+                if verbose:
+                    print(f"⚠️ Could not open position on {current_date.strftime('%Y-%m-%d')}: {e}")
+        
+        # Walk bar by bar while any position is open; otherwise jump to the next entry bar
+        if any(ticker in risk_mgr.active_positions for _, risk_mgr in managers):
+            idx += 1
+        else:
+            next_slot = np.searchsorted(entry_positions, idx, side='right')
+            idx = int(entry_positions[next_slot]) if next_slot < len(entry_positions) else n_bars
+    
+    if on_checkpoint is not None and checkpoint_idx >= 0:
+        on_checkpoint(checkpoint_idx)
+    
+    # Close any remaining open positions at last price
+    for label, risk_mgr in managers:
+        if ticker in risk_mgr.active_positions:
+            last_price = close[-1]
+            last_date = dates[-1]
+            
+            trade = risk_mgr.close_position(
+                ticker=ticker,
+                exit_price=last_price,
+                exit_type='END_OF_DATA',
+                exit_date=last_date,
+                exit_idx=n_bars - 1
+            )
+            
+            if trade:
+                trades_by_label[label].append(trade)
+                if verbose:
+                    print(f"⏸️ Position closed at end of data: {last_date.strftime('%Y-%m-%d')} @ ${last_price:.2f}")
+        
+        risk_mgr.unbind_frame()
+    
+    return trades_by_label
+
+
 def run_risk_managed_backtest(
     df: pd.DataFrame, 
     ticker: str, 
@@ -1215,7 +1532,8 @@ def run_risk_managed_backtest(
     risk_pct: float = 0.75,
     stop_strategy: str = 'time_decay',
     save_to_file: bool = True,
-    output_dir: str = 'backtest_results'
+    output_dir: str = 'backtest_results',
+    checkpoint_dir: Optional[str] = None
 ) -> Dict:
     """
     Run backtest using RiskManager for position management and exit logic.
@@ -1236,9 +1554,12 @@ def run_risk_managed_backtest(
         stop_strategy: Stop-loss strategy (static, vol_regime, atr_dynamic, pct_trail, time_decay)
         save_to_file: Whether to save report to file
         output_dir: Directory to save reports
+        checkpoint_dir: Resume from (and update) this ticker's checkpoint in
+            this directory, processing only bars after the last run (see
+            backtest_checkpoint.py); None replays the full history
         
     Returns:
-        Dict with trades, risk_manager, and performance summary
+        Dict with trades, risk_manager, performance summary and report_file (saved path or None)
         
     Raises:
         ImportError: If risk_manager module not available
@@ -1260,151 +1581,31 @@ def run_risk_managed_backtest(
     print(f"   Starting Account Value: ${account_value:,.0f}")
     print(f"   Risk Per Trade: {risk_pct}%")
     print(f"   Stop Strategy: {stop_strategy}")
-    print("="*70)
-    
-    # Entry and exit signal columns to monitor
-    entry_signals = ['Strong_Buy', 'Moderate_Buy', 'Stealth_Accumulation', 
-                     'Confluence_Signal', 'Volume_Breakout']
-    
-    exit_signals = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal',
-                    'Momentum_Exhaustion', 'Stop_Loss']
     
-    # Track all trades
-    all_trades = []
-    
-    # Iterate through DataFrame
-    for idx in range(len(df)):
-        current_date = df.index[idx]
-        current_price = df.iloc[idx]['Close']
+    start_idx = 0
+    on_checkpoint = None
+    if checkpoint_dir is not None:
+        from backtest_checkpoint import load_checkpoint, save_checkpoint
         
-        # Update active positions FIRST (before checking for new entries)
-        if ticker in risk_mgr.active_positions:
-            # Check risk management rules (hard stops, time stops, profit scaling)
-            exit_check = risk_mgr.update_position(
-                ticker=ticker,
-                current_date=current_date,
-                current_price=current_price,
-                df=df,
-                current_idx=idx
-            )
-            
-            # Check for regular exit signals (proven exit system)
-            has_exit_signal = any(df.iloc[idx][sig] for sig in exit_signals)
-            triggered_exits = [sig for sig in exit_signals if df.iloc[idx][sig]]
-            
-            # Exit if EITHER risk management OR regular exit signal triggers
-            should_exit_risk_mgmt = exit_check['should_exit']
-            should_exit_signal = has_exit_signal
-            
-            if should_exit_risk_mgmt or should_exit_signal:
-                # Determine exit type, reason, and capture exit signals
-                if should_exit_risk_mgmt:
-                    exit_type = exit_check['exit_type']
-                    exit_reason = exit_check['reason']
-                    # For risk management exits, no specific exit signals triggered
-                    exit_signals_list = []
-                else:
-                    # Regular exit signal - use the first one that triggered
-                    exit_type = 'SIGNAL_EXIT'
-                    exit_reason = f"Exit signal: {', '.join(triggered_exits)}"
-                    exit_check['exit_type'] = exit_type
-                    exit_check['reason'] = exit_reason
-                    exit_check['should_exit'] = True
-                    # Store the actual exit signals that triggered
-                    exit_signals_list = triggered_exits
-                
-                # Add exit signals to exit_check for passing to close_position
-                exit_check['exit_signals'] = exit_signals_list
-                
-                # Close position (use current price for signal exits)
-                exit_date = current_date
-                exit_price = current_price if should_exit_signal else exit_check['exit_price']
-                
-                # For partial exits, just record the trade but keep position open
-                trade = risk_mgr.close_position(
-                    ticker=ticker,
-                    exit_price=exit_price,
-                    exit_type=exit_check['exit_type'],
-                    exit_date=exit_date,
-                    partial_exit_pct=exit_check.get('exit_pct', 1.0),
-                    exit_signals=exit_signals_list
-                )
-                
-                if trade:
-                    all_trades.append(trade)
-                    
-                    if exit_check.get('partial_exit', False):
-                        print(f"📊 PARTIAL EXIT ({int(exit_check['exit_pct']*100)}%): {exit_date.strftime('%Y-%m-%d')} @ ${exit_price:.2f} - {exit_check['exit_type']} - {exit_check['reason']}")
-                    else:
-                        print(f"🚪 EXIT: {exit_date.strftime('%Y-%m-%d')} @ ${exit_price:.2f} - {exit_check['exit_type']} - {exit_check['reason']}")
-                        print(f"   Return: {trade['profit_pct']:.2f}%, R-Multiple: {trade['r_multiple']:.2f}R, Held: {trade['bars_held']} days")
+        restored = load_checkpoint(ticker, df, account_value, risk_pct, stop_strategy, checkpoint_dir)
+        if restored is not None:
+            risk_mgr, start_idx = restored
+            print(f"   ♻️ Resuming from checkpoint: {df.index[start_idx].strftime('%Y-%m-%d')} "
+                  f"({len(df) - start_idx} bars to process)")
         
-        # Check for entry signals on this bar (only if no active position)
-        if ticker not in risk_mgr.active_positions:
-            has_entry_signal = any(df.iloc[idx][sig] for sig in entry_signals)
-            
-            if has_entry_signal:
-                # Entry signal fired - check if we can enter next day
-                if idx + 1 >= len(df):
-                    continue  # No next day data
-                
-                # Entry price = next day's open (realistic execution)
-                entry_price = df.iloc[idx + 1]['Open']
-                entry_date = df.index[idx + 1]
-                
-                # Extract signal metadata at signal bar (idx, not idx+1)
-                triggered_entries = [sig for sig in entry_signals if df.iloc[idx][sig]]
-                
-                # Extract signal scores at signal bar
-                signal_scores = {}
-                if 'Accumulation_Score' in df.columns:
-                    signal_scores['Accumulation_Score'] = float(df.iloc[idx]['Accumulation_Score'])
-                if 'Moderate_Buy_Score' in df.columns and df.iloc[idx].get('Moderate_Buy', False):
-                    signal_scores['Moderate_Buy_Score'] = float(df.iloc[idx]['Moderate_Buy_Score'])
-                if 'Profit_Taking_Score' in df.columns:
-                    signal_scores['Profit_Taking_Score'] = float(df.iloc[idx]['Profit_Taking_Score'])
-                
-                # Calculate initial stop using RiskManager
-                try:
-                    stop_price = risk_mgr.calculate_initial_stop(df, idx)
-                    
-                    # Open position with signal metadata
-                    position = risk_mgr.open_position(
-                        ticker=ticker,
-                        entry_date=entry_date,
-                        entry_price=entry_price,
-                        stop_price=stop_price,
-                        entry_idx=idx + 1,  # Entry happens next day
-                        df=df,
-                        entry_signals=triggered_entries,
-                        signal_scores=signal_scores
-                    )
-                    
-                    print(f"✅ ENTRY: {entry_date.strftime('%Y-%m-%d')} @ ${entry_price:.2f}, Stop: ${stop_price:.2f}, Size: {position['position_size']} shares")
-                    
-                except (KeyError, ValueError) as e:
-                    print(f"⚠️ Could not open position on {current_date.strftime('%Y-%m-%d')}: {e}")
-                    continue
+        def _save(resume_idx):
+            save_checkpoint(ticker, risk_mgr, df, resume_idx, checkpoint_dir)
+        on_checkpoint = _save
+    print("="*70)
     
-    # Close any remaining open positions at last price
-    if ticker in risk_mgr.active_positions:
-        last_price = df.iloc[-1]['Close']
-        last_date = df.index[-1]
-        
-        trade = risk_mgr.close_position(
-            ticker=ticker,
-            exit_price=last_price,
-            exit_type='END_OF_DATA',
-            exit_date=last_date
-        )
-        
-        if trade:
-            all_trades.append(trade)
-            print(f"⏸️ Position closed at end of data: {last_date.strftime('%Y-%m-%d')} @ ${last_price:.2f}")
+    all_trades = _simulate_risk_managed_trades(
+        df, ticker, {stop_strategy: risk_mgr},
+        start_idx=start_idx, on_checkpoint=on_checkpoint
+    )[stop_strategy]
     
     # Generate comprehensive analysis
     if all_trades:
-        analysis = analyze_risk_managed_trades(all_trades)
+        analysis = analyze_risk_managed_trades(risk_mgr.ledger)
         ending_equity = risk_mgr.equity
         net_profit = ending_equity - risk_mgr.starting_equity
         analysis['Starting Equity'] = f"${risk_mgr.starting_equity:,.0f}"
@@ -1417,6 +1618,7 @@ def run_risk_managed_backtest(
         print("\n" + report)
         
         # Save to file if requested
+        filepath = None
         if save_to_file:
             os.makedirs(output_dir, exist_ok=True)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -1432,7 +1634,8 @@ def run_risk_managed_backtest(
             'trades': all_trades,
             'risk_manager': risk_mgr,
             'analysis': analysis,
-            'report': report
+            'report': report,
+            'report_file': filepath
         }
     else:
         print("\n⚠️ No trades generated in this analysis period")
@@ -1440,10 +1643,63 @@ def run_risk_managed_backtest(
             'trades': [],
             'risk_manager': risk_mgr,
             'analysis': {},
-            'report': "No trades generated"
+            'report': "No trades generated",
+            'report_file': None
         }
 
 
+def run_multi_strategy_backtest(
+    df: pd.DataFrame,
+    ticker: str,
+    stop_strategies: Optional[List[str]] = None,
+    account_value: float = 100000,
+    risk_pct: float = 0.75
+) -> Dict[str, Dict]:
+    """
+    Backtest several stop strategies in a single pass over the bars.
+    
+    One RiskManager per strategy is advanced over the same pre-extracted
+    arrays, entry signals and initial stops, so the result for each strategy
+    is identical to a separate run_risk_managed_backtest() call with that
+    stop_strategy, without repeating the per-bar work for every strategy.
+    
+    Args:
+        df: DataFrame with signals and indicators from vol_analysis.py
+        ticker: Stock symbol
+        stop_strategies: Strategies to evaluate (default: all supported)
+        account_value: Starting account value for each strategy
+        risk_pct: Risk percentage per trade
+        
+    Returns:
+        Dict mapping strategy → {'trades', 'ledger', 'risk_manager', 'analysis'}
+    """
+    from risk_manager import RiskManager, analyze_risk_managed_trades
+    
+    if stop_strategies is None:
+        stop_strategies = sorted(RiskManager.SUPPORTED_STOP_STRATEGIES)
+    
+    risk_managers = {
+        strategy: RiskManager(
+            account_value=account_value,
+            risk_pct_per_trade=risk_pct,
+            stop_strategy=strategy
+        )
+        for strategy in stop_strategies
+    }
+    
+    trades_by_strategy = _simulate_risk_managed_trades(df, ticker, risk_managers, verbose=False)
+    
+    return {
+        strategy: {
+            'trades': trades_by_strategy[strategy],
+            'ledger': risk_mgr.ledger,
+            'risk_manager': risk_mgr,
+            'analysis': analyze_risk_managed_trades(risk_mgr.ledger) if len(risk_mgr.ledger) else {}
+        }
+        for strategy, risk_mgr in risk_managers.items()
+    }
+
+
 def generate_risk_managed_report(
     ticker: str,
     trades: List[Dict],
@@ -1548,6 +1804,8 @@ def generate_risk_managed_report(
         report_lines.append(f"  Exit:  {exit_date} @ ${trade['exit_price']:.2f} ({trade['exit_type']}{exit_signals_str})")
         report_lines.append(f"  Result: {trade['profit_pct']:+.2f}% | {trade['r_multiple']:+.2f}R")
         report_lines.append(f"  Held: {trade['bars_held']} days")
+        if trade.get('mae_pct') is not None and trade.get('mfe_pct') is not None:
+            report_lines.append(f"  Excursion: MAE {trade['mae_pct']:+.2f}% | MFE {trade['mfe_pct']:+.2f}%")
         report_lines.append(f"  Position: {trade['position_size']} shares")
         
         # Add signal scores if available
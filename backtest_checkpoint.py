@@ -0,0 +1,220 @@
+"""
+Resumable state for risk-managed backtests.
+
+run_risk_managed_backtest() normally replays the full history on every run. With
+a checkpoint directory it stores the RiskManager state (equity, open positions
+with their stop levels, closed-trade ledger) reached just before the last bar,
+one file per ticker and stop strategy:
+
+    data_cache/backtest_checkpoints/{TICKER}_{stop_strategy}.json
+
+The next run restores that state and processes only the bars from the
+checkpoint onward. Periods are cut relative to today, so a resumable run does
+not build its frame from the period start: it reads the history from the
+first bar of the ticker's checkpoint (get_checkpoint_start(); the period
+start on the first run), and the already-processed rows stay the same from
+one run to the next. The result is identical to a full replay as long as the
+history the checkpoint was built from is unchanged, so a checkpoint is
+discarded (and the backtest replays from the first bar) when:
+- the frame starts on a different date or no longer has the checkpoint bar
+- a checksum of the already-processed rows (prices, signals, stop inputs)
+  differs, e.g. after a cache rebuild or corporate-action adjustment, or when
+  a new bar confirms a swing pivot low (the anchored VWAP and swing lows of
+  earlier bars are revised)
+- the empirical threshold config in threshold_config.py changed
+- account value, risk %, stop strategy or stop parameters differ
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from error_handler import ErrorContext, FileOperationError, validate_ticker, logger
+from risk_manager import RiskManager
+from threshold_config import get_threshold_fingerprint
+
+CHECKPOINT_VERSION = 1
+
+DEFAULT_CHECKPOINT_DIR = os.path.join('data_cache', 'backtest_checkpoints')
+
+# Columns the risk-managed loop reads; other columns do not affect its state
+CHECKSUM_COLUMNS = [
+    'Open', 'High', 'Low', 'Close', 'ATR20', 'ATR_Z', 'Recent_Swing_Low', 'VWAP',
+    'Strong_Buy', 'Moderate_Buy', 'Stealth_Accumulation', 'Confluence_Signal', 'Volume_Breakout',
+    'Profit_Taking', 'Distribution_Warning', 'Sell_Signal', 'Momentum_Exhaustion', 'Stop_Loss',
+    'Accumulation_Score', 'Moderate_Buy_Score', 'Profit_Taking_Score',
+    'Market_Regime_OK', 'Sector_Regime_OK', 'Overall_Regime_OK',
+]
+
+
+def get_checkpoint_filepath(ticker: str, stop_strategy: str,
+                            checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR) -> Path:
+    """Get the checkpoint file path for a ticker and stop strategy."""
+    validate_ticker(ticker)
+    return Path(checkpoint_dir) / f"{ticker.upper()}_{stop_strategy}.json"
+
+
+def calculate_frame_checksum(df: pd.DataFrame, end_idx: int) -> str:
+    """
+    Checksum of rows 0..end_idx (inclusive) of the columns the backtest reads.
+
+    Args:
+        df: Backtest frame
+        end_idx: Last row covered
+
+    Returns:
+        str: First 16 hex chars of a SHA-256 digest
+    """
+    columns = [col for col in CHECKSUM_COLUMNS if col in df.columns]
+    rows = df.iloc[:end_idx + 1][columns]
+    digest = hashlib.sha256(','.join(columns).encode())
+    digest.update(pd.util.hash_pandas_object(rows, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _encode(value: Any) -> Any:
+    """JSON fallback for timestamps and NumPy scalars in position/trade records."""
+    if isinstance(value, pd.Timestamp):
+        return {'__timestamp__': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__} in backtest checkpoint")
+
+
+def _decode(obj: Dict) -> Any:
+    if '__timestamp__' in obj and len(obj) == 1:
+        return pd.Timestamp(obj['__timestamp__'])
+    return obj
+
+
+def save_checkpoint(ticker: str, risk_mgr: RiskManager, df: pd.DataFrame, resume_idx: int,
+                    checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR) -> None:
+    """
+    Persist the manager's current state as resumable from bar resume_idx.
+
+    Args:
+        ticker: Stock symbol
+        risk_mgr: RiskManager holding the state of every bar before resume_idx
+        df: Backtest frame
+        resume_idx: First bar a resumed run must process
+        checkpoint_dir: Directory holding checkpoint files
+    """
+    with ErrorContext("saving backtest checkpoint", ticker=ticker):
+        filepath = get_checkpoint_filepath(ticker, risk_mgr.stop_strategy, checkpoint_dir)
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise FileOperationError(f"Failed to create checkpoint directory {filepath.parent}: {e}")
+
+        payload = {
+            'version': CHECKPOINT_VERSION,
+            'ticker': ticker.upper(),
+            'first_date': df.index[0],
+            'resume_idx': int(resume_idx),
+            'resume_date': df.index[resume_idx],
+            # Covers the resume bar too: entries placed on the bar before it fill at its open
+            'data_checksum': calculate_frame_checksum(df, resume_idx),
+            'threshold_fingerprint': get_threshold_fingerprint(),
+            'state': risk_mgr.get_state(),
+        }
+        tmp_path = filepath.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, default=_encode)
+        os.replace(tmp_path, filepath)
+        logger.info(f"Saved backtest checkpoint for {ticker} ({risk_mgr.stop_strategy}) "
+                    f"at {payload['resume_date']:%Y-%m-%d}")
+
+
+def _read_checkpoint(ticker: str, filepath: Path) -> Optional[Dict]:
+    """Stored checkpoint payload (None when missing or unreadable)."""
+    if not filepath.exists():
+        return None
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f, object_hook=_decode)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Error reading backtest checkpoint for {ticker}: {e}")
+        return None
+
+
+def get_checkpoint_start(ticker: str, stop_strategy: str,
+                         checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR) -> Optional[pd.Timestamp]:
+    """
+    First bar of the frame a ticker's checkpoint was built on.
+
+    Resumable runs build their frame from this date, so it keeps the same
+    start (and the processed rows their checksum) as new bars are appended.
+
+    Args:
+        ticker: Stock symbol
+        stop_strategy: Stop strategy of the run
+        checkpoint_dir: Directory holding checkpoint files
+
+    Returns:
+        Optional[pd.Timestamp]: History start date, or None without a readable checkpoint
+    """
+    filepath = get_checkpoint_filepath(ticker, (stop_strategy or 'static').lower(), checkpoint_dir)
+    payload = _read_checkpoint(ticker, filepath)
+    if payload is None or not isinstance(payload.get('first_date'), pd.Timestamp):
+        return None
+    return payload['first_date']
+
+
+def _invalid_reason(payload: Dict, df: pd.DataFrame, risk_mgr: RiskManager) -> Optional[str]:
+    """Why a stored checkpoint cannot be resumed on df (None when it can)."""
+    if payload.get('version') != CHECKPOINT_VERSION:
+        return f"checkpoint version {payload.get('version')} != {CHECKPOINT_VERSION}"
+    state = payload['state']
+    for key, current in [('account_value', risk_mgr.account_value), ('risk_pct', risk_mgr.risk_pct),
+                         ('stop_strategy', risk_mgr.stop_strategy), ('stop_params', risk_mgr.stop_params)]:
+        if state[key] != current:
+            return f"{key} changed"
+    if payload['threshold_fingerprint'] != get_threshold_fingerprint():
+        return "threshold config changed"
+    resume_idx = payload['resume_idx']
+    if df.empty or df.index[0] != payload['first_date']:
+        return "history start date changed"
+    if resume_idx >= len(df) or df.index[resume_idx] != payload['resume_date']:
+        return "checkpoint bar not found at the same position"
+    if calculate_frame_checksum(df, resume_idx) != payload['data_checksum']:
+        return "processed history changed (checksum mismatch)"
+    return None
+
+
+def load_checkpoint(ticker: str, df: pd.DataFrame, account_value: float, risk_pct: float,
+                    stop_strategy: str,
+                    checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR) -> Optional[Tuple[RiskManager, int]]:
+    """
+    Restore a RiskManager from a checkpoint that is still valid for df.
+
+    Args:
+        ticker: Stock symbol
+        df: Backtest frame for this run
+        account_value: Starting account value of this run
+        risk_pct: Risk percentage of this run
+        stop_strategy: Stop strategy of this run
+        checkpoint_dir: Directory holding checkpoint files
+
+    Returns:
+        (RiskManager, resume_idx), or None when there is no usable checkpoint
+    """
+    with ErrorContext("loading backtest checkpoint", ticker=ticker):
+        fresh = RiskManager(account_value, risk_pct, stop_strategy)
+        filepath = get_checkpoint_filepath(ticker, fresh.stop_strategy, checkpoint_dir)
+        payload = _read_checkpoint(ticker, filepath)
+        if payload is None:
+            return None
+
+        try:
+            reason = _invalid_reason(payload, df, fresh)
+        except KeyError as e:
+            reason = f"malformed checkpoint (missing {e})"
+        if reason:
+            logger.info(f"Discarding backtest checkpoint for {ticker} ({fresh.stop_strategy}): {reason}")
+            return None
+        return RiskManager.from_state(payload['state']), payload['resume_idx']
@@ -7,6 +7,9 @@ to determine optimal trading strategies.
 
 import pandas as pd
 import numpy as np
+import contextlib
+import io
+import logging
 import os
 import sys
 from datetime import datetime
@@ -22,20 +25,276 @@ from error_handler import (
 
 # Import empirical threshold filtering
 from signal_threshold_validator import apply_empirical_thresholds
-from analysis_service import prepare_analysis_dataframe
-from data_manager import read_ticker_file
+from analysis_service import get_analysis_dataframe, get_frame_fingerprint
+from data_manager import get_period_start, read_ticker_file
+from run_manifest import RunManifest, get_run_fingerprint
+from batch_shards import load_shard_results, parse_shard, select_shard, write_shard_result
+from batch_scheduler import plan_schedule, run_schedule
 
 # Configure logging for this module
 setup_logging()
 
 
+# Signal definitions - Using MULTI-TICKER VALIDATED filtered signals
+# Thresholds validated on 24 tickers, 24-month period (Nov 2025)
+ENTRY_SIGNALS = {
+    'Strong_Buy': '🟢 Strong Buy',
+    'Moderate_Buy_filtered': '🟡 Moderate Buy Pullback (≥6.0)',  # Redesigned pullback strategy
+    'Stealth_Accumulation_filtered': '💎 Stealth Accumulation (≥4.0)',  # Multi-ticker validated
+    'Confluence_Signal': '⭐ Multi-Signal Confluence',
+    'Volume_Breakout': '🔥 Volume Breakout'
+}
+
+# Modules whose code turns a prepared frame into a ticker's backtest result
+RESULT_MODULES = ['batch_backtest', 'backtest', 'risk_manager', 'signal_threshold_validator']
+
+EXIT_SIGNALS = {
+    'Profit_Taking': '🟠 Profit Taking',  # Exit signal - no filtering needed
+    'Distribution_Warning': '⚠️ Distribution Warning',
+    'Sell_Signal': '🔴 Sell Signal',
+    'Momentum_Exhaustion': '💜 Momentum Exhaustion',
+    'Stop_Loss': '🛑 Stop Loss'
+}
+
+
+def _frame_range(ticker: str, period: str, start_date: str, end_date: str,
+                 risk_managed: bool, stop_strategy: str, checkpoint_dir: str) -> Dict:
+    """
+    Date range of a ticker's backtest frame (empty: the period relative to today).
+    
+    Resumable runs (checkpoint_dir set) read the history from the start of the
+    ticker's checkpoint, or from today's period start when there is none yet,
+    so the rows a checkpoint covers do not move as the period window does.
+    """
+    if start_date and end_date:
+        return dict(start_date=datetime.strptime(start_date, '%Y-%m-%d'),
+                    end_date=datetime.strptime(end_date, '%Y-%m-%d'))
+    if checkpoint_dir and risk_managed:
+        from backtest_checkpoint import get_checkpoint_start
+        anchor = get_checkpoint_start(ticker, stop_strategy, checkpoint_dir)
+        if anchor is None:
+            anchor = pd.Timestamp(get_period_start(period)).normalize()
+        return dict(start_date=anchor)
+    return {}
+
+
+def _backtest_ticker(ticker: str, position: int, total: int, period: str,
+                     start_date: str, end_date: str, output_dir: str,
+                     risk_managed: bool, account_value: float, risk_pct: float,
+                     stop_strategy: str, checkpoint_dir: str) -> Dict:
+    """
+    Prepare, filter and backtest one ticker.
+    
+    Failures are caught and returned rather than raised, so one bad ticker
+    never stops the batch (serial or pooled).
+    
+    Args:
+        ticker (str): Stock symbol
+        position (int): 1-based position of the ticker in the batch (for logs)
+        total (int): Number of tickers in the batch
+        Remaining arguments as in run_batch_backtest()
+        
+    Returns:
+        Dict: 'ticker', 'trades', 'ticker_results', 'error' (None on success)
+            and 'outputs' (report files written)
+    """
+    logger.info(f"Processing {ticker} ({position}/{total})")
+    
+    with ErrorContext("processing ticker", ticker=ticker):
+        try:
+            validate_ticker(ticker)
+            
+            # A date range is read directly (plus indicator warmup) instead of
+            # building the whole period and masking it
+            range_kwargs = _frame_range(ticker, period, start_date, end_date,
+                                        risk_managed, stop_strategy, checkpoint_dir)
+            
+            df = get_analysis_dataframe(
+                ticker=ticker,
+                period=period,
+                data_source='yfinance',
+                force_refresh=False,
+                verbose=False,
+                **range_kwargs
+            )
+            
+            if range_kwargs:
+                end_label = f"{range_kwargs['end_date']:%Y-%m-%d}" if 'end_date' in range_kwargs else 'cache end'
+                logger.info(f"Built {ticker} for date range {range_kwargs['start_date']:%Y-%m-%d} "
+                            f"to {end_label}: {len(df)} periods")
+            
+            # Apply empirical thresholds to filter signals
+            # This ensures we use validated thresholds (e.g., Moderate Buy ≥6.5 instead of ≥5.0)
+            df = apply_empirical_thresholds(df)
+            logger.info(f"Applied empirical thresholds for {ticker}")
+            
+            if risk_managed:
+                # Use RiskManager for position management and exits
+                risk_result = backtest.run_risk_managed_backtest(
+                    df=df,
+                    ticker=ticker,
+                    account_value=account_value,
+                    risk_pct=risk_pct,
+                    stop_strategy=stop_strategy,
+                    save_to_file=True,
+                    output_dir=output_dir,
+                    checkpoint_dir=checkpoint_dir
+                )
+                
+                # Extract trades from risk manager
+                paired_trades = risk_result['trades']
+                outputs = [risk_result['report_file']] if risk_result.get('report_file') else []
+                
+                # Add ticker identifier if not already present
+                for trade in paired_trades:
+                    if 'ticker' not in trade:
+                        trade['ticker'] = ticker
+                
+                # Store ticker-specific results
+                ticker_results = {
+                    'total_trades': len(paired_trades),
+                    'closed_trades': len([t for t in paired_trades if not t.get('partial_exit', False)]),
+                    'risk_managed': True,
+                    'analysis': risk_result.get('analysis', {})
+                }
+            else:
+                # Traditional entry/exit signal pairing
+                paired_trades = backtest.pair_entry_exit_signals(
+                    df, 
+                    list(ENTRY_SIGNALS.keys()), 
+                    list(EXIT_SIGNALS.keys())
+                )
+                
+                # Add ticker identifier to each trade
+                for trade in paired_trades:
+                    trade['ticker'] = ticker
+                
+                # Analyze this ticker's performance
+                entry_comparison = backtest.compare_entry_strategies(paired_trades, ENTRY_SIGNALS)
+                exit_comparison = backtest.compare_exit_strategies(paired_trades, EXIT_SIGNALS)
+                
+                # Store ticker-specific results
+                ticker_results = {
+                    'total_trades': len(paired_trades),
+                    'closed_trades': len([t for t in paired_trades if not t.get('is_open', False)]),
+                    'risk_managed': False,
+                    'entry_performance': entry_comparison,
+                    'exit_performance': exit_comparison
+                }
+                
+                # Generate and save individual backtest report
+                strategy_report = backtest.generate_strategy_comparison_report(
+                    paired_trades, 
+                    ENTRY_SIGNALS, 
+                    EXIT_SIGNALS
+                )
+                
+                # Save individual report
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                filename = f"{ticker}_{period}_backtest_{timestamp}.txt"
+                filepath = os.path.join(output_dir, filename)
+                
+                def _save_report():
+                    with open(filepath, 'w') as f:
+                        f.write(f"📊 BACKTEST REPORT: {ticker} ({period})\n")
+                        f.write("="*70 + "\n\n")
+                        f.write(strategy_report)
+                
+                safe_operation(f"saving backtest report for {ticker}", _save_report)
+                outputs = [filepath] if os.path.exists(filepath) else []
+            
+            logger.info(f"Completed {ticker}: {len(paired_trades)} trades generated")
+            return {'ticker': ticker, 'trades': paired_trades, 'ticker_results': ticker_results,
+                    'error': None, 'outputs': outputs}
+            
+        except Exception as e:
+            logger.error(f"Failed to process {ticker}: {str(e)}")
+            return {'ticker': ticker, 'trades': [], 'ticker_results': None, 'error': str(e)}
+
+
+def _init_backtest_worker(offline: bool, frame_cache_enabled: bool = True) -> None:
+    """Process-pool initializer: carry CLI-level module settings into workers."""
+    if offline:
+        import earnings_calendar
+        earnings_calendar.set_offline_mode(True)
+    if not frame_cache_enabled:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+
+
+def _backtest_ticker_captured(ticker: str, position: int, total: int, options: Dict) -> Dict:
+    """
+    Process-pool job: _backtest_ticker() with its console output captured.
+    
+    Prints and vol_analysis log records go to a buffer returned as 'log', so
+    the parent can replay each ticker's output in input order instead of
+    interleaving workers.
+    """
+    buffer = io.StringIO()
+    handlers = logger.handlers[:]
+    capture = logging.StreamHandler(buffer)
+    if handlers:
+        capture.setFormatter(handlers[0].formatter)
+    # Keep file logging; only console output is captured
+    logger.handlers = [capture] + [h for h in handlers if isinstance(h, logging.FileHandler)]
+    try:
+        with contextlib.redirect_stdout(buffer):
+            outcome = _backtest_ticker(ticker, position, total, **options)
+    finally:
+        logger.handlers = handlers
+    outcome['log'] = buffer.getvalue()
+    return outcome
+
+
+def _iter_backtest_outcomes(tickers: List[str], options: Dict, jobs: int):
+    """
+    Yield _backtest_ticker() outcomes in input order.
+    
+    With jobs > 1 tickers run on worker processes following a cost-aware
+    schedule (batch_scheduler.py); each worker's captured output is printed
+    when its ticker's turn comes. A worker process that dies (rather than
+    raising) fails only the ticker it was running: run_schedule() restarts
+    it for the rest of that worker's tickers.
+    """
+    total = len(tickers)
+    if jobs <= 1 or total <= 1:
+        for i, ticker in enumerate(tickers, 1):
+            yield _backtest_ticker(ticker, i, total, **options)
+        return
+    
+    import earnings_calendar
+    import frame_cache
+    schedule = plan_schedule(tickers, jobs)
+    logger.info(f"Running {total} tickers on {len(schedule.workers)} worker processes")
+    print(schedule.describe())
+    job_args = {ticker: (ticker, i, total, options) for i, ticker in enumerate(tickers, 1)}
+    for ticker, future in run_schedule(schedule, _backtest_ticker_captured, job_args,
+                                       initializer=_init_backtest_worker,
+                                       initargs=(earnings_calendar.is_offline_mode(),
+                                                 frame_cache.is_frame_cache_enabled())):
+        try:
+            outcome = future.result()
+        except Exception as e:
+            logger.error(f"Failed to process {ticker}: worker error: {e}")
+            outcome = {'ticker': ticker, 'trades': [], 'ticker_results': None,
+                       'error': f"worker error: {e}", 'log': ''}
+        sys.stdout.write(outcome.pop('log'))
+        sys.stdout.flush()
+        yield outcome
+    print(schedule.describe().splitlines()[-1])
+
+
 def run_batch_backtest(ticker_file: str, period: str = '12mo',
                       start_date: str = None, end_date: str = None,
                       output_dir: str = 'backtest_results',
                       risk_managed: bool = True,
                       account_value: float = 100000,
                       risk_pct: float = 0.75,
-                      stop_strategy: str = 'time_decay') -> Dict:
+                      stop_strategy: str = 'time_decay',
+                      checkpoint_dir: str = None,
+                      jobs: int = 1,
+                      incremental: bool = False,
+                      shard: Tuple[int, int] = None) -> Dict:
     """
     Run backtests on all tickers in a file and aggregate results.
     
@@ -49,9 +308,19 @@ def run_batch_backtest(ticker_file: str, period: str = '12mo',
         account_value (float): Account value for position sizing (risk-managed only)
         risk_pct (float): Risk percentage per trade (risk-managed only)
         stop_strategy (str): Stop strategy when using risk-managed mode
+        checkpoint_dir (str): Resume risk-managed runs from per-ticker checkpoints
+            in this directory and update them (optional)
+        jobs (int): Worker processes; tickers run in parallel when > 1 with
+            results merged in input order (default: 1, serial)
+        incremental (bool): Reuse the results of tickers recorded in the
+            output directory's run manifest with unchanged inputs, so only
+            new, changed or unfinished tickers are processed (see run_manifest.py)
+        shard (Tuple[int, int]): Process only shard (i, N) of the tickers and
+            save its partial result for merge_backtest_shards() (see batch_shards.py)
         
     Returns:
-        Dict: Aggregated backtest results across all tickers
+        Dict: Aggregated backtest results across all tickers (of the shard,
+            with its partial result path under 'shard_file', when sharded)
     """
     with ErrorContext("batch backtesting", ticker_file=ticker_file, period=period, output_dir=output_dir):
         # Validate inputs
@@ -79,212 +348,191 @@ def run_batch_backtest(ticker_file: str, period: str = '12mo',
         
         logger.info(f"Output directory: {output_dir}")
         
-        # Aggregate results storage
-        aggregated_results = {
-            'tickers_processed': [],
-            'tickers_failed': [],
-            'entry_signal_stats': {},
-            'exit_signal_stats': {},
-            'all_paired_trades': [],
-            'ticker_specific_results': {},
-            'account_value': account_value
+        # Process each ticker (in a process pool when jobs > 1); outcomes arrive
+        # in input order, so the aggregate is identical to a serial run
+        options = {
+            'period': period,
+            'start_date': start_date,
+            'end_date': end_date,
+            'output_dir': output_dir,
+            'risk_managed': risk_managed,
+            'account_value': account_value,
+            'risk_pct': risk_pct,
+            'stop_strategy': stop_strategy,
+            'checkpoint_dir': checkpoint_dir
         }
         
-        # Signal definitions - Using MULTI-TICKER VALIDATED filtered signals
-        # Thresholds validated on 24 tickers, 24-month period (Nov 2025)
-        entry_signals = {
-            'Strong_Buy': '🟢 Strong Buy',
-            'Moderate_Buy_filtered': '🟡 Moderate Buy Pullback (≥6.0)',  # Redesigned pullback strategy
-            'Stealth_Accumulation_filtered': '💎 Stealth Accumulation (≥4.0)',  # Multi-ticker validated
-            'Confluence_Signal': '⭐ Multi-Signal Confluence',
-            'Volume_Breakout': '🔥 Volume Breakout'
-        }
+        all_tickers = tickers
+        if shard is not None:
+            tickers = select_shard(all_tickers, shard)
+            print(f"🧩 Shard {shard[0]}/{shard[1]}: {len(tickers)} of {len(all_tickers)} tickers")
         
-        exit_signals = {
-            'Profit_Taking': '🟠 Profit Taking',  # Exit signal - no filtering needed
-            'Distribution_Warning': '⚠️ Distribution Warning',
-            'Sell_Signal': '🔴 Sell Signal',
-            'Momentum_Exhaustion': '💜 Momentum Exhaustion',
-            'Stop_Loss': '🛑 Stop Loss'
-        }
+        # Every completed ticker is recorded, so any run can later be resumed
+        manifest = RunManifest(output_dir)
+        result_options = {key: options[key] for key in
+                          ['risk_managed', 'account_value', 'risk_pct', 'stop_strategy']}
+        fingerprints = {}
+        for ticker in tickers:
+            try:
+                frame_fingerprint = get_frame_fingerprint(
+                    ticker, period, **_frame_range(ticker, period, start_date, end_date,
+                                                   risk_managed, stop_strategy, checkpoint_dir))
+            except Exception:
+                frame_fingerprint = None  # invalid ticker: processed (and reported) as usual
+            fingerprints[ticker] = get_run_fingerprint(ticker, frame_fingerprint, result_options, RESULT_MODULES)
         
-        # Process each ticker
-        for i, ticker in enumerate(tickers, 1):
-            logger.info(f"Processing {ticker} ({i}/{len(tickers)})")
+        reused = {}
+        if incremental:
+            for ticker in tickers:
+                stored = manifest.lookup(ticker, fingerprints[ticker])
+                if stored is not None:
+                    reused[ticker] = stored
+            logger.info(f"Incremental run: {len(reused)} of {len(tickers)} tickers unchanged since their last run")
+            print(f"♻️ Incremental run: reusing {len(reused)} unchanged tickers, "
+                  f"processing {len(tickers) - len(reused)}")
+        
+        # Outcomes (fresh or reused) are aggregated in input order
+        outcomes = dict(reused)
+        for outcome in _iter_backtest_outcomes([t for t in tickers if t not in reused], options, jobs):
+            ticker = outcome['ticker']
+            outcomes[ticker] = outcome
+            if outcome['error'] is None:
+                manifest.record(ticker, fingerprints[ticker], outcome, outcome.get('outputs'))
+        
+        aggregated_results = aggregate_backtest_outcomes(tickers, outcomes, risk_managed, account_value,
+                                                         reused=list(reused))
+        
+        if shard is not None:
+            report_options = {key: options[key] for key in
+                              ['period', 'start_date', 'end_date', 'risk_managed', 'account_value',
+                               'risk_pct', 'stop_strategy']}
+            aggregated_results['shard_file'] = write_shard_result(
+                output_dir, 'batch_backtest', shard, all_tickers, tickers, report_options,
+                {'outcomes': outcomes, 'reused': list(reused)})
+        
+        return aggregated_results
+
+
+def aggregate_backtest_outcomes(tickers: List[str], outcomes: Dict[str, Dict], risk_managed: bool,
+                                account_value: float, reused: List[str] = None) -> Dict:
+    """
+    Aggregate per-ticker backtest outcomes into batch results.
+    
+    Args:
+        tickers (List[str]): Tickers in input order (the aggregation order)
+        outcomes (Dict[str, Dict]): _backtest_ticker() outcome per ticker
+        risk_managed (bool): Whether the outcomes come from risk-managed backtests
+        account_value (float): Starting account equity of the run
+        reused (List[str]): Tickers whose outcomes came from the run manifest
+        
+    Returns:
+        Dict: Aggregated backtest results across all tickers
+    """
+    aggregated_results = {
+        'tickers_processed': [],
+        'tickers_failed': [],
+        'entry_signal_stats': {},
+        'exit_signal_stats': {},
+        'all_paired_trades': [],
+        'ticker_specific_results': {},
+        'account_value': account_value,
+        'tickers_reused': list(reused or [])
+    }
+    
+    for ticker in tickers:
+        outcome = outcomes[ticker]
+        if outcome['error'] is not None:
+            aggregated_results['tickers_failed'].append({
+                'ticker': ticker,
+                'error': outcome['error']
+            })
+            continue
+        
+        aggregated_results['all_paired_trades'].extend(outcome['trades'])
+        aggregated_results['ticker_specific_results'][ticker] = outcome['ticker_results']
+        aggregated_results['tickers_processed'].append(ticker)
+
+    # Aggregate statistics across all tickers
+    if aggregated_results['all_paired_trades']:
+        logger.info(f"Aggregating results across {len(aggregated_results['tickers_processed'])} tickers")
+        
+        if not risk_managed:
+            # Traditional backtest: Aggregate entry and exit signal performance
+            standard_trades = [
+                t for t in aggregated_results['all_paired_trades']
+                if 'entry_signals' in t and 'exit_signals' in t
+            ]
             
-            with ErrorContext("processing ticker", ticker=ticker):
-                try:
-                    validate_ticker(ticker)
-                    
-                    df = prepare_analysis_dataframe(
-                        ticker=ticker,
-                        period=period,
-                        data_source='yfinance',
-                        force_refresh=False,
-                        verbose=False
+            if not standard_trades:
+                logger.warning("No standard trades with entry/exit signals available for aggregate analysis.")
+            else:
+                for signal_col, signal_name in ENTRY_SIGNALS.items():
+                    metrics = backtest.analyze_strategy_performance(
+                        standard_trades,
+                        entry_filter=signal_col
                     )
                     
-                    # Filter to requested date range if specified
-                    if start_date and end_date:
-                        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                        end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                        
-                        # Filter dataframe to date range
-                        mask = (df.index >= start_dt) & (df.index <= end_dt)
-                        df = df[mask].copy()
-                        logger.info(f"Filtered {ticker} to date range {start_date} to {end_date}: {len(df)} periods")
-                    
-                    # Apply empirical thresholds to filter signals
-                    # This ensures we use validated thresholds (e.g., Moderate Buy ≥6.5 instead of ≥5.0)
-                    df = apply_empirical_thresholds(df)
-                    logger.info(f"Applied empirical thresholds for {ticker}")
-                    
-                    if risk_managed:
-                        # Use RiskManager for position management and exits
-                        risk_result = backtest.run_risk_managed_backtest(
-                            df=df,
-                            ticker=ticker,
-                            account_value=account_value,
-                            risk_pct=risk_pct,
-                            stop_strategy=stop_strategy,
-                            save_to_file=True,
-                            output_dir=output_dir
-                        )
-                        
-                        # Extract trades from risk manager
-                        paired_trades = risk_result['trades']
-                        
-                        # Add ticker identifier if not already present
-                        for trade in paired_trades:
-                            if 'ticker' not in trade:
-                                trade['ticker'] = ticker
-                        
-                        # Aggregate all trades
-                        aggregated_results['all_paired_trades'].extend(paired_trades)
-                        
-                        # Store ticker-specific results
-                        aggregated_results['ticker_specific_results'][ticker] = {
-                            'total_trades': len(paired_trades),
-                            'closed_trades': len([t for t in paired_trades if not t.get('partial_exit', False)]),
-                            'risk_managed': True,
-                            'analysis': risk_result.get('analysis', {})
-                        }
-                    else:
-                        # Traditional entry/exit signal pairing
-                        paired_trades = backtest.pair_entry_exit_signals(
-                            df, 
-                            list(entry_signals.keys()), 
-                            list(exit_signals.keys())
-                        )
-                        
-                        # Add ticker identifier to each trade
-                        for trade in paired_trades:
-                            trade['ticker'] = ticker
-                        
-                        # Aggregate all trades
-                        aggregated_results['all_paired_trades'].extend(paired_trades)
-                        
-                        # Analyze this ticker's performance
-                        entry_comparison = backtest.compare_entry_strategies(paired_trades, entry_signals)
-                        exit_comparison = backtest.compare_exit_strategies(paired_trades, exit_signals)
-                        
-                        # Store ticker-specific results
-                        aggregated_results['ticker_specific_results'][ticker] = {
-                            'total_trades': len(paired_trades),
-                            'closed_trades': len([t for t in paired_trades if not t.get('is_open', False)]),
-                            'risk_managed': False,
-                            'entry_performance': entry_comparison,
-                            'exit_performance': exit_comparison
+                    if metrics['closed_trades'] > 0:
+                        aggregated_results['entry_signal_stats'][signal_col] = {
+                            'name': signal_name,
+                            **metrics
                         }
-                        
-                        # Generate and save individual backtest report
-                        strategy_report = backtest.generate_strategy_comparison_report(
-                            paired_trades, 
-                            entry_signals, 
-                            exit_signals
-                        )
-                        
-                        # Save individual report
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                        filename = f"{ticker}_{period}_backtest_{timestamp}.txt"
-                        filepath = os.path.join(output_dir, filename)
-                        
-                        def _save_report():
-                            with open(filepath, 'w') as f:
-                                f.write(f"📊 BACKTEST REPORT: {ticker} ({period})\n")
-                                f.write("="*70 + "\n\n")
-                                f.write(strategy_report)
-                        
-                        safe_operation(f"saving backtest report for {ticker}", _save_report)
-                    
-                    aggregated_results['tickers_processed'].append(ticker)
-                    logger.info(f"Completed {ticker}: {len(paired_trades)} trades generated")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to process {ticker}: {str(e)}")
-                    aggregated_results['tickers_failed'].append({
-                        'ticker': ticker,
-                        'error': str(e)
-                    })
-                    continue
-    
-        # Aggregate statistics across all tickers
-        if aggregated_results['all_paired_trades']:
-            logger.info(f"Aggregating results across {len(aggregated_results['tickers_processed'])} tickers")
-            
-            if not risk_managed:
-                # Traditional backtest: Aggregate entry and exit signal performance
-                standard_trades = [
-                    t for t in aggregated_results['all_paired_trades']
-                    if 'entry_signals' in t and 'exit_signals' in t
-                ]
                 
-                if not standard_trades:
-                    logger.warning("No standard trades with entry/exit signals available for aggregate analysis.")
-                else:
-                    for signal_col, signal_name in entry_signals.items():
-                        metrics = backtest.analyze_strategy_performance(
-                            standard_trades,
-                            entry_filter=signal_col
-                        )
-                        
-                        if metrics['closed_trades'] > 0:
-                            aggregated_results['entry_signal_stats'][signal_col] = {
-                                'name': signal_name,
-                                **metrics
-                            }
-                    
-                    # Aggregate exit signal performance
-                    for signal_col, signal_name in exit_signals.items():
-                        metrics = backtest.analyze_strategy_performance(
-                            standard_trades,
-                            exit_filter=signal_col
-                        )
-                        
-                        if metrics['closed_trades'] > 0:
-                            aggregated_results['exit_signal_stats'][signal_col] = {
-                                'name': signal_name,
-                                **metrics
-                            }
-            else:
-                # Risk-managed: Aggregate R-multiples and exit types
-                try:
-                    from risk_manager import analyze_risk_managed_trades
-                    
-                    # Analyze all trades together
-                    all_trades_analysis = analyze_risk_managed_trades(aggregated_results['all_paired_trades'])
-                    aggregated_results['risk_analysis'] = all_trades_analysis
+                # Aggregate exit signal performance
+                for signal_col, signal_name in EXIT_SIGNALS.items():
+                    metrics = backtest.analyze_strategy_performance(
+                        standard_trades,
+                        exit_filter=signal_col
+                    )
                     
-                except ImportError:
-                    logger.error("risk_manager module not available for aggregation")
+                    if metrics['closed_trades'] > 0:
+                        aggregated_results['exit_signal_stats'][signal_col] = {
+                            'name': signal_name,
+                            **metrics
+                        }
+        else:
+            # Risk-managed: Aggregate R-multiples and exit types
+            try:
+                from risk_manager import analyze_risk_managed_trades
+                
+                # Analyze all trades together
+                all_trades_analysis = analyze_risk_managed_trades(aggregated_results['all_paired_trades'])
+                aggregated_results['risk_analysis'] = all_trades_analysis
+                
+            except ImportError:
+                logger.error("risk_manager module not available for aggregation")
+    
+    return aggregated_results
+
+
+def merge_backtest_shards(shard_dir: str) -> Tuple[Dict, Dict]:
+    """
+    Rebuild the aggregated results of a sharded run from its partial results.
+    
+    Args:
+        shard_dir (str): Directory with the run's batch_backtest shard files
         
-        return aggregated_results
+    Returns:
+        Tuple[Dict, Dict]: (aggregated results identical to a single-host run,
+            the run's options: period, start_date, end_date, risk_managed, ...)
+    """
+    tickers, options, payloads = load_shard_results(shard_dir, 'batch_backtest')
+    outcomes = {}
+    reused = set()
+    for payload in payloads:
+        outcomes.update(payload['outcomes'])
+        reused.update(payload['reused'])
+    
+    aggregated_results = aggregate_backtest_outcomes(tickers, outcomes, options['risk_managed'],
+                                                     options['account_value'],
+                                                     reused=[t for t in tickers if t in reused])
+    return aggregated_results, options
 
 
 def generate_risk_managed_aggregate_report(results: Dict, period: str, output_dir: str) -> str:
     """Generate aggregate report for risk-managed backtests."""
     try:
-        from risk_manager import analyze_risk_managed_trades
+        from risk_manager import TradeLedger, analyze_risk_managed_trades
     except ImportError:
         logger.error("risk_manager module not available for risk-managed aggregate reporting")
         return "Error: risk_manager module not available"
@@ -295,9 +543,12 @@ def generate_risk_managed_aggregate_report(results: Dict, period: str, output_di
     partial_trades = [t for t in trades if t.get("partial_exit", False)]
     full_exits = [t for t in trades if not t.get("partial_exit", False)]
 
+    # Columnar view of every trade; analytics and the CSV ledger read from it
+    trade_ledger = TradeLedger.from_records(trades)
+
     risk_analysis = results.get("risk_analysis")
     if not risk_analysis:
-        risk_analysis = analyze_risk_managed_trades(trades)
+        risk_analysis = analyze_risk_managed_trades(trade_ledger)
 
     starting_equity = results.get("account_value", 100000)
     portfolio_ledger = None
@@ -308,7 +559,7 @@ def generate_risk_managed_aggregate_report(results: Dict, period: str, output_di
     ledger_csv_path = None
 
     if trades:
-        ledger_df = pd.DataFrame(trades).copy()
+        ledger_df = trade_ledger.to_frame()
         if 'dollar_pnl' not in ledger_df.columns:
             ledger_df['dollar_pnl'] = 0.0
         ledger_df['dollar_pnl'] = ledger_df['dollar_pnl'].fillna(0.0)
@@ -375,7 +626,7 @@ def generate_risk_managed_aggregate_report(results: Dict, period: str, output_di
         portfolio_ledger = ledger_df[['entry_date', 'exit_date', 'ticker', 'entry_price', 'exit_price',
                                       'position_size', 'partial_exit', 'exit_pct', 'exit_type', 'dollar_pnl',
                                       'equity_before_trade', 'portfolio_equity', 'r_multiple', 'profit_pct',
-                                      'entry_signals_str', 'primary_signal', 'exit_signals_str', 'primary_exit_signal',
+                                      'mae_pct', 'mfe_pct', 'initial_stop', 'entry_signals_str', 'primary_signal', 'exit_signals_str', 'primary_exit_signal',
                                       'accumulation_score', 'moderate_buy_score', 'profit_taking_score'] + regime_columns]
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         ledger_filename = f"PORTFOLIO_TRADE_LOG_{period.replace(' ', '_')}_{timestamp}.csv"
@@ -806,8 +1057,7 @@ def main():
     parser.add_argument(
         '-f', '--file',
         dest='ticker_file',
-        required=True,
-        help='Path to file containing ticker symbols (one per line)'
+        help='Path to file containing ticker symbols (one per line; required unless --merge-shards)'
     )
     
     parser.add_argument(
@@ -862,23 +1112,123 @@ def main():
         help='Starting account equity for risk-managed runs (default: 100000)'
     )
     
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for running tickers in parallel (default: 1, serial)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume each ticker from its last checkpoint and process only new bars '
+             '(risk-managed only; the history starts where the first checkpointed run started '
+             'instead of moving with the period; checkpoints are discarded when data or thresholds change)'
+    )
+    
+    parser.add_argument(
+        '--checkpoint-dir',
+        default=None,
+        help='Checkpoint directory for --resume (default: data_cache/backtest_checkpoints)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip tickers the output directory\'s run manifest records as completed with unchanged '
+             'inputs (resumes an interrupted run; reruns only process changed tickers)'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        metavar='I/N',
+        help='Process only shard I of N (tickers balanced by cache size) and save a partial result '
+             'to OUTPUT_DIR/shards instead of the aggregate report'
+    )
+    
+    parser.add_argument(
+        '--merge-shards',
+        metavar='DIR',
+        help='Build the aggregate report from the partial results of all shards in DIR '
+             '(run options are taken from the shards)'
+    )
+    
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Use stored earnings dates only (no network calls)'
+    )
+    
+    parser.add_argument(
+        '--no-frame-cache',
+        action='store_true',
+        help='Rebuild analysis frames instead of using the persistent frame cache'
+    )
+    
     args = parser.parse_args()
     
+    if args.no_frame_cache:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+    
+    if args.offline:
+        import earnings_calendar
+        earnings_calendar.set_offline_mode(True)
+    
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
     # Validate date range if provided
     if (args.start_date and not args.end_date) or (args.end_date and not args.start_date):
         parser.error("--start-date and --end-date must be used together")
     
-    # Run batch backtest
-    results = run_batch_backtest(
-        ticker_file=args.ticker_file,
-        period=args.period,
-        start_date=args.start_date,
-        end_date=args.end_date,
-        output_dir=args.output_dir,
-        risk_managed=args.risk_managed,
-        account_value=args.account_value,
-        stop_strategy=args.stop_strategy
-    )
+    if not args.ticker_file and not args.merge_shards:
+        parser.error("-f/--file is required (unless --merge-shards is used)")
+    
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except DataValidationError as e:
+            parser.error(str(e))
+    
+    checkpoint_dir = None
+    if args.resume:
+        from backtest_checkpoint import DEFAULT_CHECKPOINT_DIR
+        checkpoint_dir = args.checkpoint_dir or DEFAULT_CHECKPOINT_DIR
+    
+    if args.merge_shards:
+        # Aggregate a sharded run with the options its shards ran with
+        results, run_options = merge_backtest_shards(args.merge_shards)
+        for option in ['period', 'start_date', 'end_date', 'risk_managed']:
+            setattr(args, option, run_options[option])
+        print(f"🧩 Merged {len(results['tickers_processed']) + len(results['tickers_failed'])} tickers "
+              f"from the shards in {args.merge_shards}")
+    else:
+        # Run batch backtest
+        results = run_batch_backtest(
+            ticker_file=args.ticker_file,
+            period=args.period,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            output_dir=args.output_dir,
+            risk_managed=args.risk_managed,
+            account_value=args.account_value,
+            stop_strategy=args.stop_strategy,
+            checkpoint_dir=checkpoint_dir,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            shard=shard
+        )
+    
+    if shard is not None:
+        print(f"\n✅ Shard {shard[0]}/{shard[1]} complete: {len(results['tickers_processed'])} tickers, "
+              f"{len(results['all_paired_trades'])} trades")
+        print(f"📁 Partial result saved: {results['shard_file']}")
+        print(f"   Merge all shards with: python batch_backtest.py --merge-shards "
+              f"{os.path.dirname(results['shard_file'])} -o {args.output_dir}")
+        return
     
     if not results or not results['all_paired_trades']:
         print("\n❌ No results generated. Check for errors above.")
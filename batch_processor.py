@@ -8,6 +8,7 @@ Functions:
 - calculate_recent_stealth_score(): Calculate recent stealth buying activity
 - calculate_recent_entry_score(): Calculate recent strong entry signal activity  
 - generate_html_summary(): Generate interactive HTML summary with clickable charts
+- screen_universe(): Cheap, parallel last-bar screen for active qualified signals
 - process_batch(): Process multiple tickers from a file
 
 Author: Volume Analysis Tool
@@ -18,7 +19,7 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 # Import error handling framework
 from error_handler import (
@@ -31,11 +32,28 @@ from error_handler import (
 from threshold_config import OPTIMAL_THRESHOLDS, get_threshold_summary, get_threshold_quality
 import signal_generator
 from signal_metadata import get_display_name
+from analysis_service import get_analysis_dataframe, get_frame_fingerprint
+from data_manager import PERIOD_DAYS
+from run_manifest import RunManifest, get_run_fingerprint
+from batch_shards import load_shard_results, select_shard, write_shard_result
+from batch_scheduler import plan_schedule, run_schedule
 
 STEALTH_DISPLAY = get_display_name('Stealth_Accumulation')
 MODERATE_DISPLAY = get_display_name('Moderate_Buy')
 PROFIT_DISPLAY = get_display_name('Profit_Taking')
 
+# Screening window for the phase-one scan. The longest indicator chain feeding
+# the last-bar signals (20-bar CMF z-score over a 20-bar CMF, ATR/swing windows)
+# settles within ~45 bars, so 3 months reproduces the full-period flags.
+SCREEN_PERIOD = '3mo'
+
+# Scores from the shorter window can differ from the full period in the last
+# floating-point digits; keep borderline tickers rather than drop them.
+SCREEN_SCORE_TOLERANCE = 1e-9
+
+# Modules whose code turns a prepared frame into a ticker's report, chart and metrics
+RESULT_MODULES = ['batch_processor', 'vol_analysis', 'chart_builder', 'chart_builder_plotly']
+
 def check_data_staleness(results: List[Dict], warning_threshold_hours: int = 24) -> Dict[str, Any]:
     """
     Check if any tickers have stale data and return warning information.
@@ -228,6 +246,102 @@ def calculate_batch_metrics(df: pd.DataFrame, account_value: float = 500000) ->
     }
 
 
+def qualifying_signals(metrics: Dict[str, Any], tolerance: float = 0.0) -> Dict[str, bool]:
+    """
+    Which summary sections a ticker would appear in (active signal at or above threshold).
+    
+    Args:
+        metrics (Dict[str, Any]): Output of calculate_batch_metrics()
+        tolerance (float): Slack below each threshold that still counts as qualifying
+        
+    Returns:
+        Dict[str, bool]: 'moderate', 'profit' and 'stealth' flags
+    """
+    return {
+        'moderate': bool(metrics['moderate_signal_active']
+                         and metrics['moderate_buy_score'] >= metrics['moderate_threshold'] - tolerance),
+        'profit': bool(metrics['profit_signal_active']
+                       and metrics['profit_taking_score'] >= metrics['profit_threshold'] - tolerance),
+        'stealth': bool(metrics['stealth_signal_active']
+                        and metrics['stealth_score'] >= metrics['stealth_threshold'] - tolerance),
+    }
+
+def get_screen_period(period: str) -> str:
+    """Shorter of the analysis period and SCREEN_PERIOD."""
+    if PERIOD_DAYS.get(period, 365) <= PERIOD_DAYS[SCREEN_PERIOD]:
+        return period
+    return SCREEN_PERIOD
+
+def screen_ticker(ticker: str, period: str = '12mo', data_source: str = 'yfinance') -> Dict[str, Any]:
+    """
+    Phase-one screen: last-bar signal check over a short warmup window.
+    
+    Builds the analysis frame from the cache for get_screen_period(period) only
+    and skips charts and report files.
+    
+    Args:
+        ticker (str): Stock symbol
+        period (str): Analysis period of the full run
+        data_source (str): Data source to use ('yfinance' or 'massive')
+        
+    Returns:
+        Dict[str, Any]: 'ticker', 'qualifies', 'signals' (qualifying_signals flags)
+            and 'error' (message, or None)
+    """
+    try:
+        df = get_analysis_dataframe(ticker, get_screen_period(period), data_source=data_source)
+        signals = qualifying_signals(calculate_batch_metrics(df), tolerance=SCREEN_SCORE_TOLERANCE)
+    except Exception as e:
+        get_logger().error(f"Screen failed for {ticker}: {str(e)}")
+        return {'ticker': ticker, 'qualifies': False, 'signals': {}, 'error': str(e)}
+    return {'ticker': ticker, 'qualifies': any(signals.values()), 'signals': signals, 'error': None}
+
+def _init_screen_worker(offline: bool, frame_cache_enabled: bool = True) -> None:
+    """Process-pool initializer: carry CLI-level module settings into workers."""
+    if offline:
+        import earnings_calendar
+        earnings_calendar.set_offline_mode(True)
+    if not frame_cache_enabled:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+
+def screen_universe(tickers: List[str], period: str = '12mo', data_source: str = 'yfinance',
+                    jobs: int = 1) -> List[Dict[str, Any]]:
+    """
+    Run screen_ticker() over a ticker list, optionally on worker processes.
+    
+    With jobs > 1 the workers follow a cost-aware schedule (batch_scheduler.py);
+    a worker process that dies fails only the ticker it was screening.
+    
+    Args:
+        tickers (List[str]): Ticker symbols
+        period (str): Analysis period of the full run
+        data_source (str): Data source to use ('yfinance' or 'massive')
+        jobs (int): Worker processes (1 = serial in this process)
+        
+    Returns:
+        List[Dict[str, Any]]: screen_ticker() results in input order
+    """
+    if jobs <= 1 or len(tickers) <= 1:
+        return [screen_ticker(ticker, period, data_source) for ticker in tickers]
+    
+    import earnings_calendar
+    import frame_cache
+    schedule = plan_schedule(tickers, jobs)
+    job_args = {ticker: (ticker, period, data_source) for ticker in tickers}
+    screened = []
+    for ticker, future in run_schedule(schedule, screen_ticker, job_args, initializer=_init_screen_worker,
+                                       initargs=(earnings_calendar.is_offline_mode(),
+                                                 frame_cache.is_frame_cache_enabled())):
+        try:
+            screened.append(future.result())
+        except Exception as e:
+            get_logger().error(f"Screen failed for {ticker}: worker error: {e}")
+            screened.append({'ticker': ticker, 'qualifies': False, 'signals': {},
+                             'error': f"worker error: {e}"})
+    print(schedule.describe())
+    return screened
+
 def generate_html_summary(results: List[Dict], errors: List[Dict], period: str, 
                          output_dir: str, timestamp: str,
                          chart_backend: str = 'matplotlib') -> str:
@@ -726,10 +840,17 @@ def read_ticker_file(filepath: str) -> List[str]:
 
 def process_batch(ticker_file: str, period='12mo', output_dir='results_volume', 
                  save_charts=False, generate_html=True, verbose=True,
-                 chart_backend: str = 'matplotlib', data_source: str = 'yfinance'):
+                 chart_backend: str = 'matplotlib', data_source: str = 'yfinance',
+                 screen: bool = False, jobs: int = 1, incremental: bool = False,
+                 shard: Optional[Tuple[int, int]] = None):
     """
     Process multiple tickers from a file and save individual analysis reports.
     
+    With screen=True the scan runs in two phases: screen_universe() checks the
+    last bar of every ticker over a short window (in parallel with jobs > 1),
+    then only tickers with an active, threshold-qualified signal get the full
+    analysis, report file and chart.
+    
     Args:
         ticker_file (str): Path to file containing ticker symbols
         period (str): Analysis period
@@ -739,6 +860,14 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
         verbose (bool): Print progress output during batch processing
         chart_backend (str): Chart engine ('matplotlib' PNG or 'plotly' HTML) passed to analyze_ticker
         data_source (str): Data source to use ('yfinance' or 'massive')
+        screen (bool): Run the phase-one screen and fully analyze qualifying tickers only
+        jobs (int): Worker processes for the phase-one screen
+        incremental (bool): Reuse the reports and metrics of tickers recorded in
+            the output directory's run manifest with unchanged inputs (see
+            run_manifest.py); only new, changed or unfinished tickers are analyzed
+        shard (Tuple[int, int]): Process only shard (i, N) of the tickers and save
+            its partial result for merge_batch_shards() instead of the summary
+            reports (see batch_shards.py)
         
     Raises:
         DataValidationError: If input parameters are invalid
@@ -767,6 +896,10 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
         if not tickers:
             raise DataValidationError("No valid tickers found in file")
         
+        all_tickers = tickers
+        if shard is not None:
+            tickers = select_shard(all_tickers, shard)
+        
         # Create output directory if it doesn't exist
         try:
             if not os.path.exists(output_dir):
@@ -785,22 +918,67 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
         print(f"\n🚀 BATCH PROCESSING {len(tickers)} TICKERS")
         print("="*50)
         print(f"📁 Output directory: {output_dir}")
+        if shard is not None:
+            print(f"🧩 Shard: {shard[0]}/{shard[1]} ({len(tickers)} of {len(all_tickers)} tickers)")
         print(f"📅 Period: {period}")
         print(f"📊 Save charts: {'Yes' if save_charts else 'No'}")
         print(f"🎨 Chart backend: {chart_backend}")
+        if screen:
+            print(f"🔎 Screen: last bar over {get_screen_period(period)} ({jobs} job{'s' if jobs != 1 else ''})")
         print("="*50)
     
     # Track results for summary
     results = []
     errors = []
+    screened_out = []
+    to_analyze = tickers
     
-    for i, ticker in enumerate(tickers, 1):
+    if screen:
+        # Phase one: cheap last-bar screen; errors are reported like analysis errors
+        screened = screen_universe(tickers, period, data_source=data_source, jobs=jobs)
+        to_analyze = []
+        for outcome in screened:
+            if outcome['error']:
+                print(f"❌ {outcome['ticker']}: {outcome['error']}")
+                errors.append({'ticker': outcome['ticker'], 'error': outcome['error']})
+            elif outcome['qualifies']:
+                to_analyze.append(outcome['ticker'])
+            else:
+                screened_out.append(outcome['ticker'])
+        logger.info(f"Screen: {len(to_analyze)} of {len(tickers)} tickers qualify for full analysis")
         if verbose:
-            print(f"\n[{i}/{len(tickers)}] Processing {ticker}...")
+            print(f"\n🔎 SCREEN: {len(to_analyze)}/{len(tickers)} tickers with active qualified signals "
+                  f"({len(screened_out)} screened out, {len(errors)} errors)")
+            if to_analyze:
+                print(f"   Qualifying: {', '.join(to_analyze)}")
+    screen_error_count = len(errors)
+    
+    # Every analyzed ticker is recorded, so any run can later be resumed
+    manifest = RunManifest(output_dir)
+    chart_extension = 'html' if (chart_backend or 'matplotlib').lower() == 'plotly' else 'png'
+    reused = []
+    
+    for i, ticker in enumerate(to_analyze, 1):
+        try:
+            fingerprint = get_run_fingerprint(ticker, get_frame_fingerprint(ticker, period, data_source=data_source),
+                                              {'chart_backend': chart_extension}, RESULT_MODULES)
+        except Exception:
+            fingerprint = None  # invalid ticker: processed (and reported) as usual
+        
+        stored = manifest.lookup(ticker, fingerprint) if incremental else None
+        if stored is not None:
+            results.append(stored)
+            reused.append(ticker)
+            if verbose:
+                print(f"\n[{i}/{len(to_analyze)}] ♻️ {ticker}: unchanged, reusing {stored['filename']}")
+            continue
+        
+        if verbose:
+            print(f"\n[{i}/{len(to_analyze)}] Processing {ticker}...")
         
         try:
             # Use error context for individual ticker processing
-            with ErrorContext("processing ticker", ticker=ticker, index=f"{i}/{len(tickers)}"):
+            with ErrorContext("processing ticker", ticker=ticker, index=f"{i}/{len(to_analyze)}"):
                 # Analyze ticker with file output (no interactive chart display in batch mode)
                 result = analyze_ticker(
                     ticker=ticker,
@@ -831,6 +1009,10 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
                         **batch_metrics  # Unpack all calculated metrics with threshold compliance
                     })
                     
+                    chart_path = filepath.replace('_analysis.txt', f'_chart.{chart_extension}')
+                    outputs = [filepath] + ([chart_path] if os.path.exists(chart_path) else [])
+                    manifest.record(ticker, fingerprint, results[-1], outputs)
+                    
         except DataDownloadError as e:
             # Handle data availability errors more gracefully
             if "No data available" in str(e) or "possibly delisted" in str(e):
@@ -858,6 +1040,82 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
             errors.append({'ticker': ticker, 'error': str(e)})
             continue
     
+    if shard is not None:
+        shard_file = write_shard_result(
+            output_dir, 'batch_processor', shard, all_tickers, tickers,
+            {'period': period, 'chart_backend': chart_backend, 'data_source': data_source, 'screen': screen},
+            {'results': results, 'errors': errors, 'screen_error_count': screen_error_count,
+             'screened_out': screened_out, 'reused': reused, 'incremental': incremental})
+        print(f"\n✅ Shard {shard[0]}/{shard[1]} complete: {len(results)}/{len(tickers)} tickers processed, "
+              f"{len(errors)} errors")
+        print(f"📁 Partial result saved: {shard_file}")
+        return
+    
+    report_batch_results(len(all_tickers), results, errors, screened_out, reused, period, output_dir,
+                         save_charts=save_charts, generate_html=generate_html, verbose=verbose,
+                         chart_backend=chart_backend, data_source=data_source,
+                         screen=screen, incremental=incremental)
+
+
+def merge_batch_shards(shard_dir: str, output_dir: str = 'results_volume', save_charts: bool = False,
+                       generate_html: bool = True, verbose: bool = True) -> None:
+    """
+    Write the summary reports of a sharded process_batch() run from its partial results.
+    
+    The per-ticker reports and charts stay where each shard wrote them; copy
+    them into output_dir for the summary's file links (and HTML charts) to resolve.
+    
+    Args:
+        shard_dir (str): Directory with the run's batch_processor shard files
+        output_dir (str): Directory to save the summary reports
+        save_charts (bool): Whether chart images were saved by the shards
+        generate_html (bool): Whether to generate interactive HTML summary
+        verbose (bool): Print the summary output
+    """
+    tickers, options, payloads = load_shard_results(shard_dir, 'batch_processor')
+    position = {ticker: i for i, ticker in enumerate(tickers)}
+    
+    def in_input_order(items):
+        return sorted(items, key=lambda item: position[item['ticker'] if isinstance(item, dict) else item])
+    
+    # Same order as a single-host run: screen errors first, then analysis errors
+    screen_errors = [e for p in payloads for e in p['errors'][:p['screen_error_count']]]
+    analysis_errors = [e for p in payloads for e in p['errors'][p['screen_error_count']:]]
+    
+    os.makedirs(output_dir, exist_ok=True)
+    report_batch_results(
+        len(tickers),
+        in_input_order([r for p in payloads for r in p['results']]),
+        in_input_order(screen_errors) + in_input_order(analysis_errors),
+        in_input_order([t for p in payloads for t in p['screened_out']]),
+        in_input_order([t for p in payloads for t in p['reused']]),
+        options['period'], output_dir,
+        save_charts=save_charts, generate_html=generate_html, verbose=verbose,
+        chart_backend=options['chart_backend'], data_source=options['data_source'],
+        screen=options['screen'], incremental=any(p['incremental'] for p in payloads)
+    )
+
+
+def report_batch_results(ticker_count: int, results: List[Dict], errors: List[Dict], screened_out: List[str],
+                         reused: List[str], period: str, output_dir: str, save_charts: bool = False,
+                         generate_html: bool = True, verbose: bool = True, chart_backend: str = 'matplotlib',
+                         data_source: str = 'yfinance', screen: bool = False, incremental: bool = False) -> None:
+    """
+    Print and save the summary reports of a batch run.
+    
+    Args:
+        ticker_count (int): Number of tickers in the run
+        results (List[Dict]): Per-ticker metrics of the analyzed tickers, in input order
+        errors (List[Dict]): Failed tickers ('ticker', 'error')
+        screened_out (List[str]): Tickers without an active qualified signal (screen runs)
+        reused (List[str]): Tickers reused from the run manifest (incremental runs)
+        Remaining arguments as in process_batch()
+    """
+    from vol_analysis import analyze_ticker
+    
+    logger = get_logger()
+    chart_extension = 'html' if (chart_backend or 'matplotlib').lower() == 'plotly' else 'png'
+    
     # Generate summary report
     if results:
         # Filter for ACTIVE signals that ALSO meet empirically validated thresholds
@@ -875,7 +1133,11 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
         if verbose:
             print(f"\n📋 BATCH PROCESSING SUMMARY")
             print("="*60)
-            print(f"✅ Successfully processed: {len(results)}/{len(tickers)} tickers")
+            print(f"✅ Successfully processed: {len(results)}/{ticker_count} tickers")
+            if screen:
+                print(f"🔎 Screened out (no active qualified signal): {len(screened_out)}")
+            if incremental:
+                print(f"♻️ Reused unchanged: {len(reused)}")
             
             # Display data staleness warning prominently if present
             if staleness['has_stale_data']:
@@ -978,8 +1240,12 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
                 f.write(f"Processing Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"Period: {period}\n")
                 f.write(f"Portfolio Size: $500K\n")
-                f.write(f"Total Tickers: {len(tickers)}\n")
+                f.write(f"Total Tickers: {ticker_count}\n")
                 f.write(f"Successfully Processed: {len(results)}\n")
+                if screen:
+                    f.write(f"Screened Out: {len(screened_out)} (no active qualified signal on the last bar)\n")
+                if incremental:
+                    f.write(f"Reused Unchanged: {len(reused)} (from the run manifest)\n")
                 f.write(f"Errors: {len(errors)}\n\n")
                 
                 # Add data staleness warning if present
@@ -1068,11 +1334,18 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         if generate_html:
             if not save_charts:
-                if verbose:
+                # The analysis pass already saved each chart; only re-render missing
+                # ones, from the frame memoized by that pass (no pipeline rebuild)
+                missing_charts = [
+                    r['ticker'] for r in results[:5]
+                    if not os.path.exists(os.path.join(
+                        output_dir, r['filename'].replace('_analysis.txt', f'_chart.{chart_extension}')))
+                ]
+                if missing_charts and verbose:
                     print(f"\n📊 HTML requested - generating charts for interactive summary...")
-                for i, ticker in enumerate([r['ticker'] for r in results[:5]], 1):
+                for i, ticker in enumerate(missing_charts, 1):
                     if verbose:
-                        print(f"  Generating chart {i}/5: {ticker}...")
+                        print(f"  Generating chart {i}/{len(missing_charts)}: {ticker}...")
                     try:
                         analyze_ticker(
                             ticker=ticker,
@@ -1084,7 +1357,8 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
                             show_chart=False,
                             show_summary=False,
                             debug=verbose,
-                            chart_backend=chart_backend
+                            chart_backend=chart_backend,
+                            data_source=data_source
                         )
                     except Exception as e:
                         print(f"    ⚠️ Chart generation failed for {ticker}: {str(e)}")
@@ -1100,5 +1374,8 @@ def process_batch(ticker_file: str, period='12mo', output_dir='results_volume',
             print(f"\n📄 Summary report saved: {summary_filename}")
             print(f"📁 All files saved to: {os.path.abspath(output_dir)}")
     
+    elif screen and screened_out:
+        print(f"\n🔎 No tickers have an active qualified signal ({len(screened_out)} screened out).")
+    
     else:
         print(f"\n❌ No tickers were successfully processed.")
@@ -0,0 +1,220 @@
+"""
+Cost-aware scheduling of batch tickers across worker processes.
+
+With --jobs > 1, batch runs no longer hand tickers to a shared pool in file
+order. plan_schedule() estimates each ticker's cost from its cache row count
+(the record_count in the cache metadata header) and builds one work list per
+worker:
+
+- Longest first: tickers are placed in descending cost on the least loaded
+  worker, so huge histories start early instead of leaving the other workers
+  idle at the end of the run.
+- Sector affinity: a ticker goes to a worker that already holds its sector ETF
+  (regime_filter.get_sector_etf) when that does not push the worker past the
+  longest-first makespan (the current maximum load, the least loaded worker
+  plus the ticker, or the even share of the total, whichever is largest).
+  Each worker then loads fewer benchmark series into its in-process regime
+  store.
+
+run_schedule() runs each list in order on its own single-process executor,
+so a worker's regime store and frame memo persist across its tickers. A
+worker process that dies fails only the ticker it was running; the rest of
+its list continues on a fresh process. Results
+still come back in input order, so aggregates match a serial run. The
+schedule reports its planned balance and, after the run, the achieved
+utilization: worker busy time / (workers x wall time).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from data_manager import get_cache_filepath
+from error_handler import DataValidationError, logger
+from regime_filter import get_sector_etf
+from schema_manager import schema_manager
+
+
+def estimate_ticker_cost(ticker: str, interval: str = '1d') -> int:
+    """
+    Estimated processing cost of a ticker: the row count of its cache.
+
+    Read from the cache metadata header (rows are counted for legacy files
+    without one); 0 when the ticker is not cached.
+    """
+    try:
+        cache_file = get_cache_filepath(ticker, interval)
+    except DataValidationError:
+        return 0
+    if not os.path.exists(cache_file):
+        return 0
+    try:
+        metadata = schema_manager.read_metadata_from_csv(cache_file)
+        if metadata and metadata.get('record_count') is not None:
+            return int(metadata['record_count'])
+    except Exception:
+        pass
+    with open(cache_file, 'r') as f:
+        return max(sum(1 for line in f if not line.startswith('#')) - 1, 0)
+
+
+@dataclass
+class BatchSchedule:
+    """Per-worker ticker lists of a batch run, with planned and achieved balance."""
+    tickers: List[str]
+    workers: List[List[str]]
+    costs: Dict[str, int]
+    busy_seconds: List[float] = field(default_factory=list)
+    wall_seconds: Optional[float] = None
+
+    @property
+    def loads(self) -> List[int]:
+        """Estimated cost (rows) of each worker's list."""
+        return [sum(max(self.costs.get(t, 0), 1) for t in plan) for plan in self.workers]
+
+    @property
+    def planned_balance(self) -> float:
+        """Mean / max estimated worker load (1.0 = perfectly balanced)."""
+        loads = self.loads
+        return sum(loads) / (len(loads) * max(loads)) if loads and max(loads) else 1.0
+
+    @property
+    def benchmark_loads(self) -> int:
+        """Benchmark series the workers load: SPY plus their distinct sector ETFs."""
+        return sum(len({'SPY'} | {get_sector_etf(t) for t in plan}) for plan in self.workers if plan)
+
+    @property
+    def utilization(self) -> Optional[float]:
+        """Achieved busy time / (workers x wall time), once the schedule has run."""
+        if not self.wall_seconds:
+            return None
+        return sum(self.busy_seconds) / (len(self.busy_seconds) * self.wall_seconds)
+
+    def describe(self) -> str:
+        """One-line summary of the plan and, after the run, the achieved utilization."""
+        line = (f"🗓️ Schedule: {len(self.tickers)} tickers on {len(self.workers)} workers, longest first; "
+                f"planned balance {self.planned_balance:.1%}, {self.benchmark_loads} benchmark loads")
+        if self.utilization is not None:
+            line += (f"\n⚖️ Achieved utilization: {self.utilization:.1%} "
+                     f"(busy {sum(self.busy_seconds):.1f}s across {len(self.busy_seconds)} workers, "
+                     f"wall {self.wall_seconds:.1f}s)")
+        return line
+
+
+def plan_schedule(tickers: List[str], workers: int,
+                  costs: Optional[Dict[str, int]] = None) -> BatchSchedule:
+    """
+    Assign tickers to worker lists, longest first with sector-ETF affinity.
+
+    Args:
+        tickers: Ticker symbols in input order
+        workers: Number of worker processes
+        costs: Cost per ticker (default: estimate_ticker_cost())
+
+    Returns:
+        BatchSchedule: Worker lists, each in descending cost (empty workers dropped)
+    """
+    if costs is None:
+        costs = {ticker: estimate_ticker_cost(ticker) for ticker in tickers}
+    workers = max(1, min(workers, len(tickers)))
+
+    plans = [[] for _ in range(workers)]
+    loads = [0] * workers
+    sectors = [set() for _ in range(workers)]
+    even_share = sum(max(costs.get(t, 0), 1) for t in tickers) / workers
+    for ticker in sorted(tickers, key=lambda t: (-costs.get(t, 0), t)):
+        cost = max(costs.get(ticker, 0), 1)
+        sector_etf = get_sector_etf(ticker)
+        makespan = max(max(loads), min(loads) + cost, even_share)
+        affine = [w for w in range(workers) if sector_etf in sectors[w] and loads[w] + cost <= makespan]
+        worker = min(affine or range(workers), key=lambda w: (loads[w], w))
+        plans[worker].append(ticker)
+        loads[worker] += cost
+        sectors[worker].add(sector_etf)
+
+    return BatchSchedule(tickers=list(tickers), workers=[plan for plan in plans if plan], costs=costs)
+
+
+def run_schedule(schedule: BatchSchedule, fn: Callable, job_args: Dict[str, Tuple],
+                 initializer: Optional[Callable] = None,
+                 initargs: Tuple = ()) -> Iterator[Tuple[str, Future]]:
+    """
+    Run fn(*job_args[ticker]) for every ticker on the schedule's workers.
+
+    Each worker list runs in order on its own single-process executor,
+    supervised by a thread. When the worker process dies (OOM, segfault,
+    os._exit) only the ticker it was running fails with BrokenProcessPool;
+    the rest of its list is resubmitted to a fresh process. Futures are
+    yielded in input order; once all are consumed the schedule's
+    busy_seconds and wall_seconds are set.
+
+    Args:
+        schedule: plan_schedule() result
+        fn: Picklable job function
+        job_args: Positional arguments of fn for each ticker
+        initializer: Worker process initializer
+        initargs: Arguments of the initializer
+
+    Yields:
+        Tuple[str, Future]: (ticker, future of its job) in input order
+    """
+    start = time.perf_counter()
+    finished = [start] * len(schedule.workers)
+    futures = {ticker: Future() for plan in schedule.workers for ticker in plan}
+    executors = [None] * len(schedule.workers)
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def supervise(worker, plan):
+        remaining = list(plan)
+        while remaining:
+            with lock:
+                if stopped.is_set():
+                    break
+                executor = ProcessPoolExecutor(max_workers=1, initializer=initializer, initargs=initargs)
+                executors[worker] = executor
+                jobs = [(ticker, executor.submit(fn, *job_args[ticker])) for ticker in remaining]
+            remaining = []
+            for index, (ticker, job) in enumerate(jobs):
+                try:
+                    futures[ticker].set_result(job.result())
+                except BrokenProcessPool as e:
+                    # The process died running this ticker: the later ones never started
+                    futures[ticker].set_exception(e)
+                    remaining = [t for t, _ in jobs[index + 1:]]
+                    logger.warning(f"Worker process died on {ticker}; restarting it for "
+                                   f"{len(remaining)} remaining tickers")
+                    break
+                except CancelledError:
+                    break
+                except Exception as e:
+                    futures[ticker].set_exception(e)
+                finally:
+                    finished[worker] = time.perf_counter()
+            executor.shutdown(wait=True)
+        for ticker in plan:
+            futures[ticker].cancel()  # no-op for completed futures
+
+    supervisors = [threading.Thread(target=supervise, args=(worker, plan), daemon=True)
+                   for worker, plan in enumerate(schedule.workers)]
+    for supervisor in supervisors:
+        supervisor.start()
+    try:
+        for ticker in schedule.tickers:
+            yield ticker, futures[ticker]
+    finally:
+        with lock:
+            stopped.set()
+            running = [executor for executor in executors if executor is not None]
+        for executor in running:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for supervisor in supervisors:
+            supervisor.join()
+
+    # Each worker is busy from the start until its last job finishes
+    schedule.busy_seconds = [done - start for done in finished]
+    schedule.wall_seconds = max(schedule.busy_seconds)
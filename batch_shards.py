@@ -0,0 +1,190 @@
+"""
+Sharded batch execution across hosts.
+
+batch_backtest.py, vol_analysis.py -f (process_batch) and
+optimize_multiticker_thresholds.py accept --shard i/N: the run processes only
+the i-th of N ticker shards and, instead of the aggregate reports, writes its
+structured partial result:
+
+    {output_dir}/shards/{tool}_shard{i}of{N}.pkl
+
+Tickers are assigned longest-first to the least loaded shard, with the
+ticker's cache row count as its cost (batch_scheduler.estimate_ticker_cost()),
+so every shard gets a similar amount of data. The assignment depends only on
+the ticker list and the cache sizes: hosts running the shards of one run must
+share the same cache snapshot.
+
+--merge-shards DIR loads the N partial results of a run (copied into one
+directory), checks that they come from the same ticker list and options and
+cover every ticker exactly once, and rebuilds the aggregate reports exactly
+as a single-host run would: per-ticker results are merged in input order.
+"""
+
+import glob
+import os
+import pickle
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from batch_scheduler import estimate_ticker_cost
+from error_handler import DataValidationError, ErrorContext, FileOperationError, logger
+
+SHARD_FORMAT_VERSION = 1
+
+SHARD_DIRNAME = 'shards'
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard spec 'i/N' (1 <= i <= N).
+
+    Raises:
+        DataValidationError: If the spec is malformed or out of range
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', str(spec))
+    if not match:
+        raise DataValidationError(f"Invalid shard '{spec}': expected i/N, e.g. 2/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise DataValidationError(f"Invalid shard '{spec}': i must be between 1 and N")
+    return index, count
+
+
+def assign_shards(tickers: List[str], shard_count: int,
+                  costs: Optional[Dict[str, int]] = None) -> List[List[str]]:
+    """
+    Split tickers into shard_count deterministic, cost-balanced shards.
+
+    Args:
+        tickers: Ticker symbols of the whole run
+        shard_count: Number of shards (N)
+        costs: Cost per ticker (default: estimate_ticker_cost())
+
+    Returns:
+        List[List[str]]: Tickers of each shard, each in input order
+    """
+    if costs is None:
+        costs = {ticker: estimate_ticker_cost(ticker) for ticker in tickers}
+
+    loads = [0] * shard_count
+    shard_of = {}
+    # Longest first onto the least loaded shard; ties go to the lower symbol and shard
+    for ticker in sorted(tickers, key=lambda t: (-costs.get(t, 0), t)):
+        shard = min(range(shard_count), key=lambda s: (loads[s], s))
+        shard_of[ticker] = shard
+        loads[shard] += max(costs.get(ticker, 0), 1)
+
+    return [[t for t in tickers if shard_of[t] == shard] for shard in range(shard_count)]
+
+
+def select_shard(tickers: List[str], shard: Tuple[int, int]) -> List[str]:
+    """Tickers of shard (i, N) of a run, in input order."""
+    index, count = shard
+    selected = assign_shards(tickers, count)[index - 1]
+    logger.info(f"Shard {index}/{count}: {len(selected)} of {len(tickers)} tickers")
+    return selected
+
+
+def get_shard_path(output_dir: str, tool: str, shard: Tuple[int, int]) -> str:
+    """Path of a shard's partial result."""
+    return os.path.join(output_dir, SHARD_DIRNAME, f"{tool}_shard{shard[0]}of{shard[1]}.pkl")
+
+
+def write_shard_result(output_dir: str, tool: str, shard: Tuple[int, int], tickers: List[str],
+                       assigned: List[str], options: Dict[str, Any], payload: Dict[str, Any]) -> str:
+    """
+    Save a shard's structured partial result.
+
+    Args:
+        output_dir: Run output directory (the file goes to its shards/ subdirectory)
+        tool: Entry point name ('batch_backtest', 'batch_processor', ...)
+        shard: (i, N)
+        tickers: Ticker symbols of the whole run, in input order
+        assigned: Tickers this shard processed (select_shard())
+        options: Run options the aggregate reports depend on
+        payload: The tool's per-ticker results for this shard
+
+    Returns:
+        str: Path of the partial result
+    """
+    path = get_shard_path(output_dir, tool, shard)
+    with ErrorContext("writing shard result", tool=tool, shard=f"{shard[0]}/{shard[1]}"):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        except OSError as e:
+            raise FileOperationError(f"Failed to create shard directory for {path}: {e}")
+
+        record = {
+            'version': SHARD_FORMAT_VERSION,
+            'tool': tool,
+            'shard': list(shard),
+            'tickers': list(tickers),
+            'assigned': list(assigned),
+            'options': options,
+            'payload': payload,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(record, f)
+        os.replace(tmp_path, path)
+    return path
+
+
+def load_shard_results(shard_dir: str, tool: str) -> Tuple[List[str], Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Load and check the partial results of all shards of a run.
+
+    Args:
+        shard_dir: Directory holding the shard files (or a run output
+            directory with a shards/ subdirectory)
+        tool: Entry point name the shards were written by
+
+    Returns:
+        Tuple: (tickers of the run in input order, run options, payloads in shard order)
+
+    Raises:
+        DataValidationError: If shards are missing, duplicated, from different
+            runs, or do not cover every ticker exactly once
+    """
+    with ErrorContext("loading shard results", shard_dir=shard_dir, tool=tool):
+        if os.path.isdir(os.path.join(shard_dir, SHARD_DIRNAME)):
+            shard_dir = os.path.join(shard_dir, SHARD_DIRNAME)
+        paths = sorted(glob.glob(os.path.join(shard_dir, f"{tool}_shard*of*.pkl")))
+        if not paths:
+            raise DataValidationError(f"No {tool} shard results found in {shard_dir}")
+
+        records = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                record = pickle.load(f)
+            if record.get('version') != SHARD_FORMAT_VERSION or record.get('tool') != tool:
+                raise DataValidationError(f"{path} is not a {tool} shard result (format {SHARD_FORMAT_VERSION})")
+            records.append(record)
+
+        first = records[0]
+        count = first['shard'][1]
+        for record in records[1:]:
+            if record['shard'][1] != count or record['tickers'] != first['tickers'] \
+                    or record['options'] != first['options']:
+                raise DataValidationError(
+                    f"Shard {record['shard'][0]}/{record['shard'][1]} belongs to a different run "
+                    f"than shard {first['shard'][0]}/{count} (ticker list or options differ)")
+
+        indices = sorted(record['shard'][0] for record in records)
+        if indices != list(range(1, count + 1)):
+            missing = sorted(set(range(1, count + 1)) - set(indices))
+            raise DataValidationError(f"Expected shards 1..{count} exactly once; missing {missing}, found {indices}")
+
+        records.sort(key=lambda record: record['shard'][0])
+        assigned = [ticker for record in records for ticker in record['assigned']]
+        if sorted(assigned) != sorted(first['tickers']):
+            missing = sorted(set(first['tickers']) - set(assigned))
+            duplicated = sorted({t for t in assigned if assigned.count(t) > 1})
+            raise DataValidationError(
+                f"Shards do not cover each ticker exactly once (missing: {missing}, duplicated: {duplicated}); "
+                f"were they run against different cache snapshots?")
+
+    logger.info(f"Merging {count} {tool} shards covering {len(first['tickers'])} tickers")
+    return first['tickers'], first['options'], [record['payload'] for record in records]
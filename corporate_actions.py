@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Local corporate action store and read-time price adjustment.
+
+Massive.com flat files are unadjusted, while yfinance data is cached with
+auto_adjust=True. Instead of re-downloading history after every split, split
+and dividend events are stored per ticker:
+
+    data_cache/corporate_actions/{TICKER}.json
+
+and applied to cached bars at READ time as cumulative adjustment factors
+(vectorized searchsorted + reverse cumulative product). Cached bars on disk are
+never rewritten, so one split never requires re-ingesting history.
+
+Adjustment follows the yfinance auto_adjust convention:
+- Split with ratio r (new shares per old share) on ex-date d: every bar before
+  d has prices divided by r and volume multiplied by r.
+- Cash dividend D on ex-date d: every bar before d has prices multiplied by
+  (1 - D / Close[d-1]) using the raw close of the prior bar. Volume unchanged.
+
+A cache whose adjusted history had raw bars appended (populate_cache_bulk.py
+filling a yfinance cache) records the last adjusted bar as "adjusted_through"
+in its metadata. Events on or before that date are already reflected in the
+older bars and do not affect the raw ones after it, so only later events are
+applied.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from error_handler import (
+    ErrorContext, DataValidationError, FileOperationError,
+    validate_ticker, logger
+)
+
+# Cache data sources that hold unadjusted prices and must be adjusted on read
+RAW_DATA_SOURCES = {'massive', 'massive_flatfile'}
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+ACTION_TYPES = ('split', 'dividend')
+
+
+def get_actions_directory() -> Path:
+    """Get or create the corporate actions directory."""
+    with ErrorContext("creating corporate actions directory"):
+        actions_dir = Path.cwd() / 'data_cache' / 'corporate_actions'
+        if not actions_dir.exists():
+            try:
+                actions_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise FileOperationError(f"Failed to create corporate actions directory {actions_dir}: {e}")
+        return actions_dir
+
+
+def get_actions_filepath(ticker: str) -> Path:
+    """Get the corporate actions file path for a ticker."""
+    validate_ticker(ticker)
+    return get_actions_directory() / f"{ticker.upper()}.json"
+
+
+def load_actions(ticker: str) -> List[Dict]:
+    """
+    Load stored corporate actions for a ticker, sorted by ex-date.
+
+    Args:
+        ticker (str): Stock symbol
+
+    Returns:
+        List[Dict]: Actions like {'date': 'YYYY-MM-DD', 'type': 'split', 'value': 4.0}
+    """
+    with ErrorContext("loading corporate actions", ticker=ticker):
+        filepath = get_actions_filepath(ticker)
+        if not filepath.exists():
+            return []
+        try:
+            with open(filepath, 'r') as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Error reading corporate actions for {ticker}: {e}")
+            return []
+        return sorted(payload.get('actions', []), key=lambda a: (a['date'], a['type']))
+
+
+def save_actions(ticker: str, actions: List[Dict], source: str = "manual") -> None:
+    """
+    Persist corporate actions for a ticker (deduplicated on date + type).
+
+    Args:
+        ticker (str): Stock symbol
+        actions (List[Dict]): Actions to store
+        source (str): Where the actions came from (recorded in the file)
+    """
+    with ErrorContext("saving corporate actions", ticker=ticker):
+        unique = {}
+        for action in actions:
+            if action['type'] not in ACTION_TYPES:
+                raise DataValidationError(f"Unknown corporate action type: {action['type']}")
+            date = pd.Timestamp(action['date']).strftime('%Y-%m-%d')
+            unique[(date, action['type'])] = {'date': date, 'type': action['type'],
+                                              'value': float(action['value'])}
+
+        payload = {
+            'ticker': ticker.upper(),
+            'updated': datetime.now().isoformat(),
+            'source': source,
+            'actions': sorted(unique.values(), key=lambda a: (a['date'], a['type'])),
+        }
+        filepath = get_actions_filepath(ticker)
+        tmp_path = filepath.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, filepath)
+        logger.info(f"Saved {len(payload['actions'])} corporate actions for {ticker}")
+
+
+def add_action(ticker: str, date, action_type: str, value: float) -> None:
+    """
+    Record a single split or dividend.
+
+    Args:
+        ticker (str): Stock symbol
+        date: Ex-date
+        action_type (str): 'split' or 'dividend'
+        value (float): Split ratio (new/old shares) or cash dividend per share
+
+    Raises:
+        DataValidationError: If the value is not positive
+    """
+    if value <= 0:
+        raise DataValidationError(f"Corporate action value must be positive (got {value})")
+    actions = load_actions(ticker)
+    actions.append({'date': date, 'type': action_type, 'value': value})
+    save_actions(ticker, actions)
+
+
+def get_actions_fingerprint(ticker: str) -> Optional[str]:
+    """Identify the stored actions for memo keys (None when no actions exist)."""
+    filepath = Path.cwd() / 'data_cache' / 'corporate_actions' / f"{ticker.upper()}.json"
+    if not filepath.exists():
+        return None
+    stat = filepath.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def calculate_adjustment_factors(index: pd.DatetimeIndex, close: np.ndarray,
+                                 actions: List[Dict], include_dividends: bool = True):
+    """
+    Compute cumulative price and volume factors for each bar.
+
+    Each event contributes a factor to every bar strictly before its ex-date.
+    Bars are mapped to "first event after this bar" with one searchsorted call
+    and read the reverse cumulative product of event factors from there.
+
+    Args:
+        index (pd.DatetimeIndex): Sorted bar timestamps
+        close (np.ndarray): Raw close prices aligned with index
+        actions (List[Dict]): Stored corporate actions
+        include_dividends (bool): Apply dividend factors as well as splits
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (price_factor, volume_factor) per bar
+    """
+    n_bars = len(index)
+    if n_bars == 0 or not actions:
+        return np.ones(n_bars), np.ones(n_bars)
+
+    bar_days = index.normalize().values
+    event_days = []
+    price_factors = []
+    volume_factors = []
+
+    for action in actions:
+        ex_day = np.datetime64(pd.Timestamp(action['date']).normalize())
+        if action['type'] == 'split':
+            event_days.append(ex_day)
+            price_factors.append(1.0 / action['value'])
+            volume_factors.append(action['value'])
+        elif include_dividends:
+            prev_pos = np.searchsorted(bar_days, ex_day, side='left') - 1
+            if prev_pos < 0 or not np.isfinite(close[prev_pos]) or close[prev_pos] <= 0:
+                continue
+            event_days.append(ex_day)
+            price_factors.append(1.0 - action['value'] / close[prev_pos])
+            volume_factors.append(1.0)
+
+    if not event_days:
+        return np.ones(n_bars), np.ones(n_bars)
+
+    order = np.argsort(event_days, kind='stable')
+    event_days = np.asarray(event_days)[order]
+    price_factors = np.asarray(price_factors)[order]
+    volume_factors = np.asarray(volume_factors)[order]
+
+    # suffix[k] = product of factors for events k..end; suffix[len] = 1
+    price_suffix = np.append(np.cumprod(price_factors[::-1])[::-1], 1.0)
+    volume_suffix = np.append(np.cumprod(volume_factors[::-1])[::-1], 1.0)
+
+    # First event whose ex-date is after the bar's day
+    first_event = np.searchsorted(event_days, bar_days, side='right')
+    return price_suffix[first_event], volume_suffix[first_event]
+
+
+def apply_adjustments(df: pd.DataFrame, ticker: str, include_dividends: bool = True,
+                      actions: Optional[List[Dict]] = None, adjusted_through=None) -> pd.DataFrame:
+    """
+    Return a split/dividend adjusted copy of raw OHLCV bars.
+
+    Args:
+        df (pd.DataFrame): Raw OHLCV bars (not modified)
+        ticker (str): Stock symbol
+        include_dividends (bool): Apply dividend factors as well as splits
+        actions (List[Dict], optional): Actions to apply (defaults to the stored ones)
+        adjusted_through (optional): Last bar date already adjusted at the source;
+            actions on or before it are skipped
+
+    Returns:
+        pd.DataFrame: Adjusted copy (or the input unchanged if there are no actions)
+    """
+    if actions is None:
+        actions = load_actions(ticker)
+    if adjusted_through is not None:
+        boundary = pd.Timestamp(adjusted_through).normalize()
+        actions = [a for a in actions if pd.Timestamp(a['date']).normalize() > boundary]
+    if not actions or df.empty:
+        return df
+
+    price_factor, volume_factor = calculate_adjustment_factors(
+        df.index, df['Close'].to_numpy(dtype=float), actions, include_dividends
+    )
+
+    adjusted = df.copy()
+    for col in PRICE_COLUMNS:
+        if col in adjusted.columns:
+            adjusted[col] = adjusted[col].to_numpy(dtype=float) * price_factor
+    if 'Volume' in adjusted.columns:
+        adjusted['Volume'] = np.round(adjusted['Volume'].to_numpy(dtype=float) * volume_factor).astype('int64')
+
+    logger.info(f"Applied {len(actions)} corporate actions to {ticker} at read time")
+    return adjusted
+
+
+def needs_adjustment(data_source: Optional[str]) -> bool:
+    """Return True if bars from this cache data source are unadjusted."""
+    return (data_source or '').lower() in RAW_DATA_SOURCES
+
+
+def refresh_actions_from_yfinance(ticker: str) -> int:
+    """
+    Refresh stored actions from yfinance splits/dividends.
+
+    yfinance reports dividends in today's (split-adjusted) share terms; they are
+    converted back to the share count on each ex-date so factors can be
+    computed against raw closes.
+
+    Args:
+        ticker (str): Stock symbol
+
+    Returns:
+        int: Number of actions stored
+    """
+    with ErrorContext("refreshing corporate actions", ticker=ticker):
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        splits = stock.splits
+        dividends = stock.dividends
+
+        actions = []
+        split_days = []
+        split_ratios = []
+        for date, ratio in (splits.items() if splits is not None else []):
+            if ratio and ratio > 0:
+                day = pd.Timestamp(date).tz_localize(None).normalize()
+                actions.append({'date': day, 'type': 'split', 'value': float(ratio)})
+                split_days.append(day)
+                split_ratios.append(float(ratio))
+
+        for date, amount in (dividends.items() if dividends is not None else []):
+            if amount and amount > 0:
+                day = pd.Timestamp(date).tz_localize(None).normalize()
+                later_splits = np.prod([r for d, r in zip(split_days, split_ratios) if d > day])
+                actions.append({'date': day, 'type': 'dividend', 'value': float(amount) * float(later_splits)})
+
+        save_actions(ticker, actions, source="yfinance")
+        return len(actions)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Manage locally stored split/dividend adjustments',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Show stored actions
+  python corporate_actions.py NVDA --list
+
+  # Record a 10-for-1 split (no re-download needed)
+  python corporate_actions.py NVDA --split 2024-06-10 10
+
+  # Record a cash dividend
+  python corporate_actions.py AAPL --dividend 2024-08-12 0.25
+
+  # Refresh all actions from yfinance for tickers in a file
+  python corporate_actions.py --file stocks.txt --refresh
+        """
+    )
+    parser.add_argument('ticker', nargs='?', help='Stock symbol')
+    parser.add_argument('-f', '--file', help='Ticker file (one per line) for --refresh')
+    parser.add_argument('--list', action='store_true', help='List stored actions')
+    parser.add_argument('--split', nargs=2, metavar=('DATE', 'RATIO'), help='Record a split')
+    parser.add_argument('--dividend', nargs=2, metavar=('DATE', 'AMOUNT'), help='Record a cash dividend')
+    parser.add_argument('--refresh', action='store_true', help='Refresh actions from yfinance')
+
+    args = parser.parse_args()
+
+    if args.file:
+        from data_manager import read_ticker_file
+        tickers = read_ticker_file(args.file)
+    elif args.ticker:
+        tickers = [args.ticker.upper()]
+    else:
+        parser.error("Provide a ticker or --file")
+
+    for ticker in tickers:
+        if args.split:
+            add_action(ticker, args.split[0], 'split', float(args.split[1]))
+            print(f"✅ {ticker}: recorded {args.split[1]}:1 split on {args.split[0]}")
+        if args.dividend:
+            add_action(ticker, args.dividend[0], 'dividend', float(args.dividend[1]))
+            print(f"✅ {ticker}: recorded ${args.dividend[1]} dividend on {args.dividend[0]}")
+        if args.refresh:
+            try:
+                count = refresh_actions_from_yfinance(ticker)
+                print(f"✅ {ticker}: {count} actions refreshed")
+            except Exception as e:
+                print(f"❌ {ticker}: refresh failed - {e}")
+        if args.list or not (args.split or args.dividend or args.refresh):
+            actions = load_actions(ticker)
+            print(f"\n📋 {ticker}: {len(actions)} corporate actions")
+            for action in actions:
+                print(f"  {action['date']}  {action['type']:<9s} {action['value']:g}")
+
+
+if __name__ == "__main__":
+    main()
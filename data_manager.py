@@ -2,7 +2,8 @@
 Data management module for stock data retrieval and caching.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
+import io
 import pandas as pd
 import numpy as np
 import os
@@ -22,6 +23,13 @@ from schema_manager import schema_manager
 # Configure logging for this module
 setup_logging()
 
+# Calendar days covered by each normalized period
+PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 30, '2mo': 60, '3mo': 90, '6mo': 180, 
+    '12mo': 365, '24mo': 730, '36mo': 1095, '60mo': 1825, '120mo': 3650, 
+    'ytd': 365, 'max': 7300
+}
+
 def get_cache_directory() -> Path:
     """Get or create the data cache directory."""
     with ErrorContext("creating cache directory"):
@@ -128,19 +136,180 @@ def load_cached_data(ticker: str, interval: str = "1d") -> Optional[pd.DataFrame
         
         return _load_cache()
 
-def save_to_cache(ticker: str, df: pd.DataFrame, interval: str = "1d", auto_adjust: bool = True) -> None:
+def _cache_line_start(f, pos: int, data_start: int) -> int:
+    """Byte offset of the first cache line starting at or after pos."""
+    if pos <= data_start:
+        return data_start
+    f.seek(pos - 1)
+    f.readline()
+    return f.tell()
+
+def _cache_line_time(f, offset: int) -> Optional[pd.Timestamp]:
+    """Index timestamp of the cache line at offset (None at end of file)."""
+    f.seek(offset)
+    line = f.readline()
+    if not line.strip():
+        return None
+    timestamp = pd.Timestamp(line.split(b',', 1)[0].decode())
+    return timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+
+def _find_cache_offset(f, target: pd.Timestamp, data_start: int, file_size: int,
+                       after: bool = False) -> int:
+    """
+    Bisect the sorted cache rows for the first line at (or after) target.
+    
+    Args:
+        f: Cache file opened in binary mode
+        target (pd.Timestamp): Timestamp to search for
+        data_start (int): Byte offset of the first data row
+        file_size (int): Size of the cache file in bytes
+        after (bool): Find the first line strictly after target instead
+        
+    Returns:
+        int: Byte offset of the line (file_size when no line qualifies)
+    """
+    lo, hi = data_start, file_size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        timestamp = _cache_line_time(f, _cache_line_start(f, mid, data_start))
+        if timestamp is None or (timestamp > target if after else timestamp >= target):
+            hi = mid
+        else:
+            lo = mid + 1
+    return _cache_line_start(f, lo, data_start)
+
+def _step_back_lines(f, offset: int, n_lines: int, data_start: int) -> int:
+    """Byte offset of the line n_lines rows before the line at offset."""
+    pos = offset
+    block = 64 * 1024
+    while n_lines > 0 and pos > data_start:
+        read_from = max(data_start, pos - block)
+        f.seek(read_from)
+        chunk = f.read(pos - read_from)
+        # The chunk ends with the newline that terminates the line before pos
+        end = len(chunk) - 1
+        newline = chunk.rfind(b'\n', 0, end)
+        if newline < 0 and read_from > data_start:
+            block *= 2  # line longer than the block
+            continue
+        while n_lines > 0 and newline >= 0:
+            pos = read_from + newline + 1
+            n_lines -= 1
+            newline = chunk.rfind(b'\n', 0, newline)
+        if n_lines > 0 and read_from == data_start:
+            pos = data_start
+            n_lines -= 1
+    return pos
+
+def load_cached_range(ticker: str, start_date: Optional[Union[str, datetime]], end_date: Optional[Union[str, datetime]] = None,
+                      interval: str = "1d", warmup_bars: int = 0) -> Optional[pd.DataFrame]:
+    """
+    Read only the cached rows of a date range (plus leading warmup rows).
+    
+    Cache rows are sorted by date, so the range is located by bisecting byte
+    offsets of the file and only those rows are parsed; cost grows with the
+    range, not with the length of the cached history. The full-file checksum
+    cannot be verified on a partial read; instead the first and last rows must
+    match the start/end dates recorded in the metadata header (catches
+    truncated or partially rewritten files). Legacy files and files failing
+    that check go through load_cached_data() (migration / corruption handling).
+    
+    Args:
+        ticker (str): Stock symbol
+        start_date (str or datetime, optional): First bar of the range (inclusive; None: cache start)
+        end_date (str or datetime, optional): Last bar of the range (inclusive; default: cache end)
+        interval (str): Data interval ('1d', '1h', '30m', etc.)
+        warmup_bars (int): Rows to include before start_date, when cached
+        
+    Returns:
+        Optional[pd.DataFrame]: Rows in range (may be empty), or None if no valid cache
+    """
+    with ErrorContext("loading cached range", ticker=ticker, start_date=start_date, end_date=end_date, interval=interval):
+        validate_ticker(ticker)
+        cache_file = get_cache_filepath(ticker, interval)
+        
+        if not os.path.exists(cache_file):
+            return None
+        
+        start = normalize_datetime(pd.Timestamp(start_date)) if start_date is not None else None
+        end = normalize_datetime(pd.Timestamp(end_date)) if end_date is not None else None
+        
+        def _slice_loaded() -> Optional[pd.DataFrame]:
+            df = load_cached_data(ticker, interval)
+            if df is None:
+                return None
+            first = max(0, int(df.index.searchsorted(start, side='left')) - warmup_bars) if start is not None else 0
+            last = int(df.index.searchsorted(end, side='right')) if end is not None else len(df)
+            return df.iloc[first:last]
+        
+        metadata = schema_manager.read_metadata_from_csv(cache_file)
+        if (not metadata or schema_manager.needs_migration(metadata)
+                or not schema_manager.is_valid_schema_version(metadata.get("schema_version"))
+                or not metadata.get("start_date") or not metadata.get("end_date")):
+            return _slice_loaded()
+        
+        file_size = os.path.getsize(cache_file)
+        with open(cache_file, 'rb') as f:
+            header = f.readline()
+            while header.startswith(b'#'):
+                header = f.readline()
+            data_start = f.tell()
+            
+            # Partial reads skip the checksum: check the file still spans its metadata
+            f.seek(max(data_start, file_size - 1))
+            complete = file_size > data_start and f.read(1) == b'\n'
+            if complete:
+                last_line = _step_back_lines(f, file_size, 1, data_start)
+                complete = (_cache_line_time(f, data_start) == pd.Timestamp(metadata["start_date"])
+                            and _cache_line_time(f, last_line) == pd.Timestamp(metadata["end_date"]))
+            if not complete:
+                logger.warning(f"Cache file for {ticker} ({interval}) does not match its metadata - full validation")
+                return _slice_loaded()
+            
+            first = _find_cache_offset(f, start, data_start, file_size) if start is not None else data_start
+            if warmup_bars > 0:
+                first = _step_back_lines(f, first, warmup_bars, data_start)
+            last = _find_cache_offset(f, end, data_start, file_size, after=True) if end is not None else file_size
+            f.seek(first)
+            rows = f.read(max(0, last - first))
+        
+        df = pd.read_csv(io.BytesIO(header + rows), index_col=0, parse_dates=True)
+        if df.empty:
+            return df
+        validate_dataframe(df, schema_manager.schema_definitions[schema_manager.current_version]["required_columns"])
+        if df.index.tzinfo is not None:
+            df.index = df.index.tz_localize(None)
+        
+        logger.info(f"Loaded cached range for {ticker} ({interval}): {len(df)} periods "
+                    f"from {df.index[0].date()} to {df.index[-1].date()}")
+        return df
+
+def save_to_cache(ticker: str, df: pd.DataFrame, interval: str = "1d", auto_adjust: bool = True,
+                  data_source: str = "yfinance", adjusted_through: Optional[str] = None) -> None:
     """
     Save DataFrame to cache with schema versioning and metadata headers.
     
     Args:
         ticker (str): Stock symbol
         df (pd.DataFrame): Data to cache
-        interval (str): Data interval ('1d', '1h', '30m', etc.)
+        interval (str): Data interval ('1d', '1h', '30m', etc.); 1-minute bars
+            are written to the day-partitioned intraday store (intraday_store.py)
         auto_adjust (bool): Whether auto-adjust was used in the download
+        data_source (str): Provider recorded in the metadata (raw sources are adjusted on read)
+        adjusted_through (str, optional): Last bar of an adjusted history that raw
+            bars were appended to (see corporate_actions.py)
     """
     with ErrorContext("saving data to cache", ticker=ticker, interval=interval):
         validate_ticker(ticker)
         validate_dataframe(df, schema_manager.schema_definitions[schema_manager.current_version]["required_columns"])
+        
+        from intraday_store import BASE_INTERVAL, save_intraday_bars
+        if interval == BASE_INTERVAL:
+            # Base-interval bars live in the intraday store, where every other
+            # intraday interval is derived from them
+            save_intraday_bars(ticker, df, interval=interval, data_source=data_source)
+            return
+        
         cache_file = get_cache_filepath(ticker, interval)
         
         def _save_cache():
@@ -153,7 +322,8 @@ def save_to_cache(ticker: str, df: pd.DataFrame, interval: str = "1d", auto_adju
                 df=standardized_df,
                 interval=interval,
                 auto_adjust=auto_adjust,
-                data_source="yfinance"
+                data_source=data_source,
+                adjusted_through=adjusted_through
             )
             
             # Write file with metadata header
@@ -201,8 +371,14 @@ def append_to_cache(ticker: str, new_data: pd.DataFrame, interval: str = "1d") -
                 combined_df = combined_df[~combined_df.index.duplicated(keep='last')]
                 combined_df.sort_index(inplace=True)
                 
-                # Save the combined data with updated metadata
-                save_to_cache(ticker, combined_df, interval)
+                # Save the combined data with updated metadata, keeping the
+                # provider (raw sources are adjusted on read), adjust flag and
+                # raw/adjusted boundary
+                metadata = schema_manager.read_metadata_from_csv(cache_file) or {}
+                save_to_cache(ticker, combined_df, interval,
+                              auto_adjust=metadata.get('auto_adjust', True),
+                              data_source=metadata.get('data_source', 'yfinance'),
+                              adjusted_through=metadata.get('adjusted_through'))
                 logger.info(f"Appended {len(new_data)} new periods to {ticker} ({interval}) cache with schema update")
             else:
                 # No existing cache, just save new data
@@ -243,6 +419,31 @@ def normalize_period(period: str) -> str:
         logger.debug(f"Period normalized: {period} → {normalized}")
         return normalized
 
+def get_period_start(period: str) -> datetime:
+    """
+    Earliest bar time included in a period (periods are cut relative to now).
+    
+    Args:
+        period (str): Requested period (e.g., '3mo', '12mo')
+        
+    Returns:
+        datetime: Cutoff; bars at or after it belong to the period
+    """
+    return datetime.now() - timedelta(days=PERIOD_DAYS.get(normalize_period(period), 365))
+
+def _apply_corporate_actions(ticker: str, df: pd.DataFrame, data_source: Optional[str],
+                             adjusted_through: Optional[str] = None) -> pd.DataFrame:
+    """
+    Adjust unadjusted (raw-source) bars for stored splits/dividends at read time.
+    
+    Cached files are never modified; see corporate_actions.py. Actions on or
+    before adjusted_through are already reflected in the cache.
+    """
+    from corporate_actions import needs_adjustment, apply_adjustments
+    if not needs_adjustment(data_source):
+        return df
+    return apply_adjustments(df, ticker, adjusted_through=adjusted_through)
+
 def get_smart_data(ticker: str, period: str, interval: str = "1d", force_refresh: bool = False, data_source: str = "yfinance") -> pd.DataFrame:
     """
     Cache-only data fetching with clear error messages when data is missing.
@@ -289,9 +490,9 @@ def get_smart_data(ticker: str, period: str, interval: str = "1d", force_refresh
                 logger.info(f"Using Massive.com as data source for {ticker}")
                 df = get_massive_daily_data(ticker, period)
                 if not df.empty:
-                    # Save to cache with same format as yfinance
-                    save_to_cache(ticker, df, interval)
-                    return df
+                    # Save raw (unadjusted) bars; adjustments are applied on read
+                    save_to_cache(ticker, df, interval, auto_adjust=False, data_source="massive")
+                    return _apply_corporate_actions(ticker, df, "massive")
                 else:
                     raise DataValidationError(f"No data available from Massive.com for {ticker}")
             except Exception as e:
@@ -301,6 +502,45 @@ def get_smart_data(ticker: str, period: str, interval: str = "1d", force_refresh
     # Normalize the period first
     period = normalize_period(period)
     
+    # Intraday intervals are derived from the single base-interval store when it
+    # has been populated; legacy per-interval CSVs remain a fallback.
+    if interval != "1d":
+        from intraday_store import get_resampled_data, get_store_data_source, get_store_end_date
+        store_end = get_store_end_date(ticker)
+        if store_end is not None:
+            cutoff_date = get_period_start(period)
+            legacy_metadata = None
+            legacy_file = get_cache_filepath(ticker, interval)
+            if os.path.exists(legacy_file):
+                legacy_metadata = schema_manager.read_metadata_from_csv(legacy_file)
+            legacy_end = pd.Timestamp(legacy_metadata['end_date']) if legacy_metadata and legacy_metadata.get('end_date') else None
+            
+            # Serve from the store unless it has nothing in the period or a
+            # legacy per-interval cache holds newer bars
+            if store_end < cutoff_date:
+                if legacy_end is None:
+                    raise DataValidationError(
+                        f"\n{'='*70}\n"
+                        f"ERROR: Stale intraday data for {ticker}\n"
+                        f"{'='*70}\n"
+                        f"Requested: {period} of {interval} data (from {cutoff_date.date()})\n"
+                        f"Intraday store ends: {store_end}\n"
+                        f"Store location: data_cache/intraday/{ticker.upper()}/\n\n"
+                        f"To fix this, refresh the intraday store:\n"
+                        f"  echo \"{ticker}\" > intraday.txt\n"
+                        f"  python populate_intraday_bulk.py --file intraday.txt --start {cutoff_date.date()}\n"
+                        f"{'='*70}"
+                    )
+                logger.warning(f"Intraday store for {ticker} ends {store_end} (before the {period} period starts)")
+            elif legacy_end is not None and legacy_end > store_end:
+                logger.warning(f"Intraday store for {ticker} ends {store_end}; "
+                               f"using the newer {interval} cache (ends {legacy_end})")
+            else:
+                df = get_resampled_data(ticker, interval, start=cutoff_date.date())
+                logger.info(f"Retrieved {len(df)} {interval} periods for {ticker} ({period}) from intraday store "
+                            f"(through {store_end})")
+                return _apply_corporate_actions(ticker, df, get_store_data_source(ticker))
+    
     # Try to load cached data
     cached_df = load_cached_data(ticker, interval)
     
@@ -323,13 +563,8 @@ def get_smart_data(ticker: str, period: str, interval: str = "1d", force_refresh
         )
     
     # Calculate requested date range
-    period_days = {
-        '1d': 1, '5d': 5, '1mo': 30, '3mo': 90, '6mo': 180, 
-        '12mo': 365, '24mo': 730, '36mo': 1095, '60mo': 1825, '120mo': 3650, 
-        'ytd': 365, 'max': 7300
-    }
-    requested_days = period_days.get(period, 365)
-    cutoff_date = datetime.now() - timedelta(days=requested_days)
+    requested_days = PERIOD_DAYS.get(period, 365)
+    cutoff_date = get_period_start(period)
     
     # Check if cached data covers the requested period
     cache_start_date = cached_df.index[0]
@@ -358,12 +593,90 @@ def get_smart_data(ticker: str, period: str, interval: str = "1d", force_refresh
         )
     
     logger.info(f"Retrieved {len(filtered_df)} periods from cache for {ticker} ({period}) - using cache-only mode")
-    return filtered_df
+    metadata = schema_manager.read_metadata_from_csv(get_cache_filepath(ticker, interval))
+    metadata = metadata or {}
+    return _apply_corporate_actions(ticker, filtered_df, metadata.get('data_source'), metadata.get('adjusted_through'))
+
+def get_range_data(ticker: str, start_date: Optional[Union[str, datetime]], end_date: Optional[Union[str, datetime]] = None,
+                   warmup_bars: int = 0, interval: str = "1d") -> pd.DataFrame:
+    """
+    Cache-only data for an explicit date range, read with range seeks.
+    
+    Like get_smart_data() but bounded by dates instead of a period relative
+    to now: only the rows from warmup_bars before start_date through end_date
+    are read (see load_cached_range()), so short windows over long caches
+    stay cheap.
+    
+    Args:
+        ticker (str): Stock symbol
+        start_date (str or datetime, optional): First bar of the range (inclusive; None: cache start)
+        end_date (str or datetime, optional): Last bar of the range (inclusive; default: cache end)
+        warmup_bars (int): Extra bars before start_date for indicator warmup
+        interval (str): Data interval ('1d', '1h', '30m', etc.)
+        
+    Returns:
+        pd.DataFrame: Stock data with OHLCV columns from cache
+        
+    Raises:
+        DataValidationError: If cache is missing or has no bars in the range
+    """
+    with ErrorContext("range data retrieval", ticker=ticker, start_date=start_date, end_date=end_date, interval=interval):
+        validate_ticker(ticker)
+        cache_file = get_cache_filepath(ticker, interval)
+        metadata = schema_manager.read_metadata_from_csv(cache_file)
+        data_source = metadata.get('data_source') if metadata else None
+        
+        from corporate_actions import needs_adjustment
+        adjust = needs_adjustment(data_source)
+        
+        # Dividend factors depend on later bars: read through the cache end when adjusting
+        df = load_cached_range(ticker, start_date, None if adjust else end_date, interval, warmup_bars)
+        
+        first_date = normalize_datetime(pd.Timestamp(start_date)) if start_date is not None else None
+        months = max(1, (datetime.now() - first_date).days // 30 + 2) if first_date is not None else 36
+        if df is None:
+            raise DataValidationError(
+                f"\n{'='*70}\n"
+                f"ERROR: No cache data found for {ticker}\n"
+                f"{'='*70}\n"
+                f"Requested: {interval} data from {start_date or 'cache start'} to {end_date or 'cache end'}\n"
+                f"Cache location: data_cache/{ticker}_{interval}_data.csv\n\n"
+                f"To fix this, populate the cache:\n"
+                f"  echo \"{ticker}\" > missing_data.txt\n"
+                f"  python populate_cache_bulk.py --file missing_data.txt --months {months}\n"
+                f"{'='*70}"
+            )
+        
+        if adjust:
+            df = _apply_corporate_actions(ticker, df, data_source, metadata.get('adjusted_through'))
+            if end_date is not None:
+                df = df[df.index <= normalize_datetime(pd.Timestamp(end_date))]
+        
+        if df.empty or (first_date is not None and df.index[-1] < first_date):
+            raise DataValidationError(
+                f"\n{'='*70}\n"
+                f"ERROR: Insufficient cache data for {ticker}\n"
+                f"{'='*70}\n"
+                f"Requested: {interval} data from {start_date or 'cache start'} to {end_date or 'cache end'}\n"
+                f"Cache contains no bars in that range\n"
+                f"Cache location: data_cache/{ticker}_{interval}_data.csv\n\n"
+                f"To fix this, populate more historical data:\n"
+                f"  echo \"{ticker}\" > extend_data.txt\n"
+                f"  python populate_cache_bulk.py --file extend_data.txt --months {months}\n"
+                f"{'='*70}"
+            )
+        
+        logger.info(f"Retrieved {len(df)} periods from cache for {ticker} "
+                    f"({df.index[0].date()} to {df.index[-1].date()}, {warmup_bars} warmup bars)")
+        return df
 
 def get_intraday_data(ticker: str, days: int = 5, interval: str = "1h", force_refresh: bool = False) -> pd.DataFrame:
     """
     Get intraday data for specific number of days.
     
+    Bars are derived from the base-interval intraday store (see intraday_store.py)
+    when it holds data for the ticker, otherwise from the legacy per-interval cache.
+    
     Args:
         ticker (str): Stock symbol
         days (int): Number of days to retrieve
@@ -390,6 +703,82 @@ def get_intraday_data(ticker: str, days: int = 5, interval: str = "1h", force_re
     
     return df
 
+# Memoized higher-timeframe bars: (ticker, interval, cache checksum, actions) -> DataFrame
+HIGHER_TIMEFRAME_INTERVALS = ('1wk', '1mo')
+_timeframe_memo: Dict[tuple, pd.DataFrame] = {}
+
+def get_cache_fingerprint(ticker: str, interval: str = "1d") -> Optional[str]:
+    """
+    Identify the current contents of a cache file without parsing the data.
+    
+    Uses the data_checksum from the metadata header, falling back to file
+    size/mtime for legacy files without metadata.
+    """
+    cache_file = get_cache_filepath(ticker, interval)
+    if not os.path.exists(cache_file):
+        return None
+    metadata = schema_manager.read_metadata_from_csv(cache_file)
+    if metadata and metadata.get('data_checksum'):
+        return metadata['data_checksum']
+    stat = os.stat(cache_file)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def get_timeframe_data(ticker: str, period: str, interval: str = "1wk") -> pd.DataFrame:
+    """
+    Get weekly or monthly bars derived from the daily cache.
+    
+    The full daily cache is resampled once with vectorized OHLCV aggregation and
+    memoized per cache checksum, so repeated higher-timeframe requests cost no
+    downloads and no re-aggregation until the cache changes. Bars are labelled
+    by the last trading day in each week/month (the date the bar completes).
+    
+    Args:
+        ticker (str): Stock symbol
+        period (str): Requested period (e.g., '36mo', '120mo')
+        interval (str): Higher timeframe interval ('1wk' or '1mo')
+        
+    Returns:
+        pd.DataFrame: Resampled OHLCV bars covering the requested period
+        
+    Raises:
+        DataValidationError: If the interval is unsupported or the cache is missing
+    """
+    with ErrorContext("deriving higher timeframe data", ticker=ticker, period=period, interval=interval):
+        validate_ticker(ticker)
+        if interval not in HIGHER_TIMEFRAME_INTERVALS:
+            raise DataValidationError(
+                f"Unsupported higher timeframe '{interval}'. Use one of: {', '.join(HIGHER_TIMEFRAME_INTERVALS)}"
+            )
+        
+        period = normalize_period(period)
+        from corporate_actions import get_actions_fingerprint
+        fingerprint = get_cache_fingerprint(ticker, "1d")
+        key = (ticker.upper(), interval, fingerprint, get_actions_fingerprint(ticker))
+        
+        resampled = _timeframe_memo.get(key) if fingerprint else None
+        if resampled is None:
+            # Full-history daily bars; 'max' keeps every cached row
+            daily = get_smart_data(ticker, "max", interval="1d")
+            
+            from intraday_store import resample_ohlcv
+            resampled = resample_ohlcv(daily, interval, label='end')
+            
+            # Drop stale entries for this ticker/interval before memoizing
+            for stale_key in [k for k in _timeframe_memo if k[:2] == key[:2]]:
+                del _timeframe_memo[stale_key]
+            _timeframe_memo[key] = resampled
+            logger.info(f"Resampled {len(daily)} daily bars to {len(resampled)} {interval} bars for {ticker}")
+        
+        cutoff_date = get_period_start(period)
+        filtered_df = resampled[resampled.index >= cutoff_date]
+        
+        if filtered_df.empty:
+            raise DataValidationError(
+                f"Insufficient cache data for {ticker}: no {interval} bars within {period}"
+            )
+        
+        return filtered_df.copy()
+
 def normalize_datetime(dt):
     """
     Ensure datetime object is timezone-naive.
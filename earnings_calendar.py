@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+On-disk earnings calendar store.
+
+check_earnings_window() used to call yf.Ticker(ticker).calendar for every
+ticker on every run, which dominated wall time and failed offline. Earnings
+dates are now kept per ticker in:
+
+    data_cache/earnings/{TICKER}.json
+
+Stored dates are reused until they are older than a TTL (default 7 days).
+The store holds exactly what the live lookup returned (the upcoming date from
+yf.Ticker(ticker).calendar); a refresh replaces it. In offline mode (set_offline_mode(True) or the
+VOL_ANALYSIS_OFFLINE=1 environment variable) no network calls are made and the
+stored dates are used regardless of age.
+
+Bulk refresh:
+    python earnings_calendar.py -f stocks.txt
+
+Historical dates (opt-in, behavior change): with include_history=True
+(--include-history) past dates from get_earnings_dates() are fetched too and
+merged with the stored history, so check_earnings_window() also masks past
+earnings windows in backtests. Off by default.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from error_handler import ErrorContext, FileOperationError, validate_ticker, logger
+
+DEFAULT_TTL_DAYS = 7
+
+# After a failed fetch, wait this long before hitting the network again
+FAILED_FETCH_RETRY_HOURS = 24
+
+_offline_mode = os.environ.get('VOL_ANALYSIS_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+def set_offline_mode(enabled: bool = True) -> None:
+    """Enable/disable offline mode (no earnings fetches, stored dates only)."""
+    global _offline_mode
+    _offline_mode = bool(enabled)
+
+
+def is_offline_mode() -> bool:
+    """Return True when earnings lookups must not touch the network."""
+    return _offline_mode
+
+
+def get_earnings_directory() -> Path:
+    """Get or create the earnings store directory."""
+    with ErrorContext("creating earnings directory"):
+        earnings_dir = Path.cwd() / 'data_cache' / 'earnings'
+        if not earnings_dir.exists():
+            try:
+                earnings_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise FileOperationError(f"Failed to create earnings directory {earnings_dir}: {e}")
+        return earnings_dir
+
+
+def get_earnings_filepath(ticker: str) -> Path:
+    """Get the earnings store file path for a ticker."""
+    validate_ticker(ticker)
+    return get_earnings_directory() / f"{ticker.upper()}.json"
+
+
+def get_earnings_fingerprint(ticker: str) -> Optional[str]:
+    """Identify the stored earnings record for memo keys (None when none exists)."""
+    filepath = Path.cwd() / 'data_cache' / 'earnings' / f"{ticker.upper()}.json"
+    if not filepath.exists():
+        return None
+    stat = filepath.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_earnings_record(ticker: str) -> Optional[Dict]:
+    """
+    Load the stored earnings record for a ticker.
+
+    Args:
+        ticker (str): Stock symbol
+
+    Returns:
+        Optional[Dict]: Record with 'dates', 'fetched' and 'last_attempt', or None
+    """
+    filepath = get_earnings_filepath(ticker)
+    if not filepath.exists():
+        return None
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Error reading earnings store for {ticker}: {e}")
+        return None
+
+
+def save_earnings_record(ticker: str, dates: List[pd.Timestamp], fetched: Optional[datetime],
+                         last_attempt: Optional[datetime] = None, source: str = "yfinance") -> None:
+    """
+    Persist earnings dates for a ticker.
+
+    Args:
+        ticker (str): Stock symbol
+        dates (List[pd.Timestamp]): Earnings dates
+        fetched (datetime, optional): Time of the last successful fetch
+        last_attempt (datetime, optional): Time of the last fetch attempt
+        source (str): Where the dates came from
+    """
+    unique_days = sorted({pd.Timestamp(d).strftime('%Y-%m-%d') for d in dates})
+    record = {
+        'ticker': ticker.upper(),
+        'source': source,
+        'fetched': fetched.isoformat() if fetched else None,
+        'last_attempt': (last_attempt or fetched or datetime.now()).isoformat(),
+        'dates': unique_days,
+    }
+    filepath = get_earnings_filepath(ticker)
+    tmp_path = filepath.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp_path, filepath)
+
+
+def _normalize_dates(raw_dates) -> List[pd.Timestamp]:
+    """Convert yfinance date containers to timezone-naive day Timestamps."""
+    if raw_dates is None:
+        return []
+    if isinstance(raw_dates, (pd.DatetimeIndex, list, tuple)):
+        values = list(raw_dates)
+    else:
+        values = [raw_dates]
+
+    days = []
+    for value in values:
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        days.append(ts.normalize())
+    return days
+
+
+def fetch_earnings_dates(ticker: str, include_history: bool = False) -> List[pd.Timestamp]:
+    """
+    Fetch the upcoming earnings date(s) from yfinance.
+
+    Args:
+        ticker (str): Stock symbol
+        include_history (bool): Also fetch past earnings dates (opt-in)
+
+    Returns:
+        List[pd.Timestamp]: Earnings days (may be empty)
+    """
+    import yfinance as yf
+
+    stock = yf.Ticker(ticker)
+    dates = []
+
+    if include_history:
+        try:
+            history = stock.get_earnings_dates(limit=40)
+            if history is not None and not history.empty:
+                dates.extend(_normalize_dates(history.index))
+        except Exception as e:
+            logger.debug(f"get_earnings_dates unavailable for {ticker}: {e}")
+
+    calendar = stock.calendar
+    if calendar is not None and 'Earnings Date' in calendar:
+        dates.extend(_normalize_dates(calendar['Earnings Date']))
+
+    return dates
+
+
+def _is_fresh(timestamp: Optional[str], max_age: timedelta) -> bool:
+    """Return True if an ISO timestamp is younger than max_age."""
+    if not timestamp:
+        return False
+    try:
+        return datetime.now() - datetime.fromisoformat(timestamp) < max_age
+    except ValueError:
+        return False
+
+
+def get_earnings_dates(ticker: str, ttl_days: int = DEFAULT_TTL_DAYS,
+                       offline: Optional[bool] = None, force_refresh: bool = False,
+                       include_history: bool = False) -> List[pd.Timestamp]:
+    """
+    Get earnings dates for a ticker from the store, refreshing when stale.
+
+    Args:
+        ticker (str): Stock symbol
+        ttl_days (int): Maximum age of stored dates before a refresh
+        offline (bool, optional): Override offline mode for this call
+        force_refresh (bool): Fetch even if stored dates are fresh
+        include_history (bool): Fetch past dates too and merge them with the
+            stored ones (default: store only what the live lookup returns)
+
+    Returns:
+        List[pd.Timestamp]: Earnings days (empty if none are known)
+    """
+    with ErrorContext("getting earnings dates", ticker=ticker):
+        offline = is_offline_mode() if offline is None else offline
+        record = load_earnings_record(ticker)
+        stored = [pd.Timestamp(d) for d in record.get('dates', [])] if record else []
+
+        if offline:
+            return stored
+
+        if record and not force_refresh:
+            if _is_fresh(record.get('fetched'), timedelta(days=ttl_days)):
+                return stored
+            if _is_fresh(record.get('last_attempt'), timedelta(hours=FAILED_FETCH_RETRY_HOURS)) \
+                    and record.get('last_attempt') != record.get('fetched'):
+                # Recent failed attempt - don't hammer the network
+                return stored
+
+        now = datetime.now()
+        try:
+            fetched = fetch_earnings_dates(ticker, include_history=include_history)
+        except Exception as e:
+            logger.warning(f"Could not fetch earnings for {ticker}: {e}")
+            save_earnings_record(ticker, stored,
+                                 fetched=datetime.fromisoformat(record['fetched']) if record and record.get('fetched') else None,
+                                 last_attempt=now)
+            return stored
+
+        dates = sorted(set(stored) | set(fetched)) if include_history else sorted(set(fetched))
+        save_earnings_record(ticker, dates, fetched=now, last_attempt=now)
+        logger.info(f"Refreshed earnings dates for {ticker}: {len(dates)} dates stored")
+        return dates
+
+
+def refresh_earnings_store(tickers: List[str], ttl_days: int = DEFAULT_TTL_DAYS,
+                           force: bool = False, include_history: bool = False) -> Dict[str, int]:
+    """
+    Bulk refresh the earnings store for a list of tickers.
+
+    Args:
+        tickers (List[str]): Symbols to refresh
+        ttl_days (int): Skip tickers refreshed within this many days (unless force)
+        force (bool): Refresh every ticker regardless of age
+        include_history (bool): Also fetch and keep past earnings dates
+
+    Returns:
+        Dict[str, int]: Counts of 'refreshed', 'fresh' and 'failed' tickers
+    """
+    counts = {'refreshed': 0, 'fresh': 0, 'failed': 0}
+    for i, ticker in enumerate(tickers, 1):
+        record = load_earnings_record(ticker)
+        if not force and record and _is_fresh(record.get('fetched'), timedelta(days=ttl_days)):
+            counts['fresh'] += 1
+            continue
+
+        dates = get_earnings_dates(ticker, ttl_days=ttl_days, offline=False, force_refresh=True,
+                                   include_history=include_history)
+        record = load_earnings_record(ticker)
+        if record and record.get('fetched') == record.get('last_attempt'):
+            counts['refreshed'] += 1
+            print(f"[{i:3d}/{len(tickers)}] {ticker:6s} ✓ {len(dates)} earnings dates")
+        else:
+            counts['failed'] += 1
+            print(f"[{i:3d}/{len(tickers)}] {ticker:6s} ✗ fetch failed (kept {len(dates)} stored dates)")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Refresh the local earnings-date store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Refresh stale entries for every ticker in a file
+  python earnings_calendar.py -f stocks.txt
+
+  # Force refresh regardless of age
+  python earnings_calendar.py -f stocks.txt --force
+
+  # Also store past earnings dates (masks past windows in backtests)
+  python earnings_calendar.py -f stocks.txt --include-history
+
+  # Show stored dates for one ticker
+  python earnings_calendar.py AAPL --list
+        """
+    )
+    parser.add_argument('ticker', nargs='?', help='Stock symbol')
+    parser.add_argument('-f', '--file', help='Ticker file (one per line)')
+    parser.add_argument('--ttl-days', type=int, default=DEFAULT_TTL_DAYS,
+                        help=f'Refresh entries older than this many days (default: {DEFAULT_TTL_DAYS})')
+    parser.add_argument('--force', action='store_true', help='Refresh regardless of age')
+    parser.add_argument('--list', action='store_true', help='List stored dates without refreshing')
+    parser.add_argument('--include-history', action='store_true',
+                        help='Also fetch past earnings dates and keep them (default: upcoming date only)')
+
+    args = parser.parse_args()
+
+    if args.file:
+        from data_manager import read_ticker_file
+        tickers = read_ticker_file(args.file)
+    elif args.ticker:
+        tickers = [args.ticker.upper()]
+    else:
+        parser.error("Provide a ticker or --file")
+
+    if args.list:
+        for ticker in tickers:
+            record = load_earnings_record(ticker)
+            if not record:
+                print(f"{ticker}: no stored earnings dates")
+                continue
+            print(f"{ticker}: {len(record['dates'])} dates (fetched {record.get('fetched')})")
+            for day in record['dates'][-8:]:
+                print(f"  {day}")
+        return
+
+    counts = refresh_earnings_store(tickers, ttl_days=args.ttl_days, force=args.force,
+                                    include_history=args.include_history)
+    print(f"\n✅ Earnings store: {counts['refreshed']} refreshed, "
+          f"{counts['fresh']} already fresh, {counts['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Persistent cache of prepared analysis frames.
+
+prepare_analysis_dataframe() output is a pure function of the cached price
+data, the benchmark caches behind the regime columns, stored corporate actions
+and earnings dates, the threshold config and the pipeline code. Frames are
+stored under a content-addressed key built from all of those:
+
+    data_cache/frames/{TICKER}_{period}_{interval}_{key}.pkl
+
+so repeated research runs (analyze_ticker, batch_backtest, threshold
+optimization, sector dashboards, validation harnesses) start from warm frames,
+and any change to an input simply misses and rebuilds. Files are pickled
+DataFrames (exact dtype/index round trip, no extra dependency).
+
+The directory is kept under MAX_FRAME_CACHE_MB, evicting the least recently
+used frames first (a cache hit refreshes the file's mtime). Disable with
+set_frame_cache_enabled(False), the --no-frame-cache CLI switch, or the
+VOL_ANALYSIS_NO_FRAME_CACHE=1 environment variable.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from error_handler import ErrorContext, FileOperationError, validate_ticker, logger
+from threshold_config import get_threshold_fingerprint
+
+FRAME_CACHE_VERSION = 1
+
+DEFAULT_FRAME_CACHE_DIR = os.path.join('data_cache', 'frames')
+
+MAX_FRAME_CACHE_MB = float(os.environ.get('VOL_ANALYSIS_FRAME_CACHE_MB', 512))
+
+# Modules whose code determines prepare_analysis_dataframe() output
+PIPELINE_MODULES = [
+    'analysis_service', 'data_manager', 'corporate_actions', 'earnings_calendar',
+    'indicators', 'range_query', 'regime_filter', 'signal_generator',
+    'swing_structure', 'volume_features',
+]
+
+_enabled = os.environ.get('VOL_ANALYSIS_NO_FRAME_CACHE', '').lower() not in ('1', 'true', 'yes')
+_code_version: Optional[str] = None
+_source_hashes: Dict[tuple, str] = {}
+
+
+def set_frame_cache_enabled(enabled: bool = True) -> None:
+    """Enable/disable the persistent frame cache for this process."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_frame_cache_enabled() -> bool:
+    """Return True when prepared frames are read from and written to disk."""
+    return _enabled
+
+
+def hash_module_sources(module_names: List[str]) -> str:
+    """
+    Hash of the source files of the named modules (computed once per process).
+
+    Args:
+        module_names: Importable module names; missing modules are skipped
+
+    Returns:
+        str: First 16 hex chars of a SHA-256 digest over the sources
+    """
+    names = tuple(module_names)
+    if names not in _source_hashes:
+        digest = hashlib.sha256(str(FRAME_CACHE_VERSION).encode())
+        for name in names:
+            spec = importlib.util.find_spec(name)
+            if spec is not None and spec.origin and os.path.exists(spec.origin):
+                with open(spec.origin, 'rb') as f:
+                    digest.update(f.read())
+        _source_hashes[names] = digest.hexdigest()[:16]
+    return _source_hashes[names]
+
+
+def get_pipeline_code_version() -> str:
+    """Hash of the pipeline module sources (computed once per process)."""
+    global _code_version
+    if _code_version is None:
+        _code_version = hash_module_sources(PIPELINE_MODULES)
+    return _code_version
+
+
+def get_frame_cache_key(request_key: tuple) -> str:
+    """
+    Content-addressed key for a prepared frame.
+
+    Args:
+        request_key: Request and input fingerprints (see analysis_service._frame_memo_key)
+
+    Returns:
+        str: First 16 hex chars of a SHA-256 digest that also covers the
+            threshold config and pipeline code version
+    """
+    payload = json.dumps([list(request_key), get_threshold_fingerprint(), get_pipeline_code_version()],
+                         default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def get_frame_filepath(ticker: str, period: str, interval: str, key: str,
+                       cache_dir: str = DEFAULT_FRAME_CACHE_DIR) -> Path:
+    """Get the frame cache file path for a ticker request and key."""
+    validate_ticker(ticker)
+    return Path(cache_dir) / f"{ticker.upper()}_{period}_{interval}_{key}.pkl"
+
+
+def load_frame(ticker: str, period: str, interval: str, key: str,
+               cache_dir: str = DEFAULT_FRAME_CACHE_DIR) -> Optional[pd.DataFrame]:
+    """
+    Load a stored frame, or None when the cache is disabled or has no entry.
+
+    Args:
+        ticker: Stock symbol
+        period: Analysis period
+        interval: Bar interval
+        key: get_frame_cache_key() of the request
+        cache_dir: Directory holding frame files
+
+    Returns:
+        Optional[pd.DataFrame]: The stored frame
+    """
+    if not _enabled:
+        return None
+    filepath = get_frame_filepath(ticker, period, interval, key, cache_dir)
+    if not filepath.exists():
+        return None
+    try:
+        df = pd.read_pickle(filepath)
+        os.utime(filepath)  # LRU: mark as recently used
+    except Exception as e:
+        logger.warning(f"Error reading frame cache for {ticker} ({period}): {e}")
+        try:
+            filepath.unlink()
+        except OSError:
+            pass
+        return None
+    logger.info(f"Loaded prepared frame for {ticker} ({period}, {interval}) from frame cache")
+    return df
+
+
+def save_frame(ticker: str, period: str, interval: str, key: str, df: pd.DataFrame,
+               cache_dir: str = DEFAULT_FRAME_CACHE_DIR) -> None:
+    """
+    Store a prepared frame, replacing older keys of the same request.
+
+    Args:
+        ticker: Stock symbol
+        period: Analysis period
+        interval: Bar interval
+        key: get_frame_cache_key() of the request
+        df: Prepared analysis frame
+        cache_dir: Directory holding frame files
+    """
+    if not _enabled:
+        return
+    with ErrorContext("saving prepared frame", ticker=ticker, period=period):
+        filepath = get_frame_filepath(ticker, period, interval, key, cache_dir)
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise FileOperationError(f"Failed to create frame cache directory {filepath.parent}: {e}")
+
+        # Unique temp name: parallel workers may build the same request
+        tmp_path = filepath.with_suffix(f'.{os.getpid()}.tmp')
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, filepath)
+
+        # Frames built from older inputs of the same request can never hit again
+        prefix = f"{ticker.upper()}_{period}_{interval}_"
+        for stale in filepath.parent.glob(f"{prefix}*.pkl"):
+            if stale != filepath and len(stale.name) == len(filepath.name):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        prune_frame_cache(cache_dir=cache_dir)
+
+
+def prune_frame_cache(max_mb: Optional[float] = None, cache_dir: str = DEFAULT_FRAME_CACHE_DIR) -> int:
+    """
+    Evict least recently used frames until the cache fits within max_mb.
+
+    Args:
+        max_mb: Size limit in MB (default: MAX_FRAME_CACHE_MB)
+        cache_dir: Directory holding frame files
+
+    Returns:
+        int: Number of files removed
+    """
+    max_bytes = (MAX_FRAME_CACHE_MB if max_mb is None else max_mb) * 1024 * 1024
+    entries = []
+    for filepath in Path(cache_dir).glob('*.pkl'):
+        try:
+            stat = filepath.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, filepath))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, filepath in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        try:
+            filepath.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"Evicted {removed} least recently used frames from {cache_dir}")
+    return removed
@@ -16,7 +16,8 @@ Date: 2025-11-19
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from data_manager import get_smart_data
+from data_manager import get_period_start
+from regime_filter import build_regime_store
 import logging
 
 # Configure logging
@@ -42,6 +43,10 @@ def calculate_regime_indicators(period='24mo'):
     """
     Calculate regime indicators for SPY and all sector ETFs.
     
+    The series come from the regime store shared with the backtest regime
+    filter (regime_filter.build_regime_store): moving averages are computed
+    once over each benchmark's full cached history and cut to the period.
+    
     Args:
         period (str): Data period to analyze (default: '24mo')
         
@@ -50,64 +55,43 @@ def calculate_regime_indicators(period='24mo'):
     """
     logger.info(f"Generating regime indicators for {period} period")
     
-    # Start with SPY (market regime)
-    logger.info("Loading SPY data for market regime calculation...")
-    try:
-        spy_data = get_smart_data('SPY', period=period, force_refresh=False)
-    except Exception as e:
-        logger.error(f"Failed to load SPY data: {e}")
-        return pd.DataFrame()
+    store = build_regime_store(SECTOR_ETFS)
     
-    if spy_data.empty:
-        logger.error("SPY data is empty")
+    # Start with SPY (market regime)
+    spy_data = store.get('SPY')
+    if spy_data is None or spy_data.empty:
+        logger.error("Failed to load SPY data")
         return pd.DataFrame()
-    
-    # Calculate SPY 200-day MA and market regime
-    spy_data['SPY_200ma'] = spy_data['Close'].rolling(200, min_periods=200).mean()
-    spy_data['SPY_market_regime'] = spy_data['Close'] > spy_data['SPY_200ma']
+    spy_data = spy_data[spy_data.index >= get_period_start(period)]
     
     # Create result DataFrame starting with SPY data
     result_df = pd.DataFrame(index=spy_data.index)
     result_df['SPY_close'] = spy_data['Close']
-    result_df['SPY_200ma'] = spy_data['SPY_200ma']
-    result_df['SPY_market_regime'] = spy_data['SPY_market_regime']
+    result_df['SPY_200ma'] = spy_data['MA']
+    result_df['SPY_market_regime'] = spy_data['Regime_OK']
     
     logger.info(f"SPY data loaded: {len(spy_data)} periods from {spy_data.index[0].date()} to {spy_data.index[-1].date()}")
     
     # Process each sector ETF
     for etf in SECTOR_ETFS:
-        logger.info(f"Processing {etf}...")
+        etf_data = store.get(etf)
         
-        try:
-            etf_data = get_smart_data(etf, period=period, force_refresh=False)
-            
-            if etf_data.empty:
-                logger.warning(f"No data available for {etf}")
-                # Fill with NaN for missing ETF
-                result_df[f'{etf}_close'] = np.nan
-                result_df[f'{etf}_50ma'] = np.nan
-                result_df[f'{etf}_sector_regime'] = np.nan
-                continue
-            
-            # Calculate 50-day MA and sector regime
-            etf_data['50ma'] = etf_data['Close'].rolling(50, min_periods=50).mean()
-            etf_data['sector_regime'] = etf_data['Close'] > etf_data['50ma']
-            
-            # Align with SPY dates and add to result
-            etf_aligned = etf_data.reindex(result_df.index, method='ffill')
-            
-            result_df[f'{etf}_close'] = etf_aligned['Close']
-            result_df[f'{etf}_50ma'] = etf_aligned['50ma']
-            result_df[f'{etf}_sector_regime'] = etf_aligned['sector_regime']
-            
-            logger.info(f"{etf} processed: {len(etf_data)} periods from {etf_data.index[0].date()} to {etf_data.index[-1].date()}")
-            
-        except Exception as e:
-            logger.error(f"Failed to process {etf}: {e}")
-            # Fill with NaN for failed ETF
+        if etf_data is None or etf_data.empty:
+            logger.warning(f"No data available for {etf}")
+            # Fill with NaN for missing ETF
             result_df[f'{etf}_close'] = np.nan
             result_df[f'{etf}_50ma'] = np.nan
             result_df[f'{etf}_sector_regime'] = np.nan
+            continue
+        
+        # Align with SPY dates and add to result
+        etf_aligned = etf_data.reindex(result_df.index, method='ffill')
+        
+        result_df[f'{etf}_close'] = etf_aligned['Close']
+        result_df[f'{etf}_50ma'] = etf_aligned['MA']
+        result_df[f'{etf}_sector_regime'] = etf_aligned['Regime_OK']
+        
+        logger.info(f"{etf} processed: {len(etf_data)} periods from {etf_data.index[0].date()} to {etf_data.index[-1].date()}")
     
     # Remove rows where SPY data is incomplete (before 200-day MA is available)
     result_df = result_df.dropna(subset=['SPY_200ma'])
@@ -743,7 +743,8 @@ def check_earnings_window(ticker: str, df: pd.DataFrame, window_days: int = 3,
         ticker (str): Stock symbol
         df (pd.DataFrame): DataFrame with DatetimeIndex
         window_days (int): Days before/after earnings to exclude (default: 3)
-        earnings_dates (Optional[list]): List of earnings dates. If None, attempts to fetch.
+        earnings_dates (Optional[list]): List of earnings dates. If None, uses the
+            local earnings store (see earnings_calendar.py).
         
     Returns:
         pd.Series: Boolean series indicating safe periods (True = outside earnings windows)
@@ -752,54 +753,34 @@ def check_earnings_window(ticker: str, df: pd.DataFrame, window_days: int = 3,
         >>> earnings_dates = [pd.Timestamp('2024-11-02'), pd.Timestamp('2024-08-01')]
         >>> df['Earnings_OK'] = check_earnings_window('AAPL', df, earnings_dates=earnings_dates)
     """
-    # Initialize all dates as OK (outside earnings window)
-    earnings_ok = pd.Series(True, index=df.index)
-    
-    # If no earnings dates provided, try to fetch them
+    # If no earnings dates provided, use the local earnings store
+    # (refreshed at most once per TTL; no network access in offline mode)
     if earnings_dates is None:
-        try:
-            import yfinance as yf
-            stock = yf.Ticker(ticker)
-            calendar = stock.calendar
-            
-            if calendar is not None and 'Earnings Date' in calendar:
-                # Handle various return types from yfinance
-                raw_dates = calendar['Earnings Date']
-                
-                # Convert to list of Timestamps
-                if isinstance(raw_dates, pd.DatetimeIndex):
-                    earnings_dates = raw_dates.tolist()
-                elif isinstance(raw_dates, pd.Timestamp):
-                    earnings_dates = [raw_dates]
-                elif isinstance(raw_dates, list):
-                    earnings_dates = [pd.Timestamp(d) for d in raw_dates]
-                else:
-                    # Try to convert whatever we got
-                    earnings_dates = [pd.Timestamp(raw_dates)]
-            else:
-                # No earnings data available, return all True (no filter)
-                return earnings_ok
-                
-        except Exception as e:
-            # If fetch fails, log warning but don't fail - return all True
-            print(f"Warning: Could not fetch earnings for {ticker}: {e}")
-            return earnings_ok
-    
-    # Mark dates within earnings windows
-    if earnings_dates:
-        for earnings_date in earnings_dates:
-            # Ensure earnings_date is a Timestamp
-            earnings_ts = pd.Timestamp(earnings_date)
-            
-            # Create window around earnings date
-            window_start = earnings_ts - pd.Timedelta(days=window_days)
-            window_end = earnings_ts + pd.Timedelta(days=window_days)
-            
-            # Mark dates in window as not OK
-            in_window = (df.index >= window_start) & (df.index <= window_end)
-            earnings_ok = earnings_ok & ~in_window
-    
-    return earnings_ok
+        import earnings_calendar
+        earnings_dates = earnings_calendar.get_earnings_dates(ticker)
+    
+    if earnings_dates is None or len(earnings_dates) == 0:
+        # No earnings data available, return all True (no filter)
+        return pd.Series(True, index=df.index)
+    
+    # Sorted earnings timestamps (timezone-naive)
+    earnings_ts = [pd.Timestamp(d) for d in earnings_dates]
+    earnings_values = np.sort(pd.DatetimeIndex(
+        [ts.tz_localize(None) if ts.tzinfo is not None else ts for ts in earnings_ts]
+    ).values)
+    
+    bar_index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    bar_values = bar_index.values
+    window = np.timedelta64(pd.Timedelta(days=window_days))
+    
+    # A bar is in a window if some earnings date e satisfies t - w <= e <= t + w:
+    # find the first e >= t - w in one searchsorted pass and test it against t + w
+    first_candidate = np.searchsorted(earnings_values, bar_values - window, side='left')
+    has_candidate = first_candidate < len(earnings_values)
+    candidate = earnings_values[np.minimum(first_candidate, len(earnings_values) - 1)]
+    in_window = has_candidate & (candidate <= bar_values + window)
+    
+    return pd.Series(~in_window, index=df.index)
 
 
 def apply_prefilters(ticker: str, df: pd.DataFrame,
@@ -0,0 +1,494 @@
+"""
+Intraday data store with a single base interval and on-the-fly resampling.
+
+Intraday bars are stored ONCE at the finest available interval (1-minute by
+default), partitioned by trading day:
+
+    data_cache/intraday/{TICKER}/{YYYY-MM-DD}.csv
+
+Each partition carries the same JSON metadata header as the regular cache
+files (see schema_manager.py). Coarser intervals (5m, 15m, 30m, 1h) as well as
+daily and weekly bars are derived from the base bars by OHLCV resampling on
+demand. Resampled frames are memoized and keyed on the partition fingerprints,
+so rewriting a partition automatically invalidates the derived views.
+
+This replaces the per-interval {ticker}_{interval}_data.csv intraday files,
+which multiplied storage and drifted out of sync with each other. Minute bars
+passed to data_manager.save_to_cache() are written here.
+
+Stored timestamps are exchange-local wall time and may include extended-hours
+bars (Massive minute aggregates do). Daily and longer bars are derived from
+the regular session (09:30-16:00) only, like the daily cache.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from error_handler import (
+    ErrorContext, DataValidationError, FileOperationError,
+    validate_ticker, validate_dataframe, safe_operation, logger
+)
+from schema_manager import schema_manager
+
+# Interval stored on disk; everything coarser is derived
+BASE_INTERVAL = "1m"
+
+# Regular session open used to anchor intraday bins (09:30 exchange time)
+SESSION_OPEN_OFFSET = pd.Timedelta(hours=9, minutes=30)
+
+# Regular session close (16:00 exchange time, exclusive)
+SESSION_CLOSE_OFFSET = pd.Timedelta(hours=16)
+
+# Interval name -> pandas resample rule
+INTERVAL_RULES = {
+    '1m': '1min',
+    '2m': '2min',
+    '5m': '5min',
+    '15m': '15min',
+    '30m': '30min',
+    '60m': '60min',
+    '1h': '60min',
+    '90m': '90min',
+    '1d': 'D',
+    '1wk': 'W-FRI',
+    '1mo': 'M',
+}
+
+INTRADAY_INTERVALS = {'1m', '2m', '5m', '15m', '30m', '60m', '1h', '90m'}
+
+# Intervals aggregated by calendar period rather than fixed-width bins
+PERIOD_GROUPED_INTERVALS = {'1wk', '1mo'}
+
+# OHLCV aggregation used for every resample
+OHLCV_AGGREGATION = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+}
+
+# Bounded memo of resampled frames: key -> DataFrame
+_RESAMPLE_MEMO_MAX_ENTRIES = 64
+_resample_memo: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+
+def get_intraday_directory(ticker: Optional[str] = None) -> Path:
+    """
+    Get (and create) the intraday store directory, optionally for one ticker.
+
+    Args:
+        ticker (str, optional): Stock symbol. If None, returns the store root.
+
+    Returns:
+        Path: Directory path
+    """
+    with ErrorContext("creating intraday store directory", ticker=ticker):
+        store_dir = Path.cwd() / 'data_cache' / 'intraday'
+        if ticker:
+            validate_ticker(ticker)
+            store_dir = store_dir / ticker.upper()
+        if not store_dir.exists():
+            try:
+                store_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise FileOperationError(f"Failed to create intraday directory {store_dir}: {e}")
+        return store_dir
+
+
+def get_partition_filepath(ticker: str, trading_day) -> Path:
+    """
+    Get the partition file path for a ticker and trading day.
+
+    Args:
+        ticker (str): Stock symbol
+        trading_day: Date-like value identifying the trading day
+
+    Returns:
+        Path: Path to the day partition CSV
+    """
+    day = pd.Timestamp(trading_day).strftime('%Y-%m-%d')
+    return get_intraday_directory(ticker) / f"{day}.csv"
+
+
+def list_partition_dates(ticker: str) -> List[pd.Timestamp]:
+    """
+    List the trading days stored for a ticker, sorted ascending.
+
+    Args:
+        ticker (str): Stock symbol
+
+    Returns:
+        List[pd.Timestamp]: Trading days with a partition on disk
+    """
+    store_dir = get_intraday_directory(ticker)
+    dates = []
+    for entry in store_dir.glob('*.csv'):
+        try:
+            dates.append(pd.Timestamp(entry.stem))
+        except ValueError:
+            logger.warning(f"Ignoring unexpected file in intraday store: {entry}")
+    return sorted(dates)
+
+
+def has_intraday_data(ticker: str) -> bool:
+    """Return True if the intraday store holds any partitions for the ticker."""
+    store_dir = Path.cwd() / 'data_cache' / 'intraday' / ticker.upper()
+    return store_dir.exists() and any(store_dir.glob('*.csv'))
+
+
+def get_store_end_date(ticker: str) -> Optional[pd.Timestamp]:
+    """
+    Timestamp of the last bar in the ticker's intraday store.
+
+    Read from the newest partition's metadata header (its trading day when
+    the header has no end_date); None when nothing is stored.
+    """
+    dates = list_partition_dates(ticker)
+    if not dates:
+        return None
+    metadata = schema_manager.read_metadata_from_csv(str(get_partition_filepath(ticker, dates[-1])))
+    if metadata and metadata.get('end_date'):
+        return pd.Timestamp(metadata['end_date'])
+    return dates[-1]
+
+
+def get_store_data_source(ticker: str) -> Optional[str]:
+    """Return the data_source recorded in the ticker's most recent partition."""
+    dates = list_partition_dates(ticker)
+    if not dates:
+        return None
+    metadata = schema_manager.read_metadata_from_csv(str(get_partition_filepath(ticker, dates[-1])))
+    return metadata.get('data_source') if metadata else None
+
+
+def _write_partition_file(filepath: Path, ticker: str, day_df: pd.DataFrame,
+                          interval: str, data_source: str) -> None:
+    """Write one day partition with the standard metadata header."""
+    metadata = schema_manager.create_metadata_header(
+        ticker=ticker,
+        df=day_df,
+        interval=interval,
+        auto_adjust=False,
+        data_source=data_source
+    )
+
+    # Write to a temp file first so readers never see a half-written partition
+    tmp_path = filepath.with_suffix('.csv.tmp')
+    with open(tmp_path, 'w', newline='') as f:
+        f.write("# Volume Analysis System - Intraday Partition\n")
+        f.write(f"# Generated: {datetime.now().isoformat()}\n")
+        f.write("# Metadata (JSON format):\n")
+        for line in json.dumps(metadata, indent=2).split('\n'):
+            f.write(f"# {line}\n")
+        f.write("#\n")
+        day_df.to_csv(f, index=True)
+    os.replace(tmp_path, filepath)
+
+
+def save_intraday_bars(ticker: str, df: pd.DataFrame, interval: str = BASE_INTERVAL,
+                       data_source: str = "yfinance") -> int:
+    """
+    Save base-interval bars into day partitions, merging with existing partitions.
+
+    Args:
+        ticker (str): Stock symbol
+        df (pd.DataFrame): OHLCV bars with a DatetimeIndex
+        interval (str): Interval of the supplied bars (must be the store base interval)
+        data_source (str): Data source recorded in the partition metadata
+
+    Returns:
+        int: Number of day partitions written
+
+    Raises:
+        DataValidationError: If the bars are not at the base interval
+    """
+    with ErrorContext("saving intraday bars", ticker=ticker, interval=interval):
+        validate_ticker(ticker)
+        validate_dataframe(df, schema_manager.schema_definitions[schema_manager.current_version]["required_columns"])
+
+        if interval != BASE_INTERVAL:
+            raise DataValidationError(
+                f"Intraday store only accepts {BASE_INTERVAL} bars (got {interval}). "
+                f"Coarser intervals are derived by resampling."
+            )
+
+        bars = schema_manager._standardize_dataframe(df.copy(), ticker)
+        if bars.index.tz is not None:
+            bars.index = bars.index.tz_localize(None)
+
+        partitions_written = 0
+        for day, day_df in bars.groupby(bars.index.normalize()):
+            filepath = get_partition_filepath(ticker, day)
+
+            existing = _read_partition(filepath, ticker) if filepath.exists() else None
+            if existing is not None:
+                day_df = pd.concat([existing, day_df])
+                day_df = day_df[~day_df.index.duplicated(keep='last')].sort_index()
+
+            safe_operation(
+                f"writing intraday partition {filepath.name} for {ticker}",
+                lambda: _write_partition_file(filepath, ticker, day_df, interval, data_source)
+            )
+            partitions_written += 1
+
+        logger.info(f"Saved {len(bars)} {interval} bars for {ticker} into {partitions_written} day partitions")
+        return partitions_written
+
+
+def _read_partition(filepath: Path, ticker: str) -> Optional[pd.DataFrame]:
+    """Read and validate one day partition. Returns None if it is corrupt."""
+    try:
+        metadata = schema_manager.read_metadata_from_csv(str(filepath))
+        day_df = pd.read_csv(filepath, index_col=0, parse_dates=True, comment='#')
+        if day_df.empty:
+            return None
+        if metadata and not schema_manager.validate_schema(day_df, metadata):
+            logger.warning(f"Schema validation failed for intraday partition {filepath} ({ticker})")
+            return None
+        return day_df
+    except Exception as e:
+        logger.warning(f"Error reading intraday partition {filepath} for {ticker}: {e}")
+        return None
+
+
+def _partition_fingerprint(paths: List[Path]) -> Tuple:
+    """Fingerprint a set of partitions by name, size and mtime."""
+    fingerprint = []
+    for path in paths:
+        stat = path.stat()
+        fingerprint.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def _select_partitions(ticker: str, start=None, end=None) -> List[Path]:
+    """Select partition files overlapping the [start, end] date range."""
+    start_day = pd.Timestamp(start).normalize() if start is not None else None
+    end_day = pd.Timestamp(end).normalize() if end is not None else None
+
+    paths = []
+    for day in list_partition_dates(ticker):
+        if start_day is not None and day < start_day:
+            continue
+        if end_day is not None and day > end_day:
+            continue
+        paths.append(get_partition_filepath(ticker, day))
+    return paths
+
+
+def load_base_bars(ticker: str, start=None, end=None) -> pd.DataFrame:
+    """
+    Load base-interval bars for a ticker over an optional date range.
+
+    Args:
+        ticker (str): Stock symbol
+        start: Optional inclusive start (date or timestamp)
+        end: Optional inclusive end (date or timestamp)
+
+    Returns:
+        pd.DataFrame: Base-interval OHLCV bars (empty if nothing stored)
+    """
+    with ErrorContext("loading intraday base bars", ticker=ticker):
+        validate_ticker(ticker)
+        frames = []
+        for path in _select_partitions(ticker, start, end):
+            day_df = _read_partition(path, ticker)
+            if day_df is not None:
+                frames.append(day_df)
+
+        if not frames:
+            return pd.DataFrame(columns=list(OHLCV_AGGREGATION.keys()))
+
+        bars = pd.concat(frames).sort_index()
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start)]
+        if end is not None:
+            end_ts = pd.Timestamp(end)
+            # A bare date means "through the end of that day"
+            if end_ts == end_ts.normalize():
+                end_ts = end_ts + pd.Timedelta(days=1)
+                bars = bars[bars.index < end_ts]
+            else:
+                bars = bars[bars.index <= end_ts]
+        return bars
+
+
+def filter_regular_hours(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep only regular-session bars (09:30 <= time < 16:00 exchange time).
+
+    Args:
+        df (pd.DataFrame): Intraday bars indexed by exchange-local timestamps
+
+    Returns:
+        pd.DataFrame: Bars inside the regular session
+    """
+    if df.empty:
+        return df
+    time_of_day = df.index - df.index.normalize()
+    return df[(time_of_day >= SESSION_OPEN_OFFSET) & (time_of_day < SESSION_CLOSE_OFFSET)]
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str, label: str = 'start') -> pd.DataFrame:
+    """
+    Resample OHLCV bars to a coarser interval.
+
+    Intraday bins are anchored to the 09:30 session open so that, for example,
+    1h bars start at 09:30, 10:30, ... like the bars served by yfinance. Bins
+    without any trades are dropped.
+
+    Weekly and monthly bars group on calendar weeks (Mon-Fri) / months and are
+    labelled by a trading day inside the period: the first one for
+    label='start' (yfinance convention) or the last one for label='end'. The
+    'end' label is the date the bar is complete, which keeps point-in-time
+    lookups (regime filter, next-bar entries) free of lookahead.
+
+    Args:
+        df (pd.DataFrame): OHLCV bars with a DatetimeIndex
+        interval (str): Target interval ('5m', '15m', '30m', '1h', '1d', '1wk', '1mo', ...)
+        label (str): 'start' or 'end' labelling for weekly/monthly bars
+
+    Returns:
+        pd.DataFrame: Resampled OHLCV bars
+
+    Raises:
+        DataValidationError: If the interval or label is not supported
+    """
+    if interval not in INTERVAL_RULES:
+        raise DataValidationError(
+            f"Unsupported interval '{interval}'. Supported: {', '.join(INTERVAL_RULES.keys())}"
+        )
+    if label not in ('start', 'end'):
+        raise DataValidationError(f"Unsupported label '{label}'. Use 'start' or 'end'")
+
+    if df.empty:
+        return df.copy()
+
+    rule = INTERVAL_RULES[interval]
+    columns = [col for col in OHLCV_AGGREGATION if col in df.columns]
+    aggregation = {col: OHLCV_AGGREGATION[col] for col in columns}
+
+    if interval in PERIOD_GROUPED_INTERVALS:
+        periods = df.index.to_period(rule)
+        resampled = df[columns].groupby(periods).agg(aggregation).dropna(subset=['Open'])
+        timestamps = df.index.to_series().groupby(periods)
+        labels = (timestamps.first() if label == 'start' else timestamps.last()).dt.normalize()
+        resampled.index = pd.DatetimeIndex(labels.reindex(resampled.index).values, name=df.index.name)
+    else:
+        if interval in INTRADAY_INTERVALS:
+            resampler = df[columns].resample(
+                rule, label='left', closed='left',
+                origin='start_day', offset=SESSION_OPEN_OFFSET
+            )
+        else:
+            resampler = df[columns].resample(rule)
+        resampled = resampler.agg(aggregation).dropna(subset=['Open'])
+
+    if 'Volume' in resampled.columns:
+        resampled['Volume'] = resampled['Volume'].astype('int64')
+    return resampled
+
+
+def get_resampled_data(ticker: str, interval: str, start=None, end=None) -> pd.DataFrame:
+    """
+    Get bars at any interval derived from the base-interval store (memoized).
+
+    Args:
+        ticker (str): Stock symbol
+        interval (str): Target interval ('1m', '5m', '15m', '30m', '1h', '1d', '1wk');
+            daily and longer bars are built from regular-session bars only
+        start: Optional inclusive start
+        end: Optional inclusive end
+
+    Returns:
+        pd.DataFrame: OHLCV bars at the requested interval
+
+    Raises:
+        DataValidationError: If the store holds no bars for the ticker/range
+    """
+    with ErrorContext("resampling intraday store", ticker=ticker, interval=interval):
+        validate_ticker(ticker)
+        if interval not in INTERVAL_RULES:
+            raise DataValidationError(
+                f"Unsupported interval '{interval}'. Supported: {', '.join(INTERVAL_RULES.keys())}"
+            )
+
+        paths = _select_partitions(ticker, start, end)
+        if not paths:
+            raise DataValidationError(
+                f"\n{'='*70}\n"
+                f"ERROR: No intraday data found for {ticker}\n"
+                f"{'='*70}\n"
+                f"Requested: {interval} bars"
+                f"{f' from {pd.Timestamp(start).date()}' if start is not None else ''}"
+                f"{f' to {pd.Timestamp(end).date()}' if end is not None else ''}\n"
+                f"Store location: data_cache/intraday/{ticker.upper()}/\n"
+                f"{'='*70}"
+            )
+
+        key = (
+            ticker.upper(), interval,
+            str(start) if start is not None else None,
+            str(end) if end is not None else None,
+            _partition_fingerprint(paths)
+        )
+        cached = _resample_memo.get(key)
+        if cached is not None:
+            _resample_memo.move_to_end(key)
+            return cached.copy()
+
+        base = load_base_bars(ticker, start, end)
+        if interval not in INTRADAY_INTERVALS:
+            # Daily and longer bars cover the regular session only
+            base = filter_regular_hours(base)
+        result = base if interval == BASE_INTERVAL else resample_ohlcv(base, interval)
+
+        _resample_memo[key] = result
+        if len(_resample_memo) > _RESAMPLE_MEMO_MAX_ENTRIES:
+            _resample_memo.popitem(last=False)
+
+        logger.info(f"Derived {len(result)} {interval} bars for {ticker} from {len(paths)} intraday partitions")
+        return result.copy()
+
+
+def get_daily_bars(ticker: str, start=None, end=None) -> pd.DataFrame:
+    """Derive daily bars from the intraday store."""
+    return get_resampled_data(ticker, '1d', start, end)
+
+
+def get_weekly_bars(ticker: str, start=None, end=None) -> pd.DataFrame:
+    """Derive weekly bars from the intraday store."""
+    return get_resampled_data(ticker, '1wk', start, end)
+
+
+def clear_resample_memo() -> None:
+    """Drop all memoized resampled frames."""
+    _resample_memo.clear()
+
+
+def get_store_info(ticker: str) -> Dict:
+    """
+    Summarize what the intraday store holds for a ticker.
+
+    Args:
+        ticker (str): Stock symbol
+
+    Returns:
+        Dict: partitions, first_day, last_day and total size in bytes
+    """
+    dates = list_partition_dates(ticker)
+    paths = [get_partition_filepath(ticker, day) for day in dates]
+    return {
+        'ticker': ticker.upper(),
+        'base_interval': BASE_INTERVAL,
+        'partitions': len(dates),
+        'first_day': dates[0] if dates else None,
+        'last_day': dates[-1] if dates else None,
+        'size_bytes': sum(path.stat().st_size for path in paths),
+    }
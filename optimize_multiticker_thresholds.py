@@ -6,17 +6,29 @@ thresholds that generalize well across different stocks and market conditions.
 
 Usage:
     python optimize_multiticker_thresholds.py ibd.txt -p 24mo
+    python optimize_multiticker_thresholds.py ibd.txt -p 24mo --shard 1/4   # one of 4 hosts
+    python optimize_multiticker_thresholds.py --merge-shards backtest_results/shards
 """
 
 import pandas as pd
-import numpy as np
 from typing import Dict, List, Tuple
 from datetime import datetime
 import vol_analysis
 import backtest
 from signal_threshold_validator import apply_empirical_thresholds
+from batch_shards import load_shard_results, parse_shard, select_shard, write_shard_result
+from error_handler import DataValidationError
 import argparse
 
+DEFAULT_THRESHOLDS = [4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0]
+
+# Signals to optimize: (signal column, score column, display name)
+SIGNALS_TO_OPTIMIZE = [
+    ('Moderate_Buy', 'Moderate_Buy_Score', 'Moderate Buy'),
+    ('Stealth_Accumulation', 'Stealth_Accumulation_Score', 'Stealth Accumulation'),
+    ('Profit_Taking', 'Profit_Taking_Score', 'Profit Taking')
+]
+
 
 def optimize_signal_across_tickers(
     tickers: List[str],
@@ -39,14 +51,42 @@ def optimize_signal_across_tickers(
         Dict mapping threshold to aggregate performance metrics
     """
     if thresholds is None:
-        thresholds = [4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0]
+        thresholds = DEFAULT_THRESHOLDS
+    
+    trade_tables = collect_signal_trade_tables(tickers, signal_col, score_col, period, thresholds)
+    return aggregate_signal_thresholds(list(trade_tables.values()), thresholds)
+
+
+def collect_signal_trade_tables(
+    tickers: List[str],
+    signal_col: str,
+    score_col: str,
+    period: str,
+    thresholds: List[float] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Build each ticker's signal trade table (the per-ticker part of the optimization).
+    
+    Args:
+        tickers: List of ticker symbols
+        signal_col: Signal column name (e.g., 'Moderate_Buy')
+        score_col: Score column name (e.g., 'Moderate_Buy_Score')
+        period: Analysis period
+        thresholds: Thresholds to report trade counts for
+        
+    Returns:
+        Dict mapping ticker to its trade table (tickers without trades or
+        failing analysis are left out), in input order
+    """
+    if thresholds is None:
+        thresholds = DEFAULT_THRESHOLDS
     
     print(f"\n🔍 Optimizing {signal_col} across {len(tickers)} tickers...")
     print(f"   Testing thresholds: {thresholds}")
     print("="*70)
     
-    # Store results for each threshold
-    threshold_results = {t: {'trades': [], 'tickers_with_trades': 0} for t in thresholds}
+    # One trade table per ticker: every raw signal paired once, with its score
+    trade_tables = {}
     
     # Process each ticker
     for i, ticker in enumerate(tickers, 1):
@@ -67,53 +107,58 @@ def optimize_signal_across_tickers(
             # Apply empirical thresholds to get filtered signals
             df = apply_empirical_thresholds(df)
             
-            # Test each threshold
+            trade_table = backtest.build_signal_trade_table(df, signal_col, score_col)
+            if trade_table.empty:
+                continue
+            trade_table['ticker'] = ticker
+            trade_tables[ticker] = trade_table
+            
+            closed_scores = trade_table.loc[~trade_table['is_open'].astype(bool), 'score']
             for threshold in thresholds:
-                # Create filtered signal at this threshold
-                df_test = df.copy()
-                df_test[f'{signal_col}_test'] = (
-                    (df[signal_col] == True) & 
-                    (df[score_col] >= threshold)
-                )
-                
-                # Skip if no signals at this threshold
-                if df_test[f'{signal_col}_test'].sum() == 0:
-                    continue
-                
-                # Run backtest with this threshold
-                exit_signals = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal',
-                               'Momentum_Exhaustion', 'Stop_Loss']
-                
-                paired_trades = backtest.pair_entry_exit_signals(
-                    df_test,
-                    [f'{signal_col}_test'],
-                    exit_signals
-                )
-                
-                # Filter to closed trades and add ticker info
-                closed_trades = [t for t in paired_trades if not t.get('is_open', False)]
-                for trade in closed_trades:
-                    trade['ticker'] = ticker
-                
-                if closed_trades:
-                    threshold_results[threshold]['trades'].extend(closed_trades)
-                    threshold_results[threshold]['tickers_with_trades'] += 1
-                    print(f"  Threshold ≥{threshold}: {len(closed_trades)} trades")
+                count = int((closed_scores >= threshold).sum())
+                if count:
+                    print(f"  Threshold ≥{threshold}: {count} trades")
             
         except Exception as e:
             print(f"  ⚠️ Error processing {ticker}: {str(e)}")
             continue
     
+    return trade_tables
+
+
+def aggregate_signal_thresholds(
+    trade_tables: List[pd.DataFrame],
+    thresholds: List[float] = None
+) -> Dict[float, Dict]:
+    """
+    Sweep thresholds over the pooled trade tables of all tickers.
+    
+    Args:
+        trade_tables: Per-ticker trade tables, in input order
+        thresholds: List of thresholds to test
+        
+    Returns:
+        Dict mapping threshold to aggregate performance metrics
+    """
+    if thresholds is None:
+        thresholds = DEFAULT_THRESHOLDS
+    
     # Aggregate results for each threshold
     print(f"\n📊 Aggregating results across all tickers...")
     
+    if trade_tables:
+        sweep = backtest.sweep_signal_thresholds(
+            pd.concat(trade_tables, ignore_index=True), thresholds
+        )
+    else:
+        sweep = None
+    
     aggregated_results = {}
     
-    for threshold in thresholds:
-        trades = threshold_results[threshold]['trades']
-        tickers_with_trades = threshold_results[threshold]['tickers_with_trades']
+    for position, threshold in enumerate(thresholds):
+        metrics = sweep.iloc[position] if sweep is not None else None
         
-        if not trades:
+        if metrics is None or metrics['closed_trades'] == 0:
             aggregated_results[threshold] = {
                 'threshold': threshold,
                 'total_trades': 0,
@@ -126,31 +171,17 @@ def optimize_signal_across_tickers(
             }
             continue
         
-        # Calculate aggregate metrics
-        returns = [t['return_pct'] for t in trades]
-        wins = [r for r in returns if r > 0]
-        losses = [r for r in returns if r <= 0]
-        
-        win_rate = (len(wins) / len(returns)) * 100
-        avg_return = np.mean(returns)
-        median_return = np.median(returns)
-        avg_win = np.mean(wins) if wins else 0
-        avg_loss = np.mean(losses) if losses else 0
-        
-        expectancy = (win_rate/100 * avg_win) + ((1-win_rate/100) * avg_loss)
-        profit_factor = abs(sum(wins) / sum(losses)) if losses and sum(losses) != 0 else float('inf')
-        
         aggregated_results[threshold] = {
             'threshold': threshold,
-            'total_trades': len(trades),
-            'win_rate': win_rate,
-            'avg_return': avg_return,
-            'median_return': median_return,
-            'expectancy': expectancy,
-            'profit_factor': profit_factor,
-            'avg_win': avg_win,
-            'avg_loss': avg_loss,
-            'tickers_with_trades': tickers_with_trades
+            'total_trades': int(metrics['closed_trades']),
+            'win_rate': metrics['win_rate'],
+            'avg_return': metrics['avg_return'],
+            'median_return': metrics['median_return'],
+            'expectancy': metrics['expectancy'],
+            'profit_factor': metrics['profit_factor'],
+            'avg_win': metrics['avg_win'],
+            'avg_loss': metrics['avg_loss'],
+            'tickers_with_trades': int(metrics['tickers_with_trades'])
         }
     
     return aggregated_results
@@ -243,55 +274,31 @@ def generate_optimization_report(
     return "\n".join(report_lines)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Optimize signal thresholds across multiple tickers'
-    )
-    
-    parser.add_argument(
-        'ticker_file',
-        help='Path to file containing ticker symbols'
-    )
-    
-    parser.add_argument(
-        '-p', '--period',
-        default='12mo',
-        help='Analysis period (default: 12mo)'
-    )
-    
-    parser.add_argument(
-        '-o', '--output-dir',
-        default='backtest_results',
-        help='Output directory for reports'
-    )
-    
-    args = parser.parse_args()
-    
-    # Read tickers
-    tickers = vol_analysis.read_ticker_file(args.ticker_file)
-    print(f"\n🎯 MULTI-TICKER THRESHOLD OPTIMIZATION")
-    print(f"   Tickers: {len(tickers)}")
-    print(f"   Period: {args.period}")
-    print("="*70)
-    
-    # Signals to optimize
-    signals_to_optimize = [
-        ('Moderate_Buy', 'Moderate_Buy_Score', 'Moderate Buy'),
-        ('Stealth_Accumulation', 'Stealth_Accumulation_Score', 'Stealth Accumulation'),
-        ('Profit_Taking', 'Profit_Taking_Score', 'Profit Taking')
-    ]
+def write_optimization_reports(
+    signal_tables: Dict[str, Dict[str, pd.DataFrame]],
+    tickers: List[str],
+    period: str,
+    output_dir: str
+) -> str:
+    """
+    Print and save the optimization reports of a run.
     
+    Args:
+        signal_tables: Per-ticker trade tables of each signal column
+            (collect_signal_trade_tables())
+        tickers: Tickers of the run, in input order
+        period: Analysis period
+        output_dir: Output directory for the report
+        
+    Returns:
+        str: Path of the saved report
+    """
     all_reports = []
     recommendations = {}
     
-    for signal_col, score_col, signal_name in signals_to_optimize:
-        # Optimize this signal
-        results = optimize_signal_across_tickers(
-            tickers=tickers,
-            signal_col=signal_col,
-            score_col=score_col,
-            period=args.period
-        )
+    for signal_col, score_col, signal_name in SIGNALS_TO_OPTIMIZE:
+        tables = signal_tables[signal_col]
+        results = aggregate_signal_thresholds([tables[t] for t in tickers if t in tables])
         
         # Generate report
         report = generate_optimization_report(signal_name, results, len(tickers))
@@ -316,7 +323,7 @@ def main():
     summary_lines.append("🎯 MULTI-TICKER THRESHOLD RECOMMENDATIONS SUMMARY")
     summary_lines.append("="*80)
     summary_lines.append("")
-    summary_lines.append(f"Analysis Period: {args.period}")
+    summary_lines.append(f"Analysis Period: {period}")
     summary_lines.append(f"Tickers Analyzed: {len(tickers)}")
     summary_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     summary_lines.append("")
@@ -348,11 +355,11 @@ def main():
     
     # Save complete report
     import os
-    os.makedirs(args.output_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"MULTITICKER_threshold_optimization_{args.period}_{timestamp}.txt"
-    filepath = os.path.join(args.output_dir, filename)
+    filename = f"MULTITICKER_threshold_optimization_{period}_{timestamp}.txt"
+    filepath = os.path.join(output_dir, filename)
     
     with open(filepath, 'w') as f:
         f.write("\n\n".join(all_reports))
@@ -360,6 +367,105 @@ def main():
     
     print(f"✅ Complete optimization report saved: {filename}")
     print(f"📁 Location: {os.path.abspath(filepath)}")
+    
+    return filepath
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Optimize signal thresholds across multiple tickers'
+    )
+    
+    parser.add_argument(
+        'ticker_file',
+        nargs='?',
+        help='Path to file containing ticker symbols (required unless --merge-shards)'
+    )
+    
+    parser.add_argument(
+        '-p', '--period',
+        default='12mo',
+        help='Analysis period (default: 12mo)'
+    )
+    
+    parser.add_argument(
+        '-o', '--output-dir',
+        default='backtest_results',
+        help='Output directory for reports'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        metavar='I/N',
+        help='Process only shard I of N (tickers balanced by cache size) and save a partial result '
+             'to OUTPUT_DIR/shards instead of the reports'
+    )
+    
+    parser.add_argument(
+        '--merge-shards',
+        metavar='DIR',
+        help='Build the reports from the partial results of all shards in DIR'
+    )
+    
+    parser.add_argument(
+        '--no-frame-cache',
+        action='store_true',
+        help='Rebuild analysis frames instead of using the persistent frame cache'
+    )
+    
+    args = parser.parse_args()
+    
+    if args.no_frame_cache:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+    
+    if not args.ticker_file and not args.merge_shards:
+        parser.error("ticker_file is required (unless --merge-shards is used)")
+    
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except DataValidationError as e:
+            parser.error(str(e))
+    
+    if args.merge_shards:
+        tickers, options, payloads = load_shard_results(args.merge_shards, 'multiticker_thresholds')
+        signal_tables = {signal_col: {} for signal_col, _, _ in SIGNALS_TO_OPTIMIZE}
+        for payload in payloads:
+            for signal_col, tables in payload['signal_tables'].items():
+                signal_tables[signal_col].update(tables)
+        print(f"\n🧩 Merged {len(payloads)} shards covering {len(tickers)} tickers")
+        write_optimization_reports(signal_tables, tickers, options['period'], args.output_dir)
+        return
+    
+    # Read tickers
+    all_tickers = vol_analysis.read_ticker_file(args.ticker_file)
+    tickers = select_shard(all_tickers, shard) if shard is not None else all_tickers
+    print(f"\n🎯 MULTI-TICKER THRESHOLD OPTIMIZATION")
+    print(f"   Tickers: {len(tickers)}")
+    if shard is not None:
+        print(f"   Shard: {shard[0]}/{shard[1]} (of {len(all_tickers)} tickers)")
+    print(f"   Period: {args.period}")
+    print("="*70)
+    
+    signal_tables = {}
+    for signal_col, score_col, signal_name in SIGNALS_TO_OPTIMIZE:
+        signal_tables[signal_col] = collect_signal_trade_tables(
+            tickers=tickers,
+            signal_col=signal_col,
+            score_col=score_col,
+            period=args.period
+        )
+    
+    if shard is not None:
+        shard_file = write_shard_result(args.output_dir, 'multiticker_thresholds', shard, all_tickers, tickers,
+                                        {'period': args.period}, {'signal_tables': signal_tables})
+        print(f"\n✅ Shard {shard[0]}/{shard[1]} complete: {len(tickers)} tickers")
+        print(f"📁 Partial result saved: {shard_file}")
+        return
+    
+    write_optimization_reports(signal_tables, tickers, args.period, args.output_dir)
 
 
 if __name__ == "__main__":
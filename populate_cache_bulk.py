@@ -13,13 +13,14 @@ import time
 from datetime import datetime, timedelta
 from io import BytesIO
 from pathlib import Path
-from typing import Set, List, Dict
+from typing import Set, List, Dict, Optional
 
 import boto3
 import pandas as pd
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from corporate_actions import apply_adjustments, load_actions, needs_adjustment
 from schema_manager import SchemaManager
 
 schema_manager = SchemaManager()
@@ -78,16 +79,39 @@ def read_cache_dataframe(cache_file: Path) -> pd.DataFrame:
         print(f"      Warning: Failed to load {cache_file}: {e}")
         return pd.DataFrame()
 
-def write_cache_with_metadata(cache_file: Path, ticker: str, df: pd.DataFrame) -> None:
+def get_adjusted_through(cache_file: Path, existing_df: pd.DataFrame) -> Optional[str]:
+    """
+    Last bar of the cache that is already split/dividend adjusted, or None.
+
+    Caches from adjusted sources (yfinance) are adjusted through their last
+    bar; caches that already mix sources keep their recorded boundary; raw
+    (Massive) caches have none.
+    """
+    if existing_df.empty:
+        return None
+    metadata = schema_manager.read_metadata_from_csv(str(cache_file)) or {}
+    if metadata.get('adjusted_through'):
+        return metadata['adjusted_through']
+    if needs_adjustment(metadata.get('data_source')):
+        return None
+    return existing_df.index.max().isoformat()
+
+def write_cache_with_metadata(cache_file: Path, ticker: str, df: pd.DataFrame,
+                              adjusted_through: Optional[str] = None) -> None:
     """
     Persist cache data with metadata headers so downstream consumers can validate files.
+
+    Bars are raw (adjusted on read); adjusted_through marks the end of an
+    adjusted history they were appended to (see corporate_actions.py).
     """
     df = df.sort_index()
     metadata = schema_manager.create_metadata_header(
         ticker=ticker,
         df=df,
         interval="1d",
-        data_source="massive_flatfile"
+        auto_adjust=False,
+        data_source="massive_flatfile",
+        adjusted_through=adjusted_through
     )
     metadata_json = json.dumps(metadata, indent=2)
     with open(cache_file, 'w', newline='') as f:
@@ -153,8 +177,16 @@ def append_to_ticker_cache(ticker: str, date: datetime, ticker_data: pd.DataFram
             return 'SKIPPED'
         
         # Load existing data if file exists
+        adjusted_through = None
         if cache_file.exists():
             existing_df = read_cache_dataframe(cache_file)
+            adjusted_through = get_adjusted_through(cache_file, existing_df)
+            if adjusted_through is not None and converted.index.min() <= pd.Timestamp(adjusted_through):
+                # Backfill inside the adjusted history: adjust it like its neighbours
+                # (later actions are applied on read)
+                boundary = pd.Timestamp(adjusted_through).normalize()
+                actions = [a for a in load_actions(ticker) if pd.Timestamp(a['date']).normalize() <= boundary]
+                converted = apply_adjustments(converted, ticker, actions=actions)
             # Combine and sort
             combined = pd.concat([existing_df, converted])
             combined = combined[~combined.index.duplicated(keep='last')]
@@ -163,7 +195,7 @@ def append_to_ticker_cache(ticker: str, date: datetime, ticker_data: pd.DataFram
             combined = converted
         
         # Save
-        write_cache_with_metadata(cache_file, ticker, combined)
+        write_cache_with_metadata(cache_file, ticker, combined, adjusted_through)
         return 'ADDED'
         
     except Exception as e:
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Streaming ingest of Massive.com minute-aggregate flat files into the intraday store.
+
+Each trading day is one large gzip CSV (us_stocks_sip/minute_aggs_v1) holding
+every US stock. The file is decompressed and parsed in fixed-size chunks, only
+rows for our tickers are kept, and the surviving bars are written as day
+partitions into the base-interval intraday store (see intraday_store.py).
+The full file is never held in memory - peak memory is one chunk plus the
+(small) slice belonging to our tickers.
+
+Files can be streamed straight from Massive.com S3 or read from a local
+directory of previously downloaded/sample files.
+"""
+
+import argparse
+import gzip
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import boto3
+import pandas as pd
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+import intraday_store
+from error_handler import logger
+from populate_cache_bulk import collect_all_tickers, generate_trading_days
+
+MINUTE_AGGS_PREFIX = "us_stocks_sip/minute_aggs_v1"
+
+# Columns needed from the flat file (transactions etc. are skipped at parse time)
+MINUTE_AGG_COLUMNS = ['ticker', 'volume', 'open', 'close', 'high', 'low', 'window_start']
+MINUTE_AGG_DTYPES = {
+    'ticker': 'object',
+    'volume': 'float64',
+    'open': 'float64',
+    'close': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'window_start': 'int64',
+}
+
+# Rows parsed per chunk (~60 MB of parsed frame)
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Flat-file timestamps are UTC; the store keeps exchange-local wall time
+EXCHANGE_TIMEZONE = 'America/New_York'
+
+
+def get_minute_agg_key(date: datetime) -> str:
+    """Get the S3 object key for a day's minute-aggregate file."""
+    date_str = date.strftime('%Y-%m-%d')
+    return f"{MINUTE_AGGS_PREFIX}/{date.year}/{date.month:02d}/{date_str}.csv.gz"
+
+
+def convert_minute_aggs(ticker_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert Massive minute aggregates for one ticker to store format.
+
+    Args:
+        ticker_df (pd.DataFrame): Raw rows for a single ticker
+
+    Returns:
+        pd.DataFrame: OHLCV bars indexed by exchange-local, timezone-naive timestamps
+    """
+    if ticker_df.empty:
+        return pd.DataFrame()
+
+    index = (
+        pd.to_datetime(ticker_df['window_start'].to_numpy(), unit='ns', utc=True)
+        .tz_convert(EXCHANGE_TIMEZONE)
+        .tz_localize(None)
+    )
+    bars = pd.DataFrame({
+        'Open': ticker_df['open'].to_numpy(),
+        'High': ticker_df['high'].to_numpy(),
+        'Low': ticker_df['low'].to_numpy(),
+        'Close': ticker_df['close'].to_numpy(),
+        'Volume': ticker_df['volume'].to_numpy().round().astype('int64'),
+    }, index=pd.DatetimeIndex(index, name='Date'))
+    return bars.sort_index()
+
+
+def stream_minute_file(fileobj, tickers: Set[str],
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, pd.DataFrame]:
+    """
+    Stream one gzip minute-aggregate file and keep only rows for our tickers.
+
+    Args:
+        fileobj: Binary file-like object with gzip-compressed CSV content
+        tickers (Set[str]): Tickers to keep
+        chunk_rows (int): Rows parsed per chunk
+
+    Returns:
+        Dict[str, pd.DataFrame]: Converted bars per ticker found in the file
+    """
+    kept: Dict[str, List[pd.DataFrame]] = {}
+
+    with gzip.GzipFile(fileobj=fileobj) as gz:
+        reader = pd.read_csv(
+            gz,
+            usecols=MINUTE_AGG_COLUMNS,
+            dtype=MINUTE_AGG_DTYPES,
+            chunksize=chunk_rows,
+        )
+        for chunk in reader:
+            ours = chunk[chunk['ticker'].isin(tickers)]
+            if ours.empty:
+                continue
+            for ticker, ticker_rows in ours.groupby('ticker', sort=False):
+                kept.setdefault(ticker, []).append(ticker_rows)
+
+    return {
+        ticker: convert_minute_aggs(pd.concat(parts, ignore_index=True))
+        for ticker, parts in kept.items()
+    }
+
+
+def ingest_minute_file(fileobj, tickers: Set[str], chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       data_source: str = "massive_flatfile") -> Dict[str, int]:
+    """
+    Ingest one day file into the intraday store.
+
+    Args:
+        fileobj: Binary file-like object with gzip-compressed CSV content
+        tickers (Set[str]): Tickers to keep
+        chunk_rows (int): Rows parsed per chunk
+        data_source (str): Data source recorded in partition metadata
+
+    Returns:
+        Dict[str, int]: Stats with 'tickers' and 'bars' written
+    """
+    per_ticker = stream_minute_file(fileobj, tickers, chunk_rows)
+
+    bars_written = 0
+    for ticker, bars in per_ticker.items():
+        if bars.empty:
+            continue
+        intraday_store.save_intraday_bars(ticker, bars, interval=intraday_store.BASE_INTERVAL,
+                                          data_source=data_source)
+        bars_written += len(bars)
+
+    return {'tickers': len(per_ticker), 'bars': bars_written}
+
+
+def find_local_files(directory: str, start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None) -> List[Path]:
+    """
+    Find YYYY-MM-DD.csv.gz minute files in a local directory (recursively).
+
+    Args:
+        directory (str): Directory to search
+        start_date (datetime, optional): Skip files before this date
+        end_date (datetime, optional): Skip files after this date
+
+    Returns:
+        List[Path]: Matching files sorted by date
+    """
+    files = []
+    for path in Path(directory).rglob('*.csv.gz'):
+        try:
+            file_date = datetime.strptime(path.name[:10], '%Y-%m-%d')
+        except ValueError:
+            continue
+        if start_date and file_date < start_date:
+            continue
+        if end_date and file_date > end_date:
+            continue
+        files.append((file_date, path))
+    return [path for _, path in sorted(files)]
+
+
+def _iter_local_sources(files: Iterable[Path]):
+    """Yield (label, size_bytes, opener) for local files."""
+    for path in files:
+        yield path.name[:10], path.stat().st_size, lambda p=path: open(p, 'rb')
+
+
+def _iter_s3_sources(trading_days: Iterable[datetime]):
+    """Yield (label, size_bytes, opener) for Massive.com S3 objects."""
+    session = boto3.Session(profile_name='massive')
+    s3 = session.client(
+        's3',
+        endpoint_url='https://files.massive.com',
+        config=Config(signature_version='s3v4'),
+    )
+    bucket = 'flatfiles'
+
+    for date in trading_days:
+        key = get_minute_agg_key(date)
+        try:
+            response = s3.get_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                print(f"   {date.strftime('%Y-%m-%d')} ⊘ File not found (holiday/weekend)")
+                continue
+            # Throttling, expired credentials, 5xx: fail this day in the per-day
+            # handler instead of ending the whole ingest
+            def failed_opener(error=e):
+                raise error
+            yield date.strftime('%Y-%m-%d'), 0, failed_opener
+            continue
+        # StreamingBody is read incrementally by GzipFile - never buffered whole
+        yield date.strftime('%Y-%m-%d'), response.get('ContentLength', 0), lambda r=response: r['Body']
+
+
+def populate_intraday_bulk(tickers: Set[str], local_dir: Optional[str] = None,
+                           start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None,
+                           chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, float]:
+    """
+    Ingest minute-aggregate day files into the intraday store.
+
+    Args:
+        tickers (Set[str]): Tickers to keep
+        local_dir (str, optional): Read files from this directory instead of S3
+        start_date (datetime, optional): First day to ingest
+        end_date (datetime, optional): Last day to ingest
+        chunk_rows (int): Rows parsed per chunk
+
+    Returns:
+        Dict[str, float]: Summary statistics including throughput in MB/s
+    """
+    print("=" * 70)
+    print("MINUTE-AGGREGATE INGEST INTO INTRADAY STORE")
+    print("=" * 70)
+    print(f"Tickers: {len(tickers)}")
+    print(f"Source:  {local_dir if local_dir else 'Massive.com S3 (' + MINUTE_AGGS_PREFIX + ')'}")
+
+    if local_dir:
+        sources = _iter_local_sources(find_local_files(local_dir, start_date, end_date))
+    else:
+        end_date = end_date or datetime.now()
+        start_date = start_date or end_date - timedelta(days=30)
+        sources = _iter_s3_sources(generate_trading_days(start_date, end_date))
+
+    stats = {'days_processed': 0, 'days_failed': 0, 'bars_written': 0, 'bytes_read': 0}
+    start_time = time.time()
+
+    for label, size_bytes, opener in sources:
+        day_start = time.time()
+        try:
+            fileobj = opener()
+            try:
+                result = ingest_minute_file(fileobj, tickers, chunk_rows)
+            finally:
+                fileobj.close()
+
+            elapsed = time.time() - day_start
+            stats['days_processed'] += 1
+            stats['bars_written'] += result['bars']
+            stats['bytes_read'] += size_bytes
+            rate = (size_bytes / 1e6) / elapsed if elapsed > 0 else 0.0
+            print(f"   {label} ✓ {result['tickers']} tickers, {result['bars']:,} bars "
+                  f"({elapsed:.1f}s, {rate:.1f} MB/s)")
+        except Exception as e:
+            stats['days_failed'] += 1
+            logger.error(f"Failed to ingest minute file {label}: {e}")
+            print(f"   {label} ✗ Error: {str(e)[:50]}")
+
+    total_time = time.time() - start_time
+    stats['total_time'] = total_time
+    stats['mb_per_sec'] = (stats['bytes_read'] / 1e6) / total_time if total_time > 0 else 0.0
+
+    print(f"\n{'═'*70}")
+    print("📊 INGEST SUMMARY")
+    print(f"{'═'*70}")
+    print(f"  Days processed:  {stats['days_processed']}")
+    print(f"  Days failed:     {stats['days_failed']}")
+    print(f"  Bars written:    {stats['bars_written']:,}")
+    print(f"  Compressed read: {stats['bytes_read']/1e6:.1f} MB")
+    print(f"  Total time:      {total_time:.1f}s ({stats['mb_per_sec']:.1f} MB/s)")
+    print(f"{'═'*70}\n")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Stream Massive.com minute-aggregate flat files into the intraday store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Ingest last month of minute bars from Massive.com
+  python populate_intraday_bulk.py --months 1
+
+  # Ingest a date range
+  python populate_intraday_bulk.py --start 2025-01-02 --end 2025-01-31
+
+  # Ingest a local directory of sample files (YYYY-MM-DD.csv.gz)
+  python populate_intraday_bulk.py --local-dir ./minute_samples --file stocks.txt
+        """
+    )
+
+    parser.add_argument('--months', type=int, help='Number of months to go back from today')
+    parser.add_argument('--start', type=str, help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, help='End date (YYYY-MM-DD), defaults to today')
+    parser.add_argument(
+        '--file',
+        type=str,
+        default='stocks.txt',
+        help='Ticker file to read from (default: stocks.txt)'
+    )
+    parser.add_argument(
+        '--local-dir',
+        type=str,
+        help='Read minute files from a local directory instead of Massive.com'
+    )
+    parser.add_argument(
+        '--chunk-rows',
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=f'Rows parsed per chunk (default: {DEFAULT_CHUNK_ROWS:,})'
+    )
+
+    args = parser.parse_args()
+
+    end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else None
+    start_date = None
+    if args.start:
+        start_date = datetime.strptime(args.start, '%Y-%m-%d')
+    elif args.months:
+        start_date = (end_date or datetime.now()) - timedelta(days=args.months * 30)
+
+    tickers = collect_all_tickers(args.file)
+    if not tickers:
+        print(f"❌ No tickers found in {args.file}")
+        return
+
+    populate_intraday_bulk(
+        tickers=tickers,
+        local_dir=args.local_dir,
+        start_date=start_date,
+        end_date=end_date,
+        chunk_rows=args.chunk_rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,642 @@
+"""
+Portfolio-level risk-managed backtest with shared capital.
+
+batch_backtest.run_batch_backtest gives every ticker its own RiskManager
+account, so concurrent exposure and capital limits are never modelled. This
+engine runs all tickers against one account:
+
+- every ticker is aligned on a single date axis (dates x tickers arrays)
+- each day, open positions are advanced together with the same exit rules as
+  RiskManager.update_position (stop_simulator.apply_exit_rules)
+- the day's entry signals form a candidate queue ranked by score
+  (Accumulation_Score by default) and are filled in that order while the
+  max-position limit, per-sector cap and available cash allow
+
+Fills follow run_risk_managed_backtest: entries at the next bar's open, sized
+from realized equity and the initial stop, exits at the close (or stop price).
+When cash cannot cover the full risk-based size the position is reduced to
+what cash allows. Tickers that get_sector_etf() cannot map fall back to SPY
+and are not sector-capped.
+
+Usage:
+    python portfolio_backtest.py -f stocks.txt --period 24mo --max-positions 10
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest import RISK_MANAGED_ENTRY_SIGNALS, RISK_MANAGED_EXIT_SIGNALS
+from error_handler import ErrorContext, DataValidationError, validate_file_path, logger
+from range_query import RangeExtrema
+from regime_filter import get_sector_etf
+from risk_manager import (
+    DEFAULT_STOP_PARAMS, RiskManager, TradeLedger, TradeRecord, analyze_risk_managed_trades
+)
+from stop_simulator import PROFIT_TARGET_R, TRAIL_WINDOW, apply_exit_rules, calculate_initial_stops
+
+DEFAULT_RANK_COLUMN = 'Accumulation_Score'
+REGIME_COLUMNS = ('Market_Regime_OK', 'Sector_Regime_OK', 'Overall_Regime_OK')
+SCORE_COLUMNS = ('Accumulation_Score', 'Moderate_Buy_Score', 'Profit_Taking_Score')
+UNCAPPED_SECTOR = 'SPY'
+
+
+class PortfolioData:
+    """All tickers aligned on one date axis, plus the ranked entry candidates."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], rank_by: str = DEFAULT_RANK_COLUMN):
+        """
+        Align prepared analysis frames.
+
+        Args:
+            frames: Ticker -> DataFrame with signals and indicators (vol_analysis output)
+            rank_by: Column used to rank same-day entry candidates (higher first)
+        """
+        self.tickers = list(frames)
+        self.frames = frames
+        self.rank_by = rank_by
+
+        all_dates = [df.index.values for df in frames.values() if len(df)]
+        self.dates = pd.DatetimeIndex(np.unique(np.concatenate(all_dates))) if all_dates else pd.DatetimeIndex([])
+        n_dates, n_tickers = len(self.dates), len(self.tickers)
+
+        # Dense (dates x tickers) arrays; NaN where a ticker has no bar
+        self.close = np.full((n_dates, n_tickers), np.nan)
+        self.atr = np.full((n_dates, n_tickers), np.nan)
+        self.atr_z = np.full((n_dates, n_tickers), np.nan)
+        self.trail_low = np.full((n_dates, n_tickers), np.nan)
+        self.low = np.full((n_dates, n_tickers), np.nan)
+        self.high = np.full((n_dates, n_tickers), np.nan)
+        # Bit i set when RISK_MANAGED_EXIT_SIGNALS[i] fires
+        self.exit_bits = np.zeros((n_dates, n_tickers), dtype=np.uint8)
+        self.last_row = np.full(n_tickers, -1, dtype=int)
+
+        candidates = []
+        for col, (ticker, df) in enumerate(frames.items()):
+            rows = self.dates.get_indexer(df.index)
+            if not len(df):
+                continue
+            self.last_row[col] = rows[-1]
+
+            close = df['Close'].to_numpy(dtype=float)
+            self.close[rows, col] = close
+            self.trail_low[rows, col] = RangeExtrema(close).rolling_min(TRAIL_WINDOW)
+            if 'ATR20' in df.columns:
+                self.atr[rows, col] = df['ATR20'].to_numpy(dtype=float)
+            # update_position treats a missing ATR_Z column as 0
+            self.atr_z[rows, col] = df['ATR_Z'].to_numpy(dtype=float) if 'ATR_Z' in df.columns else 0.0
+            self.low[rows, col] = df['Low'].to_numpy(dtype=float) if 'Low' in df.columns else close
+            self.high[rows, col] = df['High'].to_numpy(dtype=float) if 'High' in df.columns else close
+
+            self.exit_bits[rows, col] = _signal_bits(df, RISK_MANAGED_EXIT_SIGNALS)
+
+            entry_bits = _signal_bits(df, RISK_MANAGED_ENTRY_SIGNALS)
+            signal_local = np.flatnonzero(entry_bits)
+            signal_local = signal_local[signal_local + 1 < len(df)]
+            if not len(signal_local):
+                continue
+            try:
+                stops = calculate_initial_stops(df, signal_local)
+            except KeyError as e:
+                logger.warning(f"{ticker}: no entries possible ({e})")
+                continue
+            if rank_by in df.columns:
+                scores = df[rank_by].to_numpy(dtype=float)[signal_local]
+            else:
+                scores = np.zeros(len(signal_local))
+            n_signals = len(signal_local)
+            table = {
+                'row': rows[signal_local],
+                'col': np.full(n_signals, col),
+                'signal_local': signal_local,
+                'entry_row': rows[signal_local + 1],
+                'entry_price': df['Open'].to_numpy(dtype=float)[signal_local + 1],
+                'stop': stops,
+                'score': np.nan_to_num(scores, nan=-np.inf),
+                'entry_bits': entry_bits[signal_local],
+            }
+            # Signal scores recorded at the signal bar, regime flags at the entry bar
+            for name in SCORE_COLUMNS:
+                present = name in df.columns
+                if name == 'Moderate_Buy_Score' and present:
+                    table[f'has_{name}'] = df['Moderate_Buy'].to_numpy().astype(bool)[signal_local]
+                else:
+                    table[f'has_{name}'] = np.full(n_signals, present)
+                table[name] = df[name].to_numpy(dtype=float)[signal_local] if present else np.full(n_signals, np.nan)
+            for name in REGIME_COLUMNS:
+                table[name] = (df[name].to_numpy().astype(bool)[signal_local + 1].astype(np.int8)
+                               if name in df.columns else np.full(n_signals, -1, dtype=np.int8))
+            candidates.append(table)
+
+        if candidates:
+            merged = {name: np.concatenate([table[name] for table in candidates]) for name in candidates[0]}
+            # Day, then score (highest first), then ticker order
+            order = np.lexsort((merged['col'], -merged['score'], merged['row']))
+            self.candidates = {name: values[order] for name, values in merged.items()}
+        else:
+            self.candidates = {name: np.zeros(0, dtype=int) for name in ('row', 'col', 'signal_local', 'entry_row')}
+        self.candidate_bounds = np.searchsorted(self.candidates['row'].astype(int),
+                                                np.arange(n_dates + 1), side='left')
+
+    def entry_metadata(self, i: int) -> Dict:
+        """Signal names, scores and regime flags for candidate i (as run_risk_managed_backtest records them)."""
+        cand = self.candidates
+        bits = int(cand['entry_bits'][i])
+        signal_scores = {
+            name: float(cand[name][i])
+            for name in SCORE_COLUMNS if cand[f'has_{name}'][i]
+        }
+        regime = {}
+        for name in REGIME_COLUMNS:
+            flag = int(cand[name][i])
+            regime[name.lower()] = None if flag < 0 else bool(flag)
+        return {
+            'entry_signals': _bits_to_signals(bits, RISK_MANAGED_ENTRY_SIGNALS),
+            'signal_scores': signal_scores,
+            **regime,
+        }
+
+    def candidates_on(self, row: int) -> range:
+        """Positions in the candidate arrays for entry signals on a date row, best first."""
+        return range(self.candidate_bounds[row], self.candidate_bounds[row + 1])
+
+
+def _signal_bits(df: pd.DataFrame, signals: List[str]) -> np.ndarray:
+    """Pack signal columns into a uint8 bitmask per bar (missing columns never fire)."""
+    bits = np.zeros(len(df), dtype=np.uint8)
+    for i, sig in enumerate(signals):
+        if sig in df.columns:
+            bits |= df[sig].to_numpy().astype(bool).astype(np.uint8) << i
+    return bits
+
+
+def _bits_to_signals(bits: int, signals: List[str]) -> List[str]:
+    """Signal names whose bits are set, in list order."""
+    return [sig for i, sig in enumerate(signals) if bits >> i & 1]
+
+
+def run_portfolio_backtest(
+    frames: Dict[str, pd.DataFrame],
+    account_value: float = 100000,
+    risk_pct: float = 0.75,
+    stop_strategy: str = 'time_decay',
+    max_positions: int = 10,
+    max_per_sector: Optional[int] = 3,
+    rank_by: str = DEFAULT_RANK_COLUMN,
+    sector_map: Optional[Dict[str, str]] = None,
+    stop_params: Optional[Dict] = None
+) -> Dict:
+    """
+    Backtest many tickers against one shared account.
+
+    Args:
+        frames: Ticker -> DataFrame with signals and indicators
+        account_value: Starting capital
+        risk_pct: Risk percentage of realized equity per trade
+        stop_strategy: One of RiskManager.SUPPORTED_STOP_STRATEGIES
+        max_positions: Maximum concurrent positions
+        max_per_sector: Maximum concurrent positions per sector ETF (None = no cap)
+        rank_by: Column ranking same-day entry candidates (higher first)
+        sector_map: Ticker -> sector label (default: regime_filter.get_sector_etf)
+        stop_params: Overrides for the strategy's DEFAULT_STOP_PARAMS entry
+
+    Returns:
+        Dict: 'trades' (TradeRecords), 'ledger', 'equity_curve' (DataFrame),
+            'analysis', 'rejected' (counts by reason) and 'summary'
+    """
+    with ErrorContext("running portfolio backtest", tickers=len(frames), stop_strategy=stop_strategy):
+        if stop_strategy not in RiskManager.SUPPORTED_STOP_STRATEGIES:
+            raise ValueError(f"Unsupported stop strategy '{stop_strategy}'. "
+                             f"Choose from {sorted(RiskManager.SUPPORTED_STOP_STRATEGIES)}")
+        if max_positions < 1:
+            raise DataValidationError("max_positions must be at least 1")
+
+        data = PortfolioData(frames, rank_by=rank_by)
+        params = {**DEFAULT_STOP_PARAMS.get(stop_strategy, {}), **(stop_params or {})}
+        stop_label = 'HARD_STOP' if stop_strategy == 'static' else f"{stop_strategy.upper()}_STOP"
+
+        tickers = data.tickers
+        sectors = [
+            (sector_map or {}).get(ticker) or get_sector_etf(ticker)
+            for ticker in tickers
+        ]
+        n_tickers = len(tickers)
+
+        # Position state, one slot per ticker (at most one position per ticker)
+        is_open = np.zeros(n_tickers, dtype=bool)
+        start_row = np.zeros(n_tickers, dtype=int)
+        entry_price = np.zeros(n_tickers)
+        stop = np.zeros(n_tickers)
+        shares = np.zeros(n_tickers, dtype=np.int64)
+        bars = np.zeros(n_tickers, dtype=int)
+        taken = np.zeros(n_tickers, dtype=bool)
+        trail_active = np.zeros(n_tickers, dtype=bool)
+        trail_price = np.full(n_tickers, np.nan)
+        peak_price = np.zeros(n_tickers)
+        peak_r = np.zeros(n_tickers)
+        lowest = np.full(n_tickers, np.inf)
+        highest = np.full(n_tickers, -np.inf)
+        last_close = np.full(n_tickers, np.nan)
+        meta: Dict[int, Dict] = {}
+
+        cash = float(account_value)
+        equity = float(account_value)
+        open_count = 0
+        sector_counts: Dict[str, int] = {}
+        trades: List[TradeRecord] = []
+        ledger = TradeLedger()
+        rejected = {'max_positions': 0, 'sector_cap': 0, 'cash': 0, 'invalid_stop': 0}
+        cash_limited = 0
+        curve = {'cash': [], 'market_value': [], 'equity': [], 'open_positions': []}
+
+        def close_position(col: int, row: int, fill: float, exit_type: str,
+                           exit_pct: float, exit_signals: List[str]) -> None:
+            """Mirror of RiskManager.close_position for one slot."""
+            nonlocal cash, equity, open_count
+            info = meta[col]
+            entry = entry_price[col]
+            risk_amount = entry - stop[col]
+            r_multiple = (fill - entry) / risk_amount if risk_amount > 0 else 0
+            partial = exit_pct < 1.0
+            exit_size = int(shares[col] * exit_pct) if partial else int(shares[col])
+            pnl = exit_size * (fill - entry)
+            cash += exit_size * fill
+            equity += pnl
+            if not partial and taken[col]:
+                r_multiple = (PROFIT_TARGET_R + r_multiple) / 2
+
+            trade = TradeRecord(
+                ticker=tickers[col],
+                entry_date=info['entry_date'],
+                entry_price=entry,
+                exit_date=data.dates[row],
+                exit_price=fill,
+                exit_type=exit_type,
+                bars_held=int(bars[col]),
+                r_multiple=r_multiple,
+                profit_pct=(fill / entry - 1) * 100,
+                position_size=exit_size,
+                partial_exit=partial,
+                exit_pct=exit_pct if partial else 1.0,
+                peak_r_multiple=peak_r[col],
+                profit_taken_50pct=exit_type == 'PROFIT_TARGET' if partial else bool(taken[col]),
+                dollar_pnl=pnl,
+                equity_after_trade=equity,
+                mae_pct=(lowest[col] / entry - 1) * 100 if np.isfinite(lowest[col]) else None,
+                mfe_pct=(highest[col] / entry - 1) * 100 if np.isfinite(highest[col]) else None,
+                initial_stop=info['initial_stop'],
+                entry_signals=info['entry_signals'],
+                exit_signals=exit_signals,
+                signal_scores=info['signal_scores'],
+                market_regime_ok=info['market_regime_ok'],
+                sector_regime_ok=info['sector_regime_ok'],
+                overall_regime_ok=info['overall_regime_ok']
+            )
+            trades.append(trade)
+            ledger.append(trade)
+
+            if partial:
+                shares[col] -= exit_size
+            else:
+                is_open[col] = False
+                open_count -= 1
+                sector_counts[sectors[col]] -= 1
+                del meta[col]
+
+        for row in range(len(data.dates)):
+            # 1. Advance every open position that has a bar today
+            cols = np.flatnonzero(is_open & (start_row <= row))
+            if cols.size:
+                price = data.close[row, cols]
+                cols, price = cols[~np.isnan(price)], price[~np.isnan(price)]
+            if cols.size:
+                bars[cols] += 1
+                lowest[cols] = np.fmin(lowest[cols], data.low[row, cols])
+                highest[cols] = np.fmax(highest[cols], data.high[row, cols])
+                last_close[cols] = price
+
+                rules = apply_exit_rules(
+                    stop_strategy, params, bars[cols], price, entry_price[cols], stop[cols],
+                    atr=data.atr[row, cols], atr_z=data.atr_z[row, cols],
+                    trail_low=data.trail_low[row, cols], live=np.ones(cols.size, dtype=bool),
+                    taken=taken[cols], trail_active=trail_active[cols],
+                    trail_price=trail_price[cols], peak_price=peak_price[cols]
+                )
+                r = rules['r']
+                peak_r[cols] = np.where(r > peak_r[cols], r, peak_r[cols])
+                stop[cols] = rules['stop']
+                taken[cols] = rules['taken']
+                trail_active[cols] = rules['trail_active']
+                trail_price[cols] = rules['trail_price']
+                peak_price[cols] = rules['peak_price']
+
+                exit_bits = data.exit_bits[row, cols]
+                signal = exit_bits != 0
+                risk_exit = rules['hard'] | rules['timed'] | rules['profit'] | rules['trail_hit']
+                for i in np.flatnonzero(risk_exit | signal):
+                    col = int(cols[i])
+                    if rules['hard'][i]:
+                        exit_type = stop_label
+                    elif rules['timed'][i]:
+                        exit_type = 'TIME_STOP'
+                    elif rules['profit'][i]:
+                        exit_type = 'PROFIT_TARGET'
+                    elif rules['trail_hit'][i]:
+                        exit_type = 'TRAIL_STOP'
+                    else:
+                        exit_type = 'SIGNAL_EXIT'
+                    if signal[i]:
+                        fill = price[i]
+                    else:
+                        fill = stop[col] if rules['hard'][i] else price[i]
+                    exit_signals = [] if risk_exit[i] else _bits_to_signals(int(exit_bits[i]), RISK_MANAGED_EXIT_SIGNALS)
+                    close_position(col, row, fill, exit_type,
+                                   0.5 if rules['profit'][i] else 1.0, exit_signals)
+
+            # 2. Tickers whose data ends today close at their last bar
+            for col in np.flatnonzero(is_open & (data.last_row == row) & (start_row <= row)):
+                close_position(int(col), row, last_close[col], 'END_OF_DATA', 1.0, [])
+
+            # 3. Fill today's entry candidates in score order
+            todays = data.candidates_on(row)
+            for i in todays:
+                col = int(data.candidates['col'][i])
+                if is_open[col]:
+                    continue
+                price_in = float(data.candidates['entry_price'][i])
+                initial_stop = float(data.candidates['stop'][i])
+                if not initial_stop < price_in:
+                    rejected['invalid_stop'] += 1
+                    continue
+                if open_count >= max_positions:
+                    # Book is full: tally the rest of the queue without walking it
+                    rest = slice(i, todays.stop)
+                    waiting = ~is_open[data.candidates['col'][rest].astype(int)]
+                    valid = data.candidates['stop'][rest] < data.candidates['entry_price'][rest]
+                    rejected['max_positions'] += int((waiting & valid).sum())
+                    rejected['invalid_stop'] += int((waiting & ~valid).sum())
+                    break
+                sector = sectors[col]
+                if (max_per_sector is not None and sector != UNCAPPED_SECTOR
+                        and sector_counts.get(sector, 0) >= max_per_sector):
+                    rejected['sector_cap'] += 1
+                    continue
+                risk_amount = equity * (risk_pct / 100)
+                size = int(risk_amount / (price_in - initial_stop)) if risk_amount > 0 else 0
+                affordable = int(cash // price_in) if cash > 0 else 0
+                if size > affordable:
+                    size = affordable
+                    cash_limited += 1
+                if size <= 0:
+                    rejected['cash'] += 1
+                    continue
+
+                meta[col] = {
+                    'entry_date': data.dates[int(data.candidates['entry_row'][i])],
+                    'initial_stop': initial_stop,
+                    **data.entry_metadata(i),
+                }
+                is_open[col] = True
+                open_count += 1
+                start_row[col] = int(data.candidates['entry_row'][i])
+                entry_price[col] = price_in
+                stop[col] = initial_stop
+                shares[col] = size
+                bars[col] = -1
+                taken[col] = trail_active[col] = False
+                trail_price[col] = np.nan
+                peak_price[col] = price_in
+                peak_r[col] = 0.0
+                lowest[col], highest[col] = np.inf, -np.inf
+                last_close[col] = price_in
+                sector_counts[sector] = sector_counts.get(sector, 0) + 1
+                cash -= size * price_in
+
+            # 4. Mark to market (unfilled entries at cost)
+            held = np.flatnonzero(is_open)
+            market_value = float(np.dot(shares[held], last_close[held])) if held.size else 0.0
+            curve['cash'].append(cash)
+            curve['market_value'].append(market_value)
+            curve['equity'].append(cash + market_value)
+            curve['open_positions'].append(int(held.size))
+
+        equity_curve = pd.DataFrame(curve, index=data.dates)
+        if len(equity_curve):
+            running_peak = equity_curve['equity'].cummax()
+            equity_curve['drawdown_pct'] = (equity_curve['equity'] / running_peak - 1) * 100
+        else:
+            equity_curve['drawdown_pct'] = []
+
+        summary = {
+            'tickers': n_tickers,
+            'days': len(data.dates),
+            'starting_capital': float(account_value),
+            'ending_equity': equity,
+            'total_return_pct': (equity / account_value - 1) * 100 if account_value else 0.0,
+            'max_drawdown_pct': float(equity_curve['drawdown_pct'].min()) if len(equity_curve) else 0.0,
+            'max_concurrent_positions': int(equity_curve['open_positions'].max()) if len(equity_curve) else 0,
+            'avg_exposure_pct': float((equity_curve['market_value'] / equity_curve['equity']).mean() * 100)
+                                if len(equity_curve) else 0.0,
+            'entries_taken': len({(t['ticker'], t['entry_date']) for t in trades}),
+            'cash_limited_entries': cash_limited,
+            'stop_strategy': stop_strategy,
+            'max_positions': max_positions,
+            'max_per_sector': max_per_sector,
+        }
+
+        return {
+            'trades': trades,
+            'ledger': ledger,
+            'equity_curve': equity_curve,
+            'analysis': analyze_risk_managed_trades(ledger) if len(ledger) else {},
+            'rejected': rejected,
+            'summary': summary,
+        }
+
+
+def generate_portfolio_report(result: Dict, period: str = '') -> str:
+    """
+    Format a portfolio backtest result as a text report.
+
+    Args:
+        result: Output of run_portfolio_backtest()
+        period: Period label for the header
+
+    Returns:
+        str: Report text
+    """
+    summary = result['summary']
+    analysis = result.get('analysis') or {}
+    rejected = result['rejected']
+    lines = [
+        "=" * 70,
+        f"📊 PORTFOLIO BACKTEST{f' ({period})' if period else ''}",
+        "=" * 70,
+        "",
+        f"Tickers: {summary['tickers']} | Days: {summary['days']} | Stop strategy: {summary['stop_strategy']}",
+        f"Limits: {summary['max_positions']} positions, "
+        f"{summary['max_per_sector'] if summary['max_per_sector'] is not None else 'no'} per sector",
+        "",
+        "💰 ACCOUNT",
+        f"  Starting capital:   ${summary['starting_capital']:,.2f}",
+        f"  Ending equity:      ${summary['ending_equity']:,.2f}",
+        f"  Total return:       {summary['total_return_pct']:+.2f}%",
+        f"  Max drawdown:       {summary['max_drawdown_pct']:.2f}%",
+        f"  Avg exposure:       {summary['avg_exposure_pct']:.1f}%",
+        f"  Peak positions:     {summary['max_concurrent_positions']}",
+        "",
+        "🎯 TRADES",
+        f"  Entries taken:      {summary['entries_taken']}",
+        f"  Trade records:      {len(result['trades'])}",
+    ]
+    if analysis:
+        lines += [
+            f"  Win rate:           {analysis.get('Win Rate', 'N/A')}",
+            f"  Avg R-multiple:     {analysis.get('Average R-Multiple', 'N/A')}",
+            f"  Total P&L:          {analysis.get('Total Dollar P&L', 'N/A')}",
+        ]
+    lines += [
+        "",
+        "🚫 SKIPPED ENTRIES",
+        f"  Max positions:      {rejected['max_positions']}",
+        f"  Sector cap:         {rejected['sector_cap']}",
+        f"  Insufficient cash:  {rejected['cash']}",
+        f"  Invalid stop:       {rejected['invalid_stop']}",
+        f"  Cash-limited size:  {summary['cash_limited_entries']}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def load_portfolio_frames(tickers: List[str], period: str = '12mo',
+                          start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
+    """
+    Prepare analysis frames for every ticker (same pipeline as batch_backtest).
+
+    Args:
+        tickers: Ticker symbols
+        period: Analysis period
+        start_date: Optional start date (YYYY-MM-DD)
+        end_date: Optional end date (YYYY-MM-DD)
+
+    Returns:
+        Dict[str, pd.DataFrame]: Frames for tickers that loaded successfully
+    """
+    from analysis_service import get_analysis_dataframe
+    from signal_threshold_validator import apply_empirical_thresholds
+
+    frames = {}
+    for i, ticker in enumerate(tickers, 1):
+        try:
+            # A date range is read directly (plus indicator warmup), not masked out of the period
+            range_kwargs = {}
+            if start_date and end_date:
+                range_kwargs = dict(start_date=pd.Timestamp(start_date), end_date=pd.Timestamp(end_date))
+            df = get_analysis_dataframe(ticker=ticker, period=period, data_source='yfinance',
+                                        force_refresh=False, verbose=False, **range_kwargs)
+            frames[ticker] = apply_empirical_thresholds(df)
+            logger.info(f"Loaded {ticker} ({i}/{len(tickers)}): {len(df)} bars")
+        except Exception as e:
+            logger.error(f"Failed to load {ticker}: {e}")
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Portfolio backtest with shared capital across tickers',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 10 concurrent positions, at most 3 per sector
+  python portfolio_backtest.py -f stocks.txt --period 24mo
+
+  # Tighter book, ranked by Moderate Buy score
+  python portfolio_backtest.py -f stocks.txt --max-positions 5 --rank-by Moderate_Buy_Score
+
+  # Historical window without sector caps
+  python portfolio_backtest.py -f stocks.txt --start-date 2022-01-01 --end-date 2023-12-31 --no-sector-cap
+        """
+    )
+    parser.add_argument('-f', '--file', dest='ticker_file', required=True,
+                        help='Path to file containing ticker symbols (one per line)')
+    parser.add_argument('-p', '--period', default='12mo',
+                        help='Analysis period (default: 12mo) - ignored if date range provided')
+    parser.add_argument('--start-date', help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', help='End date (YYYY-MM-DD)')
+    parser.add_argument('-o', '--output-dir', default='backtest_results',
+                        help='Output directory (default: backtest_results)')
+    parser.add_argument('--account-value', type=float, default=100000,
+                        help='Starting capital (default: 100000)')
+    parser.add_argument('--risk-pct', type=float, default=0.75,
+                        help='Risk per trade as %% of equity (default: 0.75)')
+    parser.add_argument('--stop-strategy', choices=sorted(RiskManager.SUPPORTED_STOP_STRATEGIES),
+                        default='time_decay', help='Stop-loss strategy (default: time_decay)')
+    parser.add_argument('--max-positions', type=int, default=10,
+                        help='Maximum concurrent positions (default: 10)')
+    parser.add_argument('--max-per-sector', type=int, default=3,
+                        help='Maximum concurrent positions per sector ETF (default: 3)')
+    parser.add_argument('--no-sector-cap', action='store_true', help='Disable the sector cap')
+    parser.add_argument('--rank-by', default=DEFAULT_RANK_COLUMN,
+                        help=f'Column ranking same-day entries (default: {DEFAULT_RANK_COLUMN})')
+    parser.add_argument('--offline', action='store_true',
+                        help='Use stored earnings dates only (no network calls)')
+    parser.add_argument('--no-frame-cache', action='store_true',
+                        help='Rebuild analysis frames instead of using the persistent frame cache')
+
+    args = parser.parse_args()
+
+    if args.no_frame_cache:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+
+    if (args.start_date and not args.end_date) or (args.end_date and not args.start_date):
+        parser.error("--start-date and --end-date must be used together")
+    if args.offline:
+        import earnings_calendar
+        earnings_calendar.set_offline_mode(True)
+
+    from data_manager import read_ticker_file
+    validate_file_path(args.ticker_file, check_exists=True, check_readable=True)
+    tickers = read_ticker_file(args.ticker_file)
+    if not tickers:
+        print("❌ No valid tickers found in file")
+        sys.exit(1)
+
+    print(f"📥 Preparing {len(tickers)} tickers...")
+    frames = load_portfolio_frames(tickers, args.period, args.start_date, args.end_date)
+    if not frames:
+        print("❌ No ticker data could be prepared")
+        sys.exit(1)
+
+    result = run_portfolio_backtest(
+        frames,
+        account_value=args.account_value,
+        risk_pct=args.risk_pct,
+        stop_strategy=args.stop_strategy,
+        max_positions=args.max_positions,
+        max_per_sector=None if args.no_sector_cap else args.max_per_sector,
+        rank_by=args.rank_by
+    )
+
+    period_display = f"{args.start_date} to {args.end_date}" if args.start_date else args.period
+    report = generate_portfolio_report(result, period_display)
+    print("\n" + report)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    base = os.path.join(args.output_dir, f"PORTFOLIO_{args.stop_strategy}_{timestamp}")
+    with open(f"{base}.txt", 'w') as f:
+        f.write(report)
+    result['ledger'].to_frame().to_csv(f"{base}_trades.csv", index=False)
+    result['equity_curve'].to_csv(f"{base}_equity.csv", index_label='Date')
+    print(f"✅ Report saved: {base}.txt")
+    print(f"✅ Trades and equity curve saved alongside ({len(result['trades'])} trade records)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Range minimum/maximum queries over price columns.
+
+Trailing stops, swing detection and trade excursion metrics all ask the same
+question: "what is the lowest/highest value between bar i and bar j?". Slicing
+the DataFrame and calling .min() for every bar makes those loops O(n * window).
+RangeExtrema builds sparse tables once per column (O(n log n)) and then answers
+any inclusive [start, end] query in O(1), for single ranges or whole arrays of
+ranges at once.
+
+NaN values are ignored like pandas .min()/.max(); a range that is entirely NaN
+returns NaN.
+
+Example:
+    >>> lows = RangeExtrema(df['Low'])
+    >>> lows.range_min(entry_idx, exit_idx)          # lowest low while in a trade
+    >>> lows.rolling_min(10)                         # trailing 10-bar low for every bar
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class RangeExtrema:
+    """Sparse-table range min/max over a 1-D array of values."""
+
+    def __init__(self, values):
+        """
+        Build min and max sparse tables.
+
+        Args:
+            values: 1-D array-like (Series, ndarray or list) of numbers
+        """
+        data = np.asarray(values, dtype=float)
+        if data.ndim != 1:
+            raise ValueError("RangeExtrema requires 1-D values")
+        self.length = len(data)
+
+        # NaN never wins a min/max: +inf for the min table, -inf for the max table
+        nan_mask = np.isnan(data)
+        level_min = np.where(nan_mask, np.inf, data)
+        level_max = np.where(nan_mask, -np.inf, data)
+        self._min_levels = [level_min]
+        self._max_levels = [level_max]
+
+        span = 1
+        while 2 * span <= self.length:
+            level_min = np.minimum(level_min[:-span], level_min[span:])
+            level_max = np.maximum(level_max[:-span], level_max[span:])
+            self._min_levels.append(level_min)
+            self._max_levels.append(level_max)
+            span *= 2
+
+    def _levels_for(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Sparse-table level (floor(log2(length))) for each range."""
+        lengths = ends - starts + 1
+        if np.any(lengths <= 0) or np.any(starts < 0) or np.any(ends >= self.length):
+            raise IndexError("Range out of bounds")
+        return np.floor(np.log2(lengths)).astype(int)
+
+    def _query(self, levels_table, combine, starts, ends, empty) -> np.ndarray:
+        starts = np.asarray(starts, dtype=int)
+        ends = np.asarray(ends, dtype=int)
+        if starts.size == 0:
+            return np.empty(starts.shape, dtype=float)
+        levels = self._levels_for(starts, ends)
+        result = np.empty(starts.shape, dtype=float)
+        for level in np.unique(levels):
+            mask = levels == level
+            table = levels_table[level]
+            left = table[starts[mask]]
+            right = table[ends[mask] - (1 << level) + 1]
+            result[mask] = combine(left, right)
+        result[result == empty] = np.nan
+        return result
+
+    def range_min_many(self, starts, ends) -> np.ndarray:
+        """Minimum over each inclusive [starts[k], ends[k]] range."""
+        return self._query(self._min_levels, np.minimum, starts, ends, np.inf)
+
+    def range_max_many(self, starts, ends) -> np.ndarray:
+        """Maximum over each inclusive [starts[k], ends[k]] range."""
+        return self._query(self._max_levels, np.maximum, starts, ends, -np.inf)
+
+    def range_min(self, start: int, end: int) -> float:
+        """Minimum over the inclusive bar range [start, end]."""
+        if start < 0 or end >= self.length or end < start:
+            raise IndexError("Range out of bounds")
+        level = (end - start + 1).bit_length() - 1
+        table = self._min_levels[level]
+        value = min(table[start], table[end - (1 << level) + 1])
+        return float('nan') if value == np.inf else float(value)
+
+    def range_max(self, start: int, end: int) -> float:
+        """Maximum over the inclusive bar range [start, end]."""
+        if start < 0 or end >= self.length or end < start:
+            raise IndexError("Range out of bounds")
+        level = (end - start + 1).bit_length() - 1
+        table = self._max_levels[level]
+        value = max(table[start], table[end - (1 << level) + 1])
+        return float('nan') if value == -np.inf else float(value)
+
+    def rolling_min(self, window: int) -> np.ndarray:
+        """Trailing `window`-bar minimum ending at every bar (shorter at the start)."""
+        ends = np.arange(self.length)
+        return self.range_min_many(np.maximum(ends - window + 1, 0), ends)
+
+    def rolling_max(self, window: int) -> np.ndarray:
+        """Trailing `window`-bar maximum ending at every bar (shorter at the start)."""
+        ends = np.arange(self.length)
+        return self.range_max_many(np.maximum(ends - window + 1, 0), ends)
+
+
+def build_range_extrema(df: pd.DataFrame, columns=('Close', 'High', 'Low')) -> Dict[str, RangeExtrema]:
+    """
+    Build RangeExtrema for the given columns of a frame (missing columns skipped).
+
+    Args:
+        df (pd.DataFrame): Price DataFrame
+        columns: Column names to index
+
+    Returns:
+        Dict[str, RangeExtrema]: Range structures keyed by column name
+    """
+    return {col: RangeExtrema(df[col].to_numpy()) for col in columns if col in df.columns}
+
+
+def calculate_excursions(lows: RangeExtrema, highs: RangeExtrema, entry_idx: int,
+                         exit_idx: int, entry_price: float) -> Dict[str, Optional[float]]:
+    """
+    Maximum adverse and favorable excursion of a long trade.
+
+    Args:
+        lows (RangeExtrema): Range structure over Low (or Close) prices
+        highs (RangeExtrema): Range structure over High (or Close) prices
+        entry_idx (int): Bar position of the entry fill
+        exit_idx (int): Bar position of the exit (inclusive)
+        entry_price (float): Entry fill price
+
+    Returns:
+        Dict[str, Optional[float]]: 'mae_pct' (<= 0 when price traded below entry)
+            and 'mfe_pct' as percent of entry price; None if the range is invalid
+    """
+    if entry_price <= 0 or entry_idx < 0 or exit_idx < entry_idx or exit_idx >= lows.length:
+        return {'mae_pct': None, 'mfe_pct': None}
+    lowest = lows.range_min(entry_idx, exit_idx)
+    highest = highs.range_max(entry_idx, exit_idx)
+    return {
+        'mae_pct': None if np.isnan(lowest) else (lowest / entry_price - 1) * 100,
+        'mfe_pct': None if np.isnan(highest) else (highest / entry_price - 1) * 100,
+    }
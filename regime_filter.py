@@ -13,15 +13,27 @@ Author: Volume Analysis System
 Last Updated: 2025-11-05
 """
 
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
-from data_manager import get_smart_data
+import frame_cache
+from data_manager import get_cache_fingerprint, get_range_data, get_smart_data
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Moving-average windows of the market (SPY) and sector (ETF) regimes
+MARKET_MA_WINDOW = 200
+SECTOR_MA_WINDOW = 50
+
+# Persisted regime series (same file format and LRU limit as the frame cache)
+DEFAULT_REGIME_STORE_DIR = os.path.join('data_cache', 'regime')
+
+# Regime series computed in this process: (benchmark, window) -> (key, frame)
+_regime_store: Dict[tuple, tuple] = {}
+
 # Sector ETF mapping
 SECTOR_ETFS = {
     # Technology
@@ -89,18 +101,23 @@ def get_sector_etf(ticker: str) -> str:
 def load_benchmark_data(ticker: str, 
                        period: Optional[str] = '12mo',
                        start_date: Optional[pd.Timestamp] = None,
-                       end_date: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+                       end_date: Optional[pd.Timestamp] = None,
+                       warmup_bars: int = 0) -> Optional[pd.DataFrame]:
     """
     Load benchmark data (SPY or sector ETF) from cache ONLY.
     
     This function requires pre-populated cache and will NOT fall back to yfinance.
     This prevents rate limiting and ensures predictable data sources.
     
+    With start_date, only the rows from warmup_bars before start_date through
+    end_date are read from the cache (range seek, no full-file parse).
+    
     Args:
         ticker: Benchmark symbol
         period: Data period (e.g., '12mo', '6mo') - ignored if start_date provided
         start_date: Explicit start date (overrides period)
         end_date: Optional end date for historical analysis
+        warmup_bars: Extra bars to include before start_date (moving-average warmup)
         
     Returns:
         DataFrame with OHLCV data
@@ -127,13 +144,13 @@ def load_benchmark_data(ticker: str,
     
     try:
         # Load from cache only - no yfinance fallback
-        df = get_smart_data(ticker, period=required_period, force_refresh=False)
-        
-        # Filter to requested date range if needed
-        if df is not None and not df.empty:
-            if start_date is not None:
-                df = df[df.index >= start_date]
-            if end_date is not None:
+        if start_date is not None:
+            df = get_range_data(ticker, start_date, end_date, warmup_bars=warmup_bars)
+        else:
+            df = get_smart_data(ticker, period=required_period, force_refresh=False)
+            
+            # Filter to requested date range if needed
+            if df is not None and not df.empty and end_date is not None:
                 df = df[df.index <= end_date]
         
         if df is None or df.empty:
@@ -173,6 +190,96 @@ def load_benchmark_data(ticker: str,
         )
 
 
+def _regime_store_key(benchmark: str, window: int) -> Optional[str]:
+    """Key of a benchmark's regime series: its cache checksum, actions and the MA window."""
+    from corporate_actions import get_actions_fingerprint
+    
+    fingerprint = get_cache_fingerprint(benchmark, "1d")
+    if fingerprint is None:
+        return None
+    return frame_cache.get_frame_cache_key(
+        ('regime', benchmark, window, fingerprint, get_actions_fingerprint(benchmark))
+    )
+
+
+def get_regime_frame(benchmark: str, window: int) -> pd.DataFrame:
+    """
+    Regime series of one benchmark over its full cached history.
+    
+    Computed once per benchmark cache state: later calls in the process reuse
+    it, and other processes load it from DEFAULT_REGIME_STORE_DIR, until the
+    benchmark cache (checksum) or its corporate actions change.
+    
+    Args:
+        benchmark: Benchmark symbol (SPY or a sector ETF)
+        window: Moving-average window (MARKET_MA_WINDOW or SECTOR_MA_WINDOW)
+        
+    Returns:
+        DataFrame with 'Close', 'MA' and 'Regime_OK' (Close > MA) columns
+        
+    Raises:
+        RuntimeError: If the benchmark is not cached
+    """
+    benchmark = benchmark.upper()
+    key = _regime_store_key(benchmark, window)
+    if key is None:
+        raise RuntimeError(
+            f"No cache data for regime benchmark {benchmark} "
+            f"(populate data_cache/{benchmark}_1d_data.csv)"
+        )
+    
+    stored = _regime_store.get((benchmark, window))
+    if stored is not None and stored[0] == key:
+        return stored[1]
+    
+    label = f"ma{window}"
+    regime = frame_cache.load_frame(benchmark, label, '1d', key, DEFAULT_REGIME_STORE_DIR)
+    if regime is None:
+        close = get_range_data(benchmark, None)['Close']
+        moving_average = close.rolling(window, min_periods=window).mean()
+        regime = pd.DataFrame({
+            'Close': close,
+            'MA': moving_average,
+            'Regime_OK': close > moving_average,
+        })
+        logger.info(f"Computed {benchmark} {window}-day regime series: {len(regime)} bars")
+        try:
+            frame_cache.save_frame(benchmark, label, '1d', key, regime, DEFAULT_REGIME_STORE_DIR)
+        except Exception as e:
+            logger.warning(f"Could not store {benchmark} regime series: {e}")
+    
+    _regime_store[(benchmark, window)] = (key, regime)
+    return regime
+
+
+def build_regime_store(sector_etfs: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Compute (or load) the market regime and every sector regime series once.
+    
+    Args:
+        sector_etfs: Sector ETFs to include (default: all ETFs in SECTOR_ETFS)
+        
+    Returns:
+        Dict mapping 'SPY' to the market regime frame and each sector ETF to its
+        sector regime frame (benchmarks without a cache are skipped)
+    """
+    if sector_etfs is None:
+        sector_etfs = sorted(set(SECTOR_ETFS.values()) - {'SPY'})
+    
+    store = {}
+    for benchmark, window in [('SPY', MARKET_MA_WINDOW)] + [(etf, SECTOR_MA_WINDOW) for etf in sector_etfs]:
+        try:
+            store[benchmark] = get_regime_frame(benchmark, window)
+        except Exception as e:
+            logger.warning(f"Regime series unavailable for {benchmark}: {e}")
+    return store
+
+
+def clear_regime_store() -> None:
+    """Forget regime series computed in this process (persisted ones are kept)."""
+    _regime_store.clear()
+
+
 def calculate_historical_regime_series(ticker: str, df: pd.DataFrame) -> tuple:
     """
     Calculate historical regime status for each bar in DataFrame.
@@ -180,6 +287,10 @@ def calculate_historical_regime_series(ticker: str, df: pd.DataFrame) -> tuple:
     This function eliminates lookahead bias by checking regime status 
     for each date in the backtest period, not just current regime.
     
+    The SPY and sector ETF series come from the regime store (computed once
+    per benchmark, see get_regime_frame()); each ticker only aligns them to
+    its own dates.
+    
     Args:
         ticker: Stock symbol (determines sector ETF)
         df: DataFrame with DatetimeIndex
@@ -189,62 +300,22 @@ def calculate_historical_regime_series(ticker: str, df: pd.DataFrame) -> tuple:
         Each is a boolean Series aligned with df.index
     """
     try:
-        # Get date range from DataFrame with buffer for MA calculations
-        start_date = df.index.min() - pd.DateOffset(months=12)  # Extra buffer for 200-day MA
-        end_date = df.index.max()
-        
-        logger.info(f"Fetching historical regime data for {ticker} from {start_date.date()} to {end_date.date()}")
-        
-        # Fetch SPY historical data
-        spy_data = load_benchmark_data('SPY', period=None, 
-                                       start_date=start_date, 
-                                       end_date=end_date)
-        
-        if spy_data is None or len(spy_data) < 200:
-            logger.warning(f"Insufficient SPY data for historical regime calculation")
-            # Return all False (conservative - no signals allowed)
-            return (
-                pd.Series(False, index=df.index),
-                pd.Series(False, index=df.index),
-                pd.Series(False, index=df.index)
-            )
-        
-        # Fetch sector ETF historical data
         sector_etf = get_sector_etf(ticker)
-        sector_data = load_benchmark_data(sector_etf, period=None,
-                                         start_date=start_date,
-                                         end_date=end_date)
+        market_frame = get_regime_frame('SPY', MARKET_MA_WINDOW)
+        sector_frame = get_regime_frame(sector_etf, SECTOR_MA_WINDOW)
         
-        if sector_data is None or len(sector_data) < 50:
+        if market_frame['MA'].isna().all():
+            logger.warning(f"Insufficient SPY data for historical regime calculation")
+        if sector_frame['MA'].isna().all():
             logger.warning(f"Insufficient {sector_etf} data for historical regime calculation")
-            # Return all False (conservative)
-            return (
-                pd.Series(False, index=df.index),
-                pd.Series(False, index=df.index),
-                pd.Series(False, index=df.index)
-            )
-        
-        # Calculate SPY 200-day MA
-        spy_data['MA200'] = spy_data['Close'].rolling(200, min_periods=200).mean()
-        spy_data['Market_Regime_OK'] = spy_data['Close'] > spy_data['MA200']
-        
-        # Calculate Sector 50-day MA
-        sector_data['MA50'] = sector_data['Close'].rolling(50, min_periods=50).mean()
-        sector_data['Sector_Regime_OK'] = sector_data['Close'] > sector_data['MA50']
-        
-        # Normalize timezones - convert all to timezone-naive for comparison
-        if spy_data.index.tz is not None:
-            spy_data.index = spy_data.index.tz_localize(None)
-        if sector_data.index.tz is not None:
-            sector_data.index = sector_data.index.tz_localize(None)
         
-        # Also normalize the target DataFrame index
+        # Normalize the target DataFrame index (regime series are timezone-naive)
         df_index_normalized = df.index
         if df_index_normalized.tz is not None:
             df_index_normalized = df_index_normalized.tz_localize(None)
         
         # Align with DataFrame dates (handles weekends/holidays)
-        market_regime = spy_data['Market_Regime_OK'].reindex(
+        market_regime = market_frame['Regime_OK'].reindex(
             df_index_normalized, 
             method='ffill'  # Forward-fill for non-trading days
         ).fillna(False)  # Conservative: missing data = regime FAIL
@@ -252,7 +323,7 @@ def calculate_historical_regime_series(ticker: str, df: pd.DataFrame) -> tuple:
         # Restore original index (with timezone if it had one)
         market_regime.index = df.index
         
-        sector_regime = sector_data['Sector_Regime_OK'].reindex(
+        sector_regime = sector_frame['Regime_OK'].reindex(
             df_index_normalized,
             method='ffill'
         ).fillna(False)
@@ -13,9 +13,244 @@ Part of upgrade_spec.md Item #13
 Updated Nov 2025: Removed aggressive momentum checks, uses regular exit signals
 """
 
+import copy
+
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Optional, List, Union
+
+from range_query import RangeExtrema, calculate_excursions
+
+# Default parameters per variable stop strategy (lifted from validation harness)
+DEFAULT_STOP_PARAMS = {
+    'vol_regime': {
+        'low_vol_mult': 1.5,
+        'normal_vol_mult': 2.0,
+        'high_vol_mult': 2.5,
+        'low_threshold': -0.5,
+        'high_threshold': 0.5
+    },
+    'atr_dynamic': {
+        'multiplier': 2.0,
+        'min_multiplier': 1.5,
+        'max_multiplier': 3.0
+    },
+    'pct_trail': {
+        'trail_pct': 8.0,
+        'activation_r': 1.0
+    },
+    'time_decay': {
+        'day_5_mult': 2.5,
+        'day_10_mult': 2.0,
+        'day_15_mult': 1.5
+    }
+}
+
+
+class _RecordAccess:
+    """
+    Dict-style access for slotted position/trade records.
+    
+    Existing callers index positions and trades like dicts (trade['r_multiple'],
+    trade.get('ticker'), 'dollar_pnl' in trade). Declared fields map to slots;
+    any other key (e.g. a caller tagging trade['strategy']) goes to `extras`.
+    """
+    __slots__ = ()
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__dataclass_fields__ and key != 'extras':
+            return getattr(self, key)
+        if self.extras is not None and key in self.extras:
+            return self.extras[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.__dataclass_fields__ and key != 'extras':
+            setattr(self, key, value)
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+    
+    def __contains__(self, key: str) -> bool:
+        return (key in self.__dataclass_fields__ and key != 'extras') or \
+            (self.extras is not None and key in self.extras)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def keys(self) -> List[str]:
+        names = [name for name in self.__dataclass_fields__ if name != 'extras']
+        return names + list(self.extras or ())
+    
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain dict copy (declared fields followed by extras)."""
+        return dict(self.items())
+
+
+@dataclass(slots=True)
+class Position(_RecordAccess):
+    """Open position state, updated in place on every bar."""
+    ticker: str
+    entry_date: pd.Timestamp
+    entry_price: float
+    stop_price: float
+    position_size: int
+    original_position_size: int
+    entry_idx: int
+    bars_in_trade: int = 0
+    peak_r_multiple: float = 0.0
+    profit_taken_50pct: bool = False
+    trail_stop_active: bool = False
+    trail_stop_price: Optional[float] = None
+    current_r_multiple: float = 0.0
+    peak_price: Optional[float] = None
+    equity_at_entry: float = 0.0
+    # Stop at entry; entry_price - initial_stop is the sizing risk per share
+    initial_stop: Optional[float] = None
+    # Signal metadata for trade quality analysis
+    entry_signals: List[str] = field(default_factory=list)
+    signal_scores: Dict[str, float] = field(default_factory=dict)
+    # Regime filter status at entry
+    market_regime_ok: Optional[bool] = None
+    sector_regime_ok: Optional[bool] = None
+    overall_regime_ok: Optional[bool] = None
+    extras: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class TradeRecord(_RecordAccess):
+    """One closed (full or partial) trade produced by RiskManager.close_position()."""
+    ticker: str
+    entry_date: pd.Timestamp
+    entry_price: float
+    exit_date: pd.Timestamp
+    exit_price: float
+    exit_type: str
+    bars_held: int
+    r_multiple: float
+    profit_pct: float
+    position_size: int
+    partial_exit: bool
+    exit_pct: float
+    peak_r_multiple: float
+    profit_taken_50pct: bool
+    dollar_pnl: float
+    equity_after_trade: float
+    # Max adverse/favorable excursion from entry to exit, % of entry price
+    mae_pct: Optional[float] = None
+    mfe_pct: Optional[float] = None
+    # Stop at entry (sizing risk per share = entry_price - initial_stop)
+    initial_stop: Optional[float] = None
+    # Signal metadata
+    entry_signals: List[str] = field(default_factory=list)
+    exit_signals: List[str] = field(default_factory=list)
+    signal_scores: Dict[str, float] = field(default_factory=dict)
+    # Regime filter data at entry
+    market_regime_ok: Optional[bool] = None
+    sector_regime_ok: Optional[bool] = None
+    overall_regime_ok: Optional[bool] = None
+    extras: Optional[Dict[str, Any]] = None
+
+
+def _record_from_dict(record_cls, data: Dict[str, Any]):
+    """Build a Position/TradeRecord from to_dict() output (unknown keys → extras)."""
+    record = record_cls(**{k: v for k, v in data.items()
+                           if k in record_cls.__dataclass_fields__ and k != 'extras'})
+    for key, value in data.items():
+        if key not in record_cls.__dataclass_fields__:
+            record[key] = value
+    return record
+
+
+TRADE_COLUMNS = [f.name for f in fields(TradeRecord) if f.name != 'extras']
+_TRADE_FIELD_GETTER = attrgetter(*TRADE_COLUMNS)
+_TRADE_COLUMN_SET = frozenset(TRADE_COLUMNS)
+
+
+class TradeLedger:
+    """
+    Columnar (struct-of-arrays) trade ledger.
+    
+    Each trade field is kept in its own list, and analytics read whole columns
+    as NumPy arrays instead of walking per-trade dicts or building a DataFrame
+    from them. Rows are snapshots taken when a trade is appended.
+    """
+    
+    def __init__(self):
+        self._columns: Dict[str, List[Any]] = {name: [] for name in TRADE_COLUMNS}
+        self._base_columns = [self._columns[name] for name in TRADE_COLUMNS]
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._length = 0
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def append(self, trade: Union[TradeRecord, Dict]) -> None:
+        """Append one trade (TradeRecord or legacy dict) as a row."""
+        if isinstance(trade, TradeRecord):
+            row = _TRADE_FIELD_GETTER(trade)
+            extras = trade.extras
+        else:
+            row = [trade.get(name) for name in TRADE_COLUMNS]
+            extras = {k: v for k, v in trade.items() if k not in _TRADE_COLUMN_SET}
+        for values, value in zip(self._base_columns, row):
+            values.append(value)
+        
+        if extras or len(self._columns) > len(TRADE_COLUMNS):
+            # Extra keys become additional columns (None for rows without them)
+            for key, value in (extras or {}).items():
+                if key not in self._columns:
+                    self._columns[key] = [None] * self._length
+                self._columns[key].append(value)
+            for values in self._columns.values():
+                if len(values) == self._length:
+                    values.append(None)
+        self._length += 1
+        if self._arrays:
+            self._arrays.clear()
+    
+    @classmethod
+    def from_records(cls, trades: Iterable[Union[TradeRecord, Dict]]) -> 'TradeLedger':
+        """Build a ledger from trade records or legacy trade dicts."""
+        ledger = cls()
+        for trade in trades:
+            ledger.append(trade)
+        return ledger
+    
+    def column(self, name: str, dtype=None, fill: Any = None) -> np.ndarray:
+        """
+        Return a column as a NumPy array.
+        
+        Args:
+            name: Column name
+            dtype: Optional dtype to cast to (e.g. float, bool)
+            fill: Replacement for missing (None/NaN) values before casting
+        """
+        key = (name, dtype, fill) if fill is not None or dtype is not None else name
+        cached = self._arrays.get(key)
+        if cached is not None:
+            return cached
+        values = self._columns.get(name, [None] * self._length)
+        if fill is not None:
+            values = [fill if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in values]
+        elif dtype is float:
+            values = [np.nan if v is None else v for v in values]
+        array = np.asarray(values, dtype=dtype if dtype is not None else object)
+        self._arrays[key] = array
+        return array
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Return the ledger as a DataFrame (one row per trade)."""
+        return pd.DataFrame(self._columns)
 
 
 class RiskManager:
@@ -54,33 +289,107 @@ class RiskManager:
         if strategy not in self.SUPPORTED_STOP_STRATEGIES:
             raise ValueError(f"Unsupported stop strategy '{stop_strategy}'. Choose from {sorted(self.SUPPORTED_STOP_STRATEGIES)}")
         self.stop_strategy = strategy
-        self.active_positions: Dict[str, Dict] = {}
-        self.closed_trades: List[Dict] = []
+        self.active_positions: Dict[str, Position] = {}
+        self.closed_trades: List[TradeRecord] = []
+        self.ledger = TradeLedger()
+        
+        # Column arrays of the frame being backtested (see bind_frame)
+        self._bound_df: Optional[pd.DataFrame] = None
+        self._bound_columns: Dict[str, np.ndarray] = {}
+        self._bound_ranges: Dict[str, RangeExtrema] = {}
         
         # Stop strategy parameters (lifted from validation harness)
-        self.stop_params = {
-            'vol_regime': {
-                'low_vol_mult': 1.5,
-                'normal_vol_mult': 2.0,
-                'high_vol_mult': 2.5,
-                'low_threshold': -0.5,
-                'high_threshold': 0.5
-            },
-            'atr_dynamic': {
-                'multiplier': 2.0,
-                'min_multiplier': 1.5,
-                'max_multiplier': 3.0
-            },
-            'pct_trail': {
-                'trail_pct': 8.0,
-                'activation_r': 1.0
-            },
-            'time_decay': {
-                'day_5_mult': 2.5,
-                'day_10_mult': 2.0,
-                'day_15_mult': 1.5
-            }
-        }
+        self.stop_params = copy.deepcopy(DEFAULT_STOP_PARAMS)
+    
+    def bind_frame(self, df: pd.DataFrame, share_with: Optional['RiskManager'] = None) -> None:
+        """
+        Serve per-bar lookups on df from pre-extracted NumPy columns.
+        
+        Backtest loops call this once before walking the bars so that stop
+        calculations read array elements instead of building a row Series with
+        df.iloc[idx] on every bar. Lookups against any other frame (or with a
+        non-integer index) fall back to df.iloc. The frame must not be modified
+        while bound.
+        
+        Args:
+            df: DataFrame that subsequent calls will pass with integer positions
+            share_with: Another manager bound to the same frame whose column
+                arrays and range tables should be reused (multi-strategy runs)
+        """
+        self._bound_df = df
+        if share_with is not None and share_with is not self and share_with._bound_df is df:
+            self._bound_columns = share_with._bound_columns
+            self._bound_ranges = share_with._bound_ranges
+        else:
+            self._bound_columns = {}
+            self._bound_ranges = {}
+    
+    def unbind_frame(self) -> None:
+        """Drop the column arrays captured by bind_frame()."""
+        self._bound_df = None
+        self._bound_columns = {}
+        self._bound_ranges = {}
+    
+    def _bound_range(self, df: pd.DataFrame, column: str) -> Optional[RangeExtrema]:
+        """Range min/max structure over a bound frame column (built on first use)."""
+        if df is not self._bound_df or column not in df.columns:
+            return None
+        ranges = self._bound_ranges.get(column)
+        if ranges is None:
+            ranges = RangeExtrema(self._bound_column(df, column))
+            self._bound_ranges[column] = ranges
+        return ranges
+    
+    def _bound_column(self, df: pd.DataFrame, column: str) -> Optional[np.ndarray]:
+        """Return the cached array for column if df is the bound frame."""
+        if df is not self._bound_df:
+            return None
+        values = self._bound_columns.get(column)
+        if values is None:
+            if column not in df.columns:
+                raise KeyError(column)
+            values = df[column].to_numpy()
+            self._bound_columns[column] = values
+        return values
+    
+    def _value(self, df: pd.DataFrame, column: str, idx, default=None):
+        """
+        Look up df.iloc[idx][column], using bound column arrays when possible.
+        
+        Args:
+            df: DataFrame with indicators
+            column: Column name
+            idx: Integer bar position
+            default: Returned when the column is missing (None raises KeyError)
+        """
+        if default is not None and column not in df.columns:
+            return default
+        if isinstance(idx, (int, np.integer)):
+            values = self._bound_column(df, column)
+            if values is not None:
+                return values[idx]
+        return df.iloc[idx][column]
+    
+    def _trailing_close_low(self, df: pd.DataFrame, current_idx: int, window: int = 10) -> float:
+        """Lowest close over the last `window` bars ending at current_idx."""
+        start = current_idx - (window - 1) if current_idx >= window else 0
+        closes = self._bound_range(df, 'Close')
+        if closes is not None:
+            return closes.range_min(start, current_idx)
+        return df.iloc[start:current_idx + 1]['Close'].min()
+    
+    def _trade_excursions(self, pos: Position, exit_idx: Optional[int]) -> Dict[str, Optional[float]]:
+        """MAE/MFE for a position from the bound frame's High/Low (Close fallback)."""
+        df = self._bound_df
+        if df is None:
+            return {'mae_pct': None, 'mfe_pct': None}
+        if exit_idx is None:
+            exit_idx = pos.entry_idx + pos.bars_in_trade
+        lows = self._bound_range(df, 'Low') or self._bound_range(df, 'Close')
+        highs = self._bound_range(df, 'High') or self._bound_range(df, 'Close')
+        if lows is None or highs is None:
+            return {'mae_pct': None, 'mfe_pct': None}
+        return calculate_excursions(lows, highs, pos.entry_idx, exit_idx, pos.entry_price)
     
     def calculate_position_size(self, entry_price: float, stop_price: float) -> int:
         """
@@ -140,9 +449,10 @@ class RiskManager:
         if missing_cols:
             raise KeyError(f"Missing required columns: {missing_cols}")
         
-        # Use .iloc for integer positions
-        swing_stop = df.iloc[entry_idx]['Recent_Swing_Low'] - (0.5 * df.iloc[entry_idx]['ATR20'])
-        vwap_stop = df.iloc[entry_idx]['VWAP'] - (1.0 * df.iloc[entry_idx]['ATR20'])
+        # Integer positions (served from bound column arrays during backtests)
+        atr = self._value(df, 'ATR20', entry_idx)
+        swing_stop = self._value(df, 'Recent_Swing_Low', entry_idx) - (0.5 * atr)
+        vwap_stop = self._value(df, 'VWAP', entry_idx) - (1.0 * atr)
         
         initial_stop = min(swing_stop, vwap_stop)
         
@@ -150,7 +460,7 @@ class RiskManager:
     
     def calculate_vol_regime_stop(
         self, 
-        pos: Dict, 
+        pos: Position, 
         df: pd.DataFrame, 
         current_idx: int
     ) -> float:
@@ -166,7 +476,7 @@ class RiskManager:
         - High vol (ATR_Z > 0.5): Wider 2.5 ATR stop (volatile markets)
         
         Args:
-            pos: Position dictionary with entry info
+            pos: Position record with entry info
             df: DataFrame with indicators including ATR20 and ATR_Z
             current_idx: Current bar index
             
@@ -174,8 +484,8 @@ class RiskManager:
             Updated stop price (never lower than current stop)
         """
         # Get current volatility metrics
-        current_atr = df.iloc[current_idx]['ATR20']
-        atr_z = df.iloc[current_idx].get('ATR_Z', 0)
+        current_atr = self._value(df, 'ATR20', current_idx)
+        atr_z = self._value(df, 'ATR_Z', current_idx, default=0)
         
         # Determine regime and multiplier
         params = self.stop_params['vol_regime']
@@ -187,10 +497,10 @@ class RiskManager:
             multiplier = params['normal_vol_mult']
         
         # Calculate new stop from entry price
-        new_stop = pos['entry_price'] - (current_atr * multiplier)
+        new_stop = pos.entry_price - (current_atr * multiplier)
         
         # Never lower the stop (only tighten)
-        return max(new_stop, pos['stop_price'])
+        return max(new_stop, pos.stop_price)
     
     def calculate_variable_stop(
         self, 
@@ -220,7 +530,7 @@ class RiskManager:
             return None
         
         pos = self.active_positions[ticker]
-        current_price = df.iloc[current_idx]['Close']
+        current_price = self._value(df, 'Close', current_idx)
         
         if self.stop_strategy == 'vol_regime':
             return self.calculate_vol_regime_stop(pos, df, current_idx)
@@ -236,7 +546,7 @@ class RiskManager:
 
     def _calculate_atr_dynamic_stop(
         self,
-        pos: Dict,
+        pos: Position,
         df: pd.DataFrame,
         current_idx: int
     ) -> float:
@@ -244,17 +554,17 @@ class RiskManager:
         ATR-based dynamic stop: Adjusts between min/max multipliers.
         """
         params = self.stop_params['atr_dynamic']
-        current_atr = df.iloc[current_idx]['ATR20']
+        current_atr = self._value(df, 'ATR20', current_idx)
         multiplier = params['multiplier']
-        stop = pos['entry_price'] - (current_atr * multiplier)
-        max_stop = pos['entry_price'] - (current_atr * params['min_multiplier'])
-        min_stop = pos['entry_price'] - (current_atr * params['max_multiplier'])
+        stop = pos.entry_price - (current_atr * multiplier)
+        max_stop = pos.entry_price - (current_atr * params['min_multiplier'])
+        min_stop = pos.entry_price - (current_atr * params['max_multiplier'])
         stop = max(min_stop, min(stop, max_stop))
-        return max(stop, pos['stop_price'])
+        return max(stop, pos.stop_price)
 
     def _calculate_pct_trail_stop(
         self,
-        pos: Dict,
+        pos: Position,
         df: pd.DataFrame,
         current_idx: int,
         current_price: float
@@ -263,17 +573,17 @@ class RiskManager:
         Percentage-based trailing stop activated after reaching activation R.
         """
         params = self.stop_params['pct_trail']
-        if pos['current_r_multiple'] < params['activation_r']:
-            return pos['stop_price']
-        if 'peak_price' not in pos:
-            pos['peak_price'] = pos['entry_price']
-        pos['peak_price'] = max(pos['peak_price'], current_price)
-        trail_stop = pos['peak_price'] * (1 - params['trail_pct'] / 100)
-        return max(trail_stop, pos['stop_price'])
+        if pos.current_r_multiple < params['activation_r']:
+            return pos.stop_price
+        if pos.peak_price is None:
+            pos.peak_price = pos.entry_price
+        pos.peak_price = max(pos.peak_price, current_price)
+        trail_stop = pos.peak_price * (1 - params['trail_pct'] / 100)
+        return max(trail_stop, pos.stop_price)
 
     def _calculate_time_decay_stop(
         self,
-        pos: Dict,
+        pos: Position,
         df: pd.DataFrame,
         current_idx: int
     ) -> float:
@@ -281,8 +591,8 @@ class RiskManager:
         Time-decay stop: gradually tightens as the trade ages.
         """
         params = self.stop_params['time_decay']
-        bars_in_trade = pos['bars_in_trade']
-        current_atr = df.iloc[current_idx]['ATR20']
+        bars_in_trade = pos.bars_in_trade
+        current_atr = self._value(df, 'ATR20', current_idx)
         if bars_in_trade <= 5:
             multiplier = params['day_5_mult']
         elif bars_in_trade <= 10:
@@ -293,8 +603,8 @@ class RiskManager:
             multiplier = params['day_10_mult'] + progress * (params['day_15_mult'] - params['day_10_mult'])
         else:
             multiplier = params['day_15_mult']
-        stop = pos['entry_price'] - (current_atr * multiplier)
-        return max(stop, pos['stop_price'])
+        stop = pos.entry_price - (current_atr * multiplier)
+        return max(stop, pos.stop_price)
     
     def open_position(
         self, 
@@ -306,7 +616,7 @@ class RiskManager:
         df: pd.DataFrame,
         entry_signals: List[str] = None,
         signal_scores: Dict = None
-    ) -> Dict:
+    ) -> Position:
         """
         Open a new position with full risk management.
         
@@ -321,7 +631,7 @@ class RiskManager:
             signal_scores: Dict of signal scores at entry (e.g., {'Accumulation_Score': 7.8})
             
         Returns:
-            Position dictionary with all tracking fields
+            Position record with all tracking fields
         """
         position_size = self.calculate_position_size(entry_price, stop_price)
         
@@ -334,36 +644,31 @@ class RiskManager:
         overall_regime_ok = None
         
         if 'Market_Regime_OK' in df.columns:
-            market_regime_ok = bool(df.iloc[entry_idx]['Market_Regime_OK'])
+            market_regime_ok = bool(self._value(df, 'Market_Regime_OK', entry_idx))
         if 'Sector_Regime_OK' in df.columns:
-            sector_regime_ok = bool(df.iloc[entry_idx]['Sector_Regime_OK'])
+            sector_regime_ok = bool(self._value(df, 'Sector_Regime_OK', entry_idx))
         if 'Overall_Regime_OK' in df.columns:
-            overall_regime_ok = bool(df.iloc[entry_idx]['Overall_Regime_OK'])
-        
-        position = {
-            'ticker': ticker,
-            'entry_date': entry_date,
-            'entry_price': entry_price,
-            'stop_price': stop_price,
-            'position_size': position_size,
-            'original_position_size': position_size,
-            'entry_idx': entry_idx,
-            'bars_in_trade': 0,
-            'peak_r_multiple': 0.0,
-            'profit_taken_50pct': False,
-            'trail_stop_active': False,
-            'trail_stop_price': None,
-            'current_r_multiple': 0.0,
-            'peak_price': entry_price,
-            'equity_at_entry': self.equity,
+            overall_regime_ok = bool(self._value(df, 'Overall_Regime_OK', entry_idx))
+        
+        position = Position(
+            ticker=ticker,
+            entry_date=entry_date,
+            entry_price=entry_price,
+            stop_price=stop_price,
+            position_size=position_size,
+            original_position_size=position_size,
+            entry_idx=entry_idx,
+            peak_price=entry_price,
+            equity_at_entry=self.equity,
+            initial_stop=stop_price,
             # Signal metadata for trade quality analysis
-            'entry_signals': entry_signals or [],
-            'signal_scores': signal_scores or {},
+            entry_signals=entry_signals or [],
+            signal_scores=signal_scores or {},
             # Regime filter status at entry
-            'market_regime_ok': market_regime_ok,
-            'sector_regime_ok': sector_regime_ok,
-            'overall_regime_ok': overall_regime_ok
-        }
+            market_regime_ok=market_regime_ok,
+            sector_regime_ok=sector_regime_ok,
+            overall_regime_ok=overall_regime_ok
+        )
         
         self.active_positions[ticker] = position
         
@@ -408,12 +713,12 @@ class RiskManager:
         pos = self.active_positions[ticker]
         
         # Calculate position metrics
-        pos['bars_in_trade'] = current_idx - pos['entry_idx']
-        risk_amount = pos['entry_price'] - pos['stop_price']
-        profit_amount = current_price - pos['entry_price']
+        pos.bars_in_trade = current_idx - pos.entry_idx
+        risk_amount = pos.entry_price - pos.stop_price
+        profit_amount = current_price - pos.entry_price
         r_multiple = profit_amount / risk_amount if risk_amount > 0 else 0
-        pos['current_r_multiple'] = r_multiple
-        pos['peak_r_multiple'] = max(pos['peak_r_multiple'], r_multiple)
+        pos.current_r_multiple = r_multiple
+        pos.peak_r_multiple = max(pos.peak_r_multiple, r_multiple)
         
         exit_signals = {
             'should_exit': False,
@@ -428,7 +733,7 @@ class RiskManager:
         # CRITICAL FIX: Do not check exits on entry bar (bars_in_trade = 0)
         # This ensures end-of-day signals have at least 1 full bar before exit checks
         # Entry happens at open of bar N, we don't check exits until bar N+1
-        if pos['bars_in_trade'] == 0:
+        if pos.bars_in_trade == 0:
             return exit_signals
         
         # Exit checks only run when bars_in_trade >= 1
@@ -439,24 +744,24 @@ class RiskManager:
         if self.stop_strategy != 'static':
             new_stop = self.calculate_variable_stop(ticker, df, current_idx)
             if new_stop is not None:
-                pos['stop_price'] = new_stop
+                pos.stop_price = new_stop
         
         # 1. HARD STOP: Below initial stop (or variable stop if enabled)
-        if current_price < pos['stop_price']:
+        if current_price < pos.stop_price:
             exit_signals['should_exit'] = True
             if self.stop_strategy == 'static':
                 exit_signals['exit_type'] = 'HARD_STOP'
             else:
                 exit_signals['exit_type'] = f"{self.stop_strategy.upper()}_STOP"
-            exit_signals['exit_price'] = pos['stop_price']
-            exit_signals['reason'] = f"Stop hit at {pos['stop_price']:.2f}"
+            exit_signals['exit_price'] = pos.stop_price
+            exit_signals['reason'] = f"Stop hit at {pos.stop_price:.2f}"
             return exit_signals
         
         # 2. TIME STOP: Exit after 12 bars if <+1R
-        if pos['bars_in_trade'] >= 12 and r_multiple < 1.0:
+        if pos.bars_in_trade >= 12 and r_multiple < 1.0:
             exit_signals['should_exit'] = True
             exit_signals['exit_type'] = 'TIME_STOP'
-            exit_signals['reason'] = f"Time stop: {pos['bars_in_trade']} bars, {r_multiple:.2f}R"
+            exit_signals['reason'] = f"Time stop: {pos.bars_in_trade} bars, {r_multiple:.2f}R"
             return exit_signals
         
         # NOTE: Momentum failure check removed - use regular exit signals instead
@@ -464,7 +769,7 @@ class RiskManager:
         # are more reliable for end-of-day trading and should be checked separately
         
         # 3. PROFIT TARGET: Take 50% at +2R
-        if r_multiple >= 2.0 and not pos['profit_taken_50pct']:
+        if r_multiple >= 2.0 and not pos.profit_taken_50pct:
             exit_signals['should_exit'] = True
             exit_signals['partial_exit'] = True
             exit_signals['exit_pct'] = 0.5
@@ -472,34 +777,26 @@ class RiskManager:
             exit_signals['reason'] = f"Profit target: {r_multiple:.2f}R achieved, taking 50%"
             
             # Activate trailing stop for remaining 50%
-            pos['profit_taken_50pct'] = True
-            pos['trail_stop_active'] = True
+            pos.profit_taken_50pct = True
+            pos.trail_stop_active = True
             
             # Initialize trailing stop to 10-day low
-            if current_idx >= 10:
-                trail_stop = df.iloc[current_idx-9:current_idx+1]['Close'].min()
-            else:
-                trail_stop = df.iloc[:current_idx+1]['Close'].min()
-            
-            pos['trail_stop_price'] = trail_stop
+            pos.trail_stop_price = self._trailing_close_low(df, current_idx)
             
             return exit_signals
         
         # 4. TRAILING STOP: 10-day low after +2R
-        if pos['trail_stop_active'] and pos['trail_stop_price'] is not None:
+        if pos.trail_stop_active and pos.trail_stop_price is not None:
             # Update trailing stop to 10-day low
-            if current_idx >= 10:
-                trail_stop = df.iloc[current_idx-9:current_idx+1]['Close'].min()
-            else:
-                trail_stop = df.iloc[:current_idx+1]['Close'].min()
+            trail_stop = self._trailing_close_low(df, current_idx)
             
             # Only raise the stop, never lower it
-            pos['trail_stop_price'] = max(pos['trail_stop_price'], trail_stop)
+            pos.trail_stop_price = max(pos.trail_stop_price, trail_stop)
             
-            if current_price < pos['trail_stop_price']:
+            if current_price < pos.trail_stop_price:
                 exit_signals['should_exit'] = True
                 exit_signals['exit_type'] = 'TRAIL_STOP'
-                exit_signals['reason'] = f"Trailing stop hit at {pos['trail_stop_price']:.2f}"
+                exit_signals['reason'] = f"Trailing stop hit at {pos.trail_stop_price:.2f}"
                 return exit_signals
         
         return exit_signals
@@ -511,8 +808,9 @@ class RiskManager:
         exit_type: str, 
         exit_date: pd.Timestamp,
         partial_exit_pct: float = 1.0,
-        exit_signals: List[str] = None
-    ) -> Optional[Dict]:
+        exit_signals: List[str] = None,
+        exit_idx: Optional[int] = None
+    ) -> Optional[TradeRecord]:
         """
         Close position and calculate final P&L.
         
@@ -523,9 +821,11 @@ class RiskManager:
             exit_date: Date of exit
             partial_exit_pct: Percentage of position exited (0.5 for 50%, 1.0 for full)
             exit_signals: List of exit signal names that triggered (e.g., ['Distribution_Warning'])
+            exit_idx: Bar position of the exit, used for MAE/MFE when a frame is
+                bound (default: entry_idx + bars_in_trade)
             
         Returns:
-            Trade result dictionary, or None if position doesn't exist
+            TradeRecord for the (partial) exit, or None if position doesn't exist
         """
         if ticker not in self.active_positions:
             return None
@@ -533,53 +833,58 @@ class RiskManager:
         pos = self.active_positions[ticker]
         
         # Calculate final P&L
-        risk_amount = pos['entry_price'] - pos['stop_price']
-        profit_amount = exit_price - pos['entry_price']
+        risk_amount = pos.entry_price - pos.stop_price
+        profit_amount = exit_price - pos.entry_price
         r_multiple = profit_amount / risk_amount if risk_amount > 0 else 0
+        excursions = self._trade_excursions(pos, exit_idx)
         
         # If partial exit, adjust position size
         if partial_exit_pct < 1.0:
             # This is a 50% exit, keep position open
-            exit_size = int(pos['position_size'] * partial_exit_pct)
-            pos['position_size'] = pos['position_size'] - exit_size
+            exit_size = int(pos.position_size * partial_exit_pct)
+            pos.position_size = pos.position_size - exit_size
             
             # Record partial exit as separate trade
-            pnl = exit_size * (exit_price - pos['entry_price'])
+            pnl = exit_size * (exit_price - pos.entry_price)
             self.equity += pnl
-            partial_trade = {
-                'ticker': ticker,
-                'entry_date': pos['entry_date'],
-                'entry_price': pos['entry_price'],
-                'exit_date': exit_date,
-                'exit_price': exit_price,
-                'exit_type': exit_type,
-                'bars_held': pos['bars_in_trade'],
-                'r_multiple': r_multiple,
-                'profit_pct': (exit_price / pos['entry_price'] - 1) * 100,
-                'position_size': exit_size,
-                'partial_exit': True,
-                'exit_pct': partial_exit_pct,
-                'peak_r_multiple': pos['peak_r_multiple'],
-                'profit_taken_50pct': exit_type == 'PROFIT_TARGET',
-                'dollar_pnl': pnl,
-                'equity_after_trade': self.equity,
+            partial_trade = TradeRecord(
+                ticker=ticker,
+                entry_date=pos.entry_date,
+                entry_price=pos.entry_price,
+                exit_date=exit_date,
+                exit_price=exit_price,
+                exit_type=exit_type,
+                bars_held=pos.bars_in_trade,
+                r_multiple=r_multiple,
+                profit_pct=(exit_price / pos.entry_price - 1) * 100,
+                position_size=exit_size,
+                partial_exit=True,
+                exit_pct=partial_exit_pct,
+                peak_r_multiple=pos.peak_r_multiple,
+                profit_taken_50pct=exit_type == 'PROFIT_TARGET',
+                dollar_pnl=pnl,
+                equity_after_trade=self.equity,
+                mae_pct=excursions['mae_pct'],
+                mfe_pct=excursions['mfe_pct'],
+                initial_stop=pos.initial_stop,
                 # Signal metadata
-                'entry_signals': pos.get('entry_signals', []),
-                'exit_signals': exit_signals or [],
-                'signal_scores': pos.get('signal_scores', {}),
+                entry_signals=pos.entry_signals,
+                exit_signals=exit_signals or [],
+                signal_scores=pos.signal_scores,
                 # Regime filter data at entry
-                'market_regime_ok': pos.get('market_regime_ok'),
-                'sector_regime_ok': pos.get('sector_regime_ok'), 
-                'overall_regime_ok': pos.get('overall_regime_ok')
-            }
+                market_regime_ok=pos.market_regime_ok,
+                sector_regime_ok=pos.sector_regime_ok, 
+                overall_regime_ok=pos.overall_regime_ok
+            )
             
             self.closed_trades.append(partial_trade)
+            self.ledger.append(partial_trade)
             
             return partial_trade
         else:
             # Full exit - close position
             # Account for partial exit if 50% was taken earlier
-            if pos['profit_taken_50pct']:
+            if pos.profit_taken_50pct:
                 # 50% was taken at +2R, calculate blended result
                 first_half_r = 2.0
                 second_half_r = r_multiple
@@ -587,45 +892,49 @@ class RiskManager:
             else:
                 blended_r = r_multiple
             
-            exit_size = pos['position_size']
-            pnl = exit_size * (exit_price - pos['entry_price'])
+            exit_size = pos.position_size
+            pnl = exit_size * (exit_price - pos.entry_price)
             self.equity += pnl
             
-            trade_result = {
-                'ticker': ticker,
-                'entry_date': pos['entry_date'],
-                'entry_price': pos['entry_price'],
-                'exit_date': exit_date,
-                'exit_price': exit_price,
-                'exit_type': exit_type,
-                'bars_held': pos['bars_in_trade'],
-                'r_multiple': blended_r,
-                'profit_pct': (exit_price / pos['entry_price'] - 1) * 100,
-                'position_size': pos['position_size'],
-                'partial_exit': False,
-                'exit_pct': 1.0,
-                'profit_taken_50pct': pos['profit_taken_50pct'],
-                'peak_r_multiple': pos['peak_r_multiple'],
-                'dollar_pnl': pnl,
-                'equity_after_trade': self.equity,
+            trade_result = TradeRecord(
+                ticker=ticker,
+                entry_date=pos.entry_date,
+                entry_price=pos.entry_price,
+                exit_date=exit_date,
+                exit_price=exit_price,
+                exit_type=exit_type,
+                bars_held=pos.bars_in_trade,
+                r_multiple=blended_r,
+                profit_pct=(exit_price / pos.entry_price - 1) * 100,
+                position_size=pos.position_size,
+                partial_exit=False,
+                exit_pct=1.0,
+                profit_taken_50pct=pos.profit_taken_50pct,
+                peak_r_multiple=pos.peak_r_multiple,
+                dollar_pnl=pnl,
+                equity_after_trade=self.equity,
+                mae_pct=excursions['mae_pct'],
+                mfe_pct=excursions['mfe_pct'],
+                initial_stop=pos.initial_stop,
                 # Signal metadata
-                'entry_signals': pos.get('entry_signals', []),
-                'exit_signals': exit_signals or [],
-                'signal_scores': pos.get('signal_scores', {}),
+                entry_signals=pos.entry_signals,
+                exit_signals=exit_signals or [],
+                signal_scores=pos.signal_scores,
                 # Regime filter data at entry
-                'market_regime_ok': pos.get('market_regime_ok'),
-                'sector_regime_ok': pos.get('sector_regime_ok'), 
-                'overall_regime_ok': pos.get('overall_regime_ok')
-            }
+                market_regime_ok=pos.market_regime_ok,
+                sector_regime_ok=pos.sector_regime_ok, 
+                overall_regime_ok=pos.overall_regime_ok
+            )
             
             self.closed_trades.append(trade_result)
+            self.ledger.append(trade_result)
             
             # Remove from active positions
             del self.active_positions[ticker]
             
             return trade_result
     
-    def get_position_status(self, ticker: str) -> Optional[Dict]:
+    def get_position_status(self, ticker: str) -> Optional[Position]:
         """
         Get current status of an active position.
         
@@ -633,16 +942,16 @@ class RiskManager:
             ticker: Stock symbol
             
         Returns:
-            Position status dict or None if not found
+            Position record or None if not found
         """
         return self.active_positions.get(ticker)
     
-    def get_all_trades(self) -> List[Dict]:
+    def get_all_trades(self) -> List[TradeRecord]:
         """
         Get all closed trades.
         
         Returns:
-            List of trade result dictionaries
+            List of TradeRecord objects
         """
         return self.closed_trades
     
@@ -650,10 +959,55 @@ class RiskManager:
         """Reset risk manager state (for testing/new analysis)."""
         self.active_positions = {}
         self.closed_trades = []
+        self.ledger = TradeLedger()
         self.equity = self.starting_equity
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Snapshot of everything a backtest needs to continue from this point.
+        
+        Returns:
+            Dict with configuration, equity, open positions and closed trades
+            (records as plain dicts)
+        """
+        return {
+            'account_value': self.account_value,
+            'starting_equity': self.starting_equity,
+            'equity': self.equity,
+            'risk_pct': self.risk_pct,
+            'stop_strategy': self.stop_strategy,
+            'stop_params': copy.deepcopy(self.stop_params),
+            'active_positions': {ticker: pos.to_dict() for ticker, pos in self.active_positions.items()},
+            'closed_trades': [trade.to_dict() for trade in self.closed_trades],
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'RiskManager':
+        """
+        Rebuild a RiskManager from get_state() output.
+        
+        Args:
+            state: Snapshot returned by get_state()
+            
+        Returns:
+            RiskManager with the same equity, open positions and ledger
+        """
+        risk_mgr = cls(state['account_value'], state['risk_pct'], state['stop_strategy'])
+        risk_mgr.starting_equity = state['starting_equity']
+        risk_mgr.equity = state['equity']
+        risk_mgr.stop_params = copy.deepcopy(state['stop_params'])
+        risk_mgr.active_positions = {
+            ticker: _record_from_dict(Position, data)
+            for ticker, data in state['active_positions'].items()
+        }
+        for data in state['closed_trades']:
+            trade = _record_from_dict(TradeRecord, data)
+            risk_mgr.closed_trades.append(trade)
+            risk_mgr.ledger.append(trade)
+        return risk_mgr
 
 
-def analyze_risk_managed_trades(trades: List[Dict]) -> Dict:
+def analyze_risk_managed_trades(trades: Union[List[TradeRecord], List[Dict], TradeLedger]) -> Dict:
     """
     Analyze trades managed by RiskManager.
     
@@ -662,75 +1016,70 @@ def analyze_risk_managed_trades(trades: List[Dict]) -> Dict:
     - Exit type distribution
     - Profit scaling effectiveness
     
+    Statistics are computed from the columns of a TradeLedger; a list of
+    trade records (or legacy trade dicts) is converted to one first.
+    
     Args:
-        trades: List of trade result dictionaries
+        trades: TradeLedger, or list of TradeRecord objects / trade dictionaries
         
     Returns:
         Dict with performance analysis
     """
-    if not trades:
+    ledger = trades if isinstance(trades, TradeLedger) else TradeLedger.from_records(trades)
+    total_trades = len(ledger)
+    
+    if total_trades == 0:
         return {
             'error': 'No trades to analyze',
             'Total Trades': 0
         }
     
-    trades_df = pd.DataFrame(trades)
-    
-    # Ensure optional columns exist for downstream aggregation
-    if 'profit_taken_50pct' not in trades_df.columns:
-        trades_df['profit_taken_50pct'] = False
-    else:
-        trades_df['profit_taken_50pct'] = trades_df['profit_taken_50pct'].fillna(False)
-    
-    if 'dollar_pnl' not in trades_df.columns:
-        trades_df['dollar_pnl'] = 0.0
-    else:
-        trades_df['dollar_pnl'] = trades_df['dollar_pnl'].fillna(0.0)
-    
-    if 'equity_after_trade' not in trades_df.columns:
-        trades_df['equity_after_trade'] = np.nan
-    else:
-        trades_df['equity_after_trade'] = trades_df['equity_after_trade'].astype(float)
-    
-    if 'partial_exit' not in trades_df.columns:
-        trades_df['partial_exit'] = False
-    else:
-        trades_df['partial_exit'] = trades_df['partial_exit'].fillna(False)
+    # Missing optional values default the same way the old DataFrame fillna did
+    r_multiple = ledger.column('r_multiple', float)
+    profit_pct = ledger.column('profit_pct', float)
+    bars_held = ledger.column('bars_held', float)
+    peak_r_multiple = ledger.column('peak_r_multiple', float)
+    dollar_pnl = ledger.column('dollar_pnl', float, fill=0.0)
+    equity_after_trade = ledger.column('equity_after_trade', float)
+    profit_taken_50pct = ledger.column('profit_taken_50pct', bool, fill=False)
+    partial_exit = ledger.column('partial_exit', bool, fill=False)
+    exit_type = ledger.column('exit_type')
     
-    total_dollar_pnl = trades_df['dollar_pnl'].sum()
-    ending_equity = trades_df['equity_after_trade'].dropna().iloc[-1] if trades_df['equity_after_trade'].notna().any() else None
+    total_dollar_pnl = dollar_pnl.sum()
+    known_equity = equity_after_trade[~np.isnan(equity_after_trade)]
+    ending_equity = known_equity[-1] if len(known_equity) else None
     
     analysis = {
-        'Total Trades': len(trades),
-        'Win Rate': f"{(trades_df['r_multiple'] > 0).sum() / len(trades) * 100:.1f}%",
-        'Average R-Multiple': f"{trades_df['r_multiple'].mean():.2f}R",
-        'Average Profit %': f"{trades_df['profit_pct'].mean():.2f}%",
-        'Average Bars Held': f"{trades_df['bars_held'].mean():.1f}",
-        'Profit Scaling Used': ((trades_df['profit_taken_50pct']) & (~trades_df['partial_exit'])).sum(),
+        'Total Trades': total_trades,
+        'Win Rate': f"{(r_multiple > 0).sum() / total_trades * 100:.1f}%",
+        'Average R-Multiple': f"{np.nanmean(r_multiple):.2f}R",
+        'Average Profit %': f"{np.nanmean(profit_pct):.2f}%",
+        'Average Bars Held': f"{np.nanmean(bars_held):.1f}",
+        'Profit Scaling Used': (profit_taken_50pct & ~partial_exit).sum(),
         'Total Dollar P&L': f"${total_dollar_pnl:,.0f}",
         'Ending Equity': f"${ending_equity:,.0f}" if ending_equity is not None else "N/A",
         
         # By exit type
         'Exit Type Breakdown': {
-            'Time Stops': (trades_df['exit_type'] == 'TIME_STOP').sum(),
-            'Hard Stops': (trades_df['exit_type'] == 'HARD_STOP').sum(),
-            'Momentum Fails': (trades_df['exit_type'] == 'MOMENTUM_FAIL').sum(),
-            'Profit Targets': (trades_df['exit_type'] == 'PROFIT_TARGET').sum(),
-            'Trailing Stops': (trades_df['exit_type'] == 'TRAIL_STOP').sum(),
+            'Time Stops': (exit_type == 'TIME_STOP').sum(),
+            'Hard Stops': (exit_type == 'HARD_STOP').sum(),
+            'Momentum Fails': (exit_type == 'MOMENTUM_FAIL').sum(),
+            'Profit Targets': (exit_type == 'PROFIT_TARGET').sum(),
+            'Trailing Stops': (exit_type == 'TRAIL_STOP').sum(),
         },
         
         # R-multiple distribution
         'R-Multiple Distribution': {
-            'Trades > +2R': (trades_df['r_multiple'] >= 2.0).sum(),
-            'Trades +1R to +2R': ((trades_df['r_multiple'] >= 1.0) & (trades_df['r_multiple'] < 2.0)).sum(),
-            'Trades 0 to +1R': ((trades_df['r_multiple'] > 0) & (trades_df['r_multiple'] < 1.0)).sum(),
-            'Losing Trades': (trades_df['r_multiple'] < 0).sum()
+            'Trades > +2R': (r_multiple >= 2.0).sum(),
+            'Trades +1R to +2R': ((r_multiple >= 1.0) & (r_multiple < 2.0)).sum(),
+            'Trades 0 to +1R': ((r_multiple > 0) & (r_multiple < 1.0)).sum(),
+            'Losing Trades': (r_multiple < 0).sum()
         },
         
         # Best/worst trades
-        'Best Trade': f"{trades_df['r_multiple'].max():.2f}R",
-        'Worst Trade': f"{trades_df['r_multiple'].min():.2f}R",
-        'Peak R-Multiple Avg': f"{trades_df['peak_r_multiple'].mean():.2f}R"
+        'Best Trade': f"{np.nanmax(r_multiple):.2f}R",
+        'Worst Trade': f"{np.nanmin(r_multiple):.2f}R",
+        'Peak R-Multiple Avg': f"{np.nanmean(peak_r_multiple):.2f}R"
     }
     
     return analysis
@@ -0,0 +1,176 @@
+"""
+Run manifest for resumable, incremental batch runs.
+
+batch_backtest and process_batch record every ticker they complete in the
+output directory, one JSON line per ticker appended as it finishes:
+
+    {output_dir}/run_manifest.jsonl
+    {output_dir}/.manifest/{TICKER}_{fingerprint}.pkl   (the ticker's structured result)
+
+Each line holds the ticker's input fingerprint, its result file and the
+output files it wrote (relative to the output directory). The fingerprint
+covers everything the result depends on: the prepared-frame key (ticker and
+benchmark cache checksums, corporate actions, earnings dates, period or date
+range, threshold config, pipeline code), the run options and the code of
+the modules consuming the frame.
+
+With --incremental a ticker whose recorded fingerprint is unchanged and whose
+outputs still exist is not processed again; its stored result is merged into
+the aggregate instead. An interrupted run therefore resumes after the last
+finished ticker, and a rerun only processes tickers whose inputs changed.
+Period-based runs are cut relative to today, so their fingerprints change
+from one day to the next; date-range runs do not.
+
+Several runs (shards, concurrent hosts) may write into one output directory:
+entries are only ever appended, and result files are named by fingerprint,
+so one run never replaces a result another run's entry points to. The
+manifest is never rewritten during a run; compact() is for maintenance while
+no run is writing.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from error_handler import ErrorContext, FileOperationError, logger
+from frame_cache import hash_module_sources
+
+MANIFEST_VERSION = 1
+
+MANIFEST_FILENAME = 'run_manifest.jsonl'
+RESULTS_DIRNAME = '.manifest'
+
+
+def get_run_fingerprint(ticker: str, frame_fingerprint: Optional[str], options: Dict[str, Any],
+                        modules: List[str]) -> Optional[str]:
+    """
+    Input fingerprint of one ticker's result in a batch run.
+
+    Args:
+        ticker: Stock symbol
+        frame_fingerprint: analysis_service.get_frame_fingerprint() of its frame
+        options: Run options that change the result (JSON-serializable)
+        modules: Modules whose code turns the frame into the result
+
+    Returns:
+        Optional[str]: First 16 hex chars of a SHA-256 digest, or None when the
+            frame has no fingerprint (no cache: the ticker is always processed)
+    """
+    if frame_fingerprint is None:
+        return None
+    payload = json.dumps([MANIFEST_VERSION, ticker.upper(), frame_fingerprint, options,
+                          hash_module_sources(modules)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class RunManifest:
+    """Completed tickers of the runs writing into one output directory."""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self.results_dir = self.output_dir / RESULTS_DIRNAME
+        self.entries: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Latest entry per ticker (a torn last line from a crash is ignored)."""
+        entries = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('version') == MANIFEST_VERSION and 'ticker' in entry:
+                    entries[entry['ticker']] = entry
+        return entries
+
+    def compact(self) -> None:
+        """
+        Rewrite the manifest with only the latest entry per ticker.
+
+        Only call this while no run writes into the output directory: lines
+        appended by another writer during the rewrite would be lost.
+        """
+        if not self.path.exists():
+            return
+        with ErrorContext("compacting run manifest", path=str(self.path)):
+            tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + '\n')
+            os.replace(tmp_path, self.path)
+
+    def lookup(self, ticker: str, fingerprint: Optional[str]) -> Optional[Any]:
+        """
+        Stored result of a ticker completed with the same inputs.
+
+        Args:
+            ticker: Stock symbol
+            fingerprint: Current get_run_fingerprint() of the ticker
+
+        Returns:
+            Optional[Any]: The recorded result, or None when the ticker must be
+                processed (not recorded, inputs changed, outputs missing)
+        """
+        entry = self.entries.get(ticker.upper())
+        if fingerprint is None or entry is None or entry.get('fingerprint') != fingerprint:
+            return None
+        if not all((self.output_dir / output).exists() for output in entry.get('outputs', [])):
+            return None
+        try:
+            with open(self.output_dir / entry['result'], 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable manifest result for {ticker}: {e}")
+            return None
+
+    def record(self, ticker: str, fingerprint: Optional[str], result: Any,
+               outputs: Optional[List[str]] = None) -> None:
+        """
+        Store a completed ticker's result and append its manifest entry.
+
+        Args:
+            ticker: Stock symbol
+            fingerprint: get_run_fingerprint() the result was produced from
+                (None: nothing is recorded)
+            result: Structured result to merge into later runs (picklable)
+            outputs: Files written for the ticker
+        """
+        if fingerprint is None:
+            return
+        with ErrorContext("recording run manifest entry", ticker=ticker):
+            ticker = ticker.upper()
+            try:
+                self.results_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise FileOperationError(f"Failed to create manifest directory {self.results_dir}: {e}")
+
+            result_path = self.results_dir / f"{ticker}_{fingerprint}.pkl"
+            tmp_path = result_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f)
+            os.replace(tmp_path, result_path)
+
+            entry = {
+                'version': MANIFEST_VERSION,
+                'ticker': ticker,
+                'fingerprint': fingerprint,
+                'result': os.path.relpath(result_path, self.output_dir),
+                'outputs': [os.path.relpath(path, self.output_dir) for path in (outputs or [])],
+                'completed': datetime.now().isoformat(timespec='seconds'),
+            }
+            with open(self.path, 'a+b') as f:
+                # Start a new line after a torn last line from a crash
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write((json.dumps(entry) + '\n').encode())
+            self.entries[ticker] = entry
@@ -43,7 +43,8 @@ SCHEMA_DEFINITIONS = {
             "data_checksum",
             "record_count",
             "start_date",
-            "end_date"
+            "end_date",
+            "adjusted_through"
         ]
     }
 }
@@ -57,7 +58,8 @@ class SchemaManager:
     
     def create_metadata_header(self, ticker: str, df: pd.DataFrame, 
                              interval: str = "1d", auto_adjust: bool = True,
-                             data_source: str = "yfinance") -> Dict[str, Any]:
+                             data_source: str = "yfinance",
+                             adjusted_through: Optional[str] = None) -> Dict[str, Any]:
         """
         Create metadata header for cache file.
         
@@ -67,6 +69,8 @@ class SchemaManager:
             interval (str): Data interval
             auto_adjust (bool): Whether auto-adjust was used
             data_source (str): Data source provider
+            adjusted_through (str, optional): Last bar of an adjusted history that
+                raw bars were appended to (see corporate_actions.py)
             
         Returns:
             Dict[str, Any]: Metadata dictionary
@@ -90,6 +94,8 @@ class SchemaManager:
                 "start_date": df.index[0].isoformat() if not df.empty else None,
                 "end_date": df.index[-1].isoformat() if not df.empty else None
             }
+            if adjusted_through is not None:
+                metadata["adjusted_through"] = adjusted_through
             
             return metadata
     
@@ -302,8 +302,18 @@ def main():
         help='Skip backtests for faster analysis (volume scores will be 0)'
     )
     
+    parser.add_argument(
+        '--no-frame-cache',
+        action='store_true',
+        help='Rebuild analysis frames instead of using the persistent frame cache'
+    )
+    
     args = parser.parse_args()
     
+    if args.no_frame_cache:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+    
     try:
         # Generate dashboard
         report = generate_dashboard_with_backtest(
@@ -418,7 +418,7 @@ def calculate_sector_score(ticker: str, period: str = '3mo',
         
         # Calculate relative strength vs SPY
         if spy_df is None:
-            # Fetch SPY data
+            # Fetch SPY data (memoized: built once per run across sectors)
             spy_df = vol_analysis.analyze_ticker(
                 ticker='SPY',
                 period=period,
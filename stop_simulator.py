@@ -0,0 +1,489 @@
+"""
+Vectorized stop simulation for a fixed set of entries.
+
+Once entry bars are known, every RiskManager exit rule is a deterministic
+function of the bars that follow each entry. StopSimulator lays the frame out
+as a (trades x holding bars) matrix of closes, ATRs, ATR z-scores, trailing
+10-bar lows and exit-signal flags, then advances every trade - and every
+stop-parameter variation - one holding bar at a time with array operations:
+
+- variable stop update (static, vol_regime, atr_dynamic, pct_trail, time_decay)
+- hard stop, 12-bar time stop, 50% partial at +2R, 10-day-low trailing stop
+- regular exit signals (RISK_MANAGED_EXIT_SIGNALS by default)
+
+The R-multiple used by the time stop, profit target and pct_trail activation
+is measured against the previous bar's stop, so the stop path is a recurrence
+rather than a plain cumulative max; it is advanced column by column across
+all (variation, trade) cells at once. Results match RiskManager.update_position
+and close_position exactly for the same entries.
+
+Trades are simulated independently: overlapping entries are not suppressed
+and position sizing/equity are not modelled (they do not affect exit timing).
+
+Example:
+    >>> sim = StopSimulator.from_trades(df, result['trades'])
+    >>> grid = expand_stop_param_grid('atr_dynamic', {'multiplier': [1.5, 2.0, 2.5, 3.0]})
+    >>> scores = sim.score_variations('atr_dynamic', grid)
+"""
+
+import itertools
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest import RISK_MANAGED_EXIT_SIGNALS
+from range_query import RangeExtrema
+from risk_manager import DEFAULT_STOP_PARAMS, RiskManager
+
+# Fixed RiskManager.update_position rules
+TIME_STOP_BARS = 12
+TIME_STOP_MIN_R = 1.0
+PROFIT_TARGET_R = 2.0
+TRAIL_WINDOW = 10
+
+# Exit type codes used in the result arrays
+EXIT_OPEN = 0
+EXIT_STOP = 1
+EXIT_TIME = 2
+EXIT_TRAIL = 3
+EXIT_SIGNAL = 4
+EXIT_END_OF_DATA = 5
+EXIT_MAX_HOLDING = 6
+
+
+def _py_max(a, b):
+    """Element-wise Python max(a, b): a unless b > a (NaN handling included)."""
+    return np.where(b > a, b, a)
+
+
+def _py_min(a, b):
+    """Element-wise Python min(a, b): a unless b < a."""
+    return np.where(b < a, b, a)
+
+
+def _r_multiple(price, entry_price, stop_price):
+    """(price - entry) / (entry - stop), or 0 when the stop is not below entry."""
+    risk = entry_price - stop_price
+    positive = risk > 0
+    return np.where(positive, (price - entry_price) / np.where(positive, risk, 1.0), 0.0)
+
+
+def apply_exit_rules(stop_strategy: str, params: Dict, bars_in_trade, price, entry, stop,
+                     atr, atr_z, trail_low, live, taken, trail_active, trail_price,
+                     peak_price) -> Dict[str, np.ndarray]:
+    """
+    Advance RiskManager.update_position by one bar for many positions at once.
+
+    All array arguments broadcast together; bars_in_trade may be a scalar (every
+    position the same age) or an array. No risk exit is checked on the entry
+    bar (bars_in_trade == 0), matching update_position.
+
+    Args:
+        stop_strategy: One of RiskManager.SUPPORTED_STOP_STRATEGIES
+        params: Strategy parameters (scalars or arrays broadcasting over positions)
+        bars_in_trade: Bars since entry
+        price: Current close
+        entry: Entry price
+        stop: Stop price before this bar's update
+        atr: ATR20 on this bar
+        atr_z: ATR_Z on this bar (vol_regime)
+        trail_low: Trailing 10-bar close low on this bar
+        live: Positions to advance
+        taken: Whether the +2R partial was already taken
+        trail_active: Whether the 10-day-low trailing stop is active
+        trail_price: Current trailing stop price
+        peak_price: Highest close since pct_trail activation
+
+    Returns:
+        Dict[str, np.ndarray]: Updated 'stop', 'taken', 'trail_active',
+            'trail_price', 'peak_price', the bar's R-multiple 'r', and exit
+            masks 'hard', 'timed', 'profit' (partial) and 'trail_hit'
+    """
+    r = _r_multiple(price, entry, stop)
+    checking = live & (np.asarray(bars_in_trade) > 0)
+    k = bars_in_trade
+
+    if stop_strategy == 'vol_regime':
+        multiplier = np.where(atr_z < params['low_threshold'], params['low_vol_mult'],
+                              np.where(atr_z > params['high_threshold'], params['high_vol_mult'],
+                                       params['normal_vol_mult']))
+        new_stop = _py_max(entry - atr * multiplier, stop)
+    elif stop_strategy == 'atr_dynamic':
+        candidate = entry - atr * params['multiplier']
+        max_stop = entry - atr * params['min_multiplier']
+        min_stop = entry - atr * params['max_multiplier']
+        new_stop = _py_max(_py_max(min_stop, _py_min(candidate, max_stop)), stop)
+    elif stop_strategy == 'pct_trail':
+        activated = checking & ~(r < params['activation_r'])
+        peak_price = np.where(activated, _py_max(peak_price, price), peak_price)
+        trail_stop = peak_price * (1 - params['trail_pct'] / 100)
+        new_stop = np.where(activated, _py_max(trail_stop, stop), stop)
+    elif stop_strategy == 'time_decay':
+        multiplier = np.where(
+            k <= 5, params['day_5_mult'],
+            np.where(k <= 10, params['day_5_mult'] + (k - 5) / 5 * (params['day_10_mult'] - params['day_5_mult']),
+                     np.where(k <= 15, params['day_10_mult'] + (k - 10) / 5 * (params['day_15_mult'] - params['day_10_mult']),
+                              params['day_15_mult'])))
+        new_stop = _py_max(entry - atr * multiplier, stop)
+    else:
+        new_stop = stop
+    stop = np.where(checking, new_stop, stop)
+
+    # Same precedence as update_position: stop, time stop, +2R partial, trail
+    hard = checking & (price < stop)
+    timed = checking & ~hard & (k >= TIME_STOP_BARS) & (r < TIME_STOP_MIN_R)
+    profit = checking & ~hard & ~timed & (r >= PROFIT_TARGET_R) & ~taken
+    trailing = checking & ~hard & ~timed & ~profit & trail_active
+
+    trail_price = np.where(trailing, _py_max(trail_price, trail_low), trail_price)
+    trail_hit = trailing & (price < trail_price)
+
+    return {
+        'r': r,
+        'stop': stop,
+        'taken': taken | profit,
+        'trail_active': trail_active | profit,
+        'trail_price': np.where(profit, trail_low, trail_price),
+        'peak_price': peak_price,
+        'hard': hard,
+        'timed': timed,
+        'profit': profit,
+        'trail_hit': trail_hit,
+    }
+
+
+def calculate_initial_stops(df: pd.DataFrame, signal_idx) -> np.ndarray:
+    """
+    Vectorized RiskManager.calculate_initial_stop for many signal bars.
+
+    Args:
+        df: DataFrame with Recent_Swing_Low, ATR20 and VWAP
+        signal_idx: Integer positions of the signal bars
+
+    Returns:
+        np.ndarray: min(swing_low - 0.5*ATR, VWAP - 1*ATR) per signal bar
+
+    Raises:
+        KeyError: If required columns are missing
+    """
+    required_cols = ['Recent_Swing_Low', 'ATR20', 'VWAP']
+    missing_cols = [col for col in required_cols if col not in df.columns]
+    if missing_cols:
+        raise KeyError(f"Missing required columns: {missing_cols}")
+
+    signal_idx = np.asarray(signal_idx, dtype=int)
+    atr = df['ATR20'].to_numpy(dtype=float)[signal_idx]
+    swing_stop = df['Recent_Swing_Low'].to_numpy(dtype=float)[signal_idx] - 0.5 * atr
+    vwap_stop = df['VWAP'].to_numpy(dtype=float)[signal_idx] - 1.0 * atr
+    return _py_min(swing_stop, vwap_stop)
+
+
+def expand_stop_param_grid(stop_strategy: str, grid: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Expand a parameter grid into full stop_params dicts for one strategy.
+
+    Parameters not in the grid keep their DEFAULT_STOP_PARAMS value.
+
+    Args:
+        stop_strategy: Variable stop strategy name
+        grid: Parameter name -> candidate values
+
+    Returns:
+        List[Dict]: One parameter dict per combination (itertools.product order)
+
+    Raises:
+        ValueError: For unknown strategies or parameter names
+    """
+    defaults = DEFAULT_STOP_PARAMS.get(stop_strategy)
+    if defaults is None:
+        raise ValueError(f"Strategy '{stop_strategy}' has no tunable stop parameters. "
+                         f"Choose from {sorted(DEFAULT_STOP_PARAMS)}")
+    unknown = sorted(set(grid) - set(defaults))
+    if unknown:
+        raise ValueError(f"Unknown {stop_strategy} parameters: {unknown}. Choose from {sorted(defaults)}")
+
+    names = list(grid)
+    return [
+        {**defaults, **dict(zip(names, values))}
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+class StopSimulator:
+    """Simulate RiskManager exits for fixed entries across stop-parameter variations."""
+
+    def __init__(self, df: pd.DataFrame, entry_idx, initial_stops=None,
+                 exit_signals: Optional[List[str]] = None,
+                 max_holding_bars: Optional[int] = None):
+        """
+        Lay out the (trades x holding bars) matrices.
+
+        Args:
+            df: DataFrame with prices, ATR20 (ATR_Z optional) and signal columns
+            entry_idx: Integer positions of the entry bars (signal bar + 1)
+            initial_stops: Initial stop per entry (default: calculate_initial_stops
+                on the signal bar, like the backtest)
+            exit_signals: Signal columns that force an exit at the close
+                (default: RISK_MANAGED_EXIT_SIGNALS present in df; [] disables)
+            max_holding_bars: Cap on simulated bars per trade (default: to end of data)
+        """
+        n_bars = len(df)
+        entry_idx = np.asarray(entry_idx, dtype=int).reshape(-1)
+        in_range = (entry_idx >= 0) & (entry_idx < n_bars)
+        if initial_stops is None:
+            in_range &= entry_idx >= 1
+            entry_idx = entry_idx[in_range]
+            initial_stops = calculate_initial_stops(df, entry_idx - 1)
+        else:
+            initial_stops = np.asarray(initial_stops, dtype=float).reshape(-1)[in_range]
+            entry_idx = entry_idx[in_range]
+
+        entry_prices = df['Open'].to_numpy(dtype=float)[entry_idx]
+        # Same entries the backtest would refuse: stop not below entry (or NaN)
+        valid = initial_stops < entry_prices
+        self.entry_idx = entry_idx[valid]
+        self.entry_prices = entry_prices[valid]
+        self.initial_stops = initial_stops[valid]
+        self.entry_dates = df.index[self.entry_idx]
+        self.skipped_entries = int((~valid).sum())
+
+        remaining = n_bars - self.entry_idx
+        horizon = int(remaining.max()) if len(remaining) else 0
+        if max_holding_bars is not None:
+            horizon = min(horizon, int(max_holding_bars))
+        self.horizon = horizon
+        self.last_offset = np.minimum(remaining, horizon) - 1
+        self.ends_at_data_end = remaining <= horizon
+
+        # Holding-bar matrices: row = trade, column = bars since entry
+        bars = self.entry_idx[:, None] + np.arange(horizon)[None, :]
+        in_data = bars < n_bars
+        bars = np.minimum(bars, n_bars - 1)
+
+        close = df['Close'].to_numpy(dtype=float)
+        self.close = close[bars]
+        self.atr = df['ATR20'].to_numpy(dtype=float)[bars] if 'ATR20' in df.columns else np.full(bars.shape, np.nan)
+        self.atr_z = df['ATR_Z'].to_numpy(dtype=float)[bars] if 'ATR_Z' in df.columns else np.zeros(bars.shape)
+        self.trail_low = RangeExtrema(close).rolling_min(TRAIL_WINDOW)[bars] if n_bars else self.close
+
+        if exit_signals is None:
+            exit_signals = [sig for sig in RISK_MANAGED_EXIT_SIGNALS if sig in df.columns]
+        if exit_signals:
+            signal_any = df[exit_signals].to_numpy().astype(bool).any(axis=1)
+            self.exit_signal = signal_any[bars] & in_data
+        else:
+            self.exit_signal = np.zeros(bars.shape, dtype=bool)
+
+    @classmethod
+    def from_trades(cls, df: pd.DataFrame, trades: Iterable, **kwargs) -> 'StopSimulator':
+        """
+        Build a simulator from the entries of existing backtest trades.
+
+        Partial and final records of the same position share an entry date and
+        are collapsed to one entry.
+
+        Args:
+            df: DataFrame the trades were generated from
+            trades: TradeRecords, trade dicts or a TradeLedger
+            **kwargs: Passed to StopSimulator()
+        """
+        if hasattr(trades, 'column'):
+            entry_dates = trades.column('entry_date')
+        else:
+            entry_dates = [trade['entry_date'] for trade in trades]
+        positions = df.index.get_indexer(pd.DatetimeIndex(pd.unique(pd.Series(entry_dates))))
+        return cls(df, np.sort(positions[positions >= 0]), **kwargs)
+
+    def _resolve_params(self, stop_strategy: str, param_sets: Optional[List[Dict]]) -> List[Dict]:
+        """Fill each variation with defaults for the strategy."""
+        if stop_strategy not in RiskManager.SUPPORTED_STOP_STRATEGIES:
+            raise ValueError(f"Unsupported stop strategy '{stop_strategy}'. "
+                             f"Choose from {sorted(RiskManager.SUPPORTED_STOP_STRATEGIES)}")
+        defaults = DEFAULT_STOP_PARAMS.get(stop_strategy, {})
+        if not param_sets:
+            return [dict(defaults)]
+        return [{**defaults, **params} for params in param_sets]
+
+    def simulate_many(self, stop_strategy: str, param_sets: Optional[List[Dict]] = None) -> Dict[str, np.ndarray]:
+        """
+        Run every parameter variation over every trade at once.
+
+        Args:
+            stop_strategy: One of RiskManager.SUPPORTED_STOP_STRATEGIES
+            param_sets: stop_params dicts for the strategy (default: one default set)
+
+        Returns:
+            Dict[str, np.ndarray]: (variations x trades) arrays - exit_offset,
+                exit_price, exit_code, r_multiple (blended like close_position),
+                final_stop, partial_offset (-1 if no partial), partial_price,
+                partial_r
+        """
+        resolved = self._resolve_params(stop_strategy, param_sets)
+        n_var, n_trades = len(resolved), len(self.entry_idx)
+        shape = (n_var, n_trades)
+        params = {
+            name: np.array([p[name] for p in resolved], dtype=float)[:, None]
+            for name in DEFAULT_STOP_PARAMS.get(stop_strategy, {})
+        }
+
+        entry = self.entry_prices[None, :]
+        stop = np.broadcast_to(self.initial_stops[None, :], shape).copy()
+        peak_price = np.broadcast_to(entry, shape).copy()
+        alive = np.ones(shape, dtype=bool)
+        taken = np.zeros(shape, dtype=bool)
+        trail_active = np.zeros(shape, dtype=bool)
+        trail_price = np.full(shape, np.nan)
+
+        exit_offset = np.full(shape, -1, dtype=int)
+        exit_price = np.full(shape, np.nan)
+        exit_code = np.full(shape, EXIT_OPEN, dtype=np.int8)
+        r_final = np.full(shape, np.nan)
+        partial_offset = np.full(shape, -1, dtype=int)
+        partial_price = np.full(shape, np.nan)
+        partial_r = np.full(shape, np.nan)
+
+        for k in range(self.horizon):
+            live = alive & (k <= self.last_offset)[None, :]
+            if not live.any():
+                break
+
+            price = self.close[:, k][None, :]
+            rules = apply_exit_rules(
+                stop_strategy, params, k, price, entry, stop,
+                atr=self.atr[:, k][None, :], atr_z=self.atr_z[:, k][None, :],
+                trail_low=self.trail_low[:, k][None, :], live=live, taken=taken,
+                trail_active=trail_active, trail_price=trail_price, peak_price=peak_price
+            )
+            stop, taken, trail_active = rules['stop'], rules['taken'], rules['trail_active']
+            trail_price, peak_price = rules['trail_price'], rules['peak_price']
+            hard, timed, profit, trail_hit = rules['hard'], rules['timed'], rules['profit'], rules['trail_hit']
+
+            signal = live & self.exit_signal[:, k][None, :]
+            closing = hard | timed | profit | trail_hit | signal
+            if not closing.any():
+                continue
+
+            # Signal exits fill at the close; risk exits at the stop or the close
+            fill = np.where(signal, price, np.where(hard, stop, price))
+            fill_r = _r_multiple(fill, entry, stop)
+
+            partial_offset = np.where(profit, k, partial_offset)
+            partial_price = np.where(profit, fill, partial_price)
+            partial_r = np.where(profit, fill_r, partial_r)
+
+            full = closing & ~profit
+            code = np.where(hard, EXIT_STOP, np.where(timed, EXIT_TIME,
+                            np.where(trail_hit, EXIT_TRAIL, EXIT_SIGNAL)))
+            exit_offset = np.where(full, k, exit_offset)
+            exit_price = np.where(full, fill, exit_price)
+            exit_code = np.where(full, code, exit_code).astype(np.int8)
+            r_final = np.where(full, np.where(taken, (PROFIT_TARGET_R + fill_r) / 2, fill_r), r_final)
+            alive &= ~full
+
+        # Positions still open close at the last simulated bar
+        if alive.any():
+            trade_pos = np.broadcast_to(np.arange(n_trades)[None, :], shape)
+            last = np.broadcast_to(self.last_offset[None, :], shape)
+            last_close = self.close[trade_pos, np.maximum(last, 0)]
+            last_r = _r_multiple(last_close, entry, stop)
+            code = np.where(self.ends_at_data_end, EXIT_END_OF_DATA, EXIT_MAX_HOLDING)[None, :]
+            exit_offset = np.where(alive, last, exit_offset)
+            exit_price = np.where(alive, last_close, exit_price)
+            exit_code = np.where(alive, code, exit_code).astype(np.int8)
+            r_final = np.where(alive, np.where(taken, (PROFIT_TARGET_R + last_r) / 2, last_r), r_final)
+
+        return {
+            'exit_offset': exit_offset,
+            'exit_price': exit_price,
+            'exit_code': exit_code,
+            'r_multiple': r_final,
+            'final_stop': stop,
+            'partial_offset': partial_offset,
+            'partial_price': partial_price,
+            'partial_r': partial_r,
+        }
+
+    def simulate(self, stop_strategy: str = 'time_decay', stop_params: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Simulate one parameter set and return one row per trade.
+
+        Args:
+            stop_strategy: One of RiskManager.SUPPORTED_STOP_STRATEGIES
+            stop_params: Overrides for the strategy's DEFAULT_STOP_PARAMS entry
+
+        Returns:
+            pd.DataFrame: entry/exit dates and prices, exit_type, bars_held,
+                r_multiple, partial exit details and final stop per trade
+        """
+        result = self.simulate_many(stop_strategy, [stop_params or {}])
+        exit_offset = result['exit_offset'][0]
+        partial_offset = result['partial_offset'][0]
+        stop_label = 'HARD_STOP' if stop_strategy == 'static' else f"{stop_strategy.upper()}_STOP"
+        labels = {
+            EXIT_STOP: stop_label,
+            EXIT_TIME: 'TIME_STOP',
+            EXIT_TRAIL: 'TRAIL_STOP',
+            EXIT_SIGNAL: 'SIGNAL_EXIT',
+            EXIT_END_OF_DATA: 'END_OF_DATA',
+            EXIT_MAX_HOLDING: 'MAX_HOLDING',
+        }
+        exit_idx = self.entry_idx + exit_offset
+        has_partial = partial_offset >= 0
+        return pd.DataFrame({
+            'entry_idx': self.entry_idx,
+            'entry_date': self.entry_dates,
+            'entry_price': self.entry_prices,
+            'initial_stop': self.initial_stops,
+            'exit_idx': exit_idx,
+            'exit_price': result['exit_price'][0],
+            'exit_type': [labels.get(code, 'OPEN') for code in result['exit_code'][0]],
+            'bars_held': exit_offset,
+            'r_multiple': result['r_multiple'][0],
+            'final_stop': result['final_stop'][0],
+            'partial_exit_idx': np.where(has_partial, self.entry_idx + partial_offset, -1),
+            'partial_exit_price': result['partial_price'][0],
+            'partial_r_multiple': result['partial_r'][0],
+        })
+
+    def score_variations(self, stop_strategy: str, param_sets: List[Dict]) -> pd.DataFrame:
+        """
+        Score many stop-parameter variations over the same entries.
+
+        Each position counts once with its final (blended) R-multiple, as
+        reported on the full-exit TradeRecord.
+
+        Args:
+            stop_strategy: One of RiskManager.SUPPORTED_STOP_STRATEGIES
+            param_sets: stop_params dicts (see expand_stop_param_grid)
+
+        Returns:
+            pd.DataFrame: One row per variation with its parameters plus trades,
+                win_rate, avg_r, total_r, profit_factor, avg_bars_held,
+                partial_rate and stop_exit_rate
+        """
+        resolved = self._resolve_params(stop_strategy, param_sets)
+        result = self.simulate_many(stop_strategy, resolved)
+        r = result['r_multiple']
+        n_trades = r.shape[1]
+
+        wins = np.where(r > 0, r, 0.0).sum(axis=1)
+        losses = np.where(r <= 0, r, 0.0).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_factor = np.where(losses != 0, np.abs(wins / losses), np.inf)
+
+        scores = pd.DataFrame(resolved)
+        scores['trades'] = n_trades
+        if n_trades:
+            scores['win_rate'] = (r > 0).mean(axis=1) * 100
+            scores['avg_r'] = np.nanmean(r, axis=1)
+            scores['total_r'] = np.nansum(r, axis=1)
+            scores['profit_factor'] = profit_factor
+            scores['avg_bars_held'] = result['exit_offset'].mean(axis=1)
+            scores['partial_rate'] = (result['partial_offset'] >= 0).mean(axis=1) * 100
+            scores['stop_exit_rate'] = (result['exit_code'] == EXIT_STOP).mean(axis=1) * 100
+        else:
+            for col in ('win_rate', 'avg_r', 'total_r', 'profit_factor', 'avg_bars_held',
+                        'partial_rate', 'stop_exit_rate'):
+                scores[col] = 0.0
+        return scores
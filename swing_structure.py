@@ -14,6 +14,8 @@ import pandas as pd
 import numpy as np
 from typing import Tuple
 
+from range_query import RangeExtrema
+
 
 def find_pivots(df: pd.DataFrame, lookback: int = 3) -> Tuple[pd.Series, pd.Series]:
     """
@@ -40,24 +42,32 @@ def find_pivots(df: pd.DataFrame, lookback: int = 3) -> Tuple[pd.Series, pd.Seri
     if len(df) < (2 * lookback + 1):
         return pivot_lows, pivot_highs
     
+    # An empty comparison window never confirms a pivot
+    if lookback < 1:
+        return pivot_lows, pivot_highs
+    
     # Check each potential pivot point (skip first and last 'lookback' bars)
-    for i in range(lookback, len(df) - lookback):
-        current_low = df['Low'].iloc[i]
-        current_high = df['High'].iloc[i]
-        
-        # Check for pivot low: current bar's low is lower than lookback bars before and after
-        prev_lows = df['Low'].iloc[i-lookback:i]
-        next_lows = df['Low'].iloc[i+1:i+lookback+1]
-        
-        if (current_low < prev_lows.min()) and (current_low < next_lows.min()):
-            pivot_lows.iloc[i] = True
-        
-        # Check for pivot high: current bar's high is higher than lookback bars before and after
-        prev_highs = df['High'].iloc[i-lookback:i]
-        next_highs = df['High'].iloc[i+1:i+lookback+1]
-        
-        if (current_high > prev_highs.max()) and (current_high > next_highs.max()):
-            pivot_highs.iloc[i] = True
+    # using O(1) range min/max queries for the windows before and after
+    lows = df['Low'].to_numpy(dtype=float)
+    highs = df['High'].to_numpy(dtype=float)
+    low_ranges = RangeExtrema(lows)
+    high_ranges = RangeExtrema(highs)
+    centers = np.arange(lookback, len(df) - lookback)
+    
+    # Pivot low: current bar's low is lower than lookback bars before and after
+    is_pivot_low = (
+        (lows[centers] < low_ranges.range_min_many(centers - lookback, centers - 1)) &
+        (lows[centers] < low_ranges.range_min_many(centers + 1, centers + lookback))
+    )
+    
+    # Pivot high: current bar's high is higher than lookback bars before and after
+    is_pivot_high = (
+        (highs[centers] > high_ranges.range_max_many(centers - lookback, centers - 1)) &
+        (highs[centers] > high_ranges.range_max_many(centers + 1, centers + lookback))
+    )
+    
+    pivot_lows.iloc[centers[is_pivot_low]] = True
+    pivot_highs.iloc[centers[is_pivot_high]] = True
     
     return pivot_lows, pivot_highs
 
@@ -86,23 +96,9 @@ def calculate_swing_levels(df: pd.DataFrame, lookback: int = 3) -> Tuple[pd.Seri
     # Find pivot points
     pivot_lows, pivot_highs = find_pivots(df, lookback=lookback)
     
-    # Initialize result series
-    recent_swing_low = pd.Series(np.nan, index=df.index)
-    recent_swing_high = pd.Series(np.nan, index=df.index)
-    
-    # Forward fill swing levels from each pivot point
-    for i in range(len(df)):
-        if pivot_lows.iloc[i]:
-            # New swing low found - update from this point forward
-            recent_swing_low.iloc[i:] = df['Low'].iloc[i]
-        
-        if pivot_highs.iloc[i]:
-            # New swing high found - update from this point forward  
-            recent_swing_high.iloc[i:] = df['High'].iloc[i]
-    
-    # Forward fill any remaining NaN values
-    recent_swing_low = recent_swing_low.ffill()
-    recent_swing_high = recent_swing_high.ffill()
+    # Each pivot's level holds until the next pivot of the same kind
+    recent_swing_low = df['Low'].astype(float).where(pivot_lows).ffill()
+    recent_swing_high = df['High'].astype(float).where(pivot_highs).ffill()
     
     # If still NaN at the beginning (no pivots found in early data), 
     # use the actual lows/highs from the early period
@@ -224,25 +220,26 @@ def identify_swing_failure_patterns(df: pd.DataFrame,
     failed_breakdown = pd.Series(False, index=df.index)
     failed_breakout = pd.Series(False, index=df.index)
     
-    for i in range(lookback, len(df)):
-        # Check for failed breakdown (bullish reversal)
-        # Price went below support in last N bars but is now back above
-        recent_lows = df['Low'].iloc[i-lookback:i]
-        recent_closes = df['Close'].iloc[i-lookback:i]
-        support_level = recent_swing_low.iloc[i]
-        
-        if (recent_lows.min() < support_level and 
-            df['Close'].iloc[i] > support_level):
-            failed_breakdown.iloc[i] = True
-        
-        # Check for failed breakout (bearish reversal)
-        # Price went above resistance in last N bars but is now back below
-        recent_highs = df['High'].iloc[i-lookback:i]
-        resistance_level = recent_swing_high.iloc[i]
-        
-        if (recent_highs.max() > resistance_level and 
-            df['Close'].iloc[i] < resistance_level):
-            failed_breakout.iloc[i] = True
+    if lookback < 1 or len(df) <= lookback:
+        return failed_breakdown, failed_breakout
+    
+    bars = np.arange(lookback, len(df))
+    close = df['Close'].to_numpy(dtype=float)[bars]
+    support_level = recent_swing_low.to_numpy(dtype=float)[bars]
+    resistance_level = recent_swing_high.to_numpy(dtype=float)[bars]
+    
+    # Failed breakdown (bullish reversal):
+    # price went below support in last N bars but is now back above
+    recent_low = RangeExtrema(df['Low'].to_numpy()).range_min_many(bars - lookback, bars - 1)
+    is_failed_breakdown = (recent_low < support_level) & (close > support_level)
+    
+    # Failed breakout (bearish reversal):
+    # price went above resistance in last N bars but is now back below
+    recent_high = RangeExtrema(df['High'].to_numpy()).range_max_many(bars - lookback, bars - 1)
+    is_failed_breakout = (recent_high > resistance_level) & (close < resistance_level)
+    
+    failed_breakdown.iloc[bars[is_failed_breakdown]] = True
+    failed_breakout.iloc[bars[is_failed_breakout]] = True
     
     return failed_breakdown, failed_breakout
 
@@ -277,33 +274,35 @@ def calculate_swing_strength(pivot_lows: pd.Series,
     low_strength = pd.Series(0.0, index=df.index)
     high_strength = pd.Series(0.0, index=df.index)
     
-    # Calculate strength at each pivot
-    for i in range(len(df)):
-        if pivot_lows.iloc[i]:
-            # Strength based on volume and price range
-            vol_score = min(relative_volume.iloc[i] / volume_threshold, 1.0)
-            
-            # Look at reversal magnitude
-            if i >= 3:
-                prior_low = df['Low'].iloc[i-3:i].min()
-                reversal_pct = (df['Close'].iloc[i] - prior_low) / prior_low
-                reversal_score = min(abs(reversal_pct) * 10, 1.0)
-            else:
-                reversal_score = 0.5
-            
-            low_strength.iloc[i] = (vol_score + reversal_score) / 2
-        
-        if pivot_highs.iloc[i]:
-            # Similar calculation for highs
-            vol_score = min(relative_volume.iloc[i] / volume_threshold, 1.0)
-            
-            if i >= 3:
-                prior_high = df['High'].iloc[i-3:i].max()
-                reversal_pct = (prior_high - df['Close'].iloc[i]) / prior_high
-                reversal_score = min(abs(reversal_pct) * 10, 1.0)
-            else:
-                reversal_score = 0.5
-            
-            high_strength.iloc[i] = (vol_score + reversal_score) / 2
+    if len(df) == 0:
+        return low_strength, high_strength
+    
+    # Strength based on volume (capped at 1.0)
+    vol_score = np.minimum(relative_volume.to_numpy(dtype=float) / volume_threshold, 1.0)
+    close = df['Close'].to_numpy(dtype=float)
+    low_ranges = RangeExtrema(df['Low'].to_numpy())
+    high_ranges = RangeExtrema(df['High'].to_numpy())
+    
+    # Calculate strength at each pivot low
+    lows_idx = np.flatnonzero(pivot_lows.to_numpy(dtype=bool))
+    low_reversal = np.full(len(lows_idx), 0.5)
+    has_history = lows_idx >= 3
+    if has_history.any():
+        idx = lows_idx[has_history]
+        prior_low = low_ranges.range_min_many(idx - 3, idx - 1)
+        reversal_pct = (close[idx] - prior_low) / prior_low
+        low_reversal[has_history] = np.minimum(np.abs(reversal_pct) * 10, 1.0)
+    low_strength.iloc[lows_idx] = (vol_score[lows_idx] + low_reversal) / 2
+    
+    # Similar calculation for highs
+    highs_idx = np.flatnonzero(pivot_highs.to_numpy(dtype=bool))
+    high_reversal = np.full(len(highs_idx), 0.5)
+    has_history = highs_idx >= 3
+    if has_history.any():
+        idx = highs_idx[has_history]
+        prior_high = high_ranges.range_max_many(idx - 3, idx - 1)
+        reversal_pct = (prior_high - close[idx]) / prior_high
+        high_reversal[has_history] = np.minimum(np.abs(reversal_pct) * 10, 1.0)
+    high_strength.iloc[highs_idx] = (vol_score[highs_idx] + high_reversal) / 2
     
     return low_strength, high_strength
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test suite for the in-memory prepared-frame memo (build each frame once per run).
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import analysis_service
+import earnings_calendar
+import frame_cache
+import sector_rotation
+import vol_analysis
+from analysis_service import clear_analysis_frame_memo, get_analysis_dataframe, prepare_analysis_dataframe
+from data_manager import save_to_cache
+from test_batch_screen import make_cache_frame
+
+
+class TestAnalysisFrameMemo(unittest.TestCase):
+    """Memoized frames must equal fresh builds and follow cache changes."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        earnings_calendar.set_offline_mode(True)
+        # In-memory memo only; the persistent frame cache has its own tests
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        frame_cache.set_frame_cache_enabled(False)
+        clear_analysis_frame_memo()
+        for seed, ticker in enumerate(['AAA', 'SPY', 'XLK', 'XLE']):
+            save_to_cache(ticker, make_cache_frame(seed), '1d')
+        self.spy = mock.patch.object(analysis_service, 'prepare_analysis_dataframe',
+                                     wraps=analysis_service.prepare_analysis_dataframe)
+        self.prepare = self.spy.start()
+
+    def tearDown(self):
+        self.spy.stop()
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def built(self):
+        return [c.args[:2] for c in self.prepare.call_args_list]
+
+    def test_reuse_returns_independent_copies(self):
+        first = get_analysis_dataframe('AAA', '12mo')
+        first['Close'] = 0.0
+        second = get_analysis_dataframe('AAA', '12mo')
+        self.assertEqual(self.built(), [('AAA', '12mo')])
+        pd.testing.assert_frame_equal(second, prepare_analysis_dataframe('AAA', '12mo'))
+
+        get_analysis_dataframe('AAA', '6mo')
+        self.assertEqual(self.built(), [('AAA', '12mo'), ('AAA', '6mo')])
+
+    def test_cache_changes_rebuild(self):
+        get_analysis_dataframe('AAA', '12mo')
+        changed = make_cache_frame(0)
+        changed['Volume'] = changed['Volume'] + 1
+        save_to_cache('AAA', changed, '1d')
+        get_analysis_dataframe('AAA', '12mo')
+
+        # Benchmark caches feed the regime columns
+        save_to_cache('SPY', make_cache_frame(9), '1d')
+        get_analysis_dataframe('AAA', '12mo')
+        self.assertEqual(len(self.built()), 3)
+        self.assertEqual(len(analysis_service._frame_memo), 1)
+
+    def test_memo_is_bounded(self):
+        with mock.patch.object(analysis_service, 'MAX_MEMOIZED_FRAMES', 2):
+            for ticker in ['AAA', 'XLK', 'AAA', 'XLE', 'AAA', 'XLK']:
+                get_analysis_dataframe(ticker, '3mo')
+        # AAA stays as the most recently used; XLK is evicted by XLE and rebuilt
+        self.assertEqual([args[0] for args in self.built()], ['AAA', 'XLK', 'XLE', 'XLK'])
+
+    def test_sector_scores_build_spy_once(self):
+        for ticker in ['XLK', 'XLE']:
+            with mock.patch('builtins.print'):
+                result = sector_rotation.calculate_sector_score(ticker, period='3mo')
+            self.assertNotIn('error', result)
+        self.assertEqual(self.built(), [('XLK', '3mo'), ('SPY', '3mo'), ('XLE', '3mo')])
+
+        # analyze_ticker hands out the memoized frame as well
+        df = vol_analysis.analyze_ticker('SPY', period='3mo', show_chart=False, show_summary=False)
+        self.assertEqual(len(self.built()), 3)
+        self.assertEqual(len(df), len(prepare_analysis_dataframe('SPY', '3mo')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test suite for resumable risk-managed backtest checkpoints.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import backtest
+import batch_backtest
+import earnings_calendar
+import frame_cache
+import threshold_config
+from analysis_service import clear_analysis_frame_memo
+from backtest import run_risk_managed_backtest
+from backtest_checkpoint import get_checkpoint_filepath, get_checkpoint_start, load_checkpoint
+from data_manager import append_to_cache, get_period_start, save_to_cache
+from risk_manager import RiskManager
+from test_batch_screen import make_cache_frame
+from test_risk_managed_loop import make_backtest_frame
+
+
+def run(df, ticker, stop_strategy='time_decay', checkpoint_dir=None, risk_pct=0.75):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_risk_managed_backtest(df, ticker, stop_strategy=stop_strategy, risk_pct=risk_pct,
+                                           save_to_file=False, checkpoint_dir=checkpoint_dir)
+    return [trade.to_dict() for trade in result['trades']], result['risk_manager'].equity
+
+
+class TestBacktestCheckpoint(unittest.TestCase):
+    """Resumed runs must equal a full replay; stale checkpoints must be discarded."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resumed_runs_match_full_replay(self):
+        for ticker in ['AAPL', 'NVDA']:
+            df = make_backtest_frame(ticker, n_bars=420)
+            for stop_strategy in sorted(RiskManager.SUPPORTED_STOP_STRATEGIES):
+                with self.subTest(ticker=ticker, stop_strategy=stop_strategy):
+                    # Nightly runs: each adds bars to the same history
+                    for end in (300, 301, 360, 420):
+                        resumed = run(df.iloc[:end], ticker, stop_strategy, self.checkpoint_dir)
+                        self.assertEqual(resumed, run(df.iloc[:end], ticker, stop_strategy))
+
+                    restored = load_checkpoint(ticker, df, 100000, 0.75, stop_strategy, self.checkpoint_dir)
+                    self.assertIsNotNone(restored)
+                    self.assertEqual(restored[1], len(df) - 1)
+
+    def test_checkpoint_invalidated_by_changes(self):
+        df = make_backtest_frame('MSFT', n_bars=400)
+        run(df.iloc[:300], 'MSFT', checkpoint_dir=self.checkpoint_dir)
+        self.assertTrue(get_checkpoint_filepath('MSFT', 'time_decay', self.checkpoint_dir).exists())
+        self.assertIsNotNone(load_checkpoint('MSFT', df, 100000, 0.75, 'time_decay', self.checkpoint_dir))
+
+        revised = df.copy()
+        revised.iloc[100, revised.columns.get_loc('Close')] *= 1.01
+        self.assertIsNone(load_checkpoint('MSFT', revised, 100000, 0.75, 'time_decay', self.checkpoint_dir))
+        self.assertIsNone(load_checkpoint('MSFT', df.iloc[5:], 100000, 0.75, 'time_decay', self.checkpoint_dir))
+        self.assertIsNone(load_checkpoint('MSFT', df, 100000, 1.0, 'time_decay', self.checkpoint_dir))
+
+        with mock.patch.dict(threshold_config.OPTIMAL_THRESHOLDS['moderate_buy'], {'threshold': 6.5}):
+            self.assertIsNone(load_checkpoint('MSFT', df, 100000, 0.75, 'time_decay', self.checkpoint_dir))
+
+        # A discarded checkpoint falls back to a full replay
+        self.assertEqual(run(revised, 'MSFT', checkpoint_dir=self.checkpoint_dir), run(revised, 'MSFT'))
+
+
+class TestBatchBacktestResume(unittest.TestCase):
+    """--resume on cached data must pick up where the last nightly run stopped."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        earnings_calendar.set_offline_mode(True)
+        frame_cache.set_frame_cache_enabled(False)
+        clear_analysis_frame_memo()
+        self.history = make_cache_frame(3, n_bars=400)
+        save_to_cache('AAA', self.history.iloc[:-1], '1d')
+        save_to_cache('SPY', make_cache_frame(99, n_bars=400), '1d')
+        self.ticker_file = os.path.join(self.temp_dir, 'tickers.txt')
+        with open(self.ticker_file, 'w') as f:
+            f.write('AAA\n')
+
+    def tearDown(self):
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def run_batch(self, days_later=0):
+        """Run batch_backtest with --resume; return the frame and first bar it simulated."""
+        simulate = backtest._simulate_risk_managed_trades
+        calls = []
+
+        def tracked(df, ticker, risk_managers, **kwargs):
+            calls.append((df, kwargs.get('start_idx', 0)))
+            return simulate(df, ticker, risk_managers, **kwargs)
+
+        def period_start(period):
+            return get_period_start(period) + timedelta(days=days_later)
+
+        with mock.patch.object(backtest, '_simulate_risk_managed_trades', side_effect=tracked), \
+                mock.patch('data_manager.get_period_start', side_effect=period_start), \
+                mock.patch('batch_backtest.get_period_start', side_effect=period_start), \
+                contextlib.redirect_stdout(io.StringIO()):
+            results = batch_backtest.run_batch_backtest(self.ticker_file, period='12mo', output_dir='out',
+                                                        checkpoint_dir='checkpoints')
+        self.assertEqual(results['tickers_processed'], ['AAA'])
+        self.assertEqual(len(calls), 1)
+        return calls[0]
+
+    def test_appended_bar_resumes_from_checkpoint(self):
+        first_df, first_start = self.run_batch()
+        self.assertEqual(first_start, 0)
+        self.assertEqual(get_checkpoint_start('AAA', 'time_decay', 'checkpoints'), first_df.index[0])
+
+        # Next run, days later (the 12mo window has moved past the first bars):
+        # one new bar lands in the cache. It makes a new low, so
+        # it confirms no swing pivot (a new pivot re-anchors the VWAP of every
+        # earlier bar, which rightly discards the checkpoint)
+        new_bar = self.history.iloc[-1:].copy()
+        new_bar['Low'] = self.history['Low'].iloc[-4:-1].min() * 0.99
+        append_to_cache('AAA', new_bar, '1d')
+        df, start_idx = self.run_batch(days_later=3)
+
+        # Same history start; only the new bar (and the checkpoint bar, whose
+        # end-of-data exits were provisional) is simulated
+        self.assertEqual(df.index[0], first_df.index[0])
+        self.assertEqual(len(df), len(first_df) + 1)
+        self.assertEqual(df.index[start_idx], first_df.index[-1])
+        self.assertEqual(len(df) - start_idx, 2)
+
+        # The resumed result equals a full replay of the same frame
+        resumed, _ = run(df, 'AAA', checkpoint_dir=os.path.join(self.temp_dir, 'replay-check'))
+        self.assertEqual(resumed, run(df, 'AAA')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the array-based entry/exit pairing engine.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from backtest import pair_entry_exit_signals
+
+ENTRY_SIGNALS = ['Strong_Buy', 'Moderate_Buy', 'Volume_Breakout']
+EXIT_SIGNALS = ['Profit_Taking', 'Sell_Signal', 'Stop_Loss']
+
+
+def legacy_pair_entry_exit_signals(df, entry_signals, exit_signals):
+    """Previous slice-per-entry implementation, kept as the reference."""
+    paired_trades = []
+    df['Any_Entry'] = df[entry_signals].any(axis=1)
+    df['Any_Exit'] = df[exit_signals].any(axis=1)
+    for idx in df[df['Any_Entry']].index:
+        if 'Next_Open' in df.columns and not pd.isna(df.loc[idx, 'Next_Open']):
+            entry_price = df.loc[idx, 'Next_Open']
+            entry_idx_pos = df.index.get_loc(idx)
+            if entry_idx_pos + 1 < len(df):
+                actual_entry_date = df.index[entry_idx_pos + 1]
+            else:
+                continue
+        else:
+            continue
+        triggered_entries = [sig for sig in entry_signals if df.loc[idx, sig]]
+        future_data = df.loc[idx:].iloc[1:]
+        exit_signals_future = future_data[future_data['Any_Exit']]
+        regimes = [df.loc[actual_entry_date, c] if c in df.columns else None
+                   for c in ('Market_Regime_OK', 'Sector_Regime_OK', 'Overall_Regime_OK')]
+        if len(exit_signals_future) > 0:
+            exit_signal_idx = exit_signals_future.index[0]
+            if not pd.isna(df.loc[exit_signal_idx, 'Next_Open']):
+                exit_price = df.loc[exit_signal_idx, 'Next_Open']
+                exit_idx_pos = df.index.get_loc(exit_signal_idx)
+                if exit_idx_pos + 1 < len(df):
+                    actual_exit_date = df.index[exit_idx_pos + 1]
+                else:
+                    exit_price = df.loc[exit_signal_idx, 'Close']
+                    actual_exit_date = exit_signal_idx
+            else:
+                exit_price = df.loc[exit_signal_idx, 'Close']
+                actual_exit_date = exit_signal_idx
+            paired_trades.append({
+                'entry_signal_date': idx, 'entry_date': actual_entry_date,
+                'exit_signal_date': exit_signal_idx, 'exit_date': actual_exit_date,
+                'entry_price': entry_price, 'exit_price': exit_price,
+                'return_pct': ((exit_price - entry_price) / entry_price) * 100,
+                'holding_days': (actual_exit_date - actual_entry_date).days,
+                'entry_signals': triggered_entries,
+                'exit_signals': [sig for sig in exit_signals if df.loc[exit_signal_idx, sig]],
+                'market_regime_ok': regimes[0], 'sector_regime_ok': regimes[1],
+                'overall_regime_ok': regimes[2],
+            })
+        else:
+            last_price = df['Close'].iloc[-1]
+            paired_trades.append({
+                'entry_signal_date': idx, 'entry_date': actual_entry_date,
+                'exit_signal_date': None, 'exit_date': None,
+                'entry_price': entry_price, 'exit_price': last_price,
+                'return_pct': ((last_price - entry_price) / entry_price) * 100,
+                'holding_days': (df.index[-1] - actual_entry_date).days,
+                'entry_signals': triggered_entries, 'exit_signals': ['Open Position'],
+                'is_open': True,
+                'market_regime_ok': regimes[0], 'sector_regime_ok': regimes[1],
+                'overall_regime_ok': regimes[2],
+            })
+    return paired_trades
+
+
+def make_signal_frame(n_bars=400, seed=0, entry_rate=0.08, exit_rate=0.05):
+    """Synthetic OHLC + signal frame with sparse NaN fills."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2022-01-03', periods=n_bars)
+    close = 50 + np.cumsum(rng.normal(0, 1, n_bars))
+    df = pd.DataFrame({'Close': close, 'Open': close + rng.normal(0, 0.3, n_bars)}, index=index)
+    df['Next_Open'] = df['Open'].shift(-1)
+    df.loc[df.sample(frac=0.03, random_state=seed).index, 'Next_Open'] = np.nan
+    for col in ENTRY_SIGNALS:
+        df[col] = rng.random(n_bars) < entry_rate
+    for col in EXIT_SIGNALS:
+        df[col] = rng.random(n_bars) < exit_rate
+    df['Market_Regime_OK'] = rng.random(n_bars) < 0.7
+    df['Sector_Regime_OK'] = rng.random(n_bars) < 0.6
+    df['Overall_Regime_OK'] = df['Market_Regime_OK'] & df['Sector_Regime_OK']
+    return df
+
+
+class TestPairEntryExitSignals(unittest.TestCase):
+    """The NumPy pairing engine reproduces the legacy trade records."""
+
+    def assert_same_trades(self, df):
+        expected = legacy_pair_entry_exit_signals(df.copy(), ENTRY_SIGNALS, EXIT_SIGNALS)
+        actual = pair_entry_exit_signals(df, ENTRY_SIGNALS, EXIT_SIGNALS)
+        self.assertEqual(len(actual), len(expected))
+        for got, want in zip(actual, expected):
+            self.assertEqual(got.keys(), want.keys())
+            for key in want:
+                if isinstance(want[key], float) and np.isnan(want[key]):
+                    self.assertTrue(np.isnan(got[key]))
+                else:
+                    self.assertEqual(got[key], want[key], key)
+
+    def test_matches_legacy_on_random_frames(self):
+        for seed in range(6):
+            self.assert_same_trades(make_signal_frame(seed=seed))
+
+    def test_entry_and_exit_on_last_bars(self):
+        """Exit on the final bar falls back to Close; trailing entries stay open."""
+        df = make_signal_frame(n_bars=60, seed=9, exit_rate=0.0)
+        df.iloc[-1, df.columns.get_loc('Sell_Signal')] = True
+        df.iloc[-1, df.columns.get_loc('Next_Open')] = 123.0
+        df.iloc[-2, df.columns.get_loc('Strong_Buy')] = True
+        self.assert_same_trades(df)
+
+    def test_no_exits_leaves_positions_open(self):
+        df = make_signal_frame(n_bars=80, seed=4, exit_rate=0.0)
+        trades = pair_entry_exit_signals(df, ENTRY_SIGNALS, EXIT_SIGNALS)
+        self.assertTrue(trades)
+        self.assertTrue(all(t.get('is_open') for t in trades))
+        self.assert_same_trades(df)
+
+    def test_does_not_mutate_input(self):
+        df = make_signal_frame(seed=1)
+        columns_before = list(df.columns)
+        pair_entry_exit_signals(df, ENTRY_SIGNALS, EXIT_SIGNALS)
+        self.assertEqual(list(df.columns), columns_before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test suite for process-pool batch backtesting (--jobs).
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import batch_backtest
+from test_risk_managed_loop import make_backtest_frame
+
+
+def fake_get_analysis_dataframe(ticker, period, **kwargs):
+    """Synthetic frames; BAD fails the way a missing cache would, CRASH kills its worker."""
+    if ticker == 'BAD':
+        raise ValueError("no cached data for BAD")
+    if ticker == 'CRASH':
+        os._exit(1)
+    return make_backtest_frame(ticker, n_bars=300)
+
+
+def comparable_report(report):
+    """Aggregate report without the run-specific timestamp/file-name lines."""
+    return [line for line in report.splitlines()
+            if not line.startswith('Generated:') and 'PORTFOLIO_TRADE_LOG' not in line]
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                     "patched data loaders reach workers only with fork")
+class TestParallelBatchBacktest(unittest.TestCase):
+    """--jobs N must produce the same results and aggregate report as a serial run."""
+
+    def run_batch(self, tmp, jobs):
+        output_dir = os.path.join(tmp, f"jobs{jobs}")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            results = batch_backtest.run_batch_backtest(self.ticker_file, period='12mo',
+                                                        output_dir=output_dir, jobs=jobs)
+            report = batch_backtest.generate_risk_managed_aggregate_report(results, '12mo', output_dir)
+        return results, report, out.getvalue()
+
+    def test_parallel_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(batch_backtest, 'get_analysis_dataframe', fake_get_analysis_dataframe), \
+                mock.patch.object(batch_backtest, 'apply_empirical_thresholds', lambda df: df):
+            self.ticker_file = os.path.join(tmp, 'tickers.txt')
+            with open(self.ticker_file, 'w') as f:
+                f.write("NVDA\nAAPL\nBAD\nMSFT\nSPY\nQQQ\n")
+
+            serial, serial_report, _ = self.run_batch(tmp, jobs=1)
+            parallel, parallel_report, parallel_output = self.run_batch(tmp, jobs=3)
+
+        self.assertEqual(parallel['tickers_processed'], ['NVDA', 'AAPL', 'MSFT', 'SPY', 'QQQ'])
+        self.assertEqual(parallel['tickers_failed'], serial['tickers_failed'])
+        self.assertEqual(parallel['tickers_failed'][0]['ticker'], 'BAD')
+        self.assertGreater(len(parallel['all_paired_trades']), 0)
+        self.assertEqual([t.to_dict() for t in parallel['all_paired_trades']],
+                         [t.to_dict() for t in serial['all_paired_trades']])
+        self.assertEqual(comparable_report(parallel_report), comparable_report(serial_report))
+
+        # Worker output is replayed per ticker, in input order
+        headers = [parallel_output.index(f"RISK-MANAGED BACKTEST: {t}") for t in ['NVDA', 'AAPL', 'MSFT']]
+        self.assertEqual(headers, sorted(headers))
+
+    def test_dead_worker_fails_only_its_ticker(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(batch_backtest, 'get_analysis_dataframe', fake_get_analysis_dataframe), \
+                mock.patch.object(batch_backtest, 'apply_empirical_thresholds', lambda df: df):
+            self.ticker_file = os.path.join(tmp, 'tickers.txt')
+            with open(self.ticker_file, 'w') as f:
+                f.write("CRASH\nNVDA\nAAPL\nMSFT\nSPY\nQQQ\n")
+            results, _, _ = self.run_batch(tmp, jobs=2)
+
+        self.assertEqual(results['tickers_processed'], ['NVDA', 'AAPL', 'MSFT', 'SPY', 'QQQ'])
+        self.assertEqual([f['ticker'] for f in results['tickers_failed']], ['CRASH'])
+        self.assertIn('worker error', results['tickers_failed'][0]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
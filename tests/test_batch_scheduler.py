@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test suite for the cost-aware batch scheduler.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from batch_scheduler import BatchSchedule, estimate_ticker_cost, plan_schedule, run_schedule
+from data_manager import get_cache_filepath, save_to_cache
+from test_batch_screen import make_cache_frame
+
+TECH = ['AAPL', 'MSFT', 'NVDA', 'AMD']
+FINANCIALS = ['JPM', 'BAC', 'WFC', 'GS']
+
+
+def crash_on(ticker, crash):
+    """Toy job: the worker process dies on the crash ticker."""
+    if ticker == crash:
+        os._exit(1)
+    return ticker.lower()
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """Schedules must balance cost, group sector ETFs and keep results in input order."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_cost_is_cache_row_count(self):
+        save_to_cache('AAA', make_cache_frame(0, n_bars=250), '1d')
+        self.assertEqual(estimate_ticker_cost('AAA'), 250)
+        self.assertEqual(estimate_ticker_cost('NOPE'), 0)
+
+        # Legacy cache without a metadata header: rows are counted
+        cache_file = get_cache_filepath('AAA')
+        with open(cache_file) as f:
+            rows = [line for line in f if not line.startswith('#')]
+        with open(cache_file, 'w') as f:
+            f.writelines(rows[:101])
+        self.assertEqual(estimate_ticker_cost('AAA'), 100)
+
+    def test_longest_first_and_balanced(self):
+        tickers = [f"T{i:02d}" for i in range(30)]
+        costs = {t: (i * 7919) % 2000 + 50 for i, t in enumerate(tickers)}
+        costs['T29'] = 5000  # huge history at the end of the file
+        schedule = plan_schedule(tickers, 4, costs)
+
+        self.assertEqual(sorted(t for plan in schedule.workers for t in plan), tickers)
+        self.assertEqual(schedule.workers[0][0], 'T29')  # started first
+        for plan in schedule.workers:
+            self.assertEqual(plan, sorted(plan, key=lambda t: -costs[t]))
+        self.assertLessEqual(max(schedule.loads) - min(schedule.loads), 2 * 2049)
+        self.assertGreater(schedule.planned_balance, 0.9)
+
+    def test_sector_etfs_grouped(self):
+        # Interleaved sectors with equal costs: each worker gets one sector
+        tickers = [t for pair in zip(TECH, FINANCIALS) for t in pair]
+        schedule = plan_schedule(tickers, 2, {t: 100 for t in tickers})
+        self.assertEqual(sorted(sorted(plan) for plan in schedule.workers), [sorted(TECH), sorted(FINANCIALS)])
+        self.assertEqual(schedule.benchmark_loads, 4)  # SPY + one sector ETF per worker
+        self.assertEqual(schedule.planned_balance, 1.0)
+
+    def test_run_in_input_order_with_utilization(self):
+        tickers = TECH + FINANCIALS
+        schedule = plan_schedule(tickers, 3, {t: i + 1 for i, t in enumerate(tickers)})
+        job_args = {t: (2, i) for i, t in enumerate(tickers)}
+        results = [(ticker, future.result()) for ticker, future in run_schedule(schedule, pow, job_args)]
+
+        self.assertEqual(results, [(t, 2 ** i) for i, t in enumerate(tickers)])
+        self.assertEqual(len(schedule.busy_seconds), 3)
+        self.assertTrue(0 < schedule.utilization <= 1)
+        self.assertIn('Achieved utilization', schedule.describe())
+
+    def test_dead_worker_fails_only_its_ticker(self):
+        tickers = ['A', 'BIG', 'B', 'C', 'D', 'E']
+        schedule = BatchSchedule(tickers=tickers, workers=[['A', 'C', 'D'], ['BIG', 'B', 'E']], costs={})
+        job_args = {t: (t, 'BIG') for t in tickers}
+
+        outcomes = {}
+        for ticker, future in run_schedule(schedule, crash_on, job_args):
+            try:
+                outcomes[ticker] = future.result()
+            except BrokenProcessPool:
+                outcomes[ticker] = 'crashed'
+        self.assertEqual(outcomes, {'A': 'a', 'BIG': 'crashed', 'B': 'b', 'C': 'c', 'D': 'd', 'E': 'e'})
+        self.assertEqual(len(schedule.busy_seconds), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
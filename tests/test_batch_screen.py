@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test suite for the two-phase (screen, then analyze) batch scan.
+"""
+
+import contextlib
+import glob
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import batch_processor
+import earnings_calendar
+from analysis_service import prepare_analysis_dataframe
+from batch_processor import (calculate_batch_metrics, get_screen_period, qualifying_signals,
+                             screen_ticker, screen_universe)
+from data_manager import save_to_cache
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+# make_cache_frame() seeds whose last bar carries an active, qualified signal
+SIGNAL_TICKERS = {'DDD': (14, 'moderate'), 'EEE': (29, 'stealth')}
+
+
+def make_cache_frame(seed, n_bars=400):
+    """Daily OHLCV ending today (cache reads are relative to now)."""
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=n_bars)
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n_bars)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, n_bars)),
+        'High': close * (1 + rng.uniform(0.005, 0.02, n_bars)),
+        'Low': close * (1 - rng.uniform(0.005, 0.02, n_bars)),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, n_bars),
+    }, index=dates).round(4)
+
+
+class TestBatchScreen(unittest.TestCase):
+    """The short-window screen must flag the same tickers as a full-period analysis."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        earnings_calendar.set_offline_mode(True)
+        for seed, ticker in enumerate(TICKERS + ['SPY']):
+            save_to_cache(ticker, make_cache_frame(seed), '1d')
+        for ticker, (seed, _) in SIGNAL_TICKERS.items():
+            save_to_cache(ticker, make_cache_frame(seed), '1d')
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+
+    def test_screen_matches_full_period(self):
+        self.assertEqual(get_screen_period('12mo'), '3mo')
+        self.assertEqual(get_screen_period('1mo'), '1mo')
+        for ticker in TICKERS + list(SIGNAL_TICKERS):
+            with self.subTest(ticker=ticker):
+                full = calculate_batch_metrics(prepare_analysis_dataframe(ticker, '12mo'))
+                short = calculate_batch_metrics(prepare_analysis_dataframe(ticker, get_screen_period('12mo')))
+                for key in ['moderate_signal_active', 'profit_signal_active', 'stealth_signal_active']:
+                    self.assertEqual(short[key], full[key])
+                for key in ['moderate_buy_score', 'profit_taking_score', 'stealth_score']:
+                    self.assertAlmostEqual(short[key], full[key], delta=batch_processor.SCREEN_SCORE_TOLERANCE)
+
+                screened = screen_ticker(ticker, '12mo')
+                self.assertIsNone(screened['error'])
+                self.assertEqual(screened['signals'], qualifying_signals(full))
+
+                if ticker in SIGNAL_TICKERS:
+                    # The active signal qualifies in both the 3mo screen and the 12mo run
+                    signal = SIGNAL_TICKERS[ticker][1]
+                    self.assertTrue(qualifying_signals(full)[signal])
+                    self.assertTrue(screened['signals'][signal])
+                    self.assertTrue(screened['qualifies'])
+
+    def test_screen_reports_missing_cache(self):
+        screened = screen_universe(['AAA', 'NOPE'], '12mo')
+        self.assertEqual([s['ticker'] for s in screened], ['AAA', 'NOPE'])
+        self.assertIsNone(screened[0]['error'])
+        self.assertFalse(screened[1]['qualifies'])
+        self.assertIn('No cache data', screened[1]['error'])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         "workers inherit the temporary cache directory only with fork")
+    def test_parallel_screen_matches_serial(self):
+        tickers = TICKERS + ['NOPE']
+        self.assertEqual(screen_universe(tickers, '12mo', jobs=2), screen_universe(tickers, '12mo'))
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         "patched data loaders reach workers only with fork")
+    def test_dead_screen_worker_fails_only_its_ticker(self):
+        get_analysis_dataframe = batch_processor.get_analysis_dataframe
+
+        def crash_on_ccc(ticker, *args, **kwargs):
+            if ticker == 'CCC':
+                os._exit(1)
+            return get_analysis_dataframe(ticker, *args, **kwargs)
+
+        tickers = ['CCC', 'AAA', 'BBB', 'DDD', 'EEE']
+        with mock.patch.object(batch_processor, 'get_analysis_dataframe', side_effect=crash_on_ccc), \
+                contextlib.redirect_stdout(io.StringIO()):
+            screened = screen_universe(tickers, '12mo', jobs=2)
+        self.assertEqual([s['ticker'] for s in screened], tickers)
+        self.assertIn('worker error', screened[0]['error'])
+        self.assertEqual([s['error'] for s in screened[1:]], [None] * 4)
+
+    def test_process_batch_analyzes_qualifiers_only(self):
+        ticker_file = os.path.join(self.temp_dir, 'tickers.txt')
+        with open(ticker_file, 'w') as f:
+            f.write('\n'.join(TICKERS) + '\n')
+
+        def fake_screen(ticker, period, data_source):
+            if ticker == 'CCC':
+                return {'ticker': ticker, 'qualifies': False, 'signals': {}, 'error': 'no cached data'}
+            signals = {'moderate': ticker == 'BBB', 'profit': False, 'stealth': False}
+            return {'ticker': ticker, 'qualifies': any(signals.values()), 'signals': signals, 'error': None}
+
+        def fake_analyze(ticker, period, **kwargs):
+            df = prepare_analysis_dataframe(ticker, period)
+            filename = f"{ticker}_{period}_{df.index[0]:%Y%m%d}_{df.index[-1]:%Y%m%d}_analysis.txt"
+            return df, os.path.join(kwargs['output_dir'], filename)
+
+        output_dir = os.path.join(self.temp_dir, 'results')
+        with mock.patch.object(batch_processor, 'screen_ticker', side_effect=fake_screen), \
+                mock.patch('vol_analysis.analyze_ticker', side_effect=fake_analyze) as analyze, \
+                contextlib.redirect_stdout(io.StringIO()):
+            batch_processor.process_batch(ticker_file, period='12mo', output_dir=output_dir,
+                                          generate_html=False, screen=True)
+
+        self.assertEqual([c.kwargs['ticker'] for c in analyze.call_args_list], ['BBB'])
+        summary_files = glob.glob(os.path.join(output_dir, 'batch_summary_12mo_*.txt'))
+        self.assertEqual(len(summary_files), 1)
+        with open(summary_files[0]) as f:
+            summary = f.read()
+        self.assertIn('Successfully Processed: 1', summary)
+        self.assertIn('Screened Out: 1', summary)
+        self.assertIn('CCC: no cached data', summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
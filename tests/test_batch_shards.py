@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test suite for sharded batch execution and the shard merge step.
+"""
+
+import contextlib
+import glob
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import batch_backtest
+import batch_processor
+import earnings_calendar
+import frame_cache
+import optimize_multiticker_thresholds
+from analysis_service import clear_analysis_frame_memo, prepare_analysis_dataframe
+from batch_shards import assign_shards, load_shard_results, parse_shard
+from data_manager import save_to_cache
+from error_handler import DataValidationError
+from test_batch_screen import make_cache_frame
+
+REPO_DIR = os.getcwd()
+TICKERS = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+FIXED_NOW = datetime(2026, 1, 2, 3, 4, 5)
+
+
+def read_report(pattern):
+    """Content of the single report file matching pattern, without its timestamp line."""
+    paths = glob.glob(pattern)
+    assert len(paths) == 1, paths
+    with open(paths[0]) as f:
+        return [line for line in f if not line.startswith(('Processing Date:', 'Generated:'))]
+
+
+class TestShardAssignment(unittest.TestCase):
+    """Shards must partition the tickers deterministically and balance their cost."""
+
+    def test_partition_is_deterministic_and_balanced(self):
+        tickers = [f"T{i:02d}" for i in range(40)]
+        costs = {t: (i * 7919) % 1000 + 1 for i, t in enumerate(tickers)}
+        for count in [1, 2, 3, 7]:
+            with self.subTest(count=count):
+                shards = assign_shards(tickers, count, costs)
+                # Same shard membership whatever the order of the ticker file
+                reordered = assign_shards(list(reversed(tickers)), count, costs)
+                self.assertEqual([sorted(shard) for shard in shards], [sorted(shard) for shard in reordered])
+                self.assertEqual(sorted(t for shard in shards for t in shard), tickers)
+                for shard in shards:
+                    self.assertEqual(shard, [t for t in tickers if t in shard])  # input order
+                loads = [sum(costs[t] for t in shard) for shard in shards]
+                self.assertLessEqual(max(loads) - min(loads), max(costs.values()))
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        for spec in ['0/4', '5/4', '2', 'a/b']:
+            with self.assertRaises(DataValidationError):
+                parse_shard(spec)
+
+    def test_shard_requires_ticker_file(self):
+        completed = subprocess.run([sys.executable, os.path.join(REPO_DIR, 'vol_analysis.py'), 'AAPL',
+                                    '--shard', '1/2'], capture_output=True, text=True)
+        self.assertEqual(completed.returncode, 2)
+        self.assertIn('--shard requires -f/--file', completed.stderr)
+
+
+class TestShardedRuns(unittest.TestCase):
+    """Merged shards must rebuild the reports of a single-host run."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        earnings_calendar.set_offline_mode(True)
+        frame_cache.set_frame_cache_enabled(False)
+        clear_analysis_frame_memo()
+        for seed, ticker in enumerate(TICKERS + ['SPY']):
+            # Different history lengths, so the shards are balanced by cache size
+            save_to_cache(ticker, make_cache_frame(seed, n_bars=300 + 40 * seed), '1d')
+        self.ticker_file = os.path.join(self.temp_dir, 'tickers.txt')
+        with open(self.ticker_file, 'w') as f:
+            f.write('\n'.join(TICKERS) + '\n')
+
+    def tearDown(self):
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def test_backtest_shards_in_separate_processes(self):
+        for index in range(1, 4):
+            subprocess.run([sys.executable, os.path.join(REPO_DIR, 'batch_backtest.py'), '-f', self.ticker_file,
+                            '--shard', f'{index}/3', '-o', 'sharded', '--offline', '--no-frame-cache'],
+                           check=True, capture_output=True)
+        with self.assertRaises(DataValidationError):
+            load_shard_results('sharded/shards', 'batch_processor')
+
+        merged, options = batch_backtest.merge_backtest_shards('sharded')
+        with contextlib.redirect_stdout(io.StringIO()):
+            single = batch_backtest.run_batch_backtest(self.ticker_file, output_dir='single')
+        self.assertEqual(options['period'], '12mo')
+        self.assertEqual(merged['tickers_processed'], single['tickers_processed'])
+        self.assertGreater(len(single['all_paired_trades']), 0)
+
+        with mock.patch('batch_backtest.datetime') as fixed:
+            fixed.now.return_value = FIXED_NOW
+            reports = [batch_backtest.generate_risk_managed_aggregate_report(results, '12mo', output_dir)
+                       for results, output_dir in [(merged, 'sharded'), (single, 'single')]]
+        self.assertEqual(reports[0].replace('sharded', 'single'), reports[1])
+
+        # A missing shard is refused
+        os.remove('sharded/shards/batch_backtest_shard2of3.pkl')
+        with self.assertRaises(DataValidationError):
+            batch_backtest.merge_backtest_shards('sharded')
+
+    def test_process_batch_shards_merge_to_single_summary(self):
+        def fake_analyze(ticker, period, **kwargs):
+            if ticker == 'BBB':
+                raise DataValidationError("bad data")
+            df = prepare_analysis_dataframe(ticker, period)
+            filepath = os.path.join(kwargs['output_dir'], f"{ticker}_{period}_analysis.txt")
+            with open(filepath, 'w') as f:
+                f.write(ticker)
+            return df, filepath
+
+        with mock.patch('vol_analysis.analyze_ticker', side_effect=fake_analyze), \
+                contextlib.redirect_stdout(io.StringIO()):
+            for index in [2, 1]:
+                batch_processor.process_batch(self.ticker_file, output_dir='sharded', generate_html=False,
+                                              shard=(index, 2))
+            self.assertEqual(glob.glob('sharded/batch_summary_*'), [])
+            batch_processor.merge_batch_shards('sharded/shards', output_dir='sharded', generate_html=False)
+            batch_processor.process_batch(self.ticker_file, output_dir='single', generate_html=False)
+
+        self.assertEqual(read_report('sharded/batch_summary_*'), read_report('single/batch_summary_*'))
+
+    def test_optimizer_shards_merge_to_single_report(self):
+        def run(*args):
+            with mock.patch.object(sys, 'argv', ['optimize_multiticker_thresholds.py', *args]), \
+                    mock.patch.object(optimize_multiticker_thresholds, 'datetime') as fixed, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                fixed.now.return_value = FIXED_NOW
+                optimize_multiticker_thresholds.main()
+
+        run(self.ticker_file, '-o', 'single')
+        run(self.ticker_file, '-o', 'sharded', '--shard', '1/2')
+        self.assertEqual(glob.glob('sharded/MULTITICKER_*'), [])
+        run(self.ticker_file, '-o', 'sharded', '--shard', '2/2')
+        run('--merge-shards', 'sharded', '-o', 'sharded')
+        self.assertEqual(read_report('sharded/MULTITICKER_*'), read_report('single/MULTITICKER_*'))
+
+
+if __name__ == '__main__':
+    unittest.main()
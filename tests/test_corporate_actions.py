@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test suite for read-time corporate action adjustment.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import corporate_actions
+import populate_cache_bulk
+from data_manager import append_to_cache, get_cache_filepath, get_smart_data, save_to_cache
+from schema_manager import schema_manager
+
+
+class TestCorporateActions(unittest.TestCase):
+    """Test cases for split/dividend factors and read-time adjustment."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+
+        end = pd.Timestamp.now().normalize()
+        self.dates = pd.bdate_range(end=end, periods=10)
+        # Raw bars with a 4:1 split before the 6th bar
+        close = np.array([400.0, 404, 408, 412, 416, 104, 105, 106, 107, 108])
+        self.raw = pd.DataFrame({
+            'Open': close,
+            'High': close + 2,
+            'Low': close - 2,
+            'Close': close,
+            'Volume': np.full(10, 1_000_000, dtype='int64'),
+        }, index=self.dates)
+        self.split_day = self.dates[5]
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+
+    def test_split_factors(self):
+        """Bars before the ex-date are divided by the ratio; volume multiplied."""
+        actions = [{'date': self.split_day, 'type': 'split', 'value': 4.0}]
+        adjusted = corporate_actions.apply_adjustments(self.raw, 'TEST', actions=actions)
+
+        np.testing.assert_allclose(adjusted['Close'].iloc[:5], self.raw['Close'].iloc[:5] / 4)
+        np.testing.assert_allclose(adjusted['Close'].iloc[5:], self.raw['Close'].iloc[5:])
+        self.assertTrue((adjusted['Volume'].iloc[:5] == 4_000_000).all())
+        self.assertTrue((adjusted['Volume'].iloc[5:] == 1_000_000).all())
+
+    def test_cumulative_split_and_dividend(self):
+        """Factors compound for bars before multiple events."""
+        dividend_day = self.dates[8]
+        actions = [
+            {'date': self.split_day, 'type': 'split', 'value': 4.0},
+            {'date': dividend_day, 'type': 'dividend', 'value': 1.06},
+        ]
+        price_factor, volume_factor = corporate_actions.calculate_adjustment_factors(
+            self.dates, self.raw['Close'].to_numpy(), actions
+        )
+        dividend_factor = 1 - 1.06 / 106.0
+        np.testing.assert_allclose(price_factor[:5], dividend_factor / 4)
+        np.testing.assert_allclose(price_factor[5:8], dividend_factor)
+        np.testing.assert_allclose(price_factor[8:], 1.0)
+        np.testing.assert_allclose(volume_factor[:5], 4.0)
+
+    def test_raw_cache_adjusted_on_read_and_left_immutable(self):
+        """Massive-sourced caches are adjusted in get_smart_data; the file is untouched."""
+        save_to_cache('TEST', self.raw, '1d', auto_adjust=False, data_source='massive_flatfile')
+        cache_file = get_cache_filepath('TEST', '1d')
+        with open(cache_file) as f:
+            before = f.read().split('#\n', 1)[1]
+
+        corporate_actions.add_action('TEST', self.split_day, 'split', 4.0)
+        df = get_smart_data('TEST', '1mo')
+
+        self.assertAlmostEqual(df['Close'].iloc[0], 100.0)
+        self.assertEqual(df['Volume'].iloc[0], 4_000_000)
+        with open(cache_file) as f:
+            self.assertEqual(f.read().split('#\n', 1)[1], before)
+
+    def test_append_keeps_raw_cache_source(self):
+        """Appending bars to a massive cache keeps it raw (adjusted on read)."""
+        save_to_cache('TEST', self.raw.iloc[:-1], '1d', auto_adjust=False, data_source='massive_flatfile')
+        append_to_cache('TEST', self.raw.iloc[-1:], '1d')
+
+        metadata = schema_manager.read_metadata_from_csv(get_cache_filepath('TEST', '1d'))
+        self.assertEqual(metadata['data_source'], 'massive_flatfile')
+        self.assertFalse(metadata['auto_adjust'])
+
+        corporate_actions.add_action('TEST', self.split_day, 'split', 4.0)
+        df = get_smart_data('TEST', '1mo')
+        self.assertAlmostEqual(df['Close'].iloc[0], 100.0)
+        self.assertAlmostEqual(df['Close'].iloc[-1], 108.0)
+
+    def test_bulk_fill_onto_adjusted_cache(self):
+        """Raw bars bulk-appended to a yfinance cache leave its history adjusted once."""
+        corporate_actions.add_action('TEST', self.split_day, 'split', 4.0)
+        history = corporate_actions.apply_adjustments(self.raw.iloc[:-1], 'TEST')
+        save_to_cache('TEST', history, '1d')
+        self.assertAlmostEqual(get_smart_data('TEST', '1mo')['Close'].iloc[0], 100.0)
+
+        last_day = self.dates[-1]
+        massive_rows = pd.DataFrame({
+            'ticker': ['TEST'], 'open': [108.0], 'high': [110.0], 'low': [106.0], 'close': [108.0],
+            'volume': [1_000_000], 'window_start': [last_day.value],
+        })
+        status = populate_cache_bulk.append_to_ticker_cache(
+            'TEST', last_day.to_pydatetime(), massive_rows, Path('data_cache'))
+        self.assertEqual(status, 'ADDED')
+
+        metadata = schema_manager.read_metadata_from_csv(get_cache_filepath('TEST', '1d'))
+        self.assertEqual(metadata['data_source'], 'massive_flatfile')
+        self.assertEqual(pd.Timestamp(metadata['adjusted_through']), self.dates[-2])
+        df = get_smart_data('TEST', '1mo')
+        self.assertAlmostEqual(df['Close'].iloc[0], 100.0)
+        self.assertAlmostEqual(df['Close'].iloc[-1], 108.0)
+
+        # Actions after the boundary still apply to every bar
+        corporate_actions.add_action('TEST', last_day + pd.Timedelta(days=1), 'split', 2.0)
+        df = get_smart_data('TEST', '1mo')
+        self.assertAlmostEqual(df['Close'].iloc[0], 50.0)
+        self.assertAlmostEqual(df['Close'].iloc[-1], 54.0)
+
+    def test_adjusted_sources_not_adjusted_twice(self):
+        """yfinance caches (auto_adjust=True) are returned as stored."""
+        save_to_cache('TEST', self.raw, '1d')
+        corporate_actions.add_action('TEST', self.split_day, 'split', 4.0)
+        df = get_smart_data('TEST', '1mo')
+        self.assertAlmostEqual(df['Close'].iloc[0], 400.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test suite for the on-disk earnings store and the earnings window mask.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import earnings_calendar
+from indicators import check_earnings_window
+
+
+def loop_earnings_mask(index, earnings_dates, window_days):
+    """Reference implementation: one boolean mask per earnings date."""
+    ok = pd.Series(True, index=index)
+    for date in earnings_dates:
+        ts = pd.Timestamp(date)
+        in_window = (index >= ts - pd.Timedelta(days=window_days)) & (index <= ts + pd.Timedelta(days=window_days))
+        ok &= ~in_window
+    return ok
+
+
+class TestEarningsWindowMask(unittest.TestCase):
+    """The searchsorted mask matches the per-date loop."""
+
+    def test_matches_loop_reference(self):
+        index = pd.bdate_range('2023-01-02', '2024-12-31')
+        df = pd.DataFrame({'Close': 1.0}, index=index)
+        rng = np.random.default_rng(11)
+        earnings = sorted(pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, 12), unit='D'))
+
+        for window in (0, 1, 3, 10):
+            expected = loop_earnings_mask(index, earnings, window)
+            actual = check_earnings_window('TEST', df, window_days=window, earnings_dates=earnings)
+            pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+    def test_empty_dates_pass_everything(self):
+        df = pd.DataFrame({'Close': 1.0}, index=pd.bdate_range('2024-01-01', periods=5))
+        self.assertTrue(check_earnings_window('TEST', df, earnings_dates=[]).all())
+
+
+class TestEarningsStore(unittest.TestCase):
+    """Store TTL, offline mode and failure handling."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        earnings_calendar.set_offline_mode(False)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(False)
+
+    @patch('earnings_calendar.fetch_earnings_dates')
+    def test_fresh_store_skips_network(self, mock_fetch):
+        mock_fetch.return_value = [pd.Timestamp('2024-05-02')]
+        first = earnings_calendar.get_earnings_dates('TEST')
+        second = earnings_calendar.get_earnings_dates('TEST')
+        self.assertEqual(first, second)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch('earnings_calendar.fetch_earnings_dates')
+    def test_stale_store_is_replaced_by_live_dates(self, mock_fetch):
+        earnings_calendar.save_earnings_record(
+            'TEST', [pd.Timestamp('2024-02-01')], fetched=datetime.now() - timedelta(days=30)
+        )
+        mock_fetch.return_value = [pd.Timestamp('2024-05-02')]
+        dates = earnings_calendar.get_earnings_dates('TEST', ttl_days=7)
+        self.assertEqual(dates, [pd.Timestamp('2024-05-02')])
+        mock_fetch.assert_called_once_with('TEST', include_history=False)
+
+    @patch('earnings_calendar.fetch_earnings_dates')
+    def test_include_history_merges_stored_dates(self, mock_fetch):
+        earnings_calendar.save_earnings_record(
+            'TEST', [pd.Timestamp('2024-02-01')], fetched=datetime.now() - timedelta(days=30)
+        )
+        mock_fetch.return_value = [pd.Timestamp('2024-05-02')]
+        dates = earnings_calendar.get_earnings_dates('TEST', ttl_days=7, include_history=True)
+        self.assertEqual(dates, [pd.Timestamp('2024-02-01'), pd.Timestamp('2024-05-02')])
+
+    @patch('earnings_calendar.fetch_earnings_dates')
+    def test_offline_mode_never_fetches(self, mock_fetch):
+        earnings_calendar.set_offline_mode(True)
+        self.assertEqual(earnings_calendar.get_earnings_dates('TEST'), [])
+        mock_fetch.assert_not_called()
+
+    @patch('earnings_calendar.fetch_earnings_dates')
+    def test_failed_fetch_is_not_retried_immediately(self, mock_fetch):
+        mock_fetch.side_effect = ConnectionError("offline")
+        self.assertEqual(earnings_calendar.get_earnings_dates('TEST'), [])
+        self.assertEqual(earnings_calendar.get_earnings_dates('TEST'), [])
+        self.assertEqual(mock_fetch.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test suite for the persistent prepared-frame cache.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import analysis_service
+import earnings_calendar
+import frame_cache
+import threshold_config
+from analysis_service import clear_analysis_frame_memo, get_analysis_dataframe, prepare_analysis_dataframe
+from data_manager import save_to_cache
+from test_batch_screen import make_cache_frame
+
+
+class TestFrameCache(unittest.TestCase):
+    """Warm frames must equal fresh builds; any input change must miss."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        self.original_enabled = frame_cache.is_frame_cache_enabled()
+        earnings_calendar.set_offline_mode(True)
+        frame_cache.set_frame_cache_enabled(True)
+        clear_analysis_frame_memo()
+        for seed, ticker in enumerate(['AAA', 'BBB', 'SPY']):
+            save_to_cache(ticker, make_cache_frame(seed), '1d')
+        self.spy = mock.patch.object(analysis_service, 'prepare_analysis_dataframe',
+                                     wraps=analysis_service.prepare_analysis_dataframe)
+        self.prepare = self.spy.start()
+
+    def tearDown(self):
+        self.spy.stop()
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_enabled)
+
+    def new_run(self, ticker='AAA', period='12mo'):
+        """Request a frame as a fresh process would (empty in-memory memo)."""
+        clear_analysis_frame_memo()
+        return get_analysis_dataframe(ticker, period)
+
+    def frame_files(self):
+        return sorted(os.listdir(frame_cache.DEFAULT_FRAME_CACHE_DIR))
+
+    def test_warm_frame_matches_fresh_build(self):
+        self.new_run()
+        warm = self.new_run()
+        self.assertEqual(self.prepare.call_count, 1)
+        pd.testing.assert_frame_equal(warm, prepare_analysis_dataframe('AAA', '12mo'))
+        self.assertEqual(len(self.frame_files()), 1)
+
+    def test_input_changes_miss(self):
+        self.new_run()
+        with mock.patch.dict(threshold_config.OPTIMAL_THRESHOLDS['moderate_buy'], {'threshold': 9.5}):
+            self.new_run()
+        self.assertEqual(self.prepare.call_count, 2)
+
+        with mock.patch.object(frame_cache, '_code_version', 'other-pipeline'):
+            self.new_run()
+        self.assertEqual(self.prepare.call_count, 3)
+
+        changed = make_cache_frame(0)
+        changed['Volume'] = changed['Volume'] + 1
+        save_to_cache('AAA', changed, '1d')
+        rebuilt = self.new_run()
+        self.assertEqual(self.prepare.call_count, 4)
+        pd.testing.assert_frame_equal(rebuilt, prepare_analysis_dataframe('AAA', '12mo'))
+        # Entries for superseded inputs are replaced, not accumulated
+        self.assertEqual(len(self.frame_files()), 1)
+
+    def test_disabled_cache_is_bypassed(self):
+        frame_cache.set_frame_cache_enabled(False)
+        self.new_run()
+        self.new_run()
+        self.assertEqual(self.prepare.call_count, 2)
+        self.assertFalse(os.path.exists(frame_cache.DEFAULT_FRAME_CACHE_DIR))
+
+    def test_lru_eviction(self):
+        self.new_run('AAA')
+        time.sleep(0.01)
+        self.new_run('BBB')
+        time.sleep(0.01)
+        self.new_run('AAA')  # hit: AAA becomes most recently used
+        sizes = [os.path.getsize(os.path.join(frame_cache.DEFAULT_FRAME_CACHE_DIR, name))
+                 for name in self.frame_files()]
+        self.assertEqual(frame_cache.prune_frame_cache(max_mb=max(sizes) * 1.5 / (1024 * 1024)), 1)
+        self.assertEqual([name.split('_')[0] for name in self.frame_files()], ['AAA'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test suite for the base-interval intraday store.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import intraday_store
+from error_handler import DataValidationError
+
+
+def make_minute_bars(days):
+    """Build regular-session 1-minute bars for the given trading days."""
+    frames = []
+    rng = np.random.default_rng(7)
+    for day in days:
+        index = pd.date_range(f"{day} 09:30", f"{day} 15:59", freq='1min')
+        close = 100 + np.cumsum(rng.normal(0, 0.05, len(index)))
+        frames.append(pd.DataFrame({
+            'Open': close + rng.normal(0, 0.01, len(index)),
+            'High': close + 0.05,
+            'Low': close - 0.05,
+            'Close': close,
+            'Volume': rng.integers(100, 1000, len(index)),
+        }, index=index))
+    return pd.concat(frames)
+
+
+class TestIntradayStore(unittest.TestCase):
+    """Test cases for day-partitioned storage and resampling."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        intraday_store.clear_resample_memo()
+        self.days = ['2025-03-03', '2025-03-04', '2025-03-05', '2025-03-10']
+        self.bars = make_minute_bars(self.days)
+        intraday_store.save_intraday_bars('TEST', self.bars)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        intraday_store.clear_resample_memo()
+
+    def test_partitioned_by_trading_day(self):
+        """One partition file is written per trading day."""
+        dates = intraday_store.list_partition_dates('TEST')
+        self.assertEqual([d.strftime('%Y-%m-%d') for d in dates], self.days)
+        base = intraday_store.load_base_bars('TEST')
+        self.assertEqual(len(base), len(self.bars))
+
+    def test_hourly_bars_anchored_to_session_open(self):
+        """1h bars start at 09:30 and aggregate OHLCV correctly."""
+        hourly = intraday_store.get_resampled_data('TEST', '1h', start='2025-03-03', end='2025-03-03')
+        self.assertEqual(hourly.index[0], pd.Timestamp('2025-03-03 09:30'))
+        self.assertEqual(len(hourly), 7)  # 09:30 ... 15:30
+
+        first_hour = self.bars.loc['2025-03-03 09:30':'2025-03-03 10:29']
+        self.assertAlmostEqual(hourly['Open'].iloc[0], first_hour['Open'].iloc[0])
+        self.assertAlmostEqual(hourly['High'].iloc[0], first_hour['High'].max())
+        self.assertAlmostEqual(hourly['Low'].iloc[0], first_hour['Low'].min())
+        self.assertAlmostEqual(hourly['Close'].iloc[0], first_hour['Close'].iloc[-1])
+        self.assertEqual(hourly['Volume'].iloc[0], first_hour['Volume'].sum())
+
+    def test_daily_and_weekly_derivation(self):
+        """Daily and weekly bars are derived from the same base bars."""
+        daily = intraday_store.get_daily_bars('TEST')
+        self.assertEqual(len(daily), 4)
+        self.assertEqual(daily['Volume'].sum(), self.bars['Volume'].sum())
+
+        weekly = intraday_store.get_weekly_bars('TEST')
+        self.assertEqual(len(weekly), 2)
+        self.assertEqual(weekly.index[0], pd.Timestamp('2025-03-03'))
+        self.assertEqual(weekly.index[1], pd.Timestamp('2025-03-10'))
+        self.assertAlmostEqual(weekly['High'].iloc[0], daily['High'].iloc[:3].max())
+
+    def test_memo_invalidated_when_partition_rewritten(self):
+        """Rewriting a partition invalidates memoized resampled frames."""
+        before = intraday_store.get_daily_bars('TEST')
+
+        changed = self.bars.loc['2025-03-04'].copy()
+        changed['Volume'] = changed['Volume'] * 2
+        intraday_store.save_intraday_bars('TEST', changed)
+
+        after = intraday_store.get_daily_bars('TEST')
+        self.assertEqual(after.loc['2025-03-04', 'Volume'], 2 * before.loc['2025-03-04', 'Volume'])
+
+    def test_rejects_non_base_interval(self):
+        """Only base-interval bars may be written to the store."""
+        hourly = intraday_store.resample_ohlcv(self.bars, '1h')
+        with self.assertRaises(DataValidationError):
+            intraday_store.save_intraday_bars('TEST', hourly, interval='1h')
+
+    def test_get_smart_data_serves_intraday_from_store(self):
+        """data_manager derives intraday intervals from the store, not per-interval CSVs."""
+        from unittest.mock import patch
+        import data_manager
+
+        with patch('data_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value = pd.Timestamp('2025-03-11').to_pydatetime()
+            df = data_manager.get_smart_data('TEST', period='1mo', interval='30m')
+
+        self.assertEqual(df.index[0], pd.Timestamp('2025-03-03 09:30'))
+        self.assertEqual(len(df), 4 * 13)
+        self.assertFalse(os.path.exists(os.path.join('data_cache', 'TEST_30m_data.csv')))
+
+    def test_daily_bars_use_regular_session_only(self):
+        """Extended-hours bars are stored but left out of daily bars."""
+        regular = intraday_store.get_daily_bars('TEST')
+        extended = make_minute_bars(['2025-03-04']).copy()
+        extended.index = extended.index - pd.Timedelta(hours=5, minutes=30)  # 04:00 - 10:29
+        extended['High'] = extended['High'] + 50
+        intraday_store.save_intraday_bars('TEST', extended[extended.index.hour < 9])
+
+        self.assertGreater(len(intraday_store.load_base_bars('TEST')), len(self.bars))
+        pd.testing.assert_frame_equal(intraday_store.get_daily_bars('TEST'), regular)
+        hourly = intraday_store.get_resampled_data('TEST', '1h', start='2025-03-04', end='2025-03-04')
+        self.assertLess(hourly.index[0], pd.Timestamp('2025-03-04 09:30'))
+
+    def test_minute_bars_saved_to_store(self):
+        """save_to_cache writes 1m bars into the store instead of a per-interval CSV."""
+        import data_manager
+
+        data_manager.save_to_cache('MIN', make_minute_bars(['2025-03-12']), '1m')
+        self.assertEqual(intraday_store.list_partition_dates('MIN'), [pd.Timestamp('2025-03-12')])
+        self.assertEqual(intraday_store.get_store_end_date('MIN'), pd.Timestamp('2025-03-12 15:59'))
+        self.assertFalse(os.path.exists(os.path.join('data_cache', 'MIN_1m_data.csv')))
+
+    def test_get_smart_data_checks_store_end(self):
+        """A store that ends before the period, or behind a legacy cache, is not served."""
+        from unittest.mock import patch
+        import data_manager
+
+        with patch('data_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value = pd.Timestamp('2025-05-01').to_pydatetime()
+            with self.assertRaisesRegex(DataValidationError, 'Stale intraday data'):
+                data_manager.get_smart_data('TEST', period='1mo', interval='30m')
+
+        # A legacy 30m cache with newer bars wins over the store
+        legacy = intraday_store.resample_ohlcv(make_minute_bars(['2025-03-11']), '30m')
+        data_manager.save_to_cache('TEST', legacy, '30m')
+        with patch('data_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value = pd.Timestamp('2025-03-12').to_pydatetime()
+            df = data_manager.get_smart_data('TEST', period='1mo', interval='30m')
+        self.assertEqual(len(df), 13)
+        self.assertEqual(df.index[0], pd.Timestamp('2025-03-11 09:30'))
+
+    def test_missing_ticker_raises(self):
+        """Requesting a ticker with no partitions raises a clear error."""
+        with self.assertRaises(DataValidationError):
+            intraday_store.get_resampled_data('NONE', '1h')
+
+
+if __name__ == '__main__':
+    unittest.main()
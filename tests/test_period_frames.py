@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test suite for deriving shorter analysis periods from one pipeline run.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import analysis_service
+import earnings_calendar
+import frame_cache
+import vol_analysis
+from analysis_service import (clear_analysis_frame_memo, compare_period_frames, get_period_frames,
+                              prepare_analysis_dataframe, slice_analysis_dataframe)
+from data_manager import save_to_cache
+from test_batch_screen import make_cache_frame
+
+PERIODS = ['1mo', '3mo', '6mo', '12mo']
+
+calculate_anchored_vwap = analysis_service.indicators.calculate_anchored_vwap
+
+
+def reanchor_with(offset):
+    """Pipeline builds are untouched; re-anchoring a slice returns its VWAP + offset."""
+    def reanchor(df, **kwargs):
+        if 'VWAP' not in df.columns:
+            return calculate_anchored_vwap(df, **kwargs)
+        return df['VWAP'] + offset
+    return reanchor
+
+
+class TestPeriodFrames(unittest.TestCase):
+    """Derived periods must match independent runs after the warmup bars."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        earnings_calendar.set_offline_mode(True)
+        frame_cache.set_frame_cache_enabled(False)
+        clear_analysis_frame_memo()
+
+    def tearDown(self):
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def save_caches(self, seed):
+        save_to_cache('AAA', make_cache_frame(seed), '1d')
+        save_to_cache('SPY', make_cache_frame(seed + 100), '1d')
+        clear_analysis_frame_memo()
+
+    def test_parity_with_independent_runs(self):
+        derived_count = 0
+        for seed in range(6):
+            self.save_caches(seed)
+            full = prepare_analysis_dataframe('AAA', '12mo')
+            frames = get_period_frames('AAA', ['1mo', '3mo', '6mo', '12mo'])
+            for period in ['1mo', '3mo', '6mo']:
+                with self.subTest(seed=seed, period=period):
+                    independent = prepare_analysis_dataframe('AAA', period)
+                    self.assertEqual(compare_period_frames(frames[period], independent), [])
+                    derived = slice_analysis_dataframe(full, period)
+                    if derived is None:
+                        # Warmup-length period or VWAP anchor outside the slice:
+                        # built independently, so every bar matches
+                        pd.testing.assert_frame_equal(frames[period], independent)
+                        continue
+                    derived_count += 1
+                    self.assertEqual(compare_period_frames(derived, independent), [])
+                    # Cumulative lines are rebased even inside the warmup
+                    pd.testing.assert_series_equal(derived['OBV'], independent['OBV'])
+                    pd.testing.assert_series_equal(derived['AD_Line'], independent['AD_Line'])
+        self.assertGreater(derived_count, 0)
+
+    def test_warmup_length_period_built_independently(self):
+        self.save_caches(4)
+        full = prepare_analysis_dataframe('AAA', '12mo')
+        self.assertLessEqual(len(prepare_analysis_dataframe('AAA', '1mo')),
+                             analysis_service.PERIOD_SLICE_WARMUP_BARS)
+        self.assertIsNone(slice_analysis_dataframe(full, '1mo'))
+
+    def test_pipeline_runs_once(self):
+        self.save_caches(1)
+        with mock.patch.object(analysis_service, 'prepare_analysis_dataframe',
+                               wraps=analysis_service.prepare_analysis_dataframe) as prepare, \
+                mock.patch.object(analysis_service.indicators, 'calculate_anchored_vwap',
+                                  side_effect=reanchor_with(0.0)):
+            frames = get_period_frames('AAA', PERIODS)
+        # 1mo fits in the slice warmup and is the only period built on its own
+        self.assertEqual([c.args[:2] for c in prepare.call_args_list], [('AAA', '12mo'), ('AAA', '1mo')])
+        self.assertEqual(len(frames['12mo']), len(prepare_analysis_dataframe('AAA', '12mo')))
+        for period in PERIODS:
+            self.assertTrue(frames[period].index.equals(prepare_analysis_dataframe('AAA', period).index))
+
+    def test_vwap_anchor_change_builds_independently(self):
+        self.save_caches(2)
+        with mock.patch.object(analysis_service.indicators, 'calculate_anchored_vwap',
+                               side_effect=reanchor_with(1.0)):
+            full = prepare_analysis_dataframe('AAA', '12mo')
+            self.assertIsNone(slice_analysis_dataframe(full, '3mo'))
+            frames = get_period_frames('AAA', ['3mo', '12mo'])
+        self.assertEqual(compare_period_frames(frames['3mo'], prepare_analysis_dataframe('AAA', '3mo')), [])
+
+    def test_multi_timeframe_analysis_uses_derived_frames(self):
+        self.save_caches(3)
+        with mock.patch.object(analysis_service, 'prepare_analysis_dataframe',
+                               wraps=analysis_service.prepare_analysis_dataframe) as prepare, \
+                mock.patch.object(vol_analysis, 'resolve_chart_engine',
+                                  return_value=(mock.Mock(), 'png')) as chart_engine, \
+                contextlib.redirect_stdout(io.StringIO()):
+            results = vol_analysis.multi_timeframe_analysis('AAA', periods=['3mo', '12mo'])
+        self.assertLessEqual(prepare.call_count, 2)
+        self.assertEqual(prepare.call_args_list[0].args[:2], ('AAA', '12mo'))
+        # Each period is still charted, from its own (derived) frame
+        chart = chart_engine.return_value[0]
+        self.assertEqual([len(c.kwargs['df']) for c in chart.call_args_list],
+                         [len(prepare_analysis_dataframe('AAA', p)) for p in ['3mo', '12mo']])
+        self.assertEqual(results['12mo']['total_days'], len(prepare_analysis_dataframe('AAA', '12mo')))
+
+
+if __name__ == '__main__':
+    unittest.main()
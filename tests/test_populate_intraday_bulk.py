@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test suite for streaming minute-aggregate ingest into the intraday store.
+"""
+
+import gzip
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from botocore.exceptions import ClientError
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import intraday_store
+from populate_intraday_bulk import find_local_files, populate_intraday_bulk, stream_minute_file
+
+
+def write_minute_sample(path, day, tickers):
+    """Write a Massive-style minute_aggs gzip file for one day."""
+    # 09:30-15:59 New York time during EST is 14:30-20:59 UTC
+    minutes = pd.date_range(f"{day} 14:30", f"{day} 20:59", freq='1min', tz='UTC')
+    rows = []
+    for n, ticker in enumerate(tickers):
+        price = 50.0 + n
+        rows.append(pd.DataFrame({
+            'ticker': ticker,
+            'volume': np.full(len(minutes), 100 + n),
+            'open': price,
+            'close': price + 0.1,
+            'high': price + 0.2,
+            'low': price - 0.2,
+            'window_start': minutes.asi8,
+            'transactions': 5,
+        }))
+    with gzip.open(path, 'wt') as f:
+        pd.concat(rows).to_csv(f, index=False)
+
+
+class TestPopulateIntradayBulk(unittest.TestCase):
+    """Test cases for chunked minute-file ingest."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        intraday_store.clear_resample_memo()
+
+        self.sample_dir = os.path.join(self.temp_dir, 'samples')
+        os.makedirs(self.sample_dir)
+        self.all_tickers = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+        for day in ['2025-01-06', '2025-01-07']:
+            write_minute_sample(os.path.join(self.sample_dir, f"{day}.csv.gz"), day, self.all_tickers)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        intraday_store.clear_resample_memo()
+
+    def test_stream_keeps_only_our_tickers_across_chunks(self):
+        """Small chunks still produce complete per-ticker days for our tickers only."""
+        path = find_local_files(self.sample_dir)[0]
+        with open(path, 'rb') as f:
+            per_ticker = stream_minute_file(f, {'BBB', 'DDD'}, chunk_rows=97)
+
+        self.assertEqual(set(per_ticker), {'BBB', 'DDD'})
+        self.assertEqual(len(per_ticker['BBB']), 390)
+        self.assertEqual(per_ticker['BBB'].index[0], pd.Timestamp('2025-01-06 09:30'))
+
+    def test_local_directory_ingest_writes_day_partitions(self):
+        """Local sample files land as day partitions in the intraday store."""
+        stats = populate_intraday_bulk({'AAA', 'CCC'}, local_dir=self.sample_dir, chunk_rows=250)
+
+        self.assertEqual(stats['days_processed'], 2)
+        self.assertEqual(stats['bars_written'], 2 * 2 * 390)
+        self.assertEqual(len(intraday_store.list_partition_dates('AAA')), 2)
+        self.assertFalse(intraday_store.has_intraday_data('BBB'))
+
+        daily = intraday_store.get_daily_bars('CCC')
+        self.assertEqual(len(daily), 2)
+        self.assertEqual(daily['Volume'].iloc[0], 390 * 102)
+
+    def test_s3_error_fails_only_its_day(self):
+        """A throttled S3 day is counted as failed; the ingest continues and summarizes."""
+        def get_object(Bucket, Key):
+            day = Key.rsplit('/', 1)[1][:10]
+            if day == '2025-01-06':
+                raise ClientError({'Error': {'Code': 'SlowDown', 'Message': 'Please reduce your request rate'}},
+                                  'GetObject')
+            path = os.path.join(self.sample_dir, f"{day}.csv.gz")
+            if not os.path.exists(path):
+                raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'missing'}}, 'GetObject')
+            return {'Body': open(path, 'rb'), 'ContentLength': os.path.getsize(path)}
+
+        with mock.patch('populate_intraday_bulk.boto3.Session') as session:
+            session.return_value.client.return_value.get_object.side_effect = get_object
+            stats = populate_intraday_bulk({'AAA'}, start_date=datetime(2025, 1, 6),
+                                           end_date=datetime(2025, 1, 8))
+
+        self.assertEqual(stats['days_failed'], 1)
+        self.assertEqual(stats['days_processed'], 1)
+        self.assertEqual(len(intraday_store.list_partition_dates('AAA')), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared-capital portfolio backtest.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from backtest import run_risk_managed_backtest
+from portfolio_backtest import run_portfolio_backtest
+from risk_manager import RiskManager
+from test_risk_managed_loop import ENTRY_SIGNALS, make_backtest_frame
+
+
+def position_intervals(trades):
+    """(ticker, entry_date, final exit_date) for every position in a trade list."""
+    return [(t['ticker'], t['entry_date'], t['exit_date']) for t in trades if not t['partial_exit']]
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    """Portfolio engine: single-ticker parity and shared-capital limits."""
+
+    def test_single_ticker_matches_risk_managed_backtest(self):
+        """With one ticker and cash never binding, trades equal the per-ticker engine."""
+        for ticker in ['AAPL', 'NVDA']:
+            df = make_backtest_frame(ticker, n_bars=400)
+            for stop_strategy in sorted(RiskManager.SUPPORTED_STOP_STRATEGIES):
+                with self.subTest(ticker=ticker, stop_strategy=stop_strategy):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        single = run_risk_managed_backtest(df, ticker, stop_strategy=stop_strategy,
+                                                           save_to_file=False)['trades']
+                    result = run_portfolio_backtest({ticker: df}, stop_strategy=stop_strategy)
+                    self.assertEqual(result['summary']['cash_limited_entries'], 0)
+                    self.assertEqual([t.to_dict() for t in result['trades']],
+                                     [t.to_dict() for t in single])
+
+    def test_position_and_sector_limits(self):
+        tickers = [f"T{i:02d}" for i in range(12)]
+        frames = {ticker: make_backtest_frame(ticker, n_bars=300) for ticker in tickers}
+        sector_map = {ticker: ('XLK' if i % 2 else 'XLF') for i, ticker in enumerate(tickers)}
+        result = run_portfolio_backtest(frames, max_positions=3, max_per_sector=1,
+                                        sector_map=sector_map)
+
+        self.assertGreater(result['rejected']['max_positions'] + result['rejected']['sector_cap'], 0)
+        self.assertLessEqual(result['equity_curve']['open_positions'].max(), 3)
+        self.assertGreaterEqual(result['equity_curve']['cash'].min(), 0)
+
+        intervals = position_intervals(result['trades'])
+        for day in result['equity_curve'].index:
+            held = [ticker for ticker, entry, exit_ in intervals if entry <= day <= exit_]
+            self.assertLessEqual(len(held), 3)
+            for sector in ('XLK', 'XLF'):
+                self.assertLessEqual(sum(sector_map[t] == sector for t in held), 1)
+
+        # Every position is closed by the end, so marked equity equals realized equity
+        self.assertAlmostEqual(result['equity_curve']['equity'].iloc[-1],
+                               result['summary']['ending_equity'], places=6)
+
+    def test_same_day_candidates_ranked_by_score(self):
+        frames = {}
+        for ticker, score in [('LOW', 3.0), ('HIGH', 9.0)]:
+            df = make_backtest_frame('AAPL', n_bars=120)
+            df[ENTRY_SIGNALS] = False
+            df.loc[df.index[40], 'Strong_Buy'] = True
+            df['Accumulation_Score'] = score
+            frames[ticker] = df
+        result = run_portfolio_backtest(frames, max_positions=1)
+        self.assertEqual({t['ticker'] for t in result['trades']}, {'HIGH'})
+        self.assertEqual(result['rejected']['max_positions'], 1)
+
+    def test_cash_limits_position_size(self):
+        """One ticker at a time: each position costs no more than equity at entry."""
+        df = make_backtest_frame('MSFT', n_bars=500)
+        result = run_portfolio_backtest({'MSFT': df}, account_value=100000)
+        self.assertGreater(result['summary']['cash_limited_entries'], 0)
+
+        equity, shares = 100000.0, 0
+        for trade in result['trades']:
+            shares += trade['position_size']
+            if not trade['partial_exit']:
+                self.assertLessEqual(shares * trade['entry_price'], equity + 1e-6)
+                equity, shares = trade['equity_after_trade'], 0
+
+
+if __name__ == '__main__':
+    unittest.main()
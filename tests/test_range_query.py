@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test suite for sparse-table range min/max queries.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from range_query import RangeExtrema, calculate_excursions
+
+
+class TestRangeExtrema(unittest.TestCase):
+    """Range queries must agree with pandas slicing."""
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.values = pd.Series(rng.normal(100, 5, 257))
+        self.values.iloc[[3, 4, 5, 100]] = np.nan
+        self.ranges = RangeExtrema(self.values)
+
+    def test_random_ranges_match_pandas(self):
+        rng = np.random.default_rng(1)
+        starts = rng.integers(0, len(self.values), 500)
+        ends = np.minimum(starts + rng.integers(0, 40, 500), len(self.values) - 1)
+        expected_min = [self.values.iloc[s:e + 1].min() for s, e in zip(starts, ends)]
+        expected_max = [self.values.iloc[s:e + 1].max() for s, e in zip(starts, ends)]
+        np.testing.assert_array_equal(self.ranges.range_min_many(starts, ends), expected_min)
+        np.testing.assert_array_equal(self.ranges.range_max_many(starts, ends), expected_max)
+        self.assertEqual(self.ranges.range_min(10, 50), self.values.iloc[10:51].min())
+        self.assertEqual(self.ranges.range_max(0, 256), self.values.max())
+
+    def test_all_nan_range_is_nan(self):
+        self.assertTrue(np.isnan(self.ranges.range_min(3, 5)))
+        self.assertTrue(np.isnan(self.ranges.range_max_many([3], [5])[0]))
+
+    def test_rolling_matches_pandas(self):
+        expected = self.values.rolling(10, min_periods=1).min().to_numpy()
+        np.testing.assert_array_equal(self.ranges.rolling_min(10), expected)
+
+    def test_out_of_bounds(self):
+        with self.assertRaises(IndexError):
+            self.ranges.range_min(5, 4)
+        with self.assertRaises(IndexError):
+            self.ranges.range_max_many([0], [len(self.values)])
+
+    def test_excursions(self):
+        lows = RangeExtrema([9.0, 8.0, 10.0, 11.0])
+        highs = RangeExtrema([10.0, 9.5, 12.0, 12.5])
+        result = calculate_excursions(lows, highs, 1, 2, 10.0)
+        self.assertAlmostEqual(result['mae_pct'], -20.0)
+        self.assertAlmostEqual(result['mfe_pct'], 20.0)
+        self.assertIsNone(calculate_excursions(lows, highs, 2, 1, 10.0)['mae_pct'])
+
+
+if __name__ == '__main__':
+    unittest.main()
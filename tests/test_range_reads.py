@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test suite for warmup-bounded range reads of the data cache.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import data_manager
+import earnings_calendar
+import frame_cache
+from analysis_service import (clear_analysis_frame_memo, compare_period_frames, get_analysis_dataframe,
+                              prepare_analysis_dataframe)
+from data_manager import get_cache_filepath, get_range_data, load_cached_data, load_cached_range, save_to_cache
+from test_batch_screen import make_cache_frame
+
+# Cumulative lines start wherever the read starts: equal up to a constant offset
+CUMULATIVE_COLUMNS = ['OBV', 'OBV_MA', 'AD_Line', 'AD_MA']
+
+
+class TestRangeReads(unittest.TestCase):
+    """Range reads must equal slices of a full load, and date-window frames a full build."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        earnings_calendar.set_offline_mode(True)
+        frame_cache.set_frame_cache_enabled(False)
+        clear_analysis_frame_memo()
+
+    def tearDown(self):
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def test_range_matches_full_load(self):
+        save_to_cache('AAA', make_cache_frame(0), '1d')
+        full = load_cached_data('AAA')
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            a, b = sorted(rng.integers(0, len(full), 2))
+            # Dates between bars (weekends) and warmups longer than the history
+            start = full.index[a] - pd.Timedelta(days=int(rng.integers(0, 3)))
+            end = full.index[b] + pd.Timedelta(days=int(rng.integers(0, 3)))
+            warmup = int(rng.integers(0, 300))
+            with self.subTest(start=start, end=end, warmup=warmup):
+                first = max(0, full.index.searchsorted(start) - warmup)
+                expected = full.iloc[first:full.index.searchsorted(end, side='right')]
+                pd.testing.assert_frame_equal(load_cached_range('AAA', start, end, warmup_bars=warmup),
+                                              expected, check_freq=False)
+
+        pd.testing.assert_frame_equal(load_cached_range('AAA', full.index[-5]), full.iloc[-5:], check_freq=False)
+        self.assertTrue(load_cached_range('AAA', full.index[-1] + pd.Timedelta(days=1)).empty)
+        with self.assertRaises(data_manager.DataValidationError):
+            get_range_data('AAA', full.index[-1] + pd.Timedelta(days=1))
+
+    def test_truncated_cache_is_detected(self):
+        save_to_cache('AAA', make_cache_frame(0), '1d')
+        cache_file = get_cache_filepath('AAA')
+        with open(cache_file) as f:
+            lines = f.readlines()
+        with open(cache_file, 'w') as f:
+            f.writelines(lines[:-10])
+
+        # Falls back to full validation, which rejects (and removes) the file
+        self.assertIsNone(load_cached_range('AAA', '2000-01-01'))
+        self.assertFalse(os.path.exists(cache_file))
+
+    def test_date_window_frame_matches_full_history(self):
+        for seed in range(3):
+            aaa, spy = make_cache_frame(seed), make_cache_frame(seed + 100)
+            start, end = aaa.index[250], aaa.index[330]
+            save_to_cache('AAA', aaa, '1d')
+            save_to_cache('SPY', spy, '1d')
+            # Only the window (plus warmup) is parsed: no full-file load
+            with mock.patch.object(data_manager, 'load_cached_data', side_effect=AssertionError):
+                ranged = prepare_analysis_dataframe('AAA', '12mo', start_date=start, end_date=end)
+            self.assertEqual((ranged.index[0], ranged.index[-1]), (start, end))
+
+            # Reference: the whole history up to end_date, built by period and masked
+            save_to_cache('AAA', aaa[:end], '1d')
+            save_to_cache('SPY', spy[:end], '1d')
+            reference = prepare_analysis_dataframe('AAA', '24mo')
+            reference = reference[reference.index >= start]
+            with self.subTest(seed=seed):
+                self.assertEqual(compare_period_frames(ranged, reference, warmup_bars=0), CUMULATIVE_COLUMNS)
+                for column in CUMULATIVE_COLUMNS:
+                    self.assertEqual((ranged[column] - reference[column]).round(6).nunique(), 1)
+                self.assertTrue(ranged['Market_Regime_OK'].equals(reference['Market_Regime_OK']))
+
+    def test_date_window_frames_are_memoized_by_range(self):
+        save_to_cache('AAA', make_cache_frame(0), '1d')
+        save_to_cache('SPY', make_cache_frame(100), '1d')
+        index = load_cached_data('AAA').index
+        window = dict(start_date=index[300], end_date=index[350])
+        first = get_analysis_dataframe('AAA', '12mo', **window)
+        self.assertEqual(len(first), 51)
+
+        with mock.patch('analysis_service.prepare_analysis_dataframe') as prepare:
+            pd.testing.assert_frame_equal(get_analysis_dataframe('AAA', '12mo', **window), first)
+            get_analysis_dataframe('AAA', '12mo', start_date=index[301], end_date=index[350])
+        self.assertEqual(prepare.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared regime-series store.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import frame_cache
+import generate_regime_indicators
+import regime_filter
+from data_manager import save_to_cache
+from regime_filter import (MARKET_MA_WINDOW, SECTOR_MA_WINDOW, calculate_historical_regime_series,
+                           clear_regime_store, get_regime_frame)
+from test_batch_screen import make_cache_frame
+
+
+def direct_regime(close, window, index):
+    """Regime flags computed straight from the benchmark closes."""
+    regime = close > close.rolling(window, min_periods=window).mean()
+    return regime.reindex(index, method='ffill').fillna(False).astype(bool)
+
+
+class TestRegimeStore(unittest.TestCase):
+    """Store-served regime series must equal a direct computation, computed once."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        frame_cache.set_frame_cache_enabled(False)
+        clear_regime_store()
+        self.closes = {}
+        for seed, benchmark in enumerate(['SPY', 'XLK', 'XLE']):
+            frame = make_cache_frame(seed + 10)
+            save_to_cache(benchmark, frame, '1d')
+            self.closes[benchmark] = frame['Close']
+
+    def tearDown(self):
+        clear_regime_store()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def test_series_match_direct_computation(self):
+        index = self.closes['SPY'].index[150:]
+        for ticker, sector_etf in [('AAPL', 'XLK'), ('XOM', 'XLE'), ('UNKNOWN', 'SPY')]:
+            with self.subTest(ticker=ticker):
+                market, sector, overall = calculate_historical_regime_series(ticker, pd.DataFrame(index=index))
+                expected_market = direct_regime(self.closes['SPY'], MARKET_MA_WINDOW, index)
+                expected_sector = direct_regime(self.closes[sector_etf], SECTOR_MA_WINDOW, index)
+                self.assertTrue(market.astype(bool).equals(expected_market))
+                self.assertTrue(sector.astype(bool).equals(expected_sector))
+                self.assertTrue(overall.astype(bool).equals(expected_market & expected_sector))
+                self.assertTrue(0 < expected_market.sum() < len(index))
+
+    def test_benchmarks_computed_once_per_cache_state(self):
+        get_range_data = regime_filter.get_range_data
+        with mock.patch.object(regime_filter, 'get_range_data', side_effect=get_range_data) as loads:
+            index = self.closes['SPY'].index[-100:]
+            for ticker in ['AAPL', 'MSFT', 'XOM', 'NVDA']:
+                calculate_historical_regime_series(ticker, pd.DataFrame(index=index))
+            self.assertEqual(sorted(c.args[0] for c in loads.call_args_list), ['SPY', 'XLE', 'XLK'])
+
+            # A refreshed benchmark cache is picked up
+            save_to_cache('XLK', make_cache_frame(99), '1d')
+            calculate_historical_regime_series('AAPL', pd.DataFrame(index=index))
+            self.assertEqual([c.args[0] for c in loads.call_args_list[3:]], ['XLK'])
+
+    def test_persisted_across_processes(self):
+        frame_cache.set_frame_cache_enabled(True)
+        stored = get_regime_frame('SPY', MARKET_MA_WINDOW)
+        clear_regime_store()  # as in a fresh process
+        with mock.patch.object(regime_filter, 'get_range_data', side_effect=AssertionError):
+            pd.testing.assert_frame_equal(get_regime_frame('SPY', MARKET_MA_WINDOW), stored)
+
+        save_to_cache('SPY', make_cache_frame(42), '1d')
+        clear_regime_store()
+        self.assertFalse(get_regime_frame('SPY', MARKET_MA_WINDOW).equals(stored))
+        self.assertEqual(len(os.listdir(regime_filter.DEFAULT_REGIME_STORE_DIR)), 1)
+
+    def test_indicator_report_uses_store(self):
+        report = generate_regime_indicators.calculate_regime_indicators('12mo')
+        spy = get_regime_frame('SPY', MARKET_MA_WINDOW).reindex(report.index)
+        xlk = get_regime_frame('XLK', SECTOR_MA_WINDOW).reindex(report.index)
+        pd.testing.assert_series_equal(report['SPY_200ma'], spy['MA'], check_names=False)
+        pd.testing.assert_series_equal(report['XLK_sector_regime'], xlk['Regime_OK'], check_names=False)
+        self.assertTrue(report['XLF_close'].isna().all())  # no XLF cache
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the array-based run_risk_managed_backtest event loop.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from backtest import run_multi_strategy_backtest, run_risk_managed_backtest
+from data_manager import read_ticker_file
+from risk_manager import RiskManager
+
+ENTRY_SIGNALS = ['Strong_Buy', 'Moderate_Buy', 'Stealth_Accumulation',
+                 'Confluence_Signal', 'Volume_Breakout']
+EXIT_SIGNALS = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal',
+                'Momentum_Exhaustion', 'Stop_Loss']
+EXCURSION_FIELDS = {'mae_pct': None, 'mfe_pct': None}
+TICKER_FILES = ['stocks_small.txt', 'test_single.txt', 'indices.txt']
+
+
+def legacy_risk_managed_trades(df, ticker, stop_strategy):
+    """Previous bar-by-bar df.iloc implementation, kept as the reference."""
+    risk_mgr = RiskManager(account_value=100000, risk_pct_per_trade=0.75,
+                           stop_strategy=stop_strategy)
+    all_trades = []
+    for idx in range(len(df)):
+        current_date = df.index[idx]
+        current_price = df.iloc[idx]['Close']
+        if ticker in risk_mgr.active_positions:
+            exit_check = risk_mgr.update_position(ticker=ticker, current_date=current_date,
+                                                  current_price=current_price, df=df,
+                                                  current_idx=idx)
+            has_exit_signal = any(df.iloc[idx][sig] for sig in EXIT_SIGNALS)
+            triggered_exits = [sig for sig in EXIT_SIGNALS if df.iloc[idx][sig]]
+            if exit_check['should_exit'] or has_exit_signal:
+                if exit_check['should_exit']:
+                    exit_signals_list = []
+                else:
+                    exit_check['exit_type'] = 'SIGNAL_EXIT'
+                    exit_signals_list = triggered_exits
+                exit_price = current_price if has_exit_signal else exit_check['exit_price']
+                trade = risk_mgr.close_position(ticker=ticker, exit_price=exit_price,
+                                                exit_type=exit_check['exit_type'],
+                                                exit_date=current_date,
+                                                partial_exit_pct=exit_check.get('exit_pct', 1.0),
+                                                exit_signals=exit_signals_list)
+                if trade:
+                    all_trades.append(trade)
+        if ticker not in risk_mgr.active_positions:
+            if any(df.iloc[idx][sig] for sig in ENTRY_SIGNALS):
+                if idx + 1 >= len(df):
+                    continue
+                entry_price = df.iloc[idx + 1]['Open']
+                entry_date = df.index[idx + 1]
+                triggered_entries = [sig for sig in ENTRY_SIGNALS if df.iloc[idx][sig]]
+                signal_scores = {'Accumulation_Score': float(df.iloc[idx]['Accumulation_Score'])}
+                if df.iloc[idx].get('Moderate_Buy', False):
+                    signal_scores['Moderate_Buy_Score'] = float(df.iloc[idx]['Moderate_Buy_Score'])
+                signal_scores['Profit_Taking_Score'] = float(df.iloc[idx]['Profit_Taking_Score'])
+                try:
+                    stop_price = risk_mgr.calculate_initial_stop(df, idx)
+                    risk_mgr.open_position(ticker=ticker, entry_date=entry_date,
+                                           entry_price=entry_price, stop_price=stop_price,
+                                           entry_idx=idx + 1, df=df,
+                                           entry_signals=triggered_entries,
+                                           signal_scores=signal_scores)
+                except (KeyError, ValueError):
+                    continue
+    if ticker in risk_mgr.active_positions:
+        trade = risk_mgr.close_position(ticker=ticker, exit_price=df.iloc[-1]['Close'],
+                                        exit_type='END_OF_DATA', exit_date=df.index[-1])
+        if trade:
+            all_trades.append(trade)
+    return all_trades
+
+
+def make_backtest_frame(ticker, n_bars=200):
+    """Synthetic indicator/signal frame seeded by the ticker symbol."""
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    dates = pd.bdate_range('2023-01-02', periods=n_bars)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.02, n_bars)))
+    df = pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, n_bars)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+    }, index=dates)
+    df['ATR20'] = close * 0.02
+    df['ATR_Z'] = rng.normal(0, 1, n_bars)
+    df['Recent_Swing_Low'] = df['Low'].rolling(10, min_periods=1).min()
+    df['VWAP'] = df['Close'].expanding().mean()
+    for col in ENTRY_SIGNALS:
+        df[col] = rng.random(n_bars) < 0.03
+    for col in EXIT_SIGNALS:
+        df[col] = rng.random(n_bars) < 0.015
+    df['Accumulation_Score'] = rng.uniform(0, 10, n_bars)
+    df['Moderate_Buy_Score'] = rng.uniform(0, 10, n_bars)
+    df['Profit_Taking_Score'] = rng.uniform(0, 10, n_bars)
+    df['Market_Regime_OK'] = rng.random(n_bars) < 0.7
+    df['Sector_Regime_OK'] = rng.random(n_bars) < 0.7
+    df['Overall_Regime_OK'] = df['Market_Regime_OK'] & df['Sector_Regime_OK']
+    return df
+
+
+class TestRiskManagedLoop(unittest.TestCase):
+    """The array-based loop must reproduce the legacy trades exactly."""
+
+    @classmethod
+    def setUpClass(cls):
+        tickers = []
+        for filename in TICKER_FILES:
+            if os.path.exists(filename):
+                tickers.extend(read_ticker_file(filename))
+        cls.tickers = sorted(set(tickers)) or ['AAPL', 'MSFT', 'NVDA']
+
+    def run_both(self, ticker, stop_strategy):
+        df = make_backtest_frame(ticker)
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = legacy_risk_managed_trades(df, ticker, stop_strategy)
+            result = run_risk_managed_backtest(df, ticker, stop_strategy=stop_strategy,
+                                               save_to_file=False)
+        return legacy, result['trades']
+
+    def test_trades_match_legacy_across_ticker_lists(self):
+        for ticker in self.tickers:
+            for stop_strategy in sorted(RiskManager.SUPPORTED_STOP_STRATEGIES):
+                with self.subTest(ticker=ticker, stop_strategy=stop_strategy):
+                    legacy, trades = self.run_both(ticker, stop_strategy)
+                    self.assertEqual(len(trades), len(legacy))
+                    for new, old in zip(trades, legacy):
+                        # Excursions are only computed by the new loop (bound frame)
+                        self.assertEqual({**new.to_dict(), **EXCURSION_FIELDS},
+                                         {**old.to_dict(), **EXCURSION_FIELDS})
+
+    def test_trades_carry_excursions(self):
+        """MAE/MFE bracket the entry price and match a direct High/Low scan."""
+        df = make_backtest_frame('MSFT')
+        with contextlib.redirect_stdout(io.StringIO()):
+            trades = run_risk_managed_backtest(df, 'MSFT', save_to_file=False)['trades']
+        self.assertTrue(trades)
+        for trade in trades:
+            entry_pos = df.index.get_loc(trade['entry_date'])
+            exit_pos = df.index.get_loc(trade['exit_date'])
+            window = df.iloc[entry_pos:exit_pos + 1]
+            self.assertAlmostEqual(trade['mae_pct'],
+                                   (window['Low'].min() / trade['entry_price'] - 1) * 100)
+            self.assertAlmostEqual(trade['mfe_pct'],
+                                   (window['High'].max() / trade['entry_price'] - 1) * 100)
+
+    def test_multi_strategy_pass_matches_single_runs(self):
+        """One pass over all strategies gives each strategy's standalone trades."""
+        strategies = sorted(RiskManager.SUPPORTED_STOP_STRATEGIES)
+        for ticker in self.tickers[:3]:
+            df = make_backtest_frame(ticker)
+            runs = run_multi_strategy_backtest(df, ticker, stop_strategies=strategies)
+            self.assertEqual(list(runs), strategies)
+            for stop_strategy in strategies:
+                with self.subTest(ticker=ticker, stop_strategy=stop_strategy):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        single = run_risk_managed_backtest(df, ticker, stop_strategy=stop_strategy,
+                                                           save_to_file=False)
+                    multi = runs[stop_strategy]
+                    self.assertEqual([t.to_dict() for t in multi['trades']],
+                                     [t.to_dict() for t in single['trades']])
+                    self.assertEqual(len(multi['ledger']), len(single['trades']))
+                    self.assertIsNone(multi['risk_manager']._bound_df)
+
+    def test_frame_is_unbound_after_run(self):
+        df = make_backtest_frame('AAPL')
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_risk_managed_backtest(df, 'AAPL', save_to_file=False)
+        self.assertIsNone(result['risk_manager']._bound_df)
+
+
+if __name__ == '__main__':
+    unittest.main()
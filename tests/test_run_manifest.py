@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test suite for the run manifest (resume and skip-unchanged batch runs).
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import batch_backtest
+import batch_processor
+import earnings_calendar
+import frame_cache
+from analysis_service import clear_analysis_frame_memo, prepare_analysis_dataframe
+from data_manager import save_to_cache
+from run_manifest import MANIFEST_FILENAME, RunManifest, get_run_fingerprint
+from test_batch_screen import make_cache_frame
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+
+def trade_records(results):
+    return [t.to_dict() if hasattr(t, 'to_dict') else dict(t) for t in results['all_paired_trades']]
+
+
+class TestRunManifest(unittest.TestCase):
+    """Incremental runs must process only new or changed tickers and aggregate identically."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.original_offline = earnings_calendar.is_offline_mode()
+        self.original_frame_cache = frame_cache.is_frame_cache_enabled()
+        earnings_calendar.set_offline_mode(True)
+        frame_cache.set_frame_cache_enabled(False)
+        clear_analysis_frame_memo()
+        for seed, ticker in enumerate(TICKERS + ['SPY']):
+            save_to_cache(ticker, make_cache_frame(seed), '1d')
+        self.ticker_file = os.path.join(self.temp_dir, 'tickers.txt')
+        with open(self.ticker_file, 'w') as f:
+            f.write('\n'.join(TICKERS) + '\n')
+        self.output_dir = os.path.join(self.temp_dir, 'out')
+
+    def tearDown(self):
+        clear_analysis_frame_memo()
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        earnings_calendar.set_offline_mode(self.original_offline)
+        frame_cache.set_frame_cache_enabled(self.original_frame_cache)
+
+    def run_backtest(self, incremental, fail_on=None):
+        backtest_ticker = batch_backtest._backtest_ticker
+
+        def tracked(ticker, *args, **kwargs):
+            if ticker == fail_on:
+                raise KeyboardInterrupt  # the run dies here
+            return backtest_ticker(ticker, *args, **kwargs)
+
+        with mock.patch.object(batch_backtest, '_backtest_ticker', side_effect=tracked) as calls, \
+                contextlib.redirect_stdout(io.StringIO()):
+            results = batch_backtest.run_batch_backtest(self.ticker_file, period='12mo', output_dir=self.output_dir,
+                                                        incremental=incremental)
+        return results, [c.args[0] for c in calls.call_args_list]
+
+    def test_backtest_resume_and_skip_unchanged(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self.run_backtest(incremental=False, fail_on='CCC')
+
+        # Resume: only the unfinished ticker runs
+        resumed, processed = self.run_backtest(incremental=True)
+        self.assertEqual(processed, ['CCC'])
+        self.assertEqual(resumed['tickers_reused'], ['AAA', 'BBB'])
+
+        full, processed = self.run_backtest(incremental=False)
+        self.assertEqual(processed, TICKERS)
+        self.assertEqual(resumed['tickers_processed'], full['tickers_processed'])
+        self.assertEqual(trade_records(resumed), trade_records(full))
+
+        # Incremental: only the ticker whose cache changed runs
+        changed = make_cache_frame(1)
+        changed['Volume'] = changed['Volume'] + 1
+        save_to_cache('BBB', changed, '1d')
+        _, processed = self.run_backtest(incremental=True)
+        self.assertEqual(processed, ['BBB'])
+        _, processed = self.run_backtest(incremental=True)
+        self.assertEqual(processed, [])
+
+        # Runs only append to the manifest (concurrent writers keep their lines)
+        with open(os.path.join(self.output_dir, MANIFEST_FILENAME)) as f:
+            self.assertEqual(len(f.readlines()), 2 + 1 + 3 + 1)
+
+    def test_process_batch_reuses_unchanged_reports(self):
+        def fake_analyze(ticker, period, **kwargs):
+            df = prepare_analysis_dataframe(ticker, period)
+            filepath = os.path.join(kwargs['output_dir'], f"{ticker}_{period}_analysis.txt")
+            with open(filepath, 'w') as f:
+                f.write(ticker)
+            return df, filepath
+
+        def run():
+            with mock.patch('vol_analysis.analyze_ticker', side_effect=fake_analyze) as analyze, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                batch_processor.process_batch(self.ticker_file, period='12mo', output_dir=self.output_dir,
+                                              generate_html=False, incremental=True)
+            return [c.kwargs['ticker'] for c in analyze.call_args_list]
+
+        self.assertEqual(run(), TICKERS)
+        self.assertEqual(run(), [])
+
+        # A deleted report is regenerated
+        os.remove(os.path.join(self.output_dir, 'BBB_12mo_analysis.txt'))
+        self.assertEqual(run(), ['BBB'])
+
+    def test_manifest_entries(self):
+        manifest = RunManifest(self.output_dir)
+        self.assertIsNone(get_run_fingerprint('AAA', None, {}, ['run_manifest']))
+        fingerprint = get_run_fingerprint('AAA', 'frame-key', {'risk_pct': 0.75}, ['run_manifest'])
+        self.assertNotEqual(fingerprint, get_run_fingerprint('AAA', 'frame-key', {'risk_pct': 1.0}, ['run_manifest']))
+
+        manifest.record('AAA', fingerprint, {'ticker': 'AAA'})
+        manifest.record('AAA', fingerprint, {'ticker': 'AAA', 'run': 2})
+        with open(os.path.join(self.output_dir, MANIFEST_FILENAME), 'a') as f:
+            f.write('{"version": 1, "ticker": "BB')  # torn line from a crash
+
+        reopened = RunManifest(self.output_dir)
+        self.assertEqual(reopened.lookup('AAA', fingerprint), {'ticker': 'AAA', 'run': 2})
+        self.assertIsNone(reopened.lookup('AAA', 'other'))
+        self.assertIsNone(reopened.lookup('BBB', fingerprint))
+
+        # Another writer recording different inputs does not replace the result
+        # this reader's entry points to
+        other = get_run_fingerprint('AAA', 'frame-key', {'risk_pct': 1.0}, ['run_manifest'])
+        RunManifest(self.output_dir).record('AAA', other, {'ticker': 'AAA', 'risk_pct': 1.0})
+        self.assertEqual(reopened.lookup('AAA', fingerprint), {'ticker': 'AAA', 'run': 2})
+        self.assertEqual(RunManifest(self.output_dir).lookup('AAA', other), {'ticker': 'AAA', 'risk_pct': 1.0})
+        RunManifest(self.output_dir).compact()
+        with open(os.path.join(self.output_dir, MANIFEST_FILENAME)) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
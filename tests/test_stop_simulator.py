@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test suite for the vectorized stop simulator.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from backtest import run_multi_strategy_backtest
+from stop_simulator import StopSimulator, expand_stop_param_grid
+from test_risk_managed_loop import make_backtest_frame
+
+
+class TestStopSimulator(unittest.TestCase):
+    """Vectorized exits must match the RiskManager event loop."""
+
+    def test_matches_event_loop_for_every_strategy(self):
+        for ticker in ['AAPL', 'MSFT', 'NVDA']:
+            df = make_backtest_frame(ticker, n_bars=400)
+            for stop_strategy, run in run_multi_strategy_backtest(df, ticker).items():
+                simulated = StopSimulator.from_trades(df, run['trades']).simulate(stop_strategy)
+                simulated = simulated.set_index('entry_date')
+                for trade in run['trades']:
+                    with self.subTest(ticker=ticker, stop_strategy=stop_strategy,
+                                      entry=trade['entry_date']):
+                        row = simulated.loc[trade['entry_date']]
+                        if trade['partial_exit']:
+                            self.assertEqual(df.index[row['partial_exit_idx']], trade['exit_date'])
+                            self.assertAlmostEqual(row['partial_r_multiple'], trade['r_multiple'])
+                        else:
+                            self.assertEqual(df.index[row['exit_idx']], trade['exit_date'])
+                            self.assertEqual(row['exit_type'], trade['exit_type'])
+                            self.assertAlmostEqual(row['exit_price'], trade['exit_price'])
+                            self.assertAlmostEqual(row['r_multiple'], trade['r_multiple'])
+
+    def test_variation_scores_match_single_runs(self):
+        """Each row of a batched score equals simulating that parameter set alone."""
+        df = make_backtest_frame('SPY', n_bars=400)
+        entries = np.flatnonzero(df['Strong_Buy'].to_numpy() | df['Moderate_Buy'].to_numpy()) + 1
+        sim = StopSimulator(df, entries)
+        grid = expand_stop_param_grid('atr_dynamic', {'multiplier': [1.5, 2.0, 3.0],
+                                                      'max_multiplier': [2.5, 3.5]})
+        scores = sim.score_variations('atr_dynamic', grid)
+        self.assertEqual(len(scores), 6)
+        for i, params in enumerate(grid):
+            single = sim.simulate('atr_dynamic', params)
+            self.assertAlmostEqual(scores['avg_r'].iloc[i], single['r_multiple'].mean())
+            self.assertEqual(scores['multiplier'].iloc[i], params['multiplier'])
+
+    def test_max_holding_bars_caps_open_trades(self):
+        df = make_backtest_frame('QQQ', n_bars=300)
+        sim = StopSimulator(df, [50, 120], exit_signals=[], max_holding_bars=3)
+        result = sim.simulate('static')
+        self.assertTrue((result['bars_held'] <= 2).all())
+        self.assertTrue(set(result['exit_type']) <= {'HARD_STOP', 'MAX_HOLDING', 'TRAIL_STOP'})
+
+    def test_grid_rejects_unknown_parameters(self):
+        with self.assertRaises(ValueError):
+            expand_stop_param_grid('pct_trail', {'multiplier': [1.0]})
+        with self.assertRaises(ValueError):
+            expand_stop_param_grid('static', {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the single-pass threshold sweep engine.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from backtest import (
+    THRESHOLD_EXIT_SIGNALS,
+    analyze_strategy_performance,
+    build_signal_trade_table,
+    optimize_signal_thresholds,
+    pair_entry_exit_signals,
+    sweep_signal_thresholds,
+)
+
+
+def legacy_threshold_metrics(df, signal_col, score_col, threshold):
+    """Previous copy-filter-pair implementation for a single threshold."""
+    df_filtered = df.copy()
+    df_filtered[f'{signal_col}_filtered'] = (df[signal_col] == True) & (df[score_col] >= threshold)
+    if df_filtered[f'{signal_col}_filtered'].sum() == 0:
+        return None
+    paired = pair_entry_exit_signals(df_filtered, [f'{signal_col}_filtered'], THRESHOLD_EXIT_SIGNALS)
+    if not paired:
+        return None
+    return analyze_strategy_performance(paired, entry_filter=f'{signal_col}_filtered')
+
+
+def make_score_frame(n_bars=400, seed=11):
+    """Random signal/score frame with every threshold exit column."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=n_bars)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    df = pd.DataFrame({'Close': close}, index=dates)
+    df['Next_Open'] = df['Close'].shift(-1) + rng.normal(0, 0.2, n_bars)
+    df['Moderate_Buy'] = rng.random(n_bars) < 0.2
+    df['Moderate_Buy_Score'] = np.round(rng.uniform(0, 10, n_bars), 2)
+    for col in THRESHOLD_EXIT_SIGNALS:
+        df[col] = rng.random(n_bars) < 0.02
+    # Long quiet tail leaves the final signals as open trades
+    df.loc[df.index[-40:], THRESHOLD_EXIT_SIGNALS] = False
+    df.loc[df.index[-40:-30], 'Moderate_Buy'] = True
+    return df
+
+
+class TestThresholdSweep(unittest.TestCase):
+    """Sweep metrics must equal the per-threshold copy/filter/pair loop."""
+
+    def setUp(self):
+        self.df = make_score_frame()
+
+    def assert_matches_legacy(self, df, thresholds):
+        sweep = sweep_signal_thresholds(
+            build_signal_trade_table(df, 'Moderate_Buy', 'Moderate_Buy_Score'), thresholds
+        )
+        for threshold, row in zip(thresholds, sweep.itertuples(index=False)):
+            legacy = legacy_threshold_metrics(df, 'Moderate_Buy', 'Moderate_Buy_Score', threshold)
+            if legacy is None:
+                self.assertEqual(row.total_trades, 0)
+                continue
+            self.assertEqual(row.total_trades, legacy['total_trades'])
+            self.assertEqual(row.closed_trades, legacy['closed_trades'])
+            if legacy['closed_trades'] == 0:
+                continue
+            for key in ('win_rate', 'avg_return', 'median_return', 'avg_win', 'avg_loss',
+                        'expectancy', 'profit_factor', 'best_return', 'worst_return'):
+                self.assertAlmostEqual(getattr(row, key), legacy[key], places=9,
+                                       msg=f"{key} at threshold {threshold}")
+
+    def test_default_thresholds_match_legacy(self):
+        self.assert_matches_legacy(self.df, [0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+
+    def test_fine_grid_matches_legacy(self):
+        """A 0.1 grid (including empty upper thresholds) comes from the same table."""
+        self.assert_matches_legacy(self.df, list(np.round(np.arange(0, 10.6, 0.1), 1)))
+
+    def test_missing_fills_and_nan_scores(self):
+        df = self.df.copy()
+        df.iloc[::17, df.columns.get_loc('Next_Open')] = np.nan
+        df.iloc[::13, df.columns.get_loc('Moderate_Buy_Score')] = np.nan
+        self.assert_matches_legacy(df, [0, 2.5, 5.0, 7.5])
+
+    def test_optimize_signal_thresholds_result_shape(self):
+        """Result dicts keep their keys, including the empty-threshold form."""
+        results = optimize_signal_thresholds(self.df, 'Moderate_Buy', 'Moderate_Buy_Score',
+                                             thresholds=[5.0, 11.0])
+        legacy = legacy_threshold_metrics(self.df, 'Moderate_Buy', 'Moderate_Buy_Score', 5.0)
+        self.assertEqual(results[5.0]['trades'], legacy['closed_trades'])
+        self.assertEqual(results[5.0]['sample_size'], legacy['total_trades'])
+        self.assertAlmostEqual(results[5.0]['expectancy'], legacy['expectancy'], places=9)
+        self.assertEqual(results[11.0], {'threshold': 11.0, 'trades': 0, 'win_rate': 0,
+                                         'avg_return': 0, 'expectancy': 0, 'sample_size': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
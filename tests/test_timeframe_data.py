@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test suite for weekly/monthly bars derived from the daily cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+import data_manager
+from data_manager import get_timeframe_data, save_to_cache
+from error_handler import DataValidationError
+
+
+class TestTimeframeData(unittest.TestCase):
+    """Test cases for higher-timeframe resampling of cached daily bars."""
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        data_manager._timeframe_memo.clear()
+
+        end = pd.Timestamp.now().normalize()
+        dates = pd.bdate_range(end=end, periods=300)
+        rng = np.random.default_rng(3)
+        close = 100 + np.cumsum(rng.normal(0, 1, len(dates)))
+        self.daily = pd.DataFrame({
+            'Open': close + rng.normal(0, 0.2, len(dates)),
+            'High': close + 1.0,
+            'Low': close - 1.0,
+            'Close': close,
+            'Volume': rng.integers(1_000_000, 5_000_000, len(dates)),
+        }, index=dates)
+        save_to_cache('TEST', self.daily, '1d')
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir)
+        data_manager._timeframe_memo.clear()
+
+    def test_weekly_bars_aggregate_daily_ohlcv(self):
+        """Weekly bars use first/max/min/last/sum and are labelled by week end."""
+        weekly = get_timeframe_data('TEST', 'max', interval='1wk')
+
+        week_periods = self.daily.index.to_period('W-FRI')
+        last_week = self.daily[week_periods == week_periods[-1]]
+        self.assertEqual(weekly.index[-1], last_week.index[-1])
+        self.assertAlmostEqual(weekly['Open'].iloc[-1], last_week['Open'].iloc[0], places=6)
+        self.assertAlmostEqual(weekly['High'].iloc[-1], last_week['High'].max(), places=6)
+        self.assertAlmostEqual(weekly['Low'].iloc[-1], last_week['Low'].min(), places=6)
+        self.assertAlmostEqual(weekly['Close'].iloc[-1], last_week['Close'].iloc[-1], places=6)
+        self.assertEqual(weekly['Volume'].iloc[-1], last_week['Volume'].sum())
+        self.assertEqual(weekly['Volume'].sum(), self.daily['Volume'].sum())
+
+    def test_monthly_bars(self):
+        """Monthly bars cover every calendar month in the cache."""
+        monthly = get_timeframe_data('TEST', 'max', interval='1mo')
+        self.assertEqual(len(monthly), self.daily.index.to_period('M').nunique())
+
+    def test_memoized_per_cache_checksum(self):
+        """Resampling reuses the memo until the daily cache changes."""
+        with patch('data_manager.get_smart_data', wraps=data_manager.get_smart_data) as spy:
+            get_timeframe_data('TEST', '12mo', interval='1wk')
+            get_timeframe_data('TEST', '6mo', interval='1wk')
+            self.assertEqual(spy.call_count, 1)
+
+            changed = self.daily.copy()
+            changed['Volume'] = changed['Volume'] + 1
+            save_to_cache('TEST', changed, '1d')
+            get_timeframe_data('TEST', '12mo', interval='1wk')
+            self.assertEqual(spy.call_count, 2)
+
+    def test_rejects_unsupported_interval(self):
+        """Only weekly and monthly timeframes are derived."""
+        with self.assertRaises(DataValidationError):
+            get_timeframe_data('TEST', '12mo', interval='1h')
+
+
+if __name__ == '__main__':
+    unittest.main()
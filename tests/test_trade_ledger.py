@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test suite for slotted position/trade records and the columnar trade ledger.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from risk_manager import (
+    Position,
+    RiskManager,
+    TradeLedger,
+    TradeRecord,
+    analyze_risk_managed_trades,
+)
+
+
+def legacy_analyze(trades):
+    """Previous DataFrame-based analysis (subset of keys), kept as the reference."""
+    trades_df = pd.DataFrame([dict(t.items()) if hasattr(t, 'items') else t for t in trades])
+    trades_df['profit_taken_50pct'] = trades_df['profit_taken_50pct'].fillna(False)
+    trades_df['partial_exit'] = trades_df['partial_exit'].fillna(False)
+    trades_df['dollar_pnl'] = trades_df['dollar_pnl'].fillna(0.0)
+    return {
+        'Win Rate': f"{(trades_df['r_multiple'] > 0).sum() / len(trades) * 100:.1f}%",
+        'Average R-Multiple': f"{trades_df['r_multiple'].mean():.2f}R",
+        'Average Bars Held': f"{trades_df['bars_held'].mean():.1f}",
+        'Profit Scaling Used': ((trades_df['profit_taken_50pct']) & (~trades_df['partial_exit'])).sum(),
+        'Total Dollar P&L': f"${trades_df['dollar_pnl'].sum():,.0f}",
+        'Time Stops': (trades_df['exit_type'] == 'TIME_STOP').sum(),
+        'Best Trade': f"{trades_df['r_multiple'].max():.2f}R",
+        'Peak R-Multiple Avg': f"{trades_df['peak_r_multiple'].mean():.2f}R",
+    }
+
+
+def make_trades(n_trades=500, seed=5):
+    """Random full and partial trades through a real RiskManager."""
+    rng = np.random.default_rng(seed)
+    rm = RiskManager(account_value=100_000)
+    dates = pd.bdate_range('2024-01-01', periods=n_trades * 2)
+    for i in range(n_trades):
+        rm.open_position(ticker='TEST', entry_date=dates[2 * i], entry_price=100.0,
+                         stop_price=95.0, entry_idx=2 * i, df=pd.DataFrame(index=dates),
+                         entry_signals=['Strong_Buy'])
+        rm.active_positions['TEST'].bars_in_trade = int(rng.integers(1, 20))
+        rm.active_positions['TEST'].peak_r_multiple = float(rng.uniform(0, 4))
+        if i % 4 == 0:
+            rm.active_positions['TEST'].profit_taken_50pct = True
+            rm.close_position('TEST', 110.0, 'PROFIT_TARGET', dates[2 * i + 1], partial_exit_pct=0.5)
+        exit_type = ['TIME_STOP', 'SIGNAL_EXIT', 'TRAIL_STOP'][i % 3]
+        rm.close_position('TEST', float(rng.uniform(90, 115)), exit_type, dates[2 * i + 1])
+    return rm
+
+
+class TestTradeRecords(unittest.TestCase):
+    """Slotted records keep dict-style access for existing callers."""
+
+    def setUp(self):
+        self.rm = make_trades(n_trades=20)
+        self.trade = self.rm.closed_trades[0]
+
+    def test_records_are_slotted(self):
+        self.assertFalse(hasattr(self.trade, '__dict__'))
+        self.assertIsInstance(self.trade, TradeRecord)
+        self.assertFalse(hasattr(Position.__new__(Position), '__dict__'))
+
+    def test_dict_style_access(self):
+        self.assertEqual(self.trade['r_multiple'], self.trade.r_multiple)
+        self.assertIn('dollar_pnl', self.trade)
+        self.assertIsNone(self.trade.get('missing'))
+        with self.assertRaises(KeyError):
+            self.trade['missing']
+
+        self.trade['strategy'] = 'time_decay'
+        self.assertIn('strategy', self.trade)
+        self.assertEqual(self.trade.to_dict()['strategy'], 'time_decay')
+
+    def test_ledger_extra_columns(self):
+        ledger = TradeLedger.from_records(self.rm.closed_trades[:3] + [{'ticker': 'X', 'note': 'dict'}])
+        frame = ledger.to_frame()
+        self.assertEqual(len(frame), 4)
+        self.assertEqual(frame['note'].tolist(), [None, None, None, 'dict'])
+
+
+class TestLedgerAnalysis(unittest.TestCase):
+    """Ledger-based analytics match the previous DataFrame implementation."""
+
+    def test_matches_legacy_analysis(self):
+        rm = make_trades()
+        expected = legacy_analyze(rm.closed_trades)
+        for source in (rm.ledger, rm.closed_trades, [t.to_dict() for t in rm.closed_trades]):
+            analysis = analyze_risk_managed_trades(source)
+            self.assertEqual(analysis['Total Trades'], len(rm.closed_trades))
+            for key, value in expected.items():
+                actual = analysis['Exit Type Breakdown'][key] if key == 'Time Stops' else analysis[key]
+                self.assertEqual(actual, value, key)
+
+    def test_ledger_tracks_closed_trades(self):
+        rm = make_trades(n_trades=10)
+        self.assertEqual(len(rm.ledger), len(rm.closed_trades))
+        np.testing.assert_allclose(rm.ledger.column('r_multiple', float),
+                                   [t.r_multiple for t in rm.closed_trades])
+        rm.reset()
+        self.assertEqual(len(rm.ledger), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test suite for R-space replay of recorded trade ledgers.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add current directory to path to import local modules
+sys.path.insert(0, os.getcwd())
+
+from backtest import run_risk_managed_backtest
+from error_handler import DataValidationError
+from risk_manager import TradeLedger
+from test_risk_managed_loop import make_backtest_frame
+from trade_replay import replay_trade_ledger, resize_trades, summarize_replay
+
+
+def backtest_trades(ticker, account_value=100000, risk_pct=0.75, n_bars=400):
+    df = make_backtest_frame(ticker, n_bars=n_bars)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_risk_managed_backtest(df, ticker, account_value=account_value,
+                                         risk_pct=risk_pct, save_to_file=False)['trades']
+
+
+class TestTradeReplay(unittest.TestCase):
+    """Replayed sizes and P&L must match re-running the backtest."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.trades = {ticker: backtest_trades(ticker) for ticker in ['AAPL', 'MSFT', 'NVDA']}
+
+    def assert_matches(self, resized, expected):
+        expected = TradeLedger.from_records(expected).to_frame()
+        expected = expected.sort_values('exit_date', kind='stable').reset_index(drop=True)
+        self.assertEqual(resized['position_size'].tolist(), expected['position_size'].tolist())
+        for col in ['dollar_pnl', 'equity_after_trade']:
+            pd.testing.assert_series_equal(resized[col], expected[col], check_names=False,
+                                           check_dtype=False)
+
+    def test_original_parameters_reproduce_ledger(self):
+        """Per-ticker accounts, all tickers in one ledger, as batch_backtest stores them."""
+        combined = [trade for trades in self.trades.values() for trade in trades]
+        self.assert_matches(resize_trades(combined, 100000, 0.75), combined)
+
+    def test_other_parameters_match_rerun(self):
+        for account_value, risk_pct in [(50000, 0.5), (250000, 1.5)]:
+            with self.subTest(account_value=account_value, risk_pct=risk_pct):
+                rerun = backtest_trades('MSFT', account_value, risk_pct)
+                self.assert_matches(resize_trades(self.trades['MSFT'], account_value, risk_pct), rerun)
+
+    def test_grid_summary(self):
+        replay = replay_trade_ledger(self.trades['AAPL'], [50000, 100000], [0.5, 0.75, 1.0])
+        summary = summarize_replay(replay)
+        self.assertEqual(len(summary), 6)
+        self.assertEqual(replay['position_size'].shape, (len(self.trades['AAPL']), 6))
+        self.assertTrue((summary['max_drawdown_pct'] <= 0).all())
+        self.assertTrue((summary['ending_equity'] - summary['starting_equity']
+                         - summary['total_pnl']).abs().max() < 1e-6)
+
+        single = resize_trades(self.trades['AAPL'], 100000, 1.0)
+        row = summary[(summary['account_value'] == 100000) & (summary['risk_pct'] == 1.0)].iloc[0]
+        self.assertAlmostEqual(row['total_pnl'], single['dollar_pnl'].sum())
+
+    def test_shared_account_uses_one_equity_pool(self):
+        combined = self.trades['AAPL'] + self.trades['NVDA']
+        replay = replay_trade_ledger(combined, [100000], [0.75], shared_account=True)
+        equity = replay['equity_after_trade'][:, 0]
+        self.assertEqual(replay['starting_equity'][0], 100000)
+        pd.testing.assert_series_equal(pd.Series(equity),
+                                       pd.Series(replay['total_equity'][:, 0]))
+
+    def test_rejects_ledger_without_initial_stop(self):
+        ledger = TradeLedger.from_records(self.trades['AAPL']).to_frame().drop(columns='initial_stop')
+        with self.assertRaises(DataValidationError):
+            replay_trade_ledger(ledger, [100000], [0.75])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,12 +19,11 @@ Usage:
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional
 import argparse
 import os
 
-from risk_manager import RiskManager
-from backtest import pair_entry_exit_signals, analyze_strategy_performance
+from backtest import pair_entry_exit_signals, analyze_strategy_performance, run_multi_strategy_backtest
 from data_manager import get_smart_data, read_ticker_file
 from indicators import calculate_zscore
 import vol_analysis
@@ -36,128 +35,6 @@ import indicators
 
 
 
-def run_strategy_backtest(
-    ticker: str,
-    df: pd.DataFrame,
-    strategy: str,
-    account_value: float = 100000,
-    risk_pct: float = 0.75
-) -> Tuple[List[Dict], RiskManager]:
-    """
-    Run backtest with specific variable stop strategy.
-    
-    Args:
-        ticker: Stock symbol
-        df: DataFrame with signals and indicators
-        strategy: Stop loss strategy name
-        account_value: Starting account value
-        risk_pct: Risk per trade percentage
-        
-    Returns:
-        Tuple of (trades list, risk manager instance)
-    """
-    # Initialize production risk manager (now supports all variable stops)
-    risk_mgr = RiskManager(
-        account_value=account_value,
-        risk_pct_per_trade=risk_pct,
-        stop_strategy=strategy
-    )
-    
-    # Entry and exit signals
-    entry_signals = ['Strong_Buy', 'Moderate_Buy', 'Stealth_Accumulation', 
-                     'Confluence_Signal', 'Volume_Breakout']
-    exit_signals = ['Profit_Taking', 'Distribution_Warning', 'Sell_Signal',
-                    'Momentum_Exhaustion', 'Stop_Loss']
-    
-    # Run backtest
-    all_trades = []
-    
-    for idx in range(len(df)):
-        current_date = df.index[idx]
-        current_price = df.iloc[idx]['Close']
-        
-        # Update active positions
-        if ticker in risk_mgr.active_positions:
-            exit_check = risk_mgr.update_position(
-                ticker=ticker,
-                current_date=current_date,
-                current_price=current_price,
-                df=df,
-                current_idx=idx
-            )
-            
-            # Check for exit signals
-            has_exit_signal = any(df.iloc[idx][sig] for sig in exit_signals)
-            triggered_exits = [sig for sig in exit_signals if df.iloc[idx][sig]]
-            
-            should_exit = exit_check['should_exit'] or has_exit_signal
-            
-            if should_exit:
-                # Determine exit type
-                if exit_check['should_exit']:
-                    exit_type = exit_check['exit_type']
-                    exit_reason = exit_check['reason']
-                else:
-                    exit_type = 'SIGNAL_EXIT'
-                    exit_reason = f"Exit signal: {', '.join(triggered_exits)}"
-                
-                # Close position
-                exit_price = current_price if has_exit_signal else exit_check['exit_price']
-                
-                trade = risk_mgr.close_position(
-                    ticker=ticker,
-                    exit_price=exit_price,
-                    exit_type=exit_type,
-                    exit_date=current_date,
-                    partial_exit_pct=exit_check.get('exit_pct', 1.0)
-                )
-                
-                if trade:
-                    trade['strategy'] = strategy
-                    all_trades.append(trade)
-        
-        # Check for entry signals
-        if ticker not in risk_mgr.active_positions:
-            has_entry_signal = any(df.iloc[idx][sig] for sig in entry_signals)
-            
-            if has_entry_signal and idx + 1 < len(df):
-                entry_price = df.iloc[idx + 1]['Open']
-                entry_date = df.index[idx + 1]
-                
-                try:
-                    stop_price = risk_mgr.calculate_initial_stop(df, idx)
-                    
-                    position = risk_mgr.open_position(
-                        ticker=ticker,
-                        entry_date=entry_date,
-                        entry_price=entry_price,
-                        stop_price=stop_price,
-                        entry_idx=idx + 1,
-                        df=df
-                    )
-                    
-                except (KeyError, ValueError):
-                    continue
-    
-    # Close any remaining positions
-    if ticker in risk_mgr.active_positions:
-        last_price = df.iloc[-1]['Close']
-        last_date = df.index[-1]
-        
-        trade = risk_mgr.close_position(
-            ticker=ticker,
-            exit_price=last_price,
-            exit_type='END_OF_DATA',
-            exit_date=last_date
-        )
-        
-        if trade:
-            trade['strategy'] = strategy
-            all_trades.append(trade)
-    
-    return all_trades, risk_mgr
-
-
 def calculate_all_indicators(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
     """
     Calculate indicators directly on provided DataFrame WITHOUT re-downloading data.
@@ -295,16 +172,20 @@ def compare_stop_strategies(
             print(f"❌ Error loading {ticker}: {e}")
             continue
         
-        # Test each strategy
+        # Run every strategy in one pass over the bars
+        try:
+            strategy_runs = run_multi_strategy_backtest(df, ticker, stop_strategies=strategies)
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            continue
+        
         for strategy in strategies:
             print(f"\n   Testing {strategy}...")
             
             try:
-                trades, risk_mgr = run_strategy_backtest(
-                    ticker=ticker,
-                    df=df,
-                    strategy=strategy
-                )
+                trades = strategy_runs[strategy]['trades']
+                for trade in trades:
+                    trade['strategy'] = strategy
                 
                 if not trades:
                     print(f"      No trades generated")
@@ -15,6 +15,8 @@ Generated by: Item #8 (Empirical Signal Threshold Optimization)
 Last Updated: 2025-11-04
 """
 
+import hashlib
+import json
 from datetime import datetime
 from typing import Dict, Any
 
@@ -92,6 +94,12 @@ OPTIMAL_THRESHOLDS: Dict[str, Dict[str, Any]] = {
 }
 
 
+def get_threshold_fingerprint() -> str:
+    """Identify the current threshold configuration (for checkpoint/cache keys)."""
+    payload = json.dumps(OPTIMAL_THRESHOLDS, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
 # Threshold quality assessment functions
 def get_threshold_quality(signal_type: str) -> str:
     """
@@ -0,0 +1,283 @@
+"""
+Resize recorded risk-managed trades in R-space.
+
+RiskManager sizes every position as int(equity * risk_pct / 100 / risk_per_share),
+where risk_per_share = entry_price - initial_stop and equity is the realized
+account equity when the entry is placed. Exits, prices and R-multiples do not
+depend on size, so a stored trade ledger can be replayed for any account size
+and risk percentage without re-running the backtest.
+
+replay_trade_ledger() walks the ledger's entries and exits once, in time order,
+and carries a whole grid of (account_value, risk_pct) pairs as arrays. With the
+original parameters it reproduces position_size, dollar_pnl and
+equity_after_trade exactly.
+
+By default each ticker has its own account, as in batch_backtest (one
+RiskManager per ticker); shared_account=True replays all tickers against one
+account instead.
+
+Usage:
+    python trade_replay.py backtest_results/PORTFOLIO_TRADE_LOG_24mo_*.csv \\
+        --account-values 50000 100000 --risk-pcts 0.5 0.75 1.0
+"""
+
+import argparse
+import itertools
+import sys
+from typing import Dict, Iterable, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from error_handler import ErrorContext, DataValidationError, validate_file_path
+from risk_manager import TradeLedger
+
+REQUIRED_COLUMNS = ['ticker', 'entry_date', 'entry_price', 'exit_date', 'exit_price',
+                    'partial_exit', 'exit_pct', 'initial_stop']
+
+
+def load_trade_ledger(trades: Union[str, pd.DataFrame, TradeLedger, Iterable]) -> pd.DataFrame:
+    """
+    Normalize a trade ledger to a DataFrame.
+
+    Args:
+        trades: CSV path (batch_backtest trade log), DataFrame, TradeLedger,
+            or a list of TradeRecords / trade dicts
+
+    Returns:
+        pd.DataFrame: Ledger with parsed dates, in recorded order
+
+    Raises:
+        DataValidationError: If columns needed for resizing are missing
+    """
+    if isinstance(trades, str):
+        validate_file_path(trades, check_exists=True, check_readable=True)
+        ledger = pd.read_csv(trades)
+    elif isinstance(trades, pd.DataFrame):
+        ledger = trades.copy()
+    elif isinstance(trades, TradeLedger):
+        ledger = trades.to_frame()
+    else:
+        ledger = TradeLedger.from_records(trades).to_frame()
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in ledger.columns]
+    if missing:
+        raise DataValidationError(f"Trade ledger is missing columns {missing}; "
+                                  f"re-run the backtest to record initial stops")
+    if ledger['initial_stop'].isna().any():
+        raise DataValidationError("Trade ledger has trades without initial_stop; "
+                                  "re-run the backtest to record initial stops")
+
+    ledger['entry_date'] = pd.to_datetime(ledger['entry_date'])
+    ledger['exit_date'] = pd.to_datetime(ledger['exit_date'])
+    ledger['partial_exit'] = ledger['partial_exit'].fillna(False).astype(bool)
+    return ledger.reset_index(drop=True)
+
+
+def replay_trade_ledger(trades, account_values: Sequence[float], risk_pcts: Sequence[float],
+                        shared_account: bool = False) -> Dict:
+    """
+    Recompute sizes, P&L and equity for every (account_value, risk_pct) pair.
+
+    Args:
+        trades: Anything load_trade_ledger() accepts
+        account_values: Starting account values to test
+        risk_pcts: Risk percentages per trade to test
+        shared_account: One account for all tickers (default: one per ticker)
+
+    Returns:
+        Dict: 'ledger' (DataFrame, time-ordered), 'grid' (DataFrame of pairs),
+            and (trades x grid) arrays 'position_size', 'dollar_pnl',
+            'equity_after_trade' (the trade's account) and 'total_equity'
+            (all accounts), plus 'starting_equity' per grid pair
+    """
+    with ErrorContext("replaying trade ledger"):
+        ledger = load_trade_ledger(trades)
+        grid = pd.DataFrame(list(itertools.product(account_values, risk_pcts)),
+                            columns=['account_value', 'risk_pct'])
+        n_trades, n_grid = len(ledger), len(grid)
+        accounts = grid['account_value'].to_numpy(dtype=float)
+        risk_fraction = grid['risk_pct'].to_numpy(dtype=float) / 100
+
+        # Time order; a stable sort keeps each ticker's recorded close order
+        ledger = ledger.sort_values('exit_date', kind='stable').reset_index(drop=True)
+
+        # Records -> positions (same ticker and entry date, until a full exit)
+        tickers = ledger['ticker'].to_numpy()
+        entry_dates = ledger['entry_date'].to_numpy()
+        partial = ledger['partial_exit'].to_numpy()
+        position_of = np.empty(n_trades, dtype=int)
+        open_positions: Dict = {}
+        first_record = []
+        for i in range(n_trades):
+            key = (tickers[i], entry_dates[i])
+            if key not in open_positions:
+                open_positions[key] = len(first_record)
+                first_record.append(i)
+            position_of[i] = open_positions[key]
+            if not partial[i]:
+                del open_positions[key]
+        first_record = np.array(first_record, dtype=int)
+        n_positions = len(first_record)
+
+        account_names = np.zeros(n_trades, dtype=int) if shared_account else \
+            pd.factorize(ledger['ticker'])[0]
+        n_accounts = int(account_names.max()) + 1 if n_trades else 0
+
+        # Entries are sized before exits dated the same day: the backtest opens a
+        # position while processing the signal bar, one bar before entry_date
+        entry_events = pd.DataFrame({'date': entry_dates[first_record], 'kind': 0,
+                                     'index': np.arange(n_positions)})
+        exit_events = pd.DataFrame({'date': ledger['exit_date'].to_numpy(), 'kind': 1,
+                                    'index': np.arange(n_trades)})
+        events = pd.concat([entry_events, exit_events], ignore_index=True)
+        events = events.sort_values(['date', 'kind'], kind='stable')
+
+        entry_price = ledger['entry_price'].to_numpy(dtype=float)
+        risk_per_share = entry_price - ledger['initial_stop'].to_numpy(dtype=float)
+        exit_price = ledger['exit_price'].to_numpy(dtype=float)
+        exit_pct = ledger['exit_pct'].to_numpy(dtype=float)
+
+        equity = np.broadcast_to(accounts, (n_accounts, n_grid)).astype(float)
+        total = accounts * n_accounts
+        remaining = np.zeros((n_positions, n_grid), dtype=np.int64)
+        position_size = np.zeros((n_trades, n_grid), dtype=np.int64)
+        dollar_pnl = np.zeros((n_trades, n_grid))
+        equity_after = np.zeros((n_trades, n_grid))
+        total_equity = np.zeros((n_trades, n_grid))
+
+        for kind, index in zip(events['kind'].to_numpy(), events['index'].to_numpy()):
+            if kind == 0:
+                record = first_record[index]
+                risk_amount = equity[account_names[record]] * risk_fraction
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    shares = np.floor(risk_amount / risk_per_share[record])
+                valid = (risk_amount > 0) & np.isfinite(shares) & (shares > 0)
+                remaining[index] = np.where(valid, shares, 0).astype(np.int64)
+                continue
+
+            pos = position_of[index]
+            if partial[index]:
+                size = np.floor(remaining[pos] * exit_pct[index]).astype(np.int64)
+                remaining[pos] -= size
+            else:
+                size = remaining[pos].copy()
+                remaining[pos] = 0
+            pnl = size * (exit_price[index] - entry_price[index])
+            account = account_names[index]
+            equity[account] += pnl
+            total = total + pnl
+            position_size[index] = size
+            dollar_pnl[index] = pnl
+            equity_after[index] = equity[account]
+            total_equity[index] = total
+
+        return {
+            'ledger': ledger,
+            'grid': grid,
+            'position_size': position_size,
+            'dollar_pnl': dollar_pnl,
+            'equity_after_trade': equity_after,
+            'total_equity': total_equity,
+            'starting_equity': accounts * n_accounts,
+        }
+
+
+def summarize_replay(replay: Dict) -> pd.DataFrame:
+    """
+    One row per grid pair: ending equity, return and realized drawdown.
+
+    Args:
+        replay: Output of replay_trade_ledger()
+
+    Returns:
+        pd.DataFrame: Grid columns plus starting_equity, ending_equity,
+            total_pnl, total_return_pct, max_drawdown_pct and avg_position_size
+    """
+    summary = replay['grid'].copy()
+    start = replay['starting_equity']
+    curve = np.vstack([start[None, :], replay['total_equity']])
+    peak = np.maximum.accumulate(curve, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = np.where(peak > 0, curve / peak - 1, 0.0)
+
+    ending = curve[-1]
+    summary['starting_equity'] = start
+    summary['ending_equity'] = ending
+    summary['total_pnl'] = ending - start
+    summary['total_return_pct'] = np.where(start > 0, (ending / np.where(start > 0, start, 1) - 1) * 100, 0.0)
+    summary['max_drawdown_pct'] = drawdown.min(axis=0) * 100
+    sized = replay['position_size']
+    entries = ~replay['ledger']['partial_exit'].to_numpy()
+    summary['avg_position_size'] = sized[entries].mean(axis=0) if entries.any() else 0.0
+    return summary
+
+
+def resize_trades(trades, account_value: float, risk_pct: float,
+                  shared_account: bool = False) -> pd.DataFrame:
+    """
+    Ledger with position_size, dollar_pnl and equity_after_trade recomputed.
+
+    Args:
+        trades: Anything load_trade_ledger() accepts
+        account_value: Starting account value
+        risk_pct: Risk percentage per trade
+        shared_account: One account for all tickers (default: one per ticker)
+
+    Returns:
+        pd.DataFrame: Time-ordered ledger with resized columns
+    """
+    replay = replay_trade_ledger(trades, [account_value], [risk_pct], shared_account=shared_account)
+    ledger = replay['ledger'].copy()
+    ledger['position_size'] = replay['position_size'][:, 0]
+    ledger['dollar_pnl'] = replay['dollar_pnl'][:, 0]
+    ledger['equity_after_trade'] = replay['equity_after_trade'][:, 0]
+    ledger['portfolio_equity'] = replay['total_equity'][:, 0]
+    return ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay a stored trade ledger for other account sizes and risk percentages',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Risk grid on a batch_backtest trade log (one account per ticker)
+  python trade_replay.py backtest_results/PORTFOLIO_TRADE_LOG_24mo_20251201_120000.csv \\
+      --risk-pcts 0.25 0.5 0.75 1.0
+
+  # Account sizes x risk, all tickers sharing one account, saved to CSV
+  python trade_replay.py trades.csv --account-values 25000 100000 --risk-pcts 0.5 1.0 \\
+      --shared-account -o replay_summary.csv
+        """
+    )
+    parser.add_argument('ledger', help='Trade ledger CSV (needs initial_stop column)')
+    parser.add_argument('--account-values', type=float, nargs='+', default=[100000],
+                        help='Starting account values (default: 100000)')
+    parser.add_argument('--risk-pcts', type=float, nargs='+', default=[0.75],
+                        help='Risk percentages per trade (default: 0.75)')
+    parser.add_argument('--shared-account', action='store_true',
+                        help='Replay all tickers against one account')
+    parser.add_argument('-o', '--output', help='Save the summary table to this CSV')
+
+    args = parser.parse_args()
+
+    try:
+        replay = replay_trade_ledger(args.ledger, args.account_values, args.risk_pcts,
+                                     shared_account=args.shared_account)
+    except DataValidationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    summary = summarize_replay(replay)
+    print(f"\n📊 R-SPACE REPLAY: {len(replay['ledger'])} trade records, {len(summary)} sizing combinations")
+    print("=" * 70)
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+    if args.output:
+        summary.to_csv(args.output, index=False)
+        print(f"\n✅ Summary saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ from error_handler import (
 )
 
 # Import data manager for smart data retrieval with multiple sources
-from analysis_service import prepare_analysis_dataframe
+from analysis_service import get_analysis_dataframe, get_period_frames
 from data_manager import (
     read_ticker_file as dm_read_ticker_file,
     clear_cache as dm_clear_cache,
@@ -40,6 +40,7 @@ import chart_builder
 
 # Import batch processor module for multi-ticker processing
 import batch_processor
+from batch_shards import parse_shard
 
 # Import empirically validated signal thresholds
 import threshold_config
@@ -291,7 +292,8 @@ def generate_analysis_text(ticker: str, df: pd.DataFrame, period: str) -> str:
 
 def analyze_ticker(ticker: str, period='6mo', save_to_file=False, output_dir='.', save_chart=False,
                    force_refresh=False, show_chart=True, show_summary=True, debug=False,
-                   chart_backend: str = 'matplotlib', data_source: str = 'yfinance'):
+                   chart_backend: str = 'matplotlib', data_source: str = 'yfinance',
+                   prepared_df: Optional[pd.DataFrame] = None):
     """
     Retrieve and analyze price-volume data for a given ticker symbol.
     
@@ -307,6 +309,8 @@ def analyze_ticker(ticker: str, period='6mo', save_to_file=False, output_dir='.'
         debug (bool): Enable additional progress prints when saving artifacts
         chart_backend (str): Chart engine to use ('matplotlib' for PNG, 'plotly' for interactive HTML)
         data_source (str): Data source to use ('yfinance' or 'massive')
+        prepared_df (pd.DataFrame, optional): Analysis frame for this ticker/period
+            to use instead of building one (e.g. from get_period_frames)
         
     Raises:
         DataValidationError: If ticker or period is invalid
@@ -324,13 +328,16 @@ def analyze_ticker(ticker: str, period='6mo', save_to_file=False, output_dir='.'
         
         logger = get_logger()
         
-    df = prepare_analysis_dataframe(
-        ticker,
-        period,
-        data_source=data_source,
-        force_refresh=force_refresh,
-        verbose=show_summary,
-    )
+    if prepared_df is not None:
+        df = prepared_df
+    else:
+        df = get_analysis_dataframe(
+            ticker,
+            period,
+            data_source=data_source,
+            force_refresh=force_refresh,
+            verbose=show_summary,
+        )
     
     # --- Generate Chart using selected Chart Builder Module ---
     if save_chart or show_chart:
@@ -621,22 +628,33 @@ def analyze_ticker(ticker: str, period='6mo', save_to_file=False, output_dir='.'
         
         return df
 
-def multi_timeframe_analysis(ticker: str, periods=['1mo', '3mo', '6mo', '12mo'], chart_backend: str = 'matplotlib'):
+# Lookback used for higher-timeframe confirmation (enough bars for 20-bar windows)
+HIGHER_TIMEFRAME_PERIODS = {'1wk': '36mo', '1mo': '120mo'}
+
+def multi_timeframe_analysis(ticker: str, periods=['1mo', '3mo', '6mo', '12mo'], chart_backend: str = 'matplotlib',
+                             intervals=None):
     """
     Analyze accumulation signals across multiple timeframes for stronger confirmation.
     
+    The indicator pipeline runs once on the longest period; shorter periods are
+    derived from that frame (see analysis_service.get_period_frames).
+    
     Args:
         ticker (str): Stock symbol to analyze.
         periods (List[str]): Collection of timeframe strings to process.
         chart_backend (str): Chart engine passed through to analyze_ticker.
+        intervals (List[str], optional): Higher bar timeframes ('1wk', '1mo') to add.
+            These run the same pipeline on bars resampled from the daily cache.
     """
     print(f"\n🔍 MULTI-TIMEFRAME ACCUMULATION ANALYSIS FOR {ticker.upper()}")
     print("="*70)
     
     results = {}
+    period_frames = get_period_frames(ticker, list(periods))
     for period in periods:
         print(f"\n📅 Analyzing {period} timeframe...")
-        df_temp = analyze_ticker(ticker, period=period, chart_backend=chart_backend)
+        df_temp = analyze_ticker(ticker, period=period, chart_backend=chart_backend,
+                                 prepared_df=period_frames[period])
         
         # Get recent accumulation metrics
         recent_score = df_temp['Accumulation_Score'].tail(5).mean()
@@ -656,6 +674,28 @@ def multi_timeframe_analysis(ticker: str, periods=['1mo', '3mo', '6mo', '12mo'],
         print(f"  Accumulation days: {acc_percentage:.1f}% of period")
         print(f"  Latest signal: {df_temp['Phase'].iloc[-1]}")
     
+    for interval in intervals or []:
+        bar_period = HIGHER_TIMEFRAME_PERIODS.get(interval, '36mo')
+        print(f"\n📅 Analyzing {interval} bars ({bar_period})...")
+        df_temp = get_analysis_dataframe(ticker, bar_period, interval=interval)
+        
+        recent_score = df_temp['Accumulation_Score'].tail(5).mean()
+        phase_counts = df_temp['Phase'].value_counts()
+        acc_percentage = ((phase_counts.get('Strong_Accumulation', 0) + 
+                          phase_counts.get('Moderate_Accumulation', 0) + 
+                          phase_counts.get('Support_Accumulation', 0)) / len(df_temp)) * 100
+        
+        results[interval] = {
+            'recent_score': recent_score,
+            'accumulation_percentage': acc_percentage,
+            'total_days': len(df_temp),
+            'latest_phase': df_temp['Phase'].iloc[-1]
+        }
+        
+        print(f"  Recent 5-bar avg score: {recent_score:.1f}/10")
+        print(f"  Accumulation bars: {acc_percentage:.1f}% of period")
+        print(f"  Latest signal: {df_temp['Phase'].iloc[-1]}")
+    
     print(f"\n📋 TIMEFRAME CONSENSUS:")
     avg_score = np.mean([r['recent_score'] for r in results.values()])
     avg_acc_pct = np.mean([r['accumulation_percentage'] for r in results.values()])
@@ -685,6 +725,7 @@ Examples:
   python vol_analysis.py NVDA --period 6mo   # Analyze NVIDIA with 6-month period
   python vol_analysis.py MSFT -p 3mo         # Analyze Microsoft with 3-month period
   python vol_analysis.py GOOGL --multi       # Run multi-timeframe analysis
+  python vol_analysis.py GOOGL --multi --higher-timeframes  # Add weekly/monthly bar confirmation
   python vol_analysis.py AAPL -p 36mo        # Analyze AAPL with 3-year period
 
   # Batch processing from file
@@ -692,6 +733,10 @@ Examples:
   python vol_analysis.py -f stocks.txt --period 6mo           # Process with 6-month period
   python vol_analysis.py -f stocks.txt --output-dir results   # Save to 'results' directory
   python vol_analysis.py -f stocks.txt --save-charts          # Also save chart images
+  python vol_analysis.py -f stocks.txt --screen --jobs 4      # Screen last bar in parallel, analyze qualifiers only
+  python vol_analysis.py -f stocks.txt --incremental          # Resume / only re-analyze tickers whose inputs changed
+  python vol_analysis.py -f stocks.txt --shard 2/4            # Analyze shard 2 of 4, save a partial result
+  python vol_analysis.py --merge-shards results_volume/shards # Summary reports from all shards
 
 Available periods: 1d, 5d, 1mo, 3mo, 6mo, 12mo, 24mo, 36mo, 60mo, ytd, max
 Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equivalents
@@ -736,6 +781,40 @@ Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equ
         help='Select chart renderer: matplotlib (PNG) or plotly (interactive HTML)'
     )
     
+    parser.add_argument(
+        '--screen',
+        action='store_true',
+        help='Batch mode: screen the last bar of every ticker first and run the full analysis '
+             'only for tickers with an active, threshold-qualified signal'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for the --screen phase (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Batch mode: reuse reports of tickers the output directory\'s run manifest records '
+             'as completed with unchanged inputs (resumes an interrupted run)'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        metavar='I/N',
+        help='Batch mode: analyze only shard I of N (tickers balanced by cache size) and save a '
+             'partial result to OUTPUT_DIR/shards instead of the summary reports'
+    )
+    
+    parser.add_argument(
+        '--merge-shards',
+        metavar='DIR',
+        help='Write the batch summary reports from the partial results of all shards in DIR'
+    )
+    
     parser.add_argument(
         '--data-source',
         choices=['yfinance', 'massive'],
@@ -763,6 +842,12 @@ Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equ
         help='Run multi-timeframe analysis instead of single period (single ticker mode only)'
     )
     
+    parser.add_argument(
+        '--higher-timeframes',
+        action='store_true',
+        help='With --multi, also confirm on weekly and monthly bars resampled from the daily cache'
+    )
+    
     parser.add_argument(
         '--force-refresh',
         action='store_true',
@@ -810,7 +895,39 @@ Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equ
         help='Run walk-forward threshold validation (Item #9)'
     )
     
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Use stored earnings dates only (no network calls)'
+    )
+    
+    parser.add_argument(
+        '--no-frame-cache',
+        action='store_true',
+        help='Rebuild analysis frames instead of using the persistent frame cache'
+    )
+    
     args = parser.parse_args()
+    
+    if args.no_frame_cache:
+        import frame_cache
+        frame_cache.set_frame_cache_enabled(False)
+    
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    shard = None
+    if args.shard and not args.file:
+        parser.error("--shard requires -f/--file")
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except DataValidationError as e:
+            parser.error(str(e))
+
+    if args.offline:
+        import earnings_calendar
+        earnings_calendar.set_offline_mode(True)
 
     # Configure logging verbosity based on debug flag
     log_level = "DEBUG" if args.debug else "WARNING"
@@ -830,7 +947,14 @@ Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equ
             return
         
         # Regular analysis modes
-        if args.file:
+        if args.merge_shards:
+            batch_processor.merge_batch_shards(
+                args.merge_shards,
+                output_dir=args.output_dir,
+                save_charts=args.save_charts,
+                verbose=args.debug
+            )
+        elif args.file:
             # Batch processing mode - use batch_processor module
             if args.debug:
                 print(f"🚀 Starting batch processing from file: {args.file}")
@@ -841,7 +965,11 @@ Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equ
                 save_charts=args.save_charts,
                 chart_backend=args.chart_backend,
                 verbose=args.debug,
-                data_source=args.data_source
+                data_source=args.data_source,
+                screen=args.screen,
+                jobs=args.jobs,
+                incremental=args.incremental,
+                shard=shard
             )
             if args.debug:
                 print(f"\n✅ Batch processing complete!")
@@ -852,7 +980,11 @@ Note: Legacy periods (1y, 2y, 5y, etc.) are automatically converted to month equ
             
             if args.multi:
                 # Run multi-timeframe analysis
-                results = multi_timeframe_analysis(ticker, chart_backend=args.chart_backend)
+                results = multi_timeframe_analysis(
+                    ticker,
+                    chart_backend=args.chart_backend,
+                    intervals=list(HIGHER_TIMEFRAME_PERIODS) if args.higher_timeframes else None
+                )
             else:
                 # Run single period analysis with force refresh option
                 # Don't show chart or detailed summary if backtesting